@@ -28,17 +28,18 @@
 #include <iostream>
 #include <fstream>
 #include <stdexcept>
+#include <algorithm>
 #include <linux/limits.h>
 #include <dirent.h>
 #include <signal.h>
 #include <errno.h>
 #include <libgen.h>
-#include <glob.h>
 #include <sys/wait.h>
 #include <sys/types.h>
 #include <sys/stat.h>
 #include <sys/signalfd.h>
 #include <sys/time.h>
+#include <time.h>
 #include <sys/utsname.h>
 #include <sys/sysinfo.h>
 #include <boost/filesystem/path.hpp>
@@ -78,11 +79,14 @@
 #include "utils/SymlinkReader.h"
 #include "utils/ReferenceWrapper.h"
 #include "parsers/PidProcStatParser.h"
+#include "parsers/PidSmapsParser.h"
 #include "states/ProcStat.h"
 #include "states/ProcMeminfo.h"
 #include "statistics/CpuUsageStats.h"
 #include "reports/NicThroughputThresholdMonitor.h"
 #include "reports/FreeMemoryThresholdMonitor.h"
+#include "reports/PressureThresholdMonitor.h"
+#include "reports/DiskSaturationThresholdMonitor.h"
 
 #define PROCESSOR_NAME "DCE:fefb9c66-d14a-438d-ad59-2cfd1adb272b"
 #define OS_NAME        "DCE:4a23ad60-0b25-4121-a630-68803a498f75"
@@ -118,6 +122,16 @@ private:
 };
 
 
+//
+// refresh periods (milliseconds) of the data model collectors that change
+// slower than cpu usage, the others are refreshed every cycle
+//
+static const uint32_t NIC_UPDATE_PERIOD = 1000;
+static const uint32_t DISK_UPDATE_PERIOD = 1000;
+static const uint32_t LIMITS_UPDATE_PERIOD = 5000;
+static const uint32_t MEMINFO_UPDATE_PERIOD = 1000;
+
+
 uint64_t conv_units( const std::string &units ) {
   uint64_t unit_m=1024*1024;
   if ( units == "Kb" ) unit_m = 1e3;
@@ -229,22 +243,6 @@ void GPP_i::proc_redirect::close() {
 //  component_description class and helpers
 //
 
-class FindPid : public std::binary_function< GPP_i::component_description, int, bool >  {
-
-public:
-  bool operator() ( const GPP_i::component_description &a, const int &pid ) const {
-    return a.pid == pid;
-  }
-};
-
-class FindApp : public std::binary_function< GPP_i::component_description, std::string, bool  >  {
-
-public:
-  bool operator() ( const GPP_i::component_description &a, const std::string &appName ) const {
-    return a.appName == appName;
-  }
-};
-
 inline bool operator== (const GPP_i::component_description& s1, 
 			const GPP_i::component_description& s2) {
     if (s1.appName!=s2.appName)
@@ -261,9 +259,14 @@ GPP_i::component_description::component_description() :
   identifier(""),
   app_started(false),
   reservation(-1.0),
+  core_usage(0.0),
   terminated(false),
-  pstat_idx(0)
-{ memset(pstat_history, 0, sizeof(pstat_history) ); }
+  num_files(0),
+  files_stamp(0),
+  mem_pss(0.0),
+  mem_uss(0.0),
+  mem_stamp(0)
+{}
 
 
 GPP_i::component_description::component_description( const std::string &appId) :
@@ -272,60 +275,56 @@ GPP_i::component_description::component_description( const std::string &appId) :
   identifier(""),
   app_started(false),
   reservation(-1.0),
+  core_usage(0.0),
   terminated(false),
-  pstat_idx(0)
-{ memset(pstat_history, 0, sizeof(pstat_history) ); }
+  num_files(0),
+  files_stamp(0),
+  mem_pss(0.0),
+  mem_uss(0.0),
+  mem_stamp(0)
+{}
 
 
 int64_t GPP_i::component_description::get_process_time() 
 {   
-  int64_t retval = 0;
-  if (parent->grp_children.find(pid) == parent->grp_children.end())
-      return retval;
-  BOOST_FOREACH(const int &_pid, parent->grp_children[pid].pids) {
-    PidProcStatParser pstat_file(_pid);
-    if ( pstat_file.parse() < 0 ) {
-        return -1;
-    }
-    retval += pstat_file.get_ticks();
-  }
-  return retval;
+  //
+  // ticks for the process group are sampled by the process tree during
+  // update_grp_child_pids
+  //
+  std::map<int,grp_values>::const_iterator grp = parent->grp_children.find(pid);
+  if (grp == parent->grp_children.end())
+      return -1;
+  return grp->second.ticks;
+}
+
+bool GPP_i::component_description::add_history( int64_t ptime ) {
+  return add_history(ptime, history.get_stamp());
 }
 
-void GPP_i::component_description::add_history( int64_t ptime ) {
-  if ( ptime == -1 ) ptime=0; /// Log error ..
-  pstat_idx = (pstat_idx + 1)% pstat_history_len;
-  pstat_history[pstat_idx] = ptime;
+bool GPP_i::component_description::add_history( int64_t ptime, int64_t stamp ) {
+  return history.add(ptime, stamp);
 }
 
 void GPP_i::component_description::add_history( ) {
-  int64_t ptime = get_process_time();
-  if ( ptime < 0 ) ptime=0; /// Log error ..
-  pstat_idx = (pstat_idx + 1)% pstat_history_len;
-  pstat_history[pstat_idx] = ptime;
+  add_history(get_process_time());
 }
 
 int64_t  GPP_i::component_description::get_pstat_usage( bool refresh) {
   if ( refresh) add_history();
-  int64_t retval=0;
-  int8_t p1_idx = pstat_idx -1;
-  if ( p1_idx < 0 ) p1_idx = pstat_history_len-1;
-  uint64_t p1=pstat_history[p1_idx];
-  uint64_t p2=pstat_history[pstat_idx];
-  retval=p2-p1; 
-  if ( (p2-p1) < 0 )retval=p1-p2;
-  return retval;
+  return history.get_delta();
 }
 
 int64_t  GPP_i::component_description::get_pstat_usage( uint64_t &p2,  uint64_t &p1 ){
-  int64_t retval=0;
-  p2 = pstat_history[pstat_idx];
-  int8_t p1_idx = pstat_idx -1;
-  if ( p1_idx < 0 ) p1_idx = pstat_history_len-1;
-  p1=pstat_history[p1_idx];
-  retval=p2-p1; 
-  if ( (p2-p1) < 0 )retval=p1-p2;
-  return retval;
+  int64_t t2, t1;
+  history.get_last(t2, t1);
+  p2 = t2;
+  p1 = t1;
+  return t2 > t1 ? t2-t1 : t1-t2;
+}
+
+void GPP_i::component_description::set_usage( const float usage ) {
+  core_usage = usage;
+  history.set_usage(usage);
 }
 
 
@@ -399,8 +398,14 @@ void GPP_i::_init() {
   std::ostringstream s;
   s << tmp_user_id;
   user_id = s.str();
-  limit_check_count = 0;
+  limits_collector = 0;
+  limits_exceeded = false;
   n_reservations =0;
+  cpu_windows_changed = false;
+  disk_allocated = 0;
+  last_ticks = tick_snapshot();
+  process_tree.reset( new ProcessTree() );
+  cgroups.reset( new CgroupAccounting() );
   sig_fd = -1;
 
   //
@@ -442,6 +447,7 @@ void GPP_i::_init() {
 
   // default cycle time setting for updating data model, metrics and state
   threshold_cycle_time = 500;
+  cadence.period = threshold_cycle_time;
 
   //
   // Add property change listeners and allocation modifiers
@@ -459,6 +465,9 @@ void GPP_i::_init() {
   // add property change listener
   addPropertyChangeListener("DCE:89be90ae-6a83-4399-a87d-5f4ae30ef7b1", this, &GPP_i::mcastnicThreshold_changed);
 
+  // add property change listener
+  addPropertyChangeListener("cpu_average_windows", this, &GPP_i::_cpu_average_windows_changed);
+
   utilization_entry_struct cpu;
   cpu.description = "CPU cores";
   cpu.component_load = 0;
@@ -468,6 +477,12 @@ void GPP_i::_init() {
   utilization.push_back(cpu);
   
   setPropertyQueryImpl(this->component_monitor, this, &GPP_i::get_component_monitor);
+  setPropertyQueryImpl(this->application_monitor, this, &GPP_i::get_application_monitor);
+  setPropertyQueryImpl(this->cpu_utilization, this, &GPP_i::get_cpu_utilization);
+  setPropertyQueryImpl(this->cpu_averages, this, &GPP_i::get_cpu_averages);
+  setPropertyQueryImpl(this->disk_metrics, this, &GPP_i::get_disk_metrics);
+  setPropertyQueryImpl(this->update_schedule, this, &GPP_i::get_update_schedule);
+  setPropertyQueryImpl(this->nic_metrics, this, &GPP_i::get_nic_metrics);
 
   // tie allocation modifier callbacks to identifiers
 
@@ -486,7 +501,8 @@ void GPP_i::_init() {
   // check  memory capacity allocations 
   setAllocationImpl("DCE:8dcef419-b440-4bcf-b893-cab79b6024fb", this, &GPP_i::allocate_memCapacity, &GPP_i::deallocate_memCapacity);
 
-  //setAllocationImpl("diskCapacity", this, &GPP_i::allocate_diskCapacity, &GPP_i::deallocate_diskCapacity);
+  // disk bandwidth allocations
+  setAllocationImpl("diskCapacity", this, &GPP_i::allocate_diskCapacity, &GPP_i::deallocate_diskCapacity);
 
 }
 
@@ -513,120 +529,260 @@ void GPP_i::postConstruction (std::string &profile,
 }
 
 void GPP_i::update_grp_child_pids() {
-    glob_t globbuf;
-    std::vector<int> pids_now;
-    glob("/proc/[0-9]*", GLOB_NOSORT, NULL, &globbuf);
-    for (unsigned int i = 0; i < globbuf.gl_pathc; i++) {
-        std::string stat_filename(globbuf.gl_pathv[globbuf.gl_pathc - i - 1]);
-        std::string proc_id(stat_filename.substr(stat_filename.rfind("/")+1));
-        pids_now.push_back(boost::lexical_cast<int>(proc_id));
-    }
-    globfree(&globbuf);
-
-    BOOST_FOREACH(const int &_pid, pids_now) {
-        if (parsed_stat.find(_pid) == parsed_stat.end()) { // it is not on the map
-            std::stringstream stat_filename;
-            stat_filename << "/proc/"<<_pid<<"/stat";
-            std::string line;
-            std::vector<std::string> fields;
-            try {
-                std::ifstream istr(stat_filename.str().c_str());
-                std::getline(istr, line);
-                boost::split(fields, line, boost::is_any_of(std::string(" ")));
-                static const size_t expected_size(37);
-                if (fields.size() < expected_size) {
-                    std::stringstream errstr;
-                    errstr << "Insufficient fields in "<<stat_filename<<" file (expected>=" << expected_size << " received=" << fields.size() << ")";
-                    LOG_DEBUG(GPP_i, __FUNCTION__ << ": " << errstr.str() );
-                    continue;
-                }
-            } catch ( ... ) {
-                std::stringstream errstr;
-                errstr << "Unable to read "<<stat_filename<<". The process is no longer there";
-                LOG_DEBUG(GPP_i, __FUNCTION__ << ": " << errstr.str() );
-                continue;
-            }
-            proc_values tmp;
-            tmp.mem_rss = boost::lexical_cast<float>(fields[23]) * getpagesize() / (1024*1024);
-            tmp.num_threads = boost::lexical_cast<CORBA::ULong>(fields[19]);
-            tmp.pgrpid = boost::lexical_cast<float>(fields[4]);
-            int pid = boost::lexical_cast<int>(fields[0]);
-            parsed_stat[pid] = tmp;
-            if (grp_children.find(tmp.pgrpid) == grp_children.end()) {
-                grp_children[tmp.pgrpid].num_processes = 1;
-                grp_children[tmp.pgrpid].mem_rss = tmp.mem_rss;
-                grp_children[tmp.pgrpid].num_threads = tmp.num_threads;
-                grp_children[tmp.pgrpid].pgrpid = tmp.pgrpid;
-                grp_children[tmp.pgrpid].pids.push_back(pid);
-            } else {
-                grp_children[tmp.pgrpid].num_processes += 1;
-                grp_children[tmp.pgrpid].mem_rss += tmp.mem_rss;
-                grp_children[tmp.pgrpid].num_threads += tmp.num_threads;
-                grp_children[tmp.pgrpid].pids.push_back(pid);
-            }
+    //
+    // the process tree keeps an index of /proc between cycles (maintained from
+    // process events when available) and only parses the stat files of new
+    // processes and of processes belonging to a component
+    //
+    std::vector<int> roots;
+    BOOST_FOREACH(const component_description &_pid, pids) {
+        if ( !_pid.terminated && !cgroups->is_assigned(_pid.pid) ) roots.push_back(_pid.pid);
+    }
+    process_tree->set_roots(roots);
+    process_tree->update_state();
+    LOG_TRACE(GPP_i, __FUNCTION__ << ": indexed " << process_tree->get_index().size() << " processes, parsed " << process_tree->get_parsed_count());
+
+    static const float pages_to_mb = (float)getpagesize() / (1024*1024);
+    grp_children.clear();
+    const ProcessTree::Contents &groups = process_tree->get();
+    for (ProcessTree::Contents::const_iterator _it = groups.begin(); _it != groups.end(); _it++) {
+        grp_values &grp = grp_children[_it->first];
+        grp.pgrpid = _it->first;
+        grp.num_processes = _it->second.num_processes;
+        grp.mem_rss = _it->second.rss * pages_to_mb;
+        grp.num_threads = _it->second.num_threads;
+        grp.ticks = _it->second.ticks;
+        grp.pids = _it->second.pids;
+    }
+
+    //
+    // components launched into their own cgroup are read from the cgroup,
+    // independent of the number of processes they run
+    //
+    if ( cgroups->enabled() ) {
+        static const double usec_to_ticks = (double)sysconf(_SC_CLK_TCK) / 1e6;
+        CgroupAccounting::Usage usage;
+        BOOST_FOREACH(const component_description &_pid, pids) {
+            if ( _pid.terminated || !cgroups->get_usage(_pid.pid, usage) ) continue;
+            grp_values &grp = grp_children[_pid.pid];
+            grp.pgrpid = _pid.pid;
+            grp.num_processes = usage.pids.size();
+            grp.mem_rss = (float)usage.memory / (1024*1024);
+            grp.num_threads = usage.tasks;
+            grp.ticks = (int64_t)(usage.cpu_usec * usec_to_ticks);
+            grp.pids = usage.pids;
         }
+        cgroups->cleanup();
+    }
+}
+
+std::vector<component_monitor_struct> GPP_i::get_component_monitor() {
+    //
+    // the snapshot is rebuilt by the service thread each cycle, queries only
+    // copy it
+    //
+    ComponentMonitorPtr snapshot;
+    {
+        ReadLock lock(snapshotLock);
+        snapshot = component_monitor_snapshot;
+    }
+    if ( !snapshot ) {
+        return std::vector<component_monitor_struct>();
+    }
+    return *snapshot;
+}
+
+std::vector<application_monitor_struct> GPP_i::get_application_monitor() {
+    ApplicationMonitorPtr snapshot;
+    {
+        ReadLock lock(snapshotLock);
+        snapshot = application_monitor_snapshot;
+    }
+    if ( !snapshot ) {
+        return std::vector<application_monitor_struct>();
+    }
+    return *snapshot;
+}
+
+std::vector<cpu_utilization_struct> GPP_i::get_cpu_utilization() {
+    CpuUtilizationPtr snapshot;
+    {
+        ReadLock lock(snapshotLock);
+        snapshot = cpu_utilization_snapshot;
+    }
+    if ( !snapshot ) {
+        return std::vector<cpu_utilization_struct>();
+    }
+    return *snapshot;
+}
+
+std::vector<cpu_averages_struct> GPP_i::get_cpu_averages() {
+    CpuAveragesPtr snapshot;
+    {
+        ReadLock lock(snapshotLock);
+        snapshot = cpu_averages_snapshot;
+    }
+    if ( !snapshot ) {
+        return std::vector<cpu_averages_struct>();
+    }
+    return *snapshot;
+}
+
+std::vector<disk_metrics_struct> GPP_i::get_disk_metrics() {
+    DiskMetricsPtr snapshot;
+    {
+        ReadLock lock(snapshotLock);
+        snapshot = disk_metrics_snapshot;
+    }
+    if ( !snapshot ) {
+        return std::vector<disk_metrics_struct>();
+    }
+    return *snapshot;
+}
+
+std::vector<nic_metrics_struct_struct> GPP_i::get_nic_metrics() {
+    // formatted from the counters of the last update
+    ReadLock lock(nicLock);
+    if ( !nic_facade ) {
+        return std::vector<nic_metrics_struct_struct>();
     }
-    std::vector<int> parsed_stat_to_erase;
-    for(std::map<int, proc_values>::iterator _it = parsed_stat.begin(); _it != parsed_stat.end(); _it++) {
-        if (std::find(pids_now.begin(), pids_now.end(), _it->first) == pids_now.end()) {  // it is not on the current process list
-            if (grp_children.find(parsed_stat[_it->first].pgrpid) != grp_children.end()) {
-                std::vector<int>::iterator it = std::find(grp_children[parsed_stat[_it->first].pgrpid].pids.begin(), grp_children[parsed_stat[_it->first].pgrpid].pids.end(), _it->first);
-                if (it != grp_children[parsed_stat[_it->first].pgrpid].pids.end())
-                    grp_children[parsed_stat[_it->first].pgrpid].pids.erase(it);
+    return nic_facade->get_nic_metrics();
+}
+
+std::vector<update_schedule_struct> GPP_i::get_update_schedule() {
+    UpdateScheduleStatsPtr snapshot;
+    {
+        ReadLock lock(snapshotLock);
+        snapshot = update_schedule_snapshot;
+    }
+    if ( !snapshot ) {
+        return std::vector<update_schedule_struct>();
+    }
+    return *snapshot;
+}
+
+CORBA::ULong GPP_i::_count_open_files( const std::vector<int> &grp_pids ) {
+    CORBA::ULong num_files = 0;
+    BOOST_FOREACH(const int &actual_pid, grp_pids) {
+        std::stringstream fd_dirname;
+        DIR * dirp;
+        struct dirent * entry;
+        fd_dirname <<"/proc/"<<actual_pid<<"/fd";
+        dirp = opendir(fd_dirname.str().c_str());
+        if (dirp != NULL) {
+            while ((entry = readdir(dirp)) != NULL) {
+                if (entry->d_type != DT_DIR) {  // If the entry is not a directory
+                    num_files++;
+                }
             }
-            parsed_stat_to_erase.push_back(_it->first);
+            closedir (dirp);
         }
     }
-    BOOST_FOREACH(const int &_pid, parsed_stat_to_erase) {
-        parsed_stat.erase(_pid);
+    return num_files;
+}
+
+void GPP_i::_read_component_memory( const std::vector<int> &grp_pids, float &pss, float &uss ) {
+    int64_t pss_bytes = 0, uss_bytes = 0;
+    PidSmapsParser::Contents mem;
+    BOOST_FOREACH(const int &actual_pid, grp_pids) {
+        PidSmapsParser parser(actual_pid);
+        if ( parser.parse(mem) != 0 ) continue;
+        pss_bytes += mem.pss;
+        uss_bytes += mem.uss();
     }
+    pss = (float)pss_bytes / (1024*1024);
+    uss = (float)uss_bytes / (1024*1024);
 }
 
-std::vector<component_monitor_struct> GPP_i::get_component_monitor() {
-    std::vector<component_monitor_struct> retval;
+void GPP_i::_update_component_monitor( const int64_t stamp ) {
+    //
+    // called from update with pidLock held, open files are only recounted
+    // every component_files_cycle_time milliseconds and memory maps every
+    // component_memory_cycle_time milliseconds.  Application totals are
+    // accumulated in the same pass.
+    //
+    boost::shared_ptr< std::vector<component_monitor_struct> > retval( new std::vector<component_monitor_struct>() );
+    std::map<std::string, application_monitor_struct> apps;
     struct sysinfo info;
     sysinfo(&info);
-    BOOST_FOREACH(const component_description &_pid, pids) {
+    const int64_t files_period = (int64_t)component_files_cycle_time * 1000;
+    const int64_t mem_period = (int64_t)component_memory_cycle_time * 1000;
+    BOOST_FOREACH(component_description &_pid, pids) {
         if ( !_pid.terminated ) {
-            if ((grp_children.find(_pid.pid) == grp_children.end()) or (parsed_stat.find(_pid.pid) == parsed_stat.end())) {
+            std::map<int,grp_values>::const_iterator grp = grp_children.find(_pid.pid);
+            if (grp == grp_children.end()) {
                 std::stringstream errstr;
                 errstr << "Could not find /proc/"<<_pid.pid<<"/stat. The process corresponding to component "<<_pid.identifier<<" is no longer there";
-                LOG_WARN(GPP_i, __FUNCTION__ << ": " << errstr.str() );
+                LOG_DEBUG(GPP_i, __FUNCTION__ << ": " << errstr.str() );
                 continue;
             }
             component_monitor_struct tmp;
             tmp.waveform_id = _pid.appName;
             tmp.pid = _pid.pid;
             tmp.component_id = _pid.identifier;
-            tmp.num_processes = grp_children[_pid.pid].num_processes;
+            tmp.num_processes = grp->second.num_processes;
             tmp.cores = _pid.core_usage;
-
-            tmp.mem_rss = grp_children[_pid.pid].mem_rss;
-            tmp.mem_percent = (double) grp_children[_pid.pid].mem_rss * (1024*1024) / ((double)info.totalram * info.mem_unit) * 100;
-            tmp.num_threads = grp_children[_pid.pid].num_threads;
-            
-            tmp.num_files = 0;
-            BOOST_FOREACH(const int &actual_pid, grp_children[_pid.pid].pids) {
-                std::stringstream fd_dirname;
-                DIR * dirp;
-                struct dirent * entry;
-                fd_dirname <<"/proc/"<<actual_pid<<"/fd";
-                dirp = opendir(fd_dirname.str().c_str());
-                if (dirp != NULL) {
-                    while ((entry = readdir(dirp)) != NULL) {
-                        if (entry->d_type != DT_DIR) {  // If the entry is not a directory
-                            tmp.num_files++;
-                        }
-                    }
-                    closedir (dirp);
+            tmp.cores_ewma = _pid.history.get_ewma();
+            tmp.cores_peak = _pid.history.get_peak();
+            tmp.cores_p50 = _pid.history.get_p50();
+            tmp.cores_p95 = _pid.history.get_p95();
+
+            tmp.mem_rss = grp->second.mem_rss;
+            float mem_used = grp->second.mem_rss;
+            if ( component_memory_accounting ) {
+                if ( _pid.mem_stamp == 0 || stamp - _pid.mem_stamp >= mem_period ) {
+                    _read_component_memory(grp->second.pids, _pid.mem_pss, _pid.mem_uss);
+                    _pid.mem_stamp = stamp;
                 }
+                mem_used = _pid.mem_pss;
+            } else if ( _pid.mem_stamp != 0 ) {
+                _pid.mem_pss = _pid.mem_uss = 0.0;
+                _pid.mem_stamp = 0;
+            }
+            tmp.mem_pss = _pid.mem_pss;
+            tmp.mem_uss = _pid.mem_uss;
+            tmp.mem_percent = (double) mem_used * (1024*1024) / ((double)info.totalram * info.mem_unit) * 100;
+            tmp.num_threads = grp->second.num_threads;
+
+            if ( _pid.files_stamp == 0 || stamp - _pid.files_stamp >= files_period ) {
+                _pid.num_files = _count_open_files(grp->second.pids);
+                _pid.files_stamp = stamp;
             }
+            tmp.num_files = _pid.num_files;
 
-            retval.push_back(tmp);
+            retval->push_back(tmp);
+
+            // fold the component into its application's totals
+            application_monitor_struct &app = apps[_pid.appName];
+            if ( app.num_components == 0 ) {
+                app.waveform_id = _pid.appName;
+            }
+            app.num_components++;
+            app.cores += tmp.cores;
+            if ( _pid.reservation > 0 ) {
+                app.reserved_cores += _pid.reservation;
+            }
+            app.mem_rss += tmp.mem_rss;
+            app.mem_pss += tmp.mem_pss;
+            app.mem_uss += tmp.mem_uss;
+            app.mem_percent += tmp.mem_percent;
+            app.num_processes += tmp.num_processes;
+            app.num_threads += tmp.num_threads;
+            app.num_files += tmp.num_files;
         }
     }
-    
-    return retval;
+
+    boost::shared_ptr< std::vector<application_monitor_struct> > appval( new std::vector<application_monitor_struct>() );
+    appval->reserve(apps.size());
+    for ( std::map<std::string, application_monitor_struct>::iterator it=apps.begin(); it != apps.end(); it++ ) {
+        application_monitor_struct &app = it->second;
+        app.reservation_used = app.reserved_cores > 0 ? 100.0 * app.cores / app.reserved_cores : 0.0;
+        appval->push_back(app);
+    }
+
+    WriteLock lock(snapshotLock);
+    component_monitor_snapshot = retval;
+    application_monitor_snapshot = appval;
 }
 
 void GPP_i::process_ODM(const CORBA::Any &data) {
@@ -636,28 +792,22 @@ void GPP_i::process_ODM(const CORBA::Any &data) {
         if (app_state_change->stateChangeTo == ExtendedEvent::STARTED) {
             RH_NL_TRACE("GPP", "ODM CHANNEL EVENT --> APP STARTED app: " << appId );
             ReadLock rlock(pidLock);
-            ProcessList::iterator i = pids.begin();
             // set app_started ... turns off reservation
-            while ( i != pids.end() ) {
-              i=std::find_if( i, pids.end(), std::bind2nd( FindApp(), appId ) );
-              if ( i != pids.end() ) {
-                i->app_started = true;
-                LOG_TRACE(GPP_i, "Monitor_Processes.. APP STARTED:" << i->pid << " app: " << i->appName );
-                i++;
-              }
+            BOOST_FOREACH(const int _pid, pids.find_app(appId)) {
+              ProcessList::iterator i = pids.find(_pid);
+              if ( i == pids.end() ) continue;
+              i->app_started = true;
+              LOG_TRACE(GPP_i, "Monitor_Processes.. APP STARTED:" << i->pid << " app: " << i->appName );
             }
         } else if (app_state_change->stateChangeTo == ExtendedEvent::STOPPED) {
             RH_NL_TRACE("GPP", "ODM CHANNEL EVENT --> APP STOPPED app: " << appId );
             ReadLock rlock(pidLock);
-            ProcessList::iterator i = pids.begin();
             // set app_started ... turns on reservation
-            while ( i != pids.end() ) {
-              i=std::find_if( i, pids.end(), std::bind2nd( FindApp(), appId ) );
-              if ( i != pids.end() ) {
-                i->app_started = false;
-                LOG_TRACE(GPP_i, "Monitor_Processes.. APP STOPPED :" << i->pid << " app: " << i->appName );
-                i++;
-              }
+            BOOST_FOREACH(const int _pid, pids.find_app(appId)) {
+              ProcessList::iterator i = pids.find(_pid);
+              if ( i == pids.end() ) continue;
+              i->app_started = false;
+              LOG_TRACE(GPP_i, "Monitor_Processes.. APP STOPPED :" << i->pid << " app: " << i->appName );
             }
         }
     }
@@ -690,7 +840,7 @@ int GPP_i::_setupExecPartitions( const CpuList &bl_cpus ) {
             cpus.push_back( j );
           }
         }
-        CpuUsageStats cpu_usage(cpus);
+        CpuUsageStats cpu_usage(proc_stat, cpus);
         soc.cpus = cpus;
         soc.stats = cpu_usage;
         soc.idle_threshold = thresholds.cpu_idle;      
@@ -704,6 +854,10 @@ int GPP_i::_setupExecPartitions( const CpuList &bl_cpus ) {
 #endif
 
     if ( execPartitions.size()  ) {
+      for ( int i=0; i<2; i++ ) {
+        proc_stat->update();
+        std::for_each( execPartitions.begin(), execPartitions.end(), boost::bind( &exec_socket::update, _1 ) );
+      }
       ExecPartitionList::iterator iter =  execPartitions.begin();
       std::ostringstream ss;
       ss  << boost::format("%-6s %-4s %-7s %-7s %-7s ") % "SOCKET" % "CPUS" % "USER"  % "SYSTEM"  % "IDLE"  ;
@@ -711,7 +865,6 @@ int GPP_i::_setupExecPartitions( const CpuList &bl_cpus ) {
       ss.clear();
       ss.str("");
       for ( ; iter != execPartitions.end(); iter++ ) {
-        iter->update();  iter->update();
         ss  << boost::format("%-6d %-4d %-7.2f %-7.2f %-7.2f ") % iter->id % iter->stats.get_ncpus() % iter->stats.get_user_percent()  % iter->stats.get_system_percent()  % iter->stats.get_idle_percent() ;
         LOG_INFO(GPP_i, ss.str()  );    
         ss.clear();
@@ -727,24 +880,110 @@ void
 GPP_i::initializeNetworkMonitor()
 {
     nic_facade.reset( new NicFacade(advanced.maximum_throughput_percentage,
+                                    nic_placement_policy,
                                     nic_interfaces,
+                                    monitor_filtered_nics,
                                     available_nic_interfaces,
                                     networkMonitor,
-                                    nic_metrics,
                                     nic_allocation_status) );
 
-    data_model.push_back( nic_facade );
+    // interfaces can come and go during an update, keep allocations out
+    data_model.add( "nic", boost::bind( &GPP_i::_update_nics, this ), NIC_UPDATE_PERIOD );
+
+    nic_monitors.clear();
+    _update_nic_monitors( false );
+}
+
+void
+GPP_i::_update_nic_monitors( const bool dispatch )
+{
+    std::vector<std::string> added, removed;
+    {
+        WriteLock wlock(nicLock);
+        nic_facade->get_device_changes( added, removed );
+    }
+    if( added.empty() && removed.empty() )
+        return;
 
-    std::vector<std::string> nic_devices( nic_facade->get_devices() );
-    for( size_t i=0; i<nic_devices.size(); ++i )
+    WriteLock wlock(monitorLock);
+    for( size_t i=0; i<removed.size(); ++i )
+    {
+        NicMonitorMap::iterator monitor = nic_monitors.find( removed[i] );
+        if( nic_monitors.end() == monitor )
+            continue;
+        LOG_INFO(GPP_i, __FUNCTION__ << ": Removing interface (" << removed[i] << ")" );
+        threshold_monitors.erase( std::remove(threshold_monitors.begin(), threshold_monitors.end(), monitor->second), threshold_monitors.end() );
+        nic_monitors.erase( monitor );
+    }
+    for( size_t i=0; i<added.size(); ++i )
     {
-        LOG_INFO(GPP_i, __FUNCTION__ << ": Adding interface (" << nic_devices[i] << ")" );
+        LOG_INFO(GPP_i, __FUNCTION__ << ": Adding interface (" << added[i] << ")" );
+        // a full duplex link saturates in one direction, not on the sum
         addThresholdMonitor(
             new NicThroughputThresholdMonitor(_identifier,
-                                              nic_devices[i],
+                                              added[i],
                                               MakeCref<CORBA::Long, float>(modified_thresholds.nic_usage),
-                                              boost::bind(&NicFacade::get_throughput_by_device, nic_facade, nic_devices[i]) ) );
+                                              boost::bind(&NicFacade::get_max_direction_throughput_by_device, nic_facade, added[i]) ) );
+        nic_monitors[added[i]] = threshold_monitors.back();
+        // monitors created at startup are enabled once initialization is done
+        if( dispatch )
+            threshold_monitors.back()->enable_dispatch();
+    }
+}
+
+void
+GPP_i::initializeDiskMonitor()
+{
+  disk_state.reset( new DiskState() );
+
+  //
+  // monitor the disks that back diskCapacity, or every hardware backed disk
+  // when no rates are configured
+  //
+  DiskState::DeviceList devices;
+  for ( size_t i=0; i < diskrateTotal.size(); i++ ) {
+    std::string device = DiskState::ResolveDevice(diskrateTotal[i].device);
+    if ( !device.empty() && std::find(devices.begin(), devices.end(), device) == devices.end() ) {
+      devices.push_back(device);
+    }
+  }
+  if ( devices.empty() ) {
+    devices = DiskState::ListDisks();
+  }
+
+  disk_state->update();
+  for ( size_t i=0; i < devices.size(); i++ ) {
+    if ( !disk_state->find(devices[i]) ) {
+      LOG_WARN(GPP_i, __FUNCTION__ << ": Disk (" << devices[i] << ") is not listed in /proc/diskstats" );
     }
+    LOG_INFO(GPP_i, __FUNCTION__ << ": Adding disk (" << devices[i] << ")" );
+    DiskAccumulatorPtr disk( new DiskAccumulator(disk_state, devices[i]) );
+    disk_accumulators.push_back( disk );
+    addThresholdMonitor( new DiskSaturationThresholdMonitor(_identifier, &thresholds.disk_usage, disk) );
+  }
+
+  // the accumulators compare consecutive samples, refresh them together with /proc/diskstats
+  data_model.add( "disks", boost::bind( &GPP_i::_update_disks, this ), DISK_UPDATE_PERIOD );
+}
+
+void
+GPP_i::_update_nics()
+{
+  WriteLock wlock(nicLock);
+  nic_facade->update();
+}
+
+void
+GPP_i::_update_disks()
+{
+  disk_state->update();
+  std::for_each( disk_accumulators.begin(), disk_accumulators.end(), boost::bind( &DiskAccumulator::update, _1 ) );
+}
+
+void
+GPP_i::_update_exec_partitions()
+{
+  std::for_each( execPartitions.begin(), execPartitions.end(), boost::bind( &exec_socket::update, _1 ) );
 }
 
 void
@@ -754,21 +993,37 @@ GPP_i::initializeResourceMonitors()
   // add cpu utilization calculator
   RH_NL_INFO("GPP", " initialize CPU Montior --- wl size " << wl_cpus.size());
 
+  //
+  // /proc/stat is read once per cycle, ahead of the system monitor and the
+  // execution partitions that compute their usage from it
+  //
+  data_model.add( "proc_stat", proc_stat, 0, false );
+
   // request a system monitor for this GPP
-  system_monitor.reset( new SystemMonitor( wl_cpus ) );
+  system_monitor.reset( new SystemMonitor( wl_cpus, proc_stat ) );
+  _apply_cpu_windows( cpu_average_windows );
 
   // seed system monitor history
   for ( int i=0; i<5; i++ ) { 
+    proc_stat->update();
     system_monitor->report(); 
     boost::this_thread::sleep( boost::posix_time::milliseconds( 200 ) );
   }
 
-  data_model.push_back( system_monitor );
+  data_model.add( "system_monitor", boost::bind( &SystemMonitor::report_cpu, system_monitor ), 0, false );
+  data_model.add( "meminfo", boost::bind( &SystemMonitor::report_memory, system_monitor ), MEMINFO_UPDATE_PERIOD );
 
   // add system limits reader
   process_limits.reset( new ProcessLimits( getpid() ) );
 
-  data_model.push_back( process_limits );
+  limits_collector = data_model.add( "process_limits", process_limits, LIMITS_UPDATE_PERIOD );
+
+  // follow component processes from kernel process events when permitted
+  if ( process_tree->enable_events() ) {
+    RH_NL_INFO("GPP", " initialize Process Monitor --- using process events");
+  } else {
+    RH_NL_INFO("GPP", " initialize Process Monitor --- process events unavailable (requires CAP_NET_ADMIN), polling /proc");
+  }
 
   //  observer to monitor when cpu idle pass threshold value
   addThresholdMonitor( new CpuThresholdMonitor(_identifier, &modified_thresholds.cpu_idle, 
@@ -777,6 +1032,17 @@ GPP_i::initializeResourceMonitors()
   // add available memory monitor, mem_free defaults to MB
   addThresholdMonitor( new FreeMemoryThresholdMonitor(_identifier, MakeCref<CORBA::LongLong, float>(modified_thresholds.mem_free), 
                                                       ConversionWrapper<CORBA::LongLong, float>(memCapacity, mem_cap_units, std::multiplies<float>() ) ) );
+
+  // stall monitors, for the resources the kernel reports pressure for
+  ProcPressurePtr pressure = system_monitor->getPressure();
+  for ( int i=0; i < ProcPressure::NRESOURCES; i++ ) {
+    ProcPressure::Resource resource = (ProcPressure::Resource)i;
+    if ( !pressure->is_available(resource) ) {
+      RH_NL_INFO("GPP", " initialize Pressure Monitor --- " << ProcPressure::GetName(resource) << " pressure unavailable");
+      continue;
+    }
+    addThresholdMonitor( new PressureThresholdMonitor(_identifier, resource, _get_pressure_threshold(resource), pressure) );
+  }
 }
 
 void
@@ -818,11 +1084,29 @@ void GPP_i::initialize() throw (CF::LifeCycle::InitializeError, CORBA::SystemExc
     LOG_INFO(GPP_i, "Component Output Redirection is DISABLED." << componentOutputLog );
   }
 
+  //
+  // check if components should be accounted with their own cgroup
+  //
+  if ( cgroup_accounting ) {
+    if ( cgroups->initialize() ) {
+      LOG_INFO(GPP_i, "Turning on Component Cgroup Accounting under: " << cgroups->get_base() );
+    }
+    else {
+      LOG_WARN(GPP_i, "Component Cgroup Accounting is unavailable (requires a delegated cgroup v2 hierarchy), using process group monitoring." );
+    }
+  }
+
   //
   // Setup affinity settings context
   //
   _affinity_changed( NULL, &affinity );
 
+  //
+  // snapshot of /proc/stat shared by the cpu usage consumers
+  //
+  proc_stat.reset( new ProcStat( ProcStat::CPU ) );
+  proc_stat->update();
+
   //
   // setup execution partitions for performing socket based deployments, we need to know the current black list
   //
@@ -856,11 +1140,14 @@ void GPP_i::initialize() throw (CF::LifeCycle::InitializeError, CORBA::SystemExc
   // setup the data model for the GPP 
   //
   threshold_monitors.clear();
+  data_model.clear();
   initializeResourceMonitors();
   initializeNetworkMonitor();
+  initializeDiskMonitor();
+  data_model.add( "exec_partitions", boost::bind( &GPP_i::_update_exec_partitions, this ), 0, false );
+  data_model.set_budget( (int64_t)update_cpu_budget*1000 );
 
-  std::for_each( data_model.begin(), data_model.end(), boost::bind( &Updateable::update, _1 ) );
-  std::for_each( execPartitions.begin(), execPartitions.end(), boost::bind( &Updateable::update, _1 ) );
+  data_model.run_all( UpdateSchedule::Now() );
 
   //
   // get monitored system values...
@@ -884,6 +1171,11 @@ void GPP_i::initialize() throw (CF::LifeCycle::InitializeError, CORBA::SystemExc
   memCapacity = ((int64_t)( vfree * memInitCapacityPercent)) / mem_cap_units ;
   memCapacityThreshold = memCapacity;
 
+  //
+  // disk bandwidth tracking attributes
+  //
+  diskCapacity = std::max(0.0, _get_disk_rate_limit() - disk_allocated);
+
   //
   // set initial modified thresholds
   //
@@ -1195,9 +1487,31 @@ CF::ExecutableDevice::ProcessID_Type GPP_i::do_execute (const char* name, const
  
     }
     
+    // create a cgroup for the component, the child joins it before exec
+    std::string cgroup_leaf;
+    int cgroup_fd = -1;
+    if ( cgroups->enabled() ) {
+      cgroup_fd = cgroups->create_leaf( cgroup_leaf );
+      if ( cgroup_fd < 0 ) {
+        LOG_WARN(GPP_i, "Unable to create cgroup for: " << path << ", using process group monitoring");
+      }
+    }
+
     // fork child process
     int pid = fork();
 
+    if ( pid != 0 && cgroup_fd > -1 ) {
+      int fork_errno = errno;
+      close(cgroup_fd);
+      if ( pid < 0 ) {
+        cgroups->remove_leaf( cgroup_leaf );
+      }
+      else if ( !cgroups->assign( pid, cgroup_leaf ) ) {
+        LOG_WARN(GPP_i, "Unable to assign cgroup for: " << path << ", using process group monitoring");
+      }
+      errno = fork_errno;
+    }
+
     if (pid == 0) {
 
       int num_retries = 5;
@@ -1235,6 +1549,11 @@ CF::ExecutableDevice::ProcessID_Type GPP_i::do_execute (const char* name, const
       // reset mutex in child...
       pthread_mutex_init(load_execute_lock.native_handle(),0);
       
+      // move into the component's cgroup
+      if ( cgroup_fd > -1 ) {
+        CgroupAccounting::join( cgroup_fd );
+      }
+
       // set the forked component as the process group leader
       setpgid(getpid(), 0);
 
@@ -1377,10 +1696,14 @@ bool GPP_i::_component_cleanup( const int child_pid, const int exit_status ) {
 
 bool GPP_i::_check_limits( const thresholds_struct &thresholds)
 {
-    limit_check_count = (++limit_check_count) % 10;
-    if ( limit_check_count ) {
-        return false;
+    //
+    // the limits are evaluated when process_limits is refreshed, which also
+    // keeps the warnings below to one per refresh
+    //
+    if ( !data_model.ran(limits_collector) ) {
+        return limits_exceeded;
     }
+    limits_exceeded = false;
 
     float _tthreshold = 1 - thresholds.threads * .01;
 
@@ -1391,6 +1714,7 @@ bool GPP_i::_check_limits( const thresholds_struct &thresholds)
       LOG_TRACE(GPP_i, "_gpp_check_limits threads (cur/max): "  << gpp_limits.current_threads << "/" << gpp_limits.max_threads );
       if (gpp_limits.current_threads>(gpp_limits.max_threads*_tthreshold)) {
         LOG_WARN(GPP_i, "GPP process thread limit threshold exceeded,  count/threshold: " <<  gpp_limits.current_threads   << "/" << (gpp_limits.max_threads*_tthreshold) );
+        limits_exceeded = true;
         return true;
       }
     }
@@ -1402,6 +1726,7 @@ bool GPP_i::_check_limits( const thresholds_struct &thresholds)
       LOG_TRACE(GPP_i, "_sys_check_limits threads (cur/max): "  << sys_limits.current_threads << "/" << sys_limits.max_threads );
       if (sys_limits.current_threads>( sys_limits.max_threads *_tthreshold)) {
         LOG_WARN(GPP_i, "SYSTEM thread limit threshold exceeded,  count/threshold: " <<  sys_limits.current_threads   << "/" << (sys_limits.max_threads*_tthreshold) );
+        limits_exceeded = true;
         return true;
       }
     }
@@ -1410,6 +1735,168 @@ bool GPP_i::_check_limits( const thresholds_struct &thresholds)
 }
 
 
+const float *GPP_i::_get_pressure_threshold( const ProcPressure::Resource resource ) const
+{
+    switch ( resource ) {
+    case ProcPressure::MEMORY:
+        return &thresholds.memory_pressure;
+    case ProcPressure::IO:
+        return &thresholds.io_pressure;
+    default:
+        return &thresholds.cpu_pressure;
+    }
+}
+
+bool GPP_i::_check_pressure()
+{
+    const SystemMonitor::Report &rpt = system_monitor->getReport();
+    for ( int i=0; i < ProcPressure::NRESOURCES; i++ ) {
+      ProcPressure::Resource resource = (ProcPressure::Resource)i;
+      const ProcPressure::Pressure &p = rpt.pressure.resources[i];
+      if ( !p.available ) continue;
+      float threshold = *_get_pressure_threshold(resource);
+      LOG_TRACE(GPP_i, "_check_pressure " << ProcPressure::GetName(resource) << " some/full avg10: " << p.some.avg10 << "/" << p.full.avg10 << " threshold: " << threshold );
+      if ( PressureExceeded()( p.some.avg10, threshold ) ) {
+        LOG_WARN(GPP_i, "Pressure threshold exceeded, resource: " << ProcPressure::GetName(resource) << " some avg10/threshold: " << p.some.avg10 << "/" << threshold );
+        return true;
+      }
+    }
+    return false;
+}
+
+
+//
+// share of the distance between a threshold and the best value of a metric
+// that is left, clamped to [0,1]
+//
+static double headroom_ratio( const double distance, const double range )
+{
+  if ( range <= 0 ) return distance > 0 ? 1.0 : 0.0;
+  return std::min(1.0, std::max(0.0, distance / range));
+}
+
+static void keep_smallest( const double h, const std::string &name, double &headroom, std::string &metric )
+{
+  if ( h < headroom ) {
+    headroom = h;
+    metric = name;
+  }
+}
+
+double GPP_i::_get_headroom( std::string &metric ) const
+{
+  const SystemMonitor::Report &rpt = system_monitor->getReport();
+  double headroom = 1.0;
+  metric = "";
+
+  double idle_threshold = modified_thresholds.cpu_idle;
+  keep_smallest( headroom_ratio( system_monitor->get_idle_percent() - idle_threshold, 100.0 - idle_threshold ),
+                 "cpu_idle", headroom, metric );
+
+  double mem_threshold = modified_thresholds.mem_free;
+  keep_smallest( headroom_ratio( (double)rpt.virtual_memory_free - mem_threshold, (double)rpt.virtual_memory_total - mem_threshold ),
+                 "mem_free", headroom, metric );
+
+  double load_threshold = modified_thresholds.load_avg;
+  keep_smallest( headroom_ratio( load_threshold - system_monitor->get_loadavg(), load_threshold ),
+                 "load_avg", headroom, metric );
+
+  for ( int i=0; i < ProcPressure::NRESOURCES; i++ ) {
+    ProcPressure::Resource resource = (ProcPressure::Resource)i;
+    const ProcPressure::Pressure &p = rpt.pressure.resources[i];
+    float threshold = *_get_pressure_threshold(resource);
+    if ( !p.available || threshold <= 0 ) continue;
+    keep_smallest( headroom_ratio( threshold - p.some.avg10, threshold ),
+                   PressureThresholdMonitor::GetResourceId(resource), headroom, metric );
+  }
+
+  if ( thresholds.disk_usage > 0 ) {
+    for ( size_t i=0; i < disk_accumulators.size(); i++ ) {
+      keep_smallest( headroom_ratio( thresholds.disk_usage - disk_accumulators[i]->get_utilization_percent(), thresholds.disk_usage ),
+                     "disk_usage:" + disk_accumulators[i]->get_device(), headroom, metric );
+    }
+  }
+  return headroom;
+}
+
+// cycles the target must stay above the hysteresis band before the cycle is lengthened
+static const int CADENCE_HOLD_CYCLES = 3;
+
+void GPP_i::_update_cadence( const int64_t start, const int64_t end )
+{
+  std::string metric;
+  double headroom = _get_headroom(metric);
+
+  if ( !threshold_cadence.adaptive ) {
+    cadence.period = threshold_cycle_time;
+    cadence.grow_count = 0;
+  }
+  else {
+    CORBA::ULong lo = std::max((CORBA::ULong)1, threshold_cadence.minimum);
+    CORBA::ULong hi = std::max(lo, threshold_cadence.maximum);
+    double near = threshold_cadence.near / 100.0;
+    double far = threshold_cadence.far / 100.0;
+    double scale = 1.0;
+    if ( headroom <= near ) {
+      scale = 0.0;
+    }
+    else if ( headroom < far ) {
+      scale = (headroom - near) / (far - near);
+    }
+    CORBA::ULong target = lo + (CORBA::ULong)((hi - lo) * scale);
+    cadence.period = std::min(hi, std::max(lo, cadence.period));
+
+    //
+    // shorten the cycle as soon as a metric approaches its threshold,
+    // lengthen it only once the target stayed clearly longer for a few cycles
+    //
+    if ( target < cadence.period ) {
+      cadence.period = target;
+      cadence.grow_count = 0;
+    }
+    else if ( target > cadence.period * (1.0 + threshold_cadence.hysteresis / 100.0) ) {
+      if ( ++cadence.grow_count >= CADENCE_HOLD_CYCLES ) {
+        cadence.period = std::min(target, cadence.period * 2);
+        cadence.grow_count = 0;
+      }
+    }
+    else {
+      cadence.grow_count = 0;
+    }
+  }
+
+  //
+  // cpu used by the GPP process, all threads, since the previous cycle
+  //
+  struct rusage usage;
+  int64_t cpu_time = cadence.cpu_time;
+  if ( getrusage(RUSAGE_SELF, &usage) == 0 ) {
+    cpu_time = (int64_t)(usage.ru_utime.tv_sec + usage.ru_stime.tv_sec)*1000000 + usage.ru_utime.tv_usec + usage.ru_stime.tv_usec;
+  }
+  float overhead = 0.0;
+  if ( cadence.stamp != 0 && end > cadence.stamp ) {
+    overhead = 100.0 * (cpu_time - cadence.cpu_time) / (double)(end - cadence.stamp);
+  }
+  cadence.cpu_time = cpu_time;
+  cadence.stamp = end;
+
+  threshold_cadence_status.cycle_time = _get_cycle_time();
+  threshold_cadence_status.headroom = headroom * 100.0;
+  threshold_cadence_status.limiting_metric = metric;
+  threshold_cadence_status.update_time = (end - start) / 1000.0;
+  threshold_cadence_status.overhead = overhead;
+  threshold_cadence_status.detection_time = threshold_cadence_status.cycle_time + threshold_cadence_status.update_time;
+
+  LOG_TRACE(GPP_i, __FUNCTION__ << " cycle_time: " << threshold_cadence_status.cycle_time << " headroom: " << threshold_cadence_status.headroom <<
+            " (" << metric << ") update_time: " << threshold_cadence_status.update_time << " overhead: " << overhead );
+}
+
+CORBA::ULong GPP_i::_get_cycle_time() const
+{
+  return threshold_cadence.adaptive ? cadence.period : threshold_cycle_time;
+}
+
+
 //
 //
 //  Executable/Device method overrides...
@@ -1419,7 +1906,7 @@ bool GPP_i::_check_limits( const thresholds_struct &thresholds)
 void GPP_i::updateUsageState()
 {
   double sys_idle = system_monitor->get_idle_percent();
-  double sys_idle_avg = system_monitor->get_idle_average();
+  double sys_idle_avg = _get_idle_window_average();
   double sys_load = system_monitor->get_loadavg();
   uint64_t mem_free = system_monitor->get_mem_free();
   
@@ -1457,6 +1944,10 @@ void GPP_i::updateUsageState()
     LOG_DEBUG(GPP_i, "Usage State Busy (trigger)  LIMITS....  ");
     setUsageState(CF::Device::BUSY);
   }
+  else if (_check_pressure()) {
+    LOG_DEBUG(GPP_i, "Usage State Busy (trigger)  PRESSURE....  ");
+    setUsageState(CF::Device::BUSY);
+  }
   else if (getPids().size() == 0) {
     LOG_TRACE(GPP_i, "Usage State IDLE (trigger) pids === 0...  ");
     setUsageState(CF::Device::IDLE);
@@ -1553,20 +2044,29 @@ void GPP_i::set_resource_affinity( const CF::Properties& options, const pid_t rs
 }
 
 
+static int64_t monotonic_usec()
+{
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return (int64_t)ts.tv_sec*1000000 + ts.tv_nsec/1000;
+}
+
 int GPP_i::serviceFunction()
 {
   boost::posix_time::ptime now = boost::posix_time::microsec_clock::local_time();
   boost::posix_time::time_duration dur = now -time_mark;
-  if ( dur.total_milliseconds() < threshold_cycle_time ) {
+  if ( dur.total_milliseconds() < _get_cycle_time() ) {
     return NOOP;
   }
   
   time_mark = now;
+  int64_t cycle_start = monotonic_usec();
 
-  // update data model for the GPP
+  // update the collectors of the data model that are due
   try {      
-    std::for_each( data_model.begin(), data_model.end(), boost::bind( &Updateable::update, _1 ) );
-    std::for_each( execPartitions.begin(), execPartitions.end(), boost::bind( &exec_socket::update, _1 ) );
+    data_model.set_budget( (int64_t)update_cpu_budget*1000 );
+    data_model.run( cycle_start );
+    _update_nic_monitors( true );
   }
   catch( const boost::thread_resource_error& e ){
     std::stringstream errstr;
@@ -1607,6 +2107,9 @@ int GPP_i::serviceFunction()
   // update device usages state for the GPP
   updateUsageState();
 
+  // pick the time until the next cycle
+  _update_cadence( cycle_start, monotonic_usec() );
+
   return NORMAL;
 }
 
@@ -1616,8 +2119,9 @@ void GPP_i::_set_vlan_property()
   mcastnicVLANs.clear();
   // grab nic_metrics for the specified interface
   if ( mcastnicInterface != "" ) {
-    std::vector<nic_metrics_struct_struct>::iterator nic = nic_metrics.begin();
-    for ( ; nic != nic_metrics.end(); nic++ ) {
+    std::vector<nic_metrics_struct_struct> metrics( get_nic_metrics() );
+    std::vector<nic_metrics_struct_struct>::iterator nic = metrics.begin();
+    for ( ; nic != metrics.end(); nic++ ) {
       // found match
       if ( nic->interface == mcastnicInterface ) {
         std::vector<std::string> values;
@@ -1923,7 +2427,7 @@ bool GPP_i::allocateCapacity_nic_allocation(const nic_allocation_struct &alloc)
     LOG_TRACE(GPP_i, __FUNCTION__ << ": Allocating nic_allocation (identifier=" << alloc.identifier << ")");
     try
     {
-        LOG_TRACE(GPP_i, __FUNCTION__ << ": ALLOCATION: { identifier: \"" << alloc.identifier << "\", data_rate: " << alloc.data_rate << ", data_size: " << alloc.data_size << ", multicast_support: \"" << alloc.multicast_support << "\", ip_addressable: \"" << alloc.ip_addressable << "\", interface: \"" << alloc.interface << "\" }");
+        LOG_TRACE(GPP_i, __FUNCTION__ << ": ALLOCATION: { identifier: \"" << alloc.identifier << "\", data_rate: " << alloc.data_rate << ", data_size: " << alloc.data_size << ", multicast_support: \"" << alloc.multicast_support << "\", ip_addressable: \"" << alloc.ip_addressable << "\", interface: \"" << alloc.interface << "\", socket: " << alloc.socket << " }");
         success = nic_facade->allocate_capacity(alloc);
         
         if( success )
@@ -1998,17 +2502,83 @@ CORBA::Boolean GPP_i::allocateCapacity (const CF::Properties& capacities) throw
 }
 
 
+double GPP_i::_get_disk_rate( const std::string &device ) const
+{
+  double rate = 0;
+  for ( size_t i=0; i < diskrateTotal.size(); i++ ) {
+    if ( diskrateTotal[i].rate > 0 && DiskState::ResolveDevice(diskrateTotal[i].device) == device ) {
+      rate += diskrateTotal[i].rate;
+    }
+  }
+  return rate;
+}
+
+double GPP_i::_get_disk_rate_limit() const
+{
+  double total = 0;
+  for ( size_t i=0; i < diskrateTotal.size(); i++ ) {
+    if ( diskrateTotal[i].rate > 0 ) total += diskrateTotal[i].rate;
+  }
+  if ( thresholds.disk_usage < 0 ) return total;
+  return total * thresholds.disk_usage / 100.0;
+}
+
 bool GPP_i::allocate_diskCapacity(const double &value) {
 
   if (isBusy()) {
     return false;
   }
-   
+
+  double limit = _get_disk_rate_limit();
+  LOG_DEBUG(GPP_i, "allocate disk capacity, (REQUEST) value: " << value << " diskCapacity: " << diskCapacity << " limit: " << limit );
+  if ( value < 0 ) {
+    return false;
+  }
+  if ( limit <= 0 ) {
+    LOG_WARN(GPP_i, "Allocate disk capacity failed, no disk rates are configured in diskrateTotal" );
+    return false;
+  }
+
+  WriteLock lock(snapshotLock);
+
+  //
+  // bandwidth in use is the larger of the allocated and the measured
+  // throughput, the traffic of allocated components is part of the latter
+  //
+  double measured = 0;
+  if ( disk_metrics_snapshot ) {
+    std::vector<disk_metrics_struct>::const_iterator disk = disk_metrics_snapshot->begin();
+    for ( ; disk != disk_metrics_snapshot->end(); disk++ ) {
+      if ( disk->rate_total <= 0 ) continue;
+      if ( SaturationExceeded()( disk->utilization, thresholds.disk_usage ) ) {
+        LOG_DEBUG(GPP_i, "Allocate disk capacity failed, disk " << disk->device << " is saturated, utilization: " << disk->utilization );
+        return false;
+      }
+      measured += disk->read_rate + disk->write_rate;
+    }
+  }
+
+  double committed = std::max(disk_allocated, measured);
+  if ( committed + value > limit ) {
+    LOG_DEBUG(GPP_i, "Allocate disk capacity failed due to insufficent capacity, allocated: " << disk_allocated << " measured: " << measured << " limit: " << limit );
+    return false;
+  }
+
+  disk_allocated += value;
+  diskCapacity = limit - disk_allocated;
+  LOG_DEBUG(GPP_i, "allocate disk capacity, (SUCCESS) value: " << value << " diskCapacity: " << diskCapacity );
   return true;
 }
 
 void GPP_i::deallocate_diskCapacity(const double &value) {
-  return;
+  LOG_DEBUG(GPP_i, "deallocate disk capacity, (REQUEST) value: " << value << " diskCapacity: " << diskCapacity );
+  WriteLock lock(snapshotLock);
+  disk_allocated -= value;
+  if ( disk_allocated < 0 ) {
+    disk_allocated = 0;
+  }
+  diskCapacity = std::max(0.0, _get_disk_rate_limit() - disk_allocated);
+  LOG_DEBUG(GPP_i, "deallocate disk capacity, (SUCCESS) value: " << value << " diskCapacity: " << diskCapacity );
 }
 
 bool GPP_i::allocate_memCapacity(const CORBA::LongLong &value) {
@@ -2120,64 +2690,38 @@ void GPP_i::update()
 {
   // establish what the actual load is per floor_reservation
   // if the actual load -per is less than the reservation, compute the different and add the difference to the cpu_idle
-  // read the clock from the system (start)
-
+  //
+  // usage is measured against the snapshot taken on the previous cycle, a
+  // component's history is only diffed when its previous sample belongs to
+  // that snapshot
+  //
   int64_t user=0, system=0;
-  ProcStat::GetTicks( system, user);
-  float f_start_total = (float)(system);
-  float f_use_start_total = (float)(user);
-  float reservation_set = 0;
-  size_t nres=0;
-  int64_t usage=0;
-
-  {
-    WriteLock rlock(pidLock);
-    
-    this->update_grp_child_pids();
-    
-    ProcessList::iterator i=this->pids.begin();
-    for ( ; i!=pids.end(); i++) {
-      
-      if ( !i->terminated ) {
-
-        // update pstat usage for each process
-        usage = i->get_pstat_usage();
-
-        if ( !i->app_started ) {
-          nres++;
-          if ( i->reservation == -1) {
-            reservation_set += idle_capacity_modifier;
-          } else {
-            reservation_set += 100.0 * i->reservation/((float)processor_cores);
-          }
-        }
-      }
-    }
-  }
-  LOG_TRACE(GPP_i, __FUNCTION__ << " Completed first pass, record pstats for nproc: " << nres << " res_set " << reservation_set );
-
-  // set number reservations that are not started
-  n_reservations = nres;
-  
-  // wait a little bit
-  usleep(500000);
-
-
-  user=0, system=0;
-  ProcStat::GetTicks( system, user);
-  float f_end_total = (float)(system);
-  float f_use_end_total = (float)(user);
-  float f_total = f_end_total-f_start_total;
-  if ( f_total <= 0.0 ) {
-    LOG_TRACE(GPP_i, __FUNCTION__ << std::endl<< " System Ticks end/start " << f_end_total << "/" << f_start_total << std::endl );
+  proc_stat->get_ticks( system, user);
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  int64_t sample_stamp = (int64_t)ts.tv_sec*1000000 + ts.tv_nsec/1000;
+
+  bool have_snapshot = last_ticks.stamp != 0;
+  float f_total = (float)(system - last_ticks.total);
+  float f_use_total = (float)(user - last_ticks.user);
+  if ( !have_snapshot || f_total <= 0.0 ) {
+    LOG_TRACE(GPP_i, __FUNCTION__ << std::endl<< " System Ticks end/start " << system << "/" << last_ticks.total << std::endl );
     f_total=1.0;
+    f_use_total=0.0;
   }
   float inverse_load_per_core = ((float)processor_cores)/(f_total);
   float aggregate_usage = 0;
   float non_specialized_aggregate_usage = 0;
   double percent_core;
+  float reservation_set = 0;
+  size_t nres=0;
+  int64_t usage=0;
+  const size_t history_len = std::max((CORBA::ULong)2, component_history_length);
+
+  WriteLock rlock(pidLock);
+
+  this->update_grp_child_pids();
 
-  ReadLock rlock(pidLock);
   ProcessList::iterator i=this->pids.begin(); 
   int usage_out=0;
   for ( ; i!=pids.end(); i++, usage_out++) {
@@ -2185,13 +2729,37 @@ void GPP_i::update()
     usage = 0;
     percent_core =0;
     if ( !i->terminated ) {
-        
-      // get delta from last pstat
-      usage = i->get_pstat_usage();
 
-      percent_core = (double)usage * inverse_load_per_core;
-      i->core_usage = percent_core;
+      // record pstat usage and get delta from the previous cycle
+      if ( i->history.capacity() != history_len ) {
+        i->history.resize(history_len);
+      }
+      bool have_history = have_snapshot && i->history.get_stamp() == last_ticks.stamp;
+      if ( i->add_history( i->get_process_time(), sample_stamp ) ) {
+        if ( have_history ) {
+          usage = i->get_pstat_usage(false);
+        }
+
+        percent_core = (double)usage * inverse_load_per_core;
+        if ( have_history ) {
+          i->set_usage(percent_core);
+        } else {
+          i->core_usage = percent_core;
+        }
+      } else {
+        //
+        // the process group is missing from this cycle's process tree, keep
+        // the last usage; the history stamp is left behind so the next cycle
+        // starts a fresh interval instead of charging the group's lifetime
+        //
+        percent_core = i->core_usage;
+      }
       double res =  i->reservation;
+      // usage the reservation is held against
+      double res_usage = percent_core;
+      if ( reservation_p95 && i->history.get_count() > 0 ) {
+        res_usage = i->history.get_p95();
+      }
 
 #if 0
       // debug assist
@@ -2208,11 +2776,19 @@ void GPP_i::update()
       }
 #endif
 
-      if ( i->app_started ) {
+      if ( !i->app_started ) {
+        nres++;
+        if ( i->reservation == -1) {
+          reservation_set += idle_capacity_modifier;
+        } else {
+          reservation_set += 100.0 * i->reservation/((float)processor_cores);
+        }
+      }
+      else {
 
         // if component is not using enough the add difference between minimum and current load
-        if ( percent_core < res ) {
-          reservation_set += 100.00 * ( res - percent_core)/((double)processor_cores);
+        if ( res_usage < res ) {
+          reservation_set += 100.00 * ( res - res_usage)/((double)processor_cores);
         }
         // for components with non specific 
         if ( res == -1.0 ) {
@@ -2224,14 +2800,23 @@ void GPP_i::update()
       }
     }
   }
-  
-  LOG_TRACE(GPP_i, __FUNCTION__ << " Completed SECOND pass, record pstats for processes" );
+
+  // set number reservations that are not started
+  n_reservations = nres;
+
+  _update_component_monitor( sample_stamp );
+
+  last_ticks.total = system;
+  last_ticks.user = user;
+  last_ticks.stamp = sample_stamp;
+
+  LOG_TRACE(GPP_i, __FUNCTION__ << " Completed pass, record pstats for nproc: " << nres << " res_set " << reservation_set );
 
   aggregate_usage *= inverse_load_per_core;
   non_specialized_aggregate_usage *= inverse_load_per_core;
   modified_thresholds.cpu_idle = thresholds.cpu_idle + reservation_set;
   utilization[0].component_load = aggregate_usage + non_specialized_aggregate_usage;
-  float estimate_total = (f_use_end_total-f_use_start_total) * inverse_load_per_core;
+  float estimate_total = f_use_total * inverse_load_per_core;
   utilization[0].system_load = (utilization[0].component_load > estimate_total) ? utilization[0].component_load : estimate_total; // for very light loads, sometimes there is a measurement mismatch because of timing
   utilization[0].subscribed = (reservation_set * (float)processor_cores) / 100.0 + utilization[0].component_load;
   utilization[0].maximum = processor_cores-(thresholds.cpu_idle/100.0) * processor_cores;
@@ -2250,8 +2835,8 @@ void GPP_i::update()
            " loadFree(Modified): " << loadFree <<std::endl );
 
   LOG_DEBUG(GPP_i, __FUNCTION__ << "  Reservation : " << std::endl << 
-           "  total sys usage: " << f_end_total << std::endl << 
-           "  total user usage: " << f_use_end_total << std::endl << 
+           "  total sys usage: " << system << std::endl << 
+           "  total user usage: " << user << std::endl << 
            "  reservation_set: " << reservation_set << std::endl << 
            "  inverse_load_per_core: " << inverse_load_per_core << std::endl << 
            "  aggregate_usage: " << aggregate_usage << std::endl << 
@@ -2296,6 +2881,111 @@ void GPP_i::update()
   gpp_limits.max_threads = pid_rpt.threads_limit;
   gpp_limits.current_open_files = pid_rpt.files;
   gpp_limits.max_open_files = pid_rpt.files_limit;
+
+  //
+  // per cpu utilization, computed by the system monitor for every online cpu
+  //
+  const SystemMonitor::CpuStatsPtr cpu_stats = system_monitor->getCpuStats();
+  const ProcStat::CpuStats &online = proc_stat->get().cpus;
+  boost::shared_ptr< std::vector<cpu_utilization_struct> > cpuval( new std::vector<cpu_utilization_struct>(online.size()) );
+  for ( size_t i=0; i < online.size(); i++ ) {
+    cpu_utilization_struct &cpu = (*cpuval)[i];
+    cpu.cpu = online[i].idx;
+    cpu.user = cpu_stats->get_cpu_percent(cpu.cpu, ProcStat::CPU_JIFFIES_USER) + cpu_stats->get_cpu_percent(cpu.cpu, ProcStat::CPU_JIFFIES_NICE);
+    cpu.system = cpu_stats->get_cpu_percent(cpu.cpu, ProcStat::CPU_JIFFIES_SYSTEM);
+    cpu.idle = cpu_stats->get_cpu_percent(cpu.cpu, ProcStat::CPU_JIFFIES_IDLE);
+    cpu.utilization = cpu_stats->get_cpu_utilization(cpu.cpu);
+  }
+
+  //
+  // rolling averages of the monitored cpus
+  //
+  boost::shared_ptr< std::vector<cpu_averages_struct> > avgval( new std::vector<cpu_averages_struct>(cpu_stats->get_nwindows()) );
+  for ( size_t i=0; i < avgval->size(); i++ ) {
+    cpu_averages_struct &avg = (*avgval)[i];
+    avg.window = cpu_stats->get_window_length(i);
+    avg.span = cpu_stats->get_window_span(i);
+    avg.user = cpu_stats->get_user_window(i);
+    avg.system = cpu_stats->get_system_window(i);
+    avg.idle = cpu_stats->get_idle_window(i);
+  }
+
+  //
+  // throughput of the monitored disks, and the page cache waiting to be
+  // written to them
+  //
+  boost::shared_ptr< std::vector<disk_metrics_struct> > diskval( new std::vector<disk_metrics_struct>(disk_accumulators.size()) );
+  for ( size_t i=0; i < disk_accumulators.size(); i++ ) {
+    const DiskAccumulator &acc = *disk_accumulators[i];
+    disk_metrics_struct &disk = (*diskval)[i];
+    disk.device = acc.get_device();
+    disk.read_rate = acc.get_read_MB_per_sec();
+    disk.write_rate = acc.get_write_MB_per_sec();
+    disk.utilization = acc.get_utilization_percent();
+    disk.in_flight = acc.get_in_flight();
+    disk.rate_total = _get_disk_rate(disk.device);
+  }
+
+  const SystemMonitor::MemInfoPtr meminfo = system_monitor->getMemInfo();
+  disk_writeback.dirty = meminfo->get(ProcMeminfo::DIRTY) / (1024.0*1024.0);
+  disk_writeback.writeback = meminfo->get(ProcMeminfo::WRITEBACK) / (1024.0*1024.0);
+
+  //
+  // period and cost of the data model collectors
+  //
+  const UpdateSchedule::CollectorList &collectors = data_model.get();
+  boost::shared_ptr< std::vector<update_schedule_struct> > schedval( new std::vector<update_schedule_struct>(collectors.size()) );
+  for ( size_t i=0; i < collectors.size(); i++ ) {
+    const UpdateSchedule::Collector &c = collectors[i];
+    update_schedule_struct &entry = (*schedval)[i];
+    entry.name = c.name;
+    entry.period = c.period;
+    entry.runs = c.stats.runs;
+    entry.deferred = c.stats.deferred;
+    entry.wall_time = c.stats.wall_time / 1000.0;
+    entry.cpu_time = c.stats.cpu_time / 1000.0;
+    entry.max_wall_time = c.stats.max_wall_time / 1000.0;
+  }
+
+  WriteLock lock(snapshotLock);
+  cpu_utilization_snapshot = cpuval;
+  cpu_averages_snapshot = avgval;
+  disk_metrics_snapshot = diskval;
+  update_schedule_snapshot = schedval;
+  diskCapacity = std::max(0.0, _get_disk_rate_limit() - disk_allocated);
+  if ( cpu_windows_changed ) {
+    _apply_cpu_windows( pending_cpu_windows );
+    cpu_windows_changed = false;
+  }
+}
+
+void GPP_i::_cpu_average_windows_changed(const std::vector<CORBA::ULong> *ov, const std::vector<CORBA::ULong> *nv )
+{
+  if ( nv ) {
+    WriteLock lock(snapshotLock);
+    pending_cpu_windows = *nv;
+    cpu_windows_changed = true;
+  }
+}
+
+void GPP_i::_apply_cpu_windows( const std::vector<CORBA::ULong> &windows )
+{
+  if ( !system_monitor ) return;
+  CpuUsageStats::WindowList seconds;
+  for ( size_t i=0; i < windows.size(); i++ ) {
+    if ( windows[i] > 0 ) seconds.push_back(windows[i]);
+  }
+  LOG_DEBUG(GPP_i, __FUNCTION__ << ": cpu average windows " << seconds.size() );
+  system_monitor->getCpuStats()->set_windows( seconds );
+}
+
+double GPP_i::_get_idle_window_average() const
+{
+  const SystemMonitor::CpuStatsPtr cpu_stats = system_monitor->getCpuStats();
+  for ( size_t i=0; i < cpu_stats->get_nwindows(); i++ ) {
+    if ( cpu_stats->get_window_length(i) == cpu_idle_average_window ) return cpu_stats->get_idle_window(i);
+  }
+  return cpu_stats->get_idle_average();
 }
 
 
@@ -2483,8 +3173,7 @@ std::vector<int> GPP_i::getPids()
 void GPP_i::addProcess(int pid, const std::string &appName, const std::string &identifier, const float req_reservation=1.0)
 {
   WriteLock lock(pidLock);
-  ProcessList:: iterator result = std::find_if( pids.begin(), pids.end(), std::bind2nd( FindPid(), pid ) );
-  if ( result != pids.end() ) return;
+  if ( pids.find(pid) != pids.end() ) return;
 
   LOG_DEBUG(GPP_i, "START Adding Process/RES: "  <<  pid << "/" << req_reservation << "  APP:" << appName );
   component_description tmp;
@@ -2494,14 +3183,14 @@ void GPP_i::addProcess(int pid, const std::string &appName, const std::string &i
   tmp.reservation = req_reservation;
   tmp.core_usage = 0;
   tmp.parent = this;
-  pids.push_front( tmp );
+  pids.insert( tmp );
   LOG_DEBUG(GPP_i, "END Adding Process/RES: "  <<  pid << "/" << req_reservation << "  APP:" << appName );
 }
 
 GPP_i::component_description GPP_i::getComponentDescription(int pid)
 {
   ReadLock lock(pidLock);
-  ProcessList:: iterator it = std::find_if( pids.begin(), pids.end(), std::bind2nd( FindPid(), pid ) );
+  ProcessList:: iterator it = pids.find( pid );
     if (it == pids.end())
         throw std::invalid_argument("pid not found");
     return *it;
@@ -2510,7 +3199,7 @@ GPP_i::component_description GPP_i::getComponentDescription(int pid)
 void GPP_i::markPidTerminated( const int pid)
 {
     ReadLock lock(pidLock);
-    ProcessList:: iterator it = std::find_if( pids.begin(), pids.end(), std::bind2nd( FindPid(), pid ) );
+    ProcessList:: iterator it = pids.find( pid );
     if (it == pids.end()) return;
     LOG_DEBUG(GPP_i, " Mark For Termination: "  <<  it->pid << "  APP:" << it->appName );
     it->app_started= false;
@@ -2522,13 +3211,15 @@ void GPP_i::removeProcess(int pid)
 
   {
     WriteLock wlock(pidLock);
-    ProcessList:: iterator result = std::find_if( pids.begin(), pids.end(), std::bind2nd( FindPid(), pid ) );
+    ProcessList:: iterator result = pids.find( pid );
     if ( result != pids.end() ) {
       LOG_DEBUG(GPP_i, "Monitor Process: REMOVE Process: " << result->pid << " app: " << result->appName );
       pids.erase(result);
     }
   }
 
+  cgroups->release(pid);
+
   {
     WriteLock  wlock(fdsLock);
     ProcessFds::iterator i=std::find_if( redirectedFds.begin(), redirectedFds.end(), std::bind2nd( FindRedirect(), pid ) );
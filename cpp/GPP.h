@@ -26,10 +26,16 @@
 #include <sys/resource.h>
 
 #include "utils/Updateable.h"
+#include "utils/UpdateSchedule.h"
 #include "reports/ThresholdMonitor.h"
 #include "states/State.h"
+#include "states/ProcessTree.h"
+#include "utils/ProcessRegistry.h"
+#include "utils/CgroupAccounting.h"
 #include "statistics/Statistics.h"
 #include "statistics/CpuUsageStats.h"
+#include "statistics/DiskAccumulator.h"
+#include "statistics/UsageHistory.h"
 #include "reports/SystemMonitorReporting.h"
 #include "reports/CpuThresholdMonitor.h"
 #include "NicFacade.h"
@@ -69,6 +75,7 @@ class GPP_i : public GPP_base
 
         int serviceFunction();
         void initializeNetworkMonitor();
+        void initializeDiskMonitor();
         void initializeResourceMonitors();
         void addThresholdMonitor( ThresholdMonitor* threshold_monitor );
         void send_threshold_event(const threshold_event_struct& message);
@@ -124,6 +131,18 @@ class GPP_i : public GPP_base
         int redirected_io_handler( );
         
         std::vector<component_monitor_struct> get_component_monitor();
+
+        std::vector<application_monitor_struct> get_application_monitor();
+
+        std::vector<cpu_utilization_struct> get_cpu_utilization();
+
+        std::vector<cpu_averages_struct> get_cpu_averages();
+
+        std::vector<disk_metrics_struct> get_disk_metrics();
+
+        std::vector<update_schedule_struct> get_update_schedule();
+
+        std::vector<nic_metrics_struct_struct> get_nic_metrics();
         
         struct proc_values {
             float mem_rss;
@@ -133,11 +152,12 @@ class GPP_i : public GPP_base
         
         struct grp_values : proc_values {
             int num_processes;
+            int64_t ticks;
             std::vector<int> pids;
         };
         
         void update_grp_child_pids();
-        std::map<int,proc_values> parsed_stat;
+        ProcessTreePtr process_tree;
         std::map<int,grp_values> grp_children;
 
         struct  proc_redirect {
@@ -152,7 +172,6 @@ class GPP_i : public GPP_base
 
 
         struct component_description {
-	  static const int pstat_history_len=5;
           int         pid;
           std::string appName;
           std::string identifier;
@@ -160,18 +179,24 @@ class GPP_i : public GPP_base
           float       reservation;
           float       core_usage;
           bool        terminated;
-          uint64_t    pstat_history[pstat_history_len];
-          uint8_t     pstat_idx;
+          UsageHistory history;         // process time samples and core usage statistics
+          CORBA::ULong num_files;
+          int64_t     files_stamp;      // monotonic time (usec) of the last open file count
+          float       mem_pss;          // MB, proportional set size of the process group
+          float       mem_uss;          // MB, unique set size of the process group
+          int64_t     mem_stamp;        // monotonic time (usec) of the last memory map read
           std::vector<int> pids;
           GPP_i       *parent;
 
 	  component_description();
           component_description( const std::string &appId);
-	  void          add_history( int64_t ptime );
+	  bool          add_history( int64_t ptime );
+	  bool          add_history( int64_t ptime, int64_t stamp );
 	  void          add_history();
 	  int64_t       get_pstat_usage( const bool refresh=true );
 	  int64_t       get_pstat_usage( uint64_t &p2, uint64_t &p1 );
 	  int64_t       get_process_time();
+	  void          set_usage( const float usage );
         };
 
 
@@ -216,6 +241,27 @@ class GPP_i : public GPP_base
 
           typedef std::vector< exec_socket >      ExecPartitionList;
 
+          //
+          // system tick counts recorded by the previous update
+          //
+          struct tick_snapshot {
+            tick_snapshot() : total(0), user(0), stamp(0) {};
+            int64_t   total;
+            int64_t   user;
+            int64_t   stamp;      // monotonic time (usec), 0 when no snapshot was taken
+          };
+
+          //
+          // state of the adaptive monitoring cycle
+          //
+          struct cadence_state {
+            cadence_state() : period(0), grow_count(0), cpu_time(0), stamp(0) {};
+            CORBA::ULong  period;       // milliseconds between cycles
+            int           grow_count;   // consecutive cycles the target was above the hysteresis band
+            int64_t       cpu_time;     // usec of cpu used by the GPP at the previous cycle
+            int64_t       stamp;        // monotonic time (usec) of the previous cycle
+          };
+
 
           friend bool operator==( const component_description &, 
                                   const component_description & );
@@ -242,10 +288,18 @@ class GPP_i : public GPP_base
           typedef std::vector<boost::shared_ptr<Statistics> >   StatisticsSequence;
           typedef std::vector<boost::shared_ptr<Reporting> >    ReportingSequence;
           typedef std::vector< ThresholdMonitorPtr >            MonitorSequence;
+          typedef std::map< std::string, ThresholdMonitorPtr >  NicMonitorMap;
           typedef boost::shared_ptr<SystemMonitor>              SystemMonitorPtr;
           typedef std::map<int, component_description >         ProcessMap;
-          typedef std::deque< component_description >           ProcessList;
+          typedef ProcessRegistry< component_description >      ProcessList;
           typedef std::deque< proc_redirect >                   ProcessFds;
+          typedef boost::shared_ptr< const std::vector<component_monitor_struct> >  ComponentMonitorPtr;
+          typedef boost::shared_ptr< const std::vector<application_monitor_struct> >  ApplicationMonitorPtr;
+          typedef boost::shared_ptr< const std::vector<cpu_utilization_struct> >  CpuUtilizationPtr;
+          typedef boost::shared_ptr< const std::vector<cpu_averages_struct> >  CpuAveragesPtr;
+          typedef boost::shared_ptr< const std::vector<disk_metrics_struct> >  DiskMetricsPtr;
+          typedef std::vector< DiskAccumulatorPtr >             DiskAccumulatorList;
+          typedef boost::shared_ptr< const std::vector<update_schedule_struct> >  UpdateScheduleStatsPtr;
 
           void addProcess(int pid, 
                       const std::string &appName, 
@@ -265,15 +319,33 @@ class GPP_i : public GPP_base
           bool                                                _handle_io_redirects;
           std::string                                         _componentOutputLog;
 
+          Lock                                                snapshotLock;
+          ComponentMonitorPtr                                 component_monitor_snapshot;  // rebuilt each update, returned by component_monitor queries
+          ApplicationMonitorPtr                               application_monitor_snapshot;  // per application totals of component_monitor_snapshot
+          CpuUtilizationPtr                                   cpu_utilization_snapshot;   // per cpu results of the system monitor
+          CpuAveragesPtr                                      cpu_averages_snapshot;      // rolling averages of the system monitor
+          DiskMetricsPtr                                      disk_metrics_snapshot;      // throughput of the monitored disks
+          UpdateScheduleStatsPtr                              update_schedule_snapshot;   // period and cost of the data model collectors
+          double                                              disk_allocated;             // MB/s of diskCapacity allocated, guarded by snapshotLock
+          std::vector<CORBA::ULong>                           pending_cpu_windows;        // cpu_average_windows to apply, guarded by snapshotLock
+          bool                                                cpu_windows_changed;
+          CgroupAccountingPtr                                 cgroups;            // per component cgroups, when cgroup_accounting is enabled
+
           Lock                                                nicLock;
           NicFacadePtr                                        nic_facade;
           MonitorSequence                                     threshold_monitors;
+          NicMonitorMap                                       nic_monitors;       // throughput monitors of threshold_monitors by nic device
           SystemMonitorPtr                                    system_monitor;
+          ProcStatPtr                                         proc_stat;          // /proc/stat snapshot shared by the cpu usage consumers, read once per cycle
           ProcessLimitsPtr                                    process_limits;
+          DiskStatePtr                                        disk_state;         // /proc/diskstats, read once per cycle ahead of the disk accumulators
+          DiskAccumulatorList                                 disk_accumulators;
           ExecPartitionList                                   execPartitions;
         
           Lock                                                monitorLock;
-          UpdateableSequence                                  data_model;
+          UpdateSchedule                                      data_model;         // collectors refreshed by serviceFunction, each at its own period
+          size_t                                              limits_collector;   // process_limits entry of data_model
+          bool                                                limits_exceeded;    // result of the last _check_limits evaluation
           thresholds_struct                                   modified_thresholds;
           uint64_t                                            thresh_mem_free_units;
           uint64_t                                            mem_free_units;
@@ -289,6 +361,8 @@ class GPP_i : public GPP_base
           std::string                                         binary_location;    // path to this program.
         
           boost::posix_time::ptime                            time_mark;          // time marker for update
+          tick_snapshot                                       last_ticks;         // cpu ticks from the previous update
+          cadence_state                                       cadence;            // cycle time in use when threshold_cadence is adaptive
           redhawk::events::SubscriberPtr                      odm_consumer;       // interface that receives ODM_Channel events
           redhawk::events::ManagerPtr                         mymgr;              // interface to manage event channel access
 
@@ -296,6 +370,22 @@ class GPP_i : public GPP_base
 
           bool  _component_cleanup( const int pid, const int exit_status );
 
+          //
+          // rebuild the component_monitor and application_monitor snapshots,
+          // called with pidLock held
+          //
+          void  _update_component_monitor( const int64_t stamp );
+
+          //
+          // count the open file descriptors of a process group
+          //
+          CORBA::ULong  _count_open_files( const std::vector<int> &grp_pids );
+
+          //
+          // sum the proportional and unique set size (MB) of a process group
+          //
+          void  _read_component_memory( const std::vector<int> &grp_pids, float &pss, float &uss );
+
           //
           // setup execution partitions for launching components
           // 
@@ -330,6 +420,19 @@ class GPP_i : public GPP_base
           //
           void _affinity_changed(const affinity_struct *ov, const affinity_struct *nv );
 
+          //
+          // Callback when cpu_average_windows is changed, the windows are
+          // applied by the service thread
+          //
+          void _cpu_average_windows_changed(const std::vector<CORBA::ULong> *ov, const std::vector<CORBA::ULong> *nv );
+
+          void _apply_cpu_windows( const std::vector<CORBA::ULong> &windows );
+
+          //
+          // idle average over cpu_idle_average_window
+          //
+          double _get_idle_window_average() const;
+
           //
           // Callback when componentOutputLog is changed
           //
@@ -359,8 +462,50 @@ class GPP_i : public GPP_base
           // check file and thread limits for the process and system
           //
           bool _check_limits( const thresholds_struct &threshold);
+
+          //
+          // collectors of data_model that refresh several objects together
+          //
+          void _update_nics();
+          // follow nic devices added or removed since the previous cycle
+          void _update_nic_monitors( const bool dispatch );
+          void _update_disks();
+          void _update_exec_partitions();
+
+          //
+          // true when a resource's stall share is above its pressure threshold
+          //
+          bool _check_pressure();
+
+          const float *_get_pressure_threshold( const ProcPressure::Resource resource ) const;
+
+          //
+          // diskrateTotal rate of a /proc/diskstats device, 0 when not listed
+          //
+          double _get_disk_rate( const std::string &device ) const;
+
+          //
+          // bandwidth diskCapacity is allocated from, disk_usage percent of
+          // the diskrateTotal rates
+          //
+          double _get_disk_rate_limit() const;
+
+          //
+          // smallest headroom (0 at the threshold, 1 at the metric's best
+          // value) of the metrics with a threshold, and the metric's name
+          //
+          double _get_headroom( std::string &metric ) const;
+
+          //
+          // pick the next cycle time and publish threshold_cadence_status
+          //
+          void _update_cadence( const int64_t start, const int64_t end );
+
+          //
+          // milliseconds between monitoring cycles
+          //
+          CORBA::ULong _get_cycle_time() const;
           std::string user_id;
-          int limit_check_count;
 
           ossie::ProcessThread                                _signalThread;
           ossie::ProcessThread                                _redirectedIO;
@@ -272,6 +272,24 @@ void GPP_base::loadProperties()
                 "external",
                 "configure");
 
+    addProperty(monitor_filtered_nics,
+                false,
+                "monitor_filtered_nics",
+                "monitor_filtered_nics",
+                "readwrite",
+                "",
+                "external",
+                "property");
+
+    addProperty(nic_placement_policy,
+                "first_fit",
+                "nic_placement_policy",
+                "nic_placement_policy",
+                "readwrite",
+                "",
+                "external",
+                "property");
+
     addProperty(available_nic_interfaces,
                 "available_nic_interfaces",
                 "",
@@ -330,6 +348,22 @@ void GPP_base::loadProperties()
                 "external",
                 "property");
 
+    addProperty(application_monitor,
+                "application_monitor",
+                "",
+                "readonly",
+                "",
+                "external",
+                "property");
+
+    addProperty(cpu_utilization,
+                "cpu_utilization",
+                "",
+                "readonly",
+                "",
+                "external",
+                "property");
+
     addProperty(affinity,
                 affinity_struct(),
                 "affinity",
@@ -365,6 +399,95 @@ void GPP_base::loadProperties()
                 "milliseconds",
                 "external",
                 "property");
+
+    addProperty(threshold_cadence,
+                threshold_cadence_struct(),
+                "threshold_cadence",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "property");
+
+    addProperty(threshold_cadence_status,
+                threshold_cadence_status_struct(),
+                "threshold_cadence_status",
+                "",
+                "readonly",
+                "",
+                "external",
+                "property");
+
+    addProperty(update_cpu_budget,
+                100,
+                "update_cpu_budget",
+                "update_cpu_budget",
+                "readwrite",
+                "milliseconds",
+                "external",
+                "property");
+
+    addProperty(update_schedule,
+                "update_schedule",
+                "",
+                "readonly",
+                "",
+                "external",
+                "property");
+
+    addProperty(component_files_cycle_time,
+                5000,
+                "component_files_cycle_time",
+                "component_files_cycle_time",
+                "readwrite",
+                "milliseconds",
+                "external",
+                "property");
+
+    addProperty(cgroup_accounting,
+                false,
+                "cgroup_accounting",
+                "cgroup_accounting",
+                "readwrite",
+                "",
+                "external",
+                "property");
+
+    addProperty(component_history_length,
+                60,
+                "component_history_length",
+                "component_history_length",
+                "readwrite",
+                "samples",
+                "external",
+                "property");
+
+    addProperty(reservation_p95,
+                false,
+                "reservation_p95",
+                "reservation_p95",
+                "readwrite",
+                "",
+                "external",
+                "property");
+
+    addProperty(component_memory_accounting,
+                false,
+                "component_memory_accounting",
+                "component_memory_accounting",
+                "readwrite",
+                "",
+                "external",
+                "property");
+
+    addProperty(component_memory_cycle_time,
+                10000,
+                "component_memory_cycle_time",
+                "component_memory_cycle_time",
+                "readwrite",
+                "milliseconds",
+                "external",
+                "property");
     
     addProperty(gpp_limits,
                 ulimit_struct(),
@@ -484,6 +607,70 @@ void GPP_base::loadProperties()
                 "external",
                 "property");
 
+    // Set the sequence with its initial values
+    cpu_average_windows.push_back(5);
+    cpu_average_windows.push_back(60);
+    cpu_average_windows.push_back(900);
+    addProperty(cpu_average_windows,
+                cpu_average_windows,
+                "cpu_average_windows",
+                "cpu_average_windows",
+                "readwrite",
+                "s",
+                "external",
+                "property");
+
+    addProperty(cpu_idle_average_window,
+                5,
+                "cpu_idle_average_window",
+                "cpu_idle_average_window",
+                "readwrite",
+                "s",
+                "external",
+                "property");
+
+    addProperty(cpu_averages,
+                "cpu_averages",
+                "",
+                "readonly",
+                "",
+                "external",
+                "property");
+
+    addProperty(diskrateTotal,
+                "diskrateTotal",
+                "",
+                "readwrite",
+                "",
+                "external",
+                "property");
+
+    addProperty(diskCapacity,
+                0.0,
+                "diskCapacity",
+                "diskCapacity",
+                "readwrite",
+                "MB/s",
+                "external",
+                "allocation,event");
+
+    addProperty(disk_metrics,
+                "disk_metrics",
+                "",
+                "readonly",
+                "",
+                "external",
+                "property");
+
+    addProperty(disk_writeback,
+                disk_writeback_struct(),
+                "disk_writeback",
+                "",
+                "readonly",
+                "",
+                "external",
+                "property");
+
 
 }
 
@@ -58,6 +58,8 @@ class GPP_base : public ExecutableDevice_impl, protected ThreadedComponent
         advanced_struct advanced;
 
         std::vector<std::string> nic_interfaces;
+        bool monitor_filtered_nics;
+        std::string nic_placement_policy;
         std::vector<std::string> available_nic_interfaces;
         nic_allocation_struct nic_allocation;
         std::string mcastnicInterface;
@@ -73,6 +75,8 @@ class GPP_base : public ExecutableDevice_impl, protected ThreadedComponent
         std::vector<nic_metrics_struct_struct> nic_metrics;
         std::vector<interfaces_struct> networkMonitor;
         std::vector<component_monitor_struct> component_monitor;
+        std::vector<application_monitor_struct> application_monitor;
+        std::vector<cpu_utilization_struct> cpu_utilization;
 
         // reporting struct when a threshold is broke
         threshold_event_struct threshold_event;
@@ -80,6 +84,26 @@ class GPP_base : public ExecutableDevice_impl, protected ThreadedComponent
         thresholds_struct thresholds;
         // time between cycles to refresh threshold metrics
         CORBA::ULong threshold_cycle_time;
+        // adaptive cadence of the monitoring cycle
+        threshold_cadence_struct threshold_cadence;
+        // current cycle time, duration and overhead of the monitoring cycle
+        threshold_cadence_status_struct threshold_cadence_status;
+        // cpu time the collectors of a monitoring cycle may use
+        CORBA::ULong update_cpu_budget;
+        // refresh period and cost of the collectors of the monitoring cycle
+        std::vector<update_schedule_struct> update_schedule;
+        // time between counts of open files for component_monitor
+        CORBA::ULong component_files_cycle_time;
+        // launch each component into its own cgroup for accounting
+        bool cgroup_accounting;
+        // number of cpu usage samples kept per component
+        CORBA::ULong component_history_length;
+        // hold reservations against the p95 usage of a component instead of its last sample
+        bool reservation_p95;
+        // report the proportional and unique memory of each component
+        bool component_memory_accounting;
+        // time between reads of the memory maps of the components
+        CORBA::ULong component_memory_cycle_time;
         // ulimits for the GPP process
         ulimit_struct gpp_limits;
         // ulimits for the system as a whole
@@ -100,6 +124,20 @@ class GPP_base : public ExecutableDevice_impl, protected ThreadedComponent
         double loadCapacity;
         /// Property: loadAverage
         loadAverage_struct loadAverage;
+        /// Property: cpu_average_windows - window lengths of cpu_averages
+        std::vector<CORBA::ULong> cpu_average_windows;
+        /// Property: cpu_idle_average_window - window checked by the usage state
+        CORBA::ULong cpu_idle_average_window;
+        /// Property: cpu_averages
+        std::vector<cpu_averages_struct> cpu_averages;
+        /// Property: diskrateTotal - measured rate of the disks backing diskCapacity
+        std::vector<diskrateTotal_struct> diskrateTotal;
+        /// Property: diskCapacity - disk bandwidth remaining to be allocated
+        double diskCapacity;
+        /// Property: disk_metrics
+        std::vector<disk_metrics_struct> disk_metrics;
+        /// Property: disk_writeback - dirty and writeback page cache
+        disk_writeback_struct disk_writeback;
         /// Property: reserved capacity per core for reservation schema
         float  reserved_capacity_per_component;
         /// Property  processor_cores  - number of cores the machine supports
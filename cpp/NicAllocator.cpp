@@ -21,6 +21,7 @@
 #include "states/NicState.h"
 
 #include <boost/algorithm/string.hpp>
+#include <boost/bind.hpp>
 
 #include <sstream>
 
@@ -31,10 +32,14 @@ static const int64_t MBITS_TO_BITS = 1000000;
 
 NicAllocator::NicAllocator( const AllocatableNics& allocatable_nics,
                             const double& max_throughput_percent,
+                            const std::string& placement_policy,
                             const CurrentThroughputFunction& current_throughput):
 allocatable_nics_(allocatable_nics),
 max_throughput_percent_(max_throughput_percent),
-current_throughput_(current_throughput)
+placement_policy_(placement_policy),
+current_throughput_(current_throughput),
+ranked_percent_(0),
+placement_stale_(true)
 {
   //std::cout << " NicAllocator allocatable nics....." << allocatable_nics.size() << std::endl;
   AllocatableNics::const_iterator iter=allocatable_nics.begin();
@@ -60,29 +65,106 @@ NicAllocator::allocate_capacity( const nic_allocation_struct& input_alloc )
 
     MergeAllocationStructs(alloc, input_alloc);
     
+    refresh_placement();
+    std::string interface = placement_.place( delta_alloc_throughput, alloc.socket,
+                                              boost::bind(&NicAllocator::allocatable, this, boost::cref(alloc), delta_alloc_throughput, _1) );
+    if( interface.empty() )
+        return false;
+    
+    const NicState& nic( *allocatable_nics_.find(interface)->second );
+    DeviceThroughputCapacity& nic_throughput_capacity( lookup_nic_throughput_capacity( nic ) );
+    
+    // Updated allocation map
+    alloc.interface = interface;
+    allocations_[alloc.identifier] = alloc;
+
+    // Update allocated capacity
+    nic_throughput_capacity.allocated_throughput += delta_alloc_throughput;
+    update_load( nic_throughput_capacity );
+    return true;
+}
+
+bool
+NicAllocator::allocatable( const nic_allocation_struct& alloc, double delta_alloc_throughput, const std::string& interface )
+{
+    AllocatableNics::const_iterator iter = allocatable_nics_.find(interface);
+    if( iter == allocatable_nics_.end() )
+        return false;
+    
+    const NicState& nic( *iter->second );
+    DeviceThroughputCapacity& nic_throughput_capacity( lookup_nic_throughput_capacity( nic ) );
+    DeviceThroughput current_throughput = current_throughput_( nic.get_device() );
+
+    return allocatable_by_is_addressable(alloc, nic) &&
+           allocatable_by_multicast_support(alloc, nic) &&
+           allocatable_by_interface(alloc, nic) &&
+           allocatable_by_data_rate(delta_alloc_throughput, nic_throughput_capacity, current_throughput);
+}
+
+void
+NicAllocator::refresh_placement()
+{
+    if( placement_policy_ != ranked_policy_ )
+    {
+        ranked_policy_ = placement_policy_;
+        if( !placement_.set_policy(ranked_policy_) )
+        {
+            RH_NL_WARN( "GPP", "Unknown nic placement policy (" << ranked_policy_ << "), using " << placement_.get_policy() );
+        }
+        // the loads only carry the measured throughput when the policy uses it
+        placement_stale_ = true;
+    }
+    
+    if( !placement_stale_ && ranked_percent_ == max_throughput_percent_ )
+        return;
+    
+    placement_.clear();
     AllocatableNics::const_iterator iter;
     for( iter=allocatable_nics_.begin(); iter!=allocatable_nics_.end(); ++iter )
     {
         const NicState& nic( *iter->second );
-        DeviceThroughputCapacity& nic_throughput_capacity( lookup_nic_throughput_capacity( nic ) );
-        double current_throughput = current_throughput_( nic.get_device() );
-
-        if( allocatable_by_is_addressable(alloc, nic) &&
-            allocatable_by_multicast_support(alloc, nic) &&
-            allocatable_by_interface(alloc, nic) &&
-            allocatable_by_data_rate(delta_alloc_throughput, nic_throughput_capacity, current_throughput) )
-        {        
-            // Updated allocation map
-            alloc.interface = nic.get_interface();
-            allocations_[alloc.identifier] = alloc;
-
-            // Update allocated capacity
-            nic_throughput_capacity.allocated_throughput += delta_alloc_throughput;
-            return true;
-        }
+        
+        // vlans are on the node of their device
+        int numa_node = nic.get_numa_node();
+        AllocatableNics::const_iterator device = allocatable_nics_.find( nic.get_device() );
+        if( numa_node < 0 && device != allocatable_nics_.end() )
+            numa_node = device->second->get_numa_node();
+        
+        placement_.add_interface( nic.get_interface(), nic.get_device(), numa_node );
+        if( !placement_.get_load(nic.get_device()) )
+            update_load( lookup_nic_throughput_capacity(nic) );
+    }
+    ranked_percent_ = max_throughput_percent_;
+    placement_stale_ = false;
+}
+
+void
+NicAllocator::update_load( const DeviceThroughputCapacity& capacity )
+{
+    DeviceLoad load;
+    load.maximum_throughput = capacity.maximum_throughput * max_throughput_percent_ / 100.0;
+    load.allocated_throughput = capacity.allocated_throughput;
+    if( placement_.uses_measured_throughput() )
+    {
+        DeviceThroughput current_throughput = current_throughput_( capacity.device );
+        load.rx_throughput = current_throughput.rx;
+        load.tx_throughput = current_throughput.tx;
     }
+    placement_.set_load( capacity.device, load );
+}
+
+void
+NicAllocator::update_measured_throughput()
+{
+    if( placement_stale_ || !placement_.uses_measured_throughput() )
+        return;
     
-    return false;
+    DeviceThroughputCapacities::const_iterator iter;
+    for( iter=device_throughput_capacities_.begin(); iter!=device_throughput_capacities_.end(); ++iter )
+    {
+        if( placement_.get_load(iter->first) )
+            update_load( iter->second );
+    }
 }
 
 void
@@ -120,6 +202,7 @@ NicAllocator::MergeAllocationStructs( nic_allocation_struct& merged, const nic_a
     merged.data_size = updated.data_size;
     merged.multicast_support = updated.multicast_support;
     merged.ip_addressable = updated.ip_addressable;
+    merged.socket = updated.socket;
     
     if( merged.interface.empty() )
     {
@@ -172,13 +255,16 @@ NicAllocator::allocatable_by_interface( const nic_allocation_struct& alloc, cons
 }
 
 bool
-NicAllocator::allocatable_by_data_rate( double delta_alloc_throughput, const DeviceThroughputCapacity& capacity, double current_throughput ) const
+NicAllocator::allocatable_by_data_rate( double delta_alloc_throughput, const DeviceThroughputCapacity& capacity, const DeviceThroughput& current_throughput ) const
 {
-  RH_NL_TRACE( "GPP", __FUNCTION__ << ": { delta_alloc_throughput: " << delta_alloc_throughput << ", current_throughput: " << current_throughput << ", capacity: { device: " << capacity.device << ", maximum_throughput: " << capacity.maximum_throughput << ", allocated_throughput: " << capacity.allocated_throughput << " } }" );
+  RH_NL_TRACE( "GPP", __FUNCTION__ << ": { delta_alloc_throughput: " << delta_alloc_throughput << ", current_throughput: { rx: " << current_throughput.rx << ", tx: " << current_throughput.tx << " }, capacity: { device: " << capacity.device << ", maximum_throughput: " << capacity.maximum_throughput << ", allocated_throughput: " << capacity.allocated_throughput << " } }" );
     double requested_throughput = capacity.allocated_throughput + delta_alloc_throughput;
     double adjusted_max_throughput = capacity.maximum_throughput * max_throughput_percent_ / 100.0;
     
-    return std::max(current_throughput, requested_throughput) <= adjusted_max_throughput;
+    // The link speed is available in each direction, a busy receive side
+    // must not be charged against transmit capacity and vice versa
+    return std::max(current_throughput.rx, requested_throughput) <= adjusted_max_throughput &&
+           std::max(current_throughput.tx, requested_throughput) <= adjusted_max_throughput;
 }
 
 bool
@@ -231,6 +317,7 @@ NicAllocator::deallocate_capacity( const nic_allocation_struct& alloc )
             DeviceThroughputCapacity& nic_throughput_capacity( lookup_nic_throughput_capacity( nic ) );
 
             nic_throughput_capacity.allocated_throughput -= get_throughput(iter->second);
+            update_load( nic_throughput_capacity );
         }
         allocations_.erase(iter);
     }
@@ -25,6 +25,7 @@
 #include <boost/shared_ptr.hpp>
 #include "struct_props.h"
 #include "states/NicState.h"
+#include "NicPlacement.h"
 
 class NicAllocator;
 
@@ -43,6 +44,18 @@ struct DeviceThroughputCapacity
     double allocated_throughput;
 };
 
+// Current throughput of a device in each direction
+struct DeviceThroughput
+{
+    DeviceThroughput():
+    rx(0),
+    tx(0)
+    {}
+    
+    double rx;
+    double tx;
+};
+
 class NicAllocator
 {
 public:
@@ -56,11 +69,12 @@ public:
     typedef std::map<std::string, NicStatePtr >  AllocatableNics;
     typedef std::map<std::string, nic_allocation_struct> Allocations;
     typedef std::map<std::string, DeviceThroughputCapacity> DeviceThroughputCapacities;
-    typedef boost::function< double (const std::string&) > CurrentThroughputFunction;
+    typedef boost::function< DeviceThroughput (const std::string&) > CurrentThroughputFunction;
     
 public:
     NicAllocator( const AllocatableNics& allocatable_nics, 
                   const double& max_throughput_percent,
+                  const std::string& placement_policy,
                   const CurrentThroughputFunction& current_throughput );
     
     bool allocate_capacity( const nic_allocation_struct& alloc );
@@ -69,10 +83,15 @@ public:
     const Allocations& get_allocations() const { return allocations_; }
     double get_allocated_device_throughput( const std::string& device ) const;
     
+    // the allocatable nics changed, they are ranked again on the next allocation
+    void reset_placement() { placement_stale_ = true; }
+    // follow the measured throughput, when the placement policy uses it
+    void update_measured_throughput();
+    
     bool allocatable_by_is_addressable( const nic_allocation_struct& alloc, const NicState& nic ) const;
     bool allocatable_by_multicast_support( const nic_allocation_struct& alloc, const NicState& nic ) const;
     bool allocatable_by_interface( const nic_allocation_struct& alloc, const NicState& nic ) const;
-    bool allocatable_by_data_rate( double delta_alloc_throughput, const DeviceThroughputCapacity& capacity, double current_throughput ) const;
+    bool allocatable_by_data_rate( double delta_alloc_throughput, const DeviceThroughputCapacity& capacity, const DeviceThroughput& current_throughput ) const;
     
     static void MergeAllocationStructs( nic_allocation_struct& merged, const nic_allocation_struct& updated );
     
@@ -83,6 +102,9 @@ public:
     
 private:
     void validate_allocation( const nic_allocation_struct& alloc ) const;
+    bool allocatable( const nic_allocation_struct& alloc, double delta_alloc_throughput, const std::string& interface );
+    void refresh_placement();
+    void update_load( const DeviceThroughputCapacity& capacity );
     
     double get_throughput(const nic_allocation_struct& alloc) const{ return alloc.data_rate*alloc.data_size; }
     DeviceThroughputCapacity& lookup_nic_throughput_capacity(const NicState& nic);
@@ -90,7 +112,12 @@ private:
 private:
     const AllocatableNics& allocatable_nics_;
     const double& max_throughput_percent_;
+    const std::string& placement_policy_;
     CurrentThroughputFunction current_throughput_;
+    NicPlacement placement_;
+    std::string ranked_policy_; // placement_policy_ when the nics were ranked
+    double ranked_percent_;
+    bool placement_stale_;
     Allocations allocations_;
     DeviceThroughputCapacities device_throughput_capacities_;
 };
@@ -26,8 +26,11 @@
 #include <boost/filesystem.hpp>
 #include <boost/lexical_cast.hpp>
 #include <boost/bind.hpp>
+#include <boost/foreach.hpp>
 
+#include <algorithm>
 #include <net/if.h>
+#include <ifaddrs.h>
 
 #if BOOST_FILESYSTEM_VERSION < 3
 #define BOOST_PATH_STRING(x) (x)
@@ -39,22 +42,35 @@ const int MBIT_PER_MB = 8;
 const double MBIT_PER_BIT = 1e-6;
 
 NicFacade::NicFacade( const double& max_throughput_percent, 
+                      const std::string& placement_policy,
                       const std::vector<std::string>& nic_interface_regexes,
+                      const bool& monitor_filtered_only,
                       std::vector<std::string>& filtered_nic_interfaces_reporting_data,
                       std::vector<interfaces_struct>& reporting_data,
-                      std::vector<nic_metrics_struct_struct>& nic_metrics_reporting_data,
                       std::vector<nic_allocation_status_struct_struct>& nic_allocation_status_reporting_data ):
 nic_interface_filter_(nic_interface_regexes, nic_states_, filtered_nic_states_),
+monitor_filtered_only_(monitor_filtered_only),
+polled_filtered_only_(false),
+last_update_(0),
 filtered_nic_interfaces_reporting_data_(filtered_nic_interfaces_reporting_data),
 reporting_data_(reporting_data),
-nic_metrics_reporting_data_(nic_metrics_reporting_data),
 nic_allocation_status_reporting_data_(nic_allocation_status_reporting_data)
 {
+  nic_stats_.reset( new NicStats() );
+
+  // subscribe ahead of the discovery so no change is missed in between
+  link_monitor_.reset( new LinkMonitor() );
+  if( !link_monitor_->open() )
+    {
+      RH_NL_WARN( "GPP", __FUNCTION__ << ": Unable to subscribe to link notifications, network interfaces will not be followed" );
+      link_monitor_.reset();
+    }
+
   // find all interface devices for this host...
   initialize();
 
   // build allocator list for the nics that we would be watching.
-  nic_allocator_ = boost::shared_ptr< NicAllocator >(new NicAllocator(filtered_nic_states_, max_throughput_percent, boost::bind(&NicFacade::get_throughput_by_device_bps, this, _1) ));
+  nic_allocator_ = boost::shared_ptr< NicAllocator >(new NicAllocator(filtered_nic_states_, max_throughput_percent, placement_policy, boost::bind(&NicFacade::get_throughput_by_direction_bps, this, _1) ));
 
 }
 
@@ -62,24 +78,193 @@ void
 NicFacade::initialize()
 {
   std::vector<std::string> interfaces( poll_nic_interfaces() );
+
+  std::vector<std::string> removed;
+  for( NicStates::const_iterator i=nic_states_.begin(); i!=nic_states_.end(); ++i )
+    {
+      if( std::find(interfaces.begin(), interfaces.end(), i->first) == interfaces.end() )
+        removed.push_back( i->first );
+    }
+  BOOST_FOREACH( const std::string& interface, removed )
+    {
+      remove_interface( interface );
+    }
+
   for( std::vector<std::string>::const_iterator i=interfaces.begin(); i!=interfaces.end(); ++i )
     {
-      const std::string& parsedInterface( *i );
-                
-      boost::shared_ptr<NicState> nic_state = get_or_insert_nic_state( parsedInterface );
+      add_interface( *i );
+    }
+
+  refresh_addresses();
+  filter_interfaces();
+}
+
+bool
+NicFacade::add_interface( const std::string& interface )
+{
+  if( nic_states_.find(interface) != nic_states_.end() )
+    return false;
+
+  boost::shared_ptr<NicState> nic_state = get_or_insert_nic_state( interface );
+
+  if( !has_nic_accumulator(nic_state->get_device()) )
+    {
+      RH_NL_DEBUG( "GPP", __FUNCTION__ << ": Adding NicAccumulator (" << nic_state->get_device() << ")" );
+      add_nic_accumulator( nic_state );
+    }
+  return true;
+}
+
+bool
+NicFacade::remove_interface( const std::string& interface )
+{
+  NicStates::iterator i = nic_states_.find(interface);
+  if( nic_states_.end() == i )
+    return false;
+
+  std::string device( i->second->get_device() );
+  RH_NL_DEBUG( "GPP", __FUNCTION__ << ": Removing NicState (" << interface << ")" );
+  nic_states_.erase(i);
+
+  // the accumulator goes with the last interface of its device
+  for( i=nic_states_.begin(); i!=nic_states_.end(); ++i )
+    {
+      if( i->second->get_device() == device )
+        return true;
+    }
+  RH_NL_DEBUG( "GPP", __FUNCTION__ << ": Removing NicAccumulator (" << device << ")" );
+  nic_accumulators_.erase(device);
+  if( added_devices_.erase(device) == 0 )
+    removed_devices_.insert(device);
+  return true;
+}
+
+void
+NicFacade::process_link_events()
+{
+  if( !link_monitor_ )
+    return;
+
+  link_events_.clear();
+  if( !link_monitor_->poll(link_events_) )
+    {
+      RH_NL_WARN( "GPP", __FUNCTION__ << ": Link notifications were lost, rescanning network interfaces" );
+      initialize();
+      return;
+    }
 
-      if( !has_nic_accumulator(nic_state->get_device()) )
+  InterfaceSet stale;
+  bool links_changed = false;
+  BOOST_FOREACH( const LinkMonitor::Event& ev, link_events_ )
+    {
+      switch( ev.type )
         {
-          RH_NL_DEBUG( "GPP", __FUNCTION__ << ": Adding NicAccumulator (" << nic_state->get_device() << ")" );
-          add_nic_accumulator( nic_state );
-            
-          //            // Add new NicThroughputThresholdMonitor
-          //(dynamicGPP_i, __FUNCTION__ << ": Adding interface (" << nic_state->get_device() << ")" );
-          //            addThresholdMonitor( new NicThroughputThresholdMonitor(_identifier, nic_state->get_device(), &thresholds.nic_usage, boost::bind(&dynamicGPP_i::getThroughputByInterface, this, nic_state->get_device()) ) );
+        case LinkMonitor::LINK_NEW:
+          //
+          // also sent when the flags of a known link change, a rename is
+          // reported under the new name only
+          //
+          if( nic_states_.find(ev.interface) == nic_states_.end() && has_statistics(ev.interface) )
+            {
+              std::vector<std::string> renamed;
+              for( NicStates::const_iterator i=nic_states_.begin(); i!=nic_states_.end(); ++i )
+                {
+                  if( if_nametoindex(i->first.c_str()) == 0 )
+                    renamed.push_back( i->first );
+                }
+              BOOST_FOREACH( const std::string& interface, renamed )
+                {
+                  remove_interface( interface );
+                }
+              RH_NL_INFO( "GPP", __FUNCTION__ << ": Network interface added (" << ev.interface << ")" );
+              add_interface( ev.interface );
+              stale.insert( ev.interface );
+              links_changed = true;
+            }
+          break;
+        case LinkMonitor::LINK_DEL:
+          if( remove_interface(ev.interface) )
+            {
+              RH_NL_INFO( "GPP", __FUNCTION__ << ": Network interface removed (" << ev.interface << ")" );
+              stale.erase( ev.interface );
+              links_changed = true;
+            }
+          break;
+        case LinkMonitor::ADDR_NEW:
+        case LinkMonitor::ADDR_DEL:
+          if( nic_states_.find(ev.interface) != nic_states_.end() )
+            stale.insert( ev.interface );
+          break;
         }
     }
-    
+
+  if( !stale.empty() )
+    refresh_addresses( &stale );
+  if( links_changed )
+    filter_interfaces();
+}
+
+void
+NicFacade::filter_interfaces()
+{
   nic_interface_filter_.filter();
+  if( nic_allocator_ )
+    nic_allocator_->reset_placement();
+
+  //
+  // a vlan's traffic is accounted on its parent device, poll the parent of
+  // each filtered interface as well
+  //
+  polled_interfaces_.clear();
+  polled_devices_.clear();
+  polled_filtered_only_ = monitor_filtered_only_;
+  if( !polled_filtered_only_ )
+    {
+      nic_stats_->select_all();
+      return;
+    }
+  for( NicStates::const_iterator i=filtered_nic_states_.begin(); i!=filtered_nic_states_.end(); ++i )
+    {
+      polled_interfaces_.insert( i->first );
+      polled_devices_.insert( i->second->get_device() );
+    }
+  for( InterfaceSet::const_iterator i=polled_devices_.begin(); i!=polled_devices_.end(); ++i )
+    {
+      if( nic_states_.find(*i) != nic_states_.end() )
+        polled_interfaces_.insert( *i );
+    }
+  nic_stats_->select( polled_interfaces_ );
+}
+
+bool
+NicFacade::is_polled_device( const std::string& device ) const
+{
+  return !polled_filtered_only_ || polled_devices_.find(device) != polled_devices_.end();
+}
+
+void
+NicFacade::refresh_addresses( const InterfaceSet* interfaces )
+{
+  struct ifaddrs *ifaddr;
+  if( getifaddrs(&ifaddr) == -1 )
+    {
+      RH_NL_WARN( "GPP", __FUNCTION__ << ": Unable to read network interface addresses" );
+      return;
+    }
+
+  for( NicStates::iterator i=nic_states_.begin(); i!=nic_states_.end(); ++i )
+    {
+      if( interfaces == NULL || interfaces->find(i->first) != interfaces->end() )
+        i->second->update_addresses( ifaddr );
+    }
+
+  freeifaddrs(ifaddr);
+}
+
+bool
+NicFacade::has_statistics( const std::string& interface ) const
+{
+  return !interface.empty() && boost::filesystem::is_regular_file( "/sys/class/net/" + interface + "/statistics/rx_bytes" );
 }
 
 std::vector<std::string> 
@@ -114,7 +299,7 @@ NicFacade::get_or_insert_nic_state( const std::string& interface )
     if( nic_states_.end() == i )
     {
       RH_NL_DEBUG( "GPP", __FUNCTION__ << ": Adding NicState (" << interface << ")" );
-      i = nic_states_.insert( std::make_pair(interface, new NicState(interface)) ).first;
+      i = nic_states_.insert( std::make_pair(interface, new NicState(interface, nic_stats_)) ).first;
     }
     return i->second;
 }
@@ -131,6 +316,12 @@ NicFacade::add_nic_accumulator( const NicStatePtr &nic_state )
   NicAccumulatorPtr nic_accumulator( new NicAccumulator(nic_state) );
   BOOST_ASSERT( !nic_accumulator->get_device().empty() );
   nic_accumulators_.insert( std::make_pair(nic_accumulator->get_device(), nic_accumulator) );
+  //
+  // a device that comes back before the changes are collected keeps its
+  // monitor, the accumulator restarts either way
+  //
+  if( removed_devices_.erase(nic_accumulator->get_device()) == 0 )
+    added_devices_.insert(nic_accumulator->get_device());
 }
 
 bool
@@ -151,6 +342,22 @@ NicFacade::deallocate_capacity( const nic_allocation_struct& alloc )
 void 
 NicFacade::update_state()
 {
+    process_link_events();
+    if( monitor_filtered_only_ != polled_filtered_only_ )
+        filter_interfaces();
+
+    nic_stats_->update();
+    time(&last_update_);
+    if( polled_filtered_only_ )
+    {
+        for( InterfaceSet::const_iterator i=polled_interfaces_.begin(); i!=polled_interfaces_.end(); ++i )
+        {
+            NicStates::iterator nic = nic_states_.find(*i);
+            if( nic_states_.end() != nic )
+                nic->second->update_state();
+        }
+        return;
+    }
     for( NicStates::iterator i=nic_states_.begin(); i!=nic_states_.end(); ++i )
     {
         i->second->update_state();
@@ -162,8 +369,10 @@ NicFacade::compute_statistics()
 {
     for( NicAccumulators::iterator i=nic_accumulators_.begin(); i!=nic_accumulators_.end(); ++i )
     {
-        i->second->compute_statistics();
+        if( is_polled_device(i->first) )
+            i->second->compute_statistics();
     }
+    nic_allocator_->update_measured_throughput();
 }
 
 void 
@@ -178,7 +387,6 @@ NicFacade::report()
   // update 
     write_filtered_nic_interfaces_reporting_data();
     write_reporting_data();
-    write_nic_metrics_reporting_data();
     write_nic_allocation_status_reporting_data();
 }
 
@@ -198,34 +406,43 @@ NicFacade::write_filtered_nic_interfaces_reporting_data()
 void
 NicFacade::write_reporting_data()
 {
-    reporting_data_.resize(nic_accumulators_.size());
+    reporting_data_.resize( polled_filtered_only_ ? polled_devices_.size() : nic_accumulators_.size() );
     std::vector<interfaces_struct>::iterator nic(reporting_data_.begin());
     
     NicAccumulators::const_iterator i;
-    for( i=nic_accumulators_.begin(); i!=nic_accumulators_.end(); ++i, ++nic )
+    for( i=nic_accumulators_.begin(); i!=nic_accumulators_.end() && nic!=reporting_data_.end(); ++i )
     {
+        if( !is_polled_device(i->first) )
+            continue;
         boost::shared_ptr<NicAccumulator> nic_accumulator( i->second );
         
         nic->interface = nic_accumulator->get_device();
         nic->throughput = nic_accumulator->get_throughput_MB_per_sec();
         nic->vlans = nic_accumulator->get_vlans_string();
+        ++nic;
     }
+    reporting_data_.erase( nic, reporting_data_.end() );
 }
 
-void
-NicFacade::write_nic_metrics_reporting_data()
+std::vector<nic_metrics_struct_struct>
+NicFacade::get_nic_metrics() const
 {
-    std::time_t t;
-    time(&t);
-    std::string time_str( asctime(gmtime(&t)) );
+    std::time_t t = last_update_;
+    struct tm utc;
+    char time_buf[32];
+    std::string time_str( asctime_r(gmtime_r(&t, &utc), time_buf) );
     
-    nic_metrics_reporting_data_.resize( nic_states_.size() );
-    std::vector<nic_metrics_struct_struct>::iterator report(nic_metrics_reporting_data_.begin());
+    std::vector<nic_metrics_struct_struct> metrics;
+    metrics.reserve( polled_filtered_only_ ? polled_interfaces_.size() : nic_states_.size() );
     
     NicStates::const_iterator i;
-    for( i=nic_states_.begin(); i!=nic_states_.end(); ++i, ++report )
+    for( i=nic_states_.begin(); i!=nic_states_.end(); ++i )
     {
+        if( polled_filtered_only_ && polled_interfaces_.find(i->first) == polled_interfaces_.end() )
+            continue;
         boost::shared_ptr<NicState> nic_state( i->second );
+        metrics.push_back( nic_metrics_struct_struct() );
+        nic_metrics_struct_struct* report = &metrics.back();
         
         report->interface = nic_state->get_interface();
         report->mac_address = nic_state->get_mac_address();
@@ -258,7 +475,28 @@ NicFacade::write_nic_metrics_reporting_data()
         report->time_string_utc = time_str;
         report->time = t;
         report->current_throughput =  get_throughput_by_device(nic_state->get_device()) * MBIT_PER_MB;
+
+        NicAccumulators::const_iterator acc = nic_accumulators_.find( nic_state->get_device() );
+        if( acc != nic_accumulators_.end() )
+        {
+            const NicAccumulator& nic_accumulator( *acc->second );
+            report->rx_throughput = nic_accumulator.get_rate(NicAccumulator::RX_BYTES) * MBIT_PER_MB;
+            report->tx_throughput = nic_accumulator.get_rate(NicAccumulator::TX_BYTES) * MBIT_PER_MB;
+            report->rx_throughput_average = nic_accumulator.get_average_rate(NicAccumulator::RX_BYTES) * MBIT_PER_MB;
+            report->tx_throughput_average = nic_accumulator.get_average_rate(NicAccumulator::TX_BYTES) * MBIT_PER_MB;
+            report->rx_throughput_peak = nic_accumulator.get_peak_rate(NicAccumulator::RX_BYTES) * MBIT_PER_MB;
+            report->tx_throughput_peak = nic_accumulator.get_peak_rate(NicAccumulator::TX_BYTES) * MBIT_PER_MB;
+            report->rx_packet_rate = nic_accumulator.get_rate(NicAccumulator::RX_PACKETS);
+            report->tx_packet_rate = nic_accumulator.get_rate(NicAccumulator::TX_PACKETS);
+            report->rx_dropped_rate = nic_accumulator.get_rate(NicAccumulator::RX_DROPPED);
+            report->rx_dropped_peak = nic_accumulator.get_peak_rate(NicAccumulator::RX_DROPPED);
+            report->tx_dropped_rate = nic_accumulator.get_rate(NicAccumulator::TX_DROPPED);
+            report->rx_error_rate = nic_accumulator.get_rate(NicAccumulator::RX_ERRORS);
+            report->tx_error_rate = nic_accumulator.get_rate(NicAccumulator::TX_ERRORS);
+            report->bursts = nic_accumulator.get_burst_count();
+        }
     }
+    return metrics;
 }
 
 void
@@ -320,6 +558,15 @@ NicFacade::get_devices() const
     return devices;
 }
 
+void
+NicFacade::get_device_changes( std::vector<std::string>& added, std::vector<std::string>& removed )
+{
+    added.assign( added_devices_.begin(), added_devices_.end() );
+    removed.assign( removed_devices_.begin(), removed_devices_.end() );
+    added_devices_.clear();
+    removed_devices_.clear();
+}
+
 float 
 NicFacade::get_throughput_by_device( const std::string& device ) const
 {
@@ -330,9 +577,26 @@ NicFacade::get_throughput_by_device( const std::string& device ) const
         return 0;
 }
 
-double 
-NicFacade::get_throughput_by_device_bps( const std::string& device ) const
+float 
+NicFacade::get_max_direction_throughput_by_device( const std::string& device ) const
 {
-    return get_throughput_by_device(device) * MBIT_PER_MB * 1024*1024;
+    NicAccumulators::const_iterator i = nic_accumulators_.find( device );
+    if( nic_accumulators_.end() != i )
+        return std::max( i->second->get_rx_MB_per_sec(), i->second->get_tx_MB_per_sec() );
+    else
+        return 0;
+}
+
+DeviceThroughput 
+NicFacade::get_throughput_by_direction_bps( const std::string& device ) const
+{
+    DeviceThroughput throughput;
+    NicAccumulators::const_iterator i = nic_accumulators_.find( device );
+    if( nic_accumulators_.end() != i )
+    {
+        throughput.rx = i->second->get_rx_MB_per_sec() * MBIT_PER_MB * 1024*1024;
+        throughput.tx = i->second->get_tx_MB_per_sec() * MBIT_PER_MB * 1024*1024;
+    }
+    return throughput;
 }
 
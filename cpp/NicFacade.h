@@ -23,11 +23,15 @@
 #include <string>
 #include <vector>
 #include <map>
+#include <set>
+#include <ctime>
 #include <boost/shared_ptr.hpp>
 
 #include "NicInterfaceFilter.h"
 #include "NicAllocator.h"
 #include "states/NicState.h"
+#include "states/NicStats.h"
+#include "utils/LinkMonitor.h"
 #include "reports/Reporting.h"
 #include "struct_props.h"
 
@@ -41,13 +45,27 @@ typedef boost::shared_ptr< NicFacade > NicFacadePtr;
 class NicFacade : public Reporting
 {
 public:
+    //
+    // Interfaces are discovered at construction, and followed afterwards from
+    // the kernel's link and address notifications: interfaces that appear or
+    // go away are added or removed on the next update, and the addresses of
+    // an interface are only reread when they change.
+    //
+    // With monitor_filtered_only set, only the interfaces matched by the
+    // regexes (and the parent devices of matched vlans) are polled.
+    //
+    // Allocations are placed on the filtered interfaces in the order given by
+    // placement_policy (see NicPlacementPolicy).
+    //
     NicFacade( const double& max_throughput_percent,
+               const std::string& placement_policy,
                const std::vector<std::string>& nic_interface_regexes,
+               const bool& monitor_filtered_only,
                std::vector<std::string>& filtered_nic_interfaces_reporting_data,
                std::vector<interfaces_struct>& reporting_data,
-               std::vector<nic_metrics_struct_struct>& nic_metrics_reporting_data,
                std::vector<nic_allocation_status_struct_struct>& nic_allocation_status_reporting_data );
     
+    // discover the interfaces and their addresses, dropping those that are gone
     void initialize();
 
     bool allocate_capacity( const nic_allocation_struct& alloc );
@@ -57,19 +75,35 @@ public:
     void compute_statistics();
     void report();
     
+    // metrics of the polled interfaces, as of the last update
+    std::vector<nic_metrics_struct_struct> get_nic_metrics() const;
+
     std::vector<std::string> get_devices() const;
+    // devices added and removed since the previous call, every device is
+    // reported as added on the first call
+    void get_device_changes( std::vector<std::string>& added, std::vector<std::string>& removed );
     float get_throughput_by_device( const std::string& device ) const;
-    double get_throughput_by_device_bps( const std::string& device ) const;
+    // MB/s of the busier of the receive and transmit directions
+    float get_max_direction_throughput_by_device( const std::string& device ) const;
+    DeviceThroughput get_throughput_by_direction_bps( const std::string& device ) const;
 
 private:
+    typedef std::set<std::string> InterfaceSet;
+
     std::vector<std::string> poll_nic_interfaces() const;
+    bool has_statistics( const std::string& interface ) const;
+    bool add_interface( const std::string& interface );
+    bool remove_interface( const std::string& interface );
+    void process_link_events();
+    void refresh_addresses( const InterfaceSet* interfaces=NULL );
+    void filter_interfaces();
+    bool is_polled_device( const std::string& device ) const;
     boost::shared_ptr<NicState> get_or_insert_nic_state( const std::string& interface );
     bool has_nic_accumulator( const std::string& device ) const;
     void add_nic_accumulator( const NicStatePtr &nic_state );
     
     void write_filtered_nic_interfaces_reporting_data();
     void write_reporting_data();
-    void write_nic_metrics_reporting_data();
     void write_nic_allocation_status_reporting_data();
     
     std::string flags_to_str( unsigned int flags ) const;
@@ -78,16 +112,26 @@ private:
     typedef std::map<std::string, boost::shared_ptr<NicState> > NicStates;
     typedef std::map<std::string, boost::shared_ptr<NicAccumulator> > NicAccumulators;
     
+    NicStatsPtr nic_stats_; // Counters of every link, read once per update
+    LinkMonitorPtr link_monitor_; // Link and address notifications, NULL when unavailable
+    LinkMonitor::EventList link_events_;
     NicStates nic_states_; // Indexed by nic interface
     NicStates filtered_nic_states_;
     NicAccumulators nic_accumulators_; // Indexed by nic device (interface without vlan)
+    InterfaceSet added_devices_; // Accumulators added since get_device_changes
+    InterfaceSet removed_devices_;
     
     NicInterfaceFilter nic_interface_filter_;
     boost::shared_ptr<NicAllocator> nic_allocator_;
+
+    const bool& monitor_filtered_only_;
+    bool polled_filtered_only_; // monitor_filtered_only_ when the polled sets were computed
+    InterfaceSet polled_interfaces_; // Filtered interfaces and their parent devices
+    InterfaceSet polled_devices_;
+    std::time_t last_update_;
     
     std::vector<std::string>& filtered_nic_interfaces_reporting_data_;
     std::vector<interfaces_struct>& reporting_data_;
-    std::vector<nic_metrics_struct_struct>& nic_metrics_reporting_data_;
     std::vector<nic_allocation_status_struct_struct>& nic_allocation_status_reporting_data_;
 };
 
@@ -0,0 +1,243 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include <algorithm>
+#include <limits>
+
+#include "NicPlacement.h"
+
+
+double
+NicPlacementPolicy::min_score( double delta_throughput ) const
+{
+    return -std::numeric_limits<double>::max();
+}
+
+NicPlacementPolicyPtr
+NicPlacementPolicy::Create( const std::string& name )
+{
+    if( name == FirstFitPolicy::Name() )
+        return NicPlacementPolicyPtr( new FirstFitPolicy() );
+    if( name == BestFitPolicy::Name() )
+        return NicPlacementPolicyPtr( new BestFitPolicy() );
+    if( name == LeastLoadedPolicy::Name() )
+        return NicPlacementPolicyPtr( new LeastLoadedPolicy() );
+    if( name == NumaLocalPolicy::Name() )
+        return NicPlacementPolicyPtr( new NumaLocalPolicy() );
+    return NicPlacementPolicyPtr();
+}
+
+double
+BestFitPolicy::score( const DeviceLoad& load ) const
+{
+    return load.maximum_throughput - load.allocated_throughput;
+}
+
+double
+BestFitPolicy::min_score( double delta_throughput ) const
+{
+    // a device with less unallocated capacity can not take the allocation,
+    // allow for rounding
+    return delta_throughput - 1;
+}
+
+double
+LeastLoadedPolicy::score( const DeviceLoad& load ) const
+{
+    // links with an unknown speed go last
+    if( load.maximum_throughput <= 0 )
+        return std::numeric_limits<double>::max();
+    
+    double in_use = std::max( load.allocated_throughput, std::max(load.rx_throughput, load.tx_throughput) );
+    return in_use / load.maximum_throughput;
+}
+
+
+static double Headroom( const DeviceLoad* load )
+{
+    return load ? load->maximum_throughput - load->allocated_throughput : 0;
+}
+
+
+bool
+NicPlacement::Rank::operator<( const Rank& other ) const
+{
+    if( group != other.group )
+        return group < other.group;
+    if( score != other.score )
+        return score < other.score;
+    return interface < other.interface;
+}
+
+NicPlacement::NicPlacement():
+policy_( new FirstFitPolicy() )
+{
+}
+
+bool
+NicPlacement::set_policy( const std::string& name )
+{
+    if( name == policy_->get_name() )
+        return true;
+    
+    NicPlacementPolicyPtr policy( NicPlacementPolicy::Create(name) );
+    if( !policy )
+        return false;
+    
+    policy_ = policy;
+    rerank();
+    return true;
+}
+
+void
+NicPlacement::add_interface( const std::string& interface, const std::string& device, int numa_node )
+{
+    Interfaces::iterator i = interfaces_.find( interface );
+    if( i != interfaces_.end() )
+    {
+        if( i->second.device == device && i->second.numa_node == numa_node )
+            return;
+        ranking_.erase( Rank(0, i->second.score, interface) );
+        by_node_.erase( Rank(i->second.numa_node, i->second.score, interface) );
+        for( DeviceInterfaces::iterator j=device_interfaces_.lower_bound(i->second.device);
+             j!=device_interfaces_.upper_bound(i->second.device); ++j )
+        {
+            if( j->second == interface )
+            {
+                device_interfaces_.erase(j);
+                break;
+            }
+        }
+        interfaces_.erase(i);
+    }
+    
+    Interface& entry( interfaces_[interface] );
+    entry.device = device;
+    entry.numa_node = numa_node;
+    device_interfaces_.insert( std::make_pair(device, interface) );
+    
+    const DeviceLoad* load = get_load( device );
+    entry.score = policy_->score( load ? *load : DeviceLoad() );
+    ranking_.insert( Rank(0, entry.score, interface, Headroom(load)) );
+    if( policy_->prefers_numa_node() )
+        by_node_.insert( Rank(numa_node, entry.score, interface, Headroom(load)) );
+}
+
+void
+NicPlacement::clear()
+{
+    ranking_.clear();
+    by_node_.clear();
+    interfaces_.clear();
+    device_interfaces_.clear();
+    loads_.clear();
+}
+
+void
+NicPlacement::set_load( const std::string& device, const DeviceLoad& load )
+{
+    loads_[device] = load;
+    
+    double score = policy_->score( load );
+    for( DeviceInterfaces::const_iterator i=device_interfaces_.lower_bound(device);
+         i!=device_interfaces_.upper_bound(device); ++i )
+    {
+        Interfaces::iterator entry = interfaces_.find( i->second );
+        if( entry != interfaces_.end() )
+            rank( entry->first, entry->second, score, Headroom(&load) );
+    }
+}
+
+const DeviceLoad*
+NicPlacement::get_load( const std::string& device ) const
+{
+    DeviceLoads::const_iterator i = loads_.find( device );
+    if( i == loads_.end() )
+        return NULL;
+    return &i->second;
+}
+
+void
+NicPlacement::rank( const std::string& interface, Interface& entry, double score, double headroom )
+{
+    if( score == entry.score )
+    {
+        ranking_.find( Rank(0, score, interface) )->headroom = headroom;
+        if( policy_->prefers_numa_node() )
+            by_node_.find( Rank(entry.numa_node, score, interface) )->headroom = headroom;
+        return;
+    }
+    
+    ranking_.erase( Rank(0, entry.score, interface) );
+    ranking_.insert( Rank(0, score, interface, headroom) );
+    if( policy_->prefers_numa_node() )
+    {
+        by_node_.erase( Rank(entry.numa_node, entry.score, interface) );
+        by_node_.insert( Rank(entry.numa_node, score, interface, headroom) );
+    }
+    entry.score = score;
+}
+
+void
+NicPlacement::rerank()
+{
+    ranking_.clear();
+    by_node_.clear();
+    for( Interfaces::iterator i=interfaces_.begin(); i!=interfaces_.end(); ++i )
+    {
+        const DeviceLoad* load = get_load( i->second.device );
+        i->second.score = policy_->score( load ? *load : DeviceLoad() );
+        ranking_.insert( Rank(0, i->second.score, i->first, Headroom(load)) );
+        if( policy_->prefers_numa_node() )
+            by_node_.insert( Rank(i->second.numa_node, i->second.score, i->first, Headroom(load)) );
+    }
+}
+
+std::string
+NicPlacement::place( double delta_throughput, int numa_node, const AcceptFunction& accept ) const
+{
+    double min_score = policy_->min_score( delta_throughput );
+    bool local = policy_->prefers_numa_node() && numa_node >= 0;
+    
+    if( local )
+    {
+        Ranking::const_iterator i = by_node_.lower_bound( Rank(numa_node, min_score, "") );
+        for( ; i!=by_node_.end() && i->group == numa_node; ++i )
+        {
+            if( i->headroom + 1 < delta_throughput )
+                continue;
+            if( accept(i->interface) )
+                return i->interface;
+        }
+    }
+    
+    Ranking::const_iterator i = ranking_.lower_bound( Rank(0, min_score, "") );
+    for( ; i!=ranking_.end(); ++i )
+    {
+        // skip devices without enough unallocated capacity
+        if( i->headroom + 1 < delta_throughput )
+            continue;
+        // already tried on the requested node
+        if( local && interfaces_.find(i->interface)->second.numa_node == numa_node )
+            continue;
+        if( accept(i->interface) )
+            return i->interface;
+    }
+    return "";
+}
@@ -0,0 +1,192 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef NIC_PLACEMENT_H_
+#define NIC_PLACEMENT_H_
+#include <string>
+#include <map>
+#include <set>
+#include <boost/function.hpp>
+#include <boost/shared_ptr.hpp>
+
+class NicPlacementPolicy;
+typedef boost::shared_ptr< NicPlacementPolicy > NicPlacementPolicyPtr;
+
+
+// Throughput figures of a nic device, in bps
+struct DeviceLoad
+{
+    DeviceLoad():
+    maximum_throughput(0),
+    allocated_throughput(0),
+    rx_throughput(0),
+    tx_throughput(0)
+    {}
+    
+    double maximum_throughput; // usable capacity (maximum_throughput_percentage applied)
+    double allocated_throughput;
+    double rx_throughput; // measured
+    double tx_throughput;
+};
+
+//
+// Ranks the interfaces of the allocatable devices, lower scores are tried
+// first.  Interfaces with equal scores are tried in name order.
+//
+class NicPlacementPolicy
+{
+public:
+    virtual ~NicPlacementPolicy() {}
+    
+    virtual std::string get_name() const = 0;
+    
+    virtual double score( const DeviceLoad& load ) const = 0;
+    
+    // lowest score that can take delta_throughput more bps, lower scores
+    // are skipped
+    virtual double min_score( double delta_throughput ) const;
+    
+    // the score follows the measured throughput
+    virtual bool uses_measured_throughput() const { return false; }
+    
+    // interfaces on the requested numa node are tried first
+    virtual bool prefers_numa_node() const { return false; }
+    
+    // NULL when the name is unknown
+    static NicPlacementPolicyPtr Create( const std::string& name );
+};
+
+// First interface in name order that fits
+class FirstFitPolicy : public NicPlacementPolicy
+{
+public:
+    static std::string Name() { return "first_fit"; }
+    std::string get_name() const { return Name(); }
+    double score( const DeviceLoad& load ) const { return 0; }
+};
+
+// Device left with the least unallocated capacity, keeps the large links free
+class BestFitPolicy : public NicPlacementPolicy
+{
+public:
+    static std::string Name() { return "best_fit"; }
+    std::string get_name() const { return Name(); }
+    double score( const DeviceLoad& load ) const;
+    double min_score( double delta_throughput ) const;
+};
+
+// Device with the lowest share of its capacity in use, allocated or measured
+class LeastLoadedPolicy : public NicPlacementPolicy
+{
+public:
+    static std::string Name() { return "least_loaded"; }
+    std::string get_name() const { return Name(); }
+    double score( const DeviceLoad& load ) const;
+    bool uses_measured_throughput() const { return true; }
+};
+
+// Least loaded device on the requested numa node, then on the other nodes
+class NumaLocalPolicy : public LeastLoadedPolicy
+{
+public:
+    static std::string Name() { return "numa_local"; }
+    std::string get_name() const { return Name(); }
+    bool prefers_numa_node() const { return true; }
+};
+
+
+//
+// Order in which the allocatable interfaces are tried for a nic allocation.
+//
+// The interfaces are kept in a sorted index ranked by the placement policy.
+// A change to the load of a device only re-ranks the interfaces of that
+// device, and a placement walks the index from the best candidate instead of
+// scoring every interface.  Interfaces whose device does not have enough
+// unallocated capacity are passed over without calling accept.  When the
+// policy prefers a numa node the interfaces are also indexed by node.
+//
+class NicPlacement
+{
+public:
+    typedef boost::function< bool (const std::string&) > AcceptFunction;
+    
+public:
+    NicPlacement();
+    
+    // false when the policy is unknown, the current policy is kept
+    bool set_policy( const std::string& name );
+    std::string get_policy() const { return policy_->get_name(); }
+    bool uses_measured_throughput() const { return policy_->uses_measured_throughput(); }
+    
+    void add_interface( const std::string& interface, const std::string& device, int numa_node );
+    void clear();
+    
+    void set_load( const std::string& device, const DeviceLoad& load );
+    const DeviceLoad* get_load( const std::string& device ) const;
+    
+    // first interface in ranking order that accept takes, empty if none
+    std::string place( double delta_throughput, int numa_node, const AcceptFunction& accept ) const;
+    
+    size_t size() const { return interfaces_.size(); }
+    
+private:
+    struct Rank
+    {
+        Rank( int group_, double score_, const std::string& interface_, double headroom_=0 ):
+        group(group_),
+        score(score_),
+        interface(interface_),
+        headroom(headroom_)
+        {}
+        
+        bool operator<( const Rank& other ) const;
+        
+        int group;
+        double score;
+        std::string interface;
+        // unallocated capacity of the device, not part of the ordering so it
+        // can follow the load without moving the entry
+        mutable double headroom;
+    };
+    
+    struct Interface
+    {
+        std::string device;
+        int numa_node;
+        double score;
+    };
+    
+    typedef std::set< Rank > Ranking;
+    typedef std::map< std::string, Interface > Interfaces;
+    typedef std::multimap< std::string, std::string > DeviceInterfaces;
+    typedef std::map< std::string, DeviceLoad > DeviceLoads;
+    
+    void rank( const std::string& interface, Interface& entry, double score, double headroom );
+    void rerank();
+    
+private:
+    NicPlacementPolicyPtr policy_;
+    Ranking ranking_; // every interface, group 0
+    Ranking by_node_; // grouped by numa node, when the policy prefers a node
+    Interfaces interfaces_;
+    DeviceInterfaces device_interfaces_;
+    DeviceLoads loads_;
+};
+
+#endif
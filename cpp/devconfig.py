@@ -314,7 +314,8 @@ class DevConfig(object):
                     self._log.debug("problems running hdparm for disk rate test")
                 return 0
             rate = data[eidx+1]
-            self.props['diskrateTotal'].append({"diskrateTotalDevice": dev, "diskrateTotal": rate})
+            self.props['diskrateTotal'].append({"diskrateTotal::diskrateTotal::device": dev,
+                                                "diskrateTotal::diskrateTotal::rate": float(rate)})
     
     def _get_fileSystems(self):
         """Use df to provide the current status for all file systems on this machine."""
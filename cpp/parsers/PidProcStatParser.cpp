@@ -17,12 +17,11 @@
  * You should have received a copy of the GNU Lesser General Public License
  * along with this program.  If not, see http://www.gnu.org/licenses/.
  */
+#include <stdio.h>
+#include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
 #include <iostream>
-#include <fstream>
-#include <sstream>
-#include <boost/lexical_cast.hpp>
-#include <boost/algorithm/string.hpp>
-#include <boost/format.hpp>
 
 #include "PidProcStatParser.h"
 #include "ParserExceptions.h"
@@ -34,52 +33,130 @@
 #endif
 
 
-PidProcStatParser::PidProcStatParser( const int pid) :
-  _pid(pid)
+PidProcStatParser::PidProcStatParser() :
+  _pid(-1),
+  _fields(ALL),
+  _fd(-1)
 {
- }
+  _data = Contents();
+}
+
+PidProcStatParser::PidProcStatParser( const int pid, const int fields, const std::string &proc_dir ) :
+  _pid(pid),
+  _fields(fields),
+  _fd(-1)
+{
+  char pidstr[16];
+  snprintf(pidstr, sizeof(pidstr), "/%d/stat", pid);
+  _fname = proc_dir + pidstr;
+  _data = Contents();
+}
 
 PidProcStatParser::~PidProcStatParser() 
 {
+  close();
 }
 
-void PidProcStatParser::readone(FILE *input, int64_t *x) { fscanf(input, "%lld ", (long long *) x); }
-void PidProcStatParser::readunsigned(FILE *input, uint64_t *x) { fscanf(input, "%llu ",(unsigned long long *) x); }
-void PidProcStatParser::readstr(FILE *input, char *x) {  fscanf(input, "%s ", x);}
-void PidProcStatParser::readchar(FILE *input, char *x) {  fscanf(input, "%c ", x);}
+void PidProcStatParser::close()
+{
+  if ( _fd > -1 ) {
+    ::close(_fd);
+    _fd = -1;
+  }
+}
 
 const PidProcStatParser::Contents & PidProcStatParser::get() { return _data; };
 
+//
+// parse a decimal number, advancing the cursor past it and the following space
+//
+static inline const char *scan_number( const char *s, int64_t &value )
+{
+  bool neg = false;
+  if ( *s == '-' ) { neg = true; s++; }
+  if ( *s < '0' || *s > '9' ) return NULL;
+  int64_t v = 0;
+  while ( *s >= '0' && *s <= '9' ) {
+    v = v*10 + (*s - '0');
+    s++;
+  }
+  value = neg ? -v : v;
+  if ( *s == ' ' ) s++;
+  return s;
+}
+
+int PidProcStatParser::scan( const char *buf, const int fields, Contents &data )
+{
+  //
+  // the command name may contain spaces and parenthesis, it is delimited by
+  // the first '(' and the last ')'
+  //
+  const char *lp = strchr(buf, '(');
+  const char *rp = strrchr(buf, ')');
+  if ( !lp || !rp || rp < lp || rp[1] != ' ' ) return -1;
+
+  if ( fields & PID ) {
+    if ( !scan_number(buf, data.pid) ) return -1;
+  }
+  if ( fields & COMM ) {
+    data.comm.assign(lp+1, rp-lp-1);
+  }
+  const char *s = rp+2;
+  if ( fields & STATE ) data.state = *s;
+  while ( *s && *s != ' ' ) s++;
+  if ( *s == ' ' ) s++;
+
+  int64_t *slots[25] = { NULL };
+  slots[4] = &data.ppid;
+  slots[5] = &data.pgrp;
+  slots[6] = &data.session;
+  slots[7] = &data.tty_nr;
+  slots[8] = &data.tty_pgrp;
+  slots[9] = &data.flags;
+  slots[10] = &data.min_flt;
+  slots[11] = &data.cmin_flt;
+  slots[12] = &data.maj_flt;
+  slots[13] = &data.cmaj_flt;
+  slots[14] = &data.utime;
+  slots[15] = &data.stime;
+  slots[16] = &data.cutime;
+  slots[17] = &data.cstime;
+  slots[20] = &data.num_threads;
+  slots[22] = &data.starttime;
+  slots[23] = &data.vsize;
+  slots[24] = &data.rss;
+
+  // fields 4 and up are numeric, stop after the last one requested
+  int last = 24;
+  while ( last > 3 && !(fields & (1 << (last-1))) ) last--;
+  for ( int field=4; field <= last; field++ ) {
+    int64_t value;
+    s = scan_number(s, value);
+    if ( !s ) return -1;
+    if ( slots[field] && (fields & (1 << (field-1))) ) *slots[field] = value;
+  }
+  return 0;
+}
+
 int  PidProcStatParser::parse( Contents & data )
 {
-  char tcomm[PATH_MAX];
-  char state;
-  int retval=-1;
-  std::stringstream ss;
-  ss<<"/proc/"<<_pid<<"/stat";
-  FILE *input=fopen(ss.str().c_str(), "r");
-  if( !input ) return retval;
-  readone(input,&data.pid);
-  readstr(input,tcomm);
-  data.comm = tcomm;
-  readchar(input,&state);
-  data.state = state;
-  readone(input,&data.ppid);
-  readone(input,&data.pgrp);
-  readone(input,&data.session);
-  readone(input,&data.tty_nr);
-  readone(input,&data.tty_pgrp);
-  readone(input,&data.flags);
-  readone(input,&data.min_flt);
-  readone(input,&data.cmin_flt);
-  readone(input,&data.maj_flt);
-  readone(input,&data.cmaj_flt);
-  readone(input,&data.utime);
-  readone(input,&data.stime);
-  readone(input,&data.cutime);
-  readone(input,&data.cstime);
-  fclose(input);
+  if ( _fd < 0 ) {
+    _fd = open(_fname.c_str(), O_RDONLY | O_CLOEXEC);
+    if ( _fd < 0 ) return -1;
+  }
 
+  ssize_t n = pread(_fd, _buf, sizeof(_buf)-1, 0);
+  if ( n <= 0 ) {
+    // process is gone
+    close();
+    return -1;
+  }
+  _buf[n] = '\0';
+
+  if ( scan(_buf, _fields, data) < 0 ) {
+    DEBUG(std::cout << "PidProcStatParser: unable to parse " << _fname << std::endl);
+    return -1;
+  }
   return 0;
 }
 
@@ -87,4 +164,3 @@ int  PidProcStatParser::parse( Contents & data )
 int PidProcStatParser::parse() {
   return parse(_data);
 }
-
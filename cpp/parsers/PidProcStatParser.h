@@ -23,11 +23,53 @@
 #include <iosfwd>
 #include <string>
 #include <vector>
+#include <boost/shared_ptr.hpp>
 
+class PidProcStatParser;
+typedef boost::shared_ptr<PidProcStatParser>  PidProcStatParserPtr;
+
+//
+// Reader for /proc/<pid>/stat.  The file is opened once and re-read with
+// pread on every parse, so a parser kept for a tracked pid costs a single
+// system call per sample and does not allocate.  Once the process exits the
+// descriptor reports an error instead of the contents of a recycled pid.
+//
+// Only the fields selected in the constructor are stored, and scanning stops
+// after the last selected field.
+//
 class PidProcStatParser {
 
  public:
 
+  //
+  // field selection, bit n-1 selects field n of proc(5)
+  //
+  enum Field {
+    PID         = 1 << 0,
+    COMM        = 1 << 1,
+    STATE       = 1 << 2,
+    PPID        = 1 << 3,
+    PGRP        = 1 << 4,
+    SESSION     = 1 << 5,
+    TTY_NR      = 1 << 6,
+    TTY_PGRP    = 1 << 7,
+    FLAGS       = 1 << 8,
+    MIN_FLT     = 1 << 9,
+    CMIN_FLT    = 1 << 10,
+    MAJ_FLT     = 1 << 11,
+    CMAJ_FLT    = 1 << 12,
+    UTIME       = 1 << 13,
+    STIME       = 1 << 14,
+    CUTIME      = 1 << 15,
+    CSTIME      = 1 << 16,
+    NUM_THREADS = 1 << 19,
+    STARTTIME   = 1 << 21,
+    VSIZE       = 1 << 22,
+    RSS         = 1 << 23,
+    TICKS       = UTIME | STIME | CUTIME | CSTIME,
+    ALL         = 0x00ffffff
+  };
+
   struct Contents {
     int64_t       pid;
     std::string   comm;
@@ -46,13 +88,17 @@ class PidProcStatParser {
     int64_t       stime;
     int64_t       cutime;
     int64_t       cstime;
+    int64_t       num_threads;
+    int64_t       starttime;
+    int64_t       vsize;
+    int64_t       rss;
   };
 
 public:
 
   PidProcStatParser();
 
-  PidProcStatParser( const int pid );
+  PidProcStatParser( const int pid, const int fields=ALL, const std::string &proc_dir="/proc" );
 
   virtual ~PidProcStatParser();
 
@@ -63,14 +109,21 @@ public:
     return _data.utime + _data.stime + _data.cutime + _data.cstime;
   }
 
-private:
+  // release the file descriptor, the next parse reopens the file
+  void close();
+
+  //
+  // scan the contents of a stat file, returns 0 on success
+  //
+  static int scan( const char *buf, const int fields, Contents &data );
 
-  inline void readone(FILE *input, int64_t *x);
-  inline void readunsigned(FILE *input, uint64_t *x);
-  inline void readstr(FILE *input, char *x);
-  inline void readchar(FILE *input, char *x);
+private:
 
   int      _pid;
+  int      _fields;
+  int      _fd;
+  std::string _fname;
+  char     _buf[1024];
   Contents _data;
 };
 
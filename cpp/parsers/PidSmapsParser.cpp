@@ -0,0 +1,116 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include <stdio.h>
+#include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <errno.h>
+#include <iostream>
+
+#include "PidSmapsParser.h"
+
+#ifdef DEBUG_ON
+#define DEBUG(x)            x
+#else
+#define DEBUG(x)            
+#endif
+
+
+PidSmapsParser::PidSmapsParser( const int pid, const std::string &proc_dir )
+{
+  char pidstr[16];
+  snprintf(pidstr, sizeof(pidstr), "/%d/", pid);
+  _dir = proc_dir + pidstr;
+}
+
+PidSmapsParser::~PidSmapsParser()
+{
+}
+
+int PidSmapsParser::read_file( const std::string &fname, std::string &buf )
+{
+  int fd = open(fname.c_str(), O_RDONLY | O_CLOEXEC);
+  if ( fd < 0 ) return -1;
+  char chunk[4096];
+  ssize_t n;
+  buf.clear();
+  while ( (n = read(fd, chunk, sizeof(chunk))) > 0 ) {
+    buf.append(chunk, n);
+  }
+  ::close(fd);
+  return n < 0 ? -1 : 0;
+}
+
+int PidSmapsParser::parse( Contents &data )
+{
+  std::string buf;
+  if ( read_file(_dir + "smaps_rollup", buf) != 0 ) {
+    if ( errno != ENOENT || read_file(_dir + "smaps", buf) != 0 ) {
+      DEBUG(std::cout << "PidSmapsParser: unable to read " << _dir << std::endl);
+      return -1;
+    }
+  }
+  // a process without an address space (kernel thread, zombie) reads empty
+  if ( buf.empty() ) return -1;
+  data = Contents();
+  scan(buf.c_str(), data);
+  return 0;
+}
+
+void PidSmapsParser::scan( const char *buf, Contents &data )
+{
+  //
+  // lines are "Key:   value kB", mapping headers and fields we do not keep
+  // are skipped
+  //
+  static const struct {
+    const char *key;
+    size_t      len;
+    int64_t     Contents::*field;
+  } fields[] = {
+    { "Rss:",           4,  &Contents::rss },
+    { "Pss:",           4,  &Contents::pss },
+    { "Shared_Clean:",  13, &Contents::shared_clean },
+    { "Shared_Dirty:",  13, &Contents::shared_dirty },
+    { "Private_Clean:", 14, &Contents::private_clean },
+    { "Private_Dirty:", 14, &Contents::private_dirty },
+    { "Swap:",          5,  &Contents::swap },
+  };
+  static const size_t nfields = sizeof(fields)/sizeof(fields[0]);
+
+  const char *line = buf;
+  while ( *line ) {
+    const char *eol = strchr(line, '\n');
+    for ( size_t i=0; i < nfields; i++ ) {
+      if ( strncmp(line, fields[i].key, fields[i].len) != 0 ) continue;
+      const char *s = line + fields[i].len;
+      while ( *s == ' ' ) s++;
+      int64_t v = 0;
+      while ( *s >= '0' && *s <= '9' ) {
+        v = v*10 + (*s - '0');
+        s++;
+      }
+      data.*(fields[i].field) += v * 1024;
+      break;
+    }
+    if ( eol == NULL ) break;
+    line = eol + 1;
+  }
+}
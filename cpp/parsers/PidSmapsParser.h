@@ -0,0 +1,76 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef _PIDSMAPSPARSER_H_
+#define _PIDSMAPSPARSER_H_
+#include <stdint.h>
+#include <string>
+
+//
+// Reader for the memory summary of a process.  /proc/<pid>/smaps_rollup
+// (linux 4.14) is preferred; on older kernels the per mapping entries of
+// /proc/<pid>/smaps are summed.  Reading either file walks the page tables
+// of the process, so callers should sample it on a slow cadence.
+//
+// All values are in bytes.  The unique set size (uss) is the memory that
+// would be released if the process exited, the proportional set size (pss)
+// divides each shared page between the processes that map it.
+//
+class PidSmapsParser {
+
+ public:
+
+  struct Contents {
+    Contents() : rss(0), pss(0), shared_clean(0), shared_dirty(0), private_clean(0), private_dirty(0), swap(0) {};
+    int64_t       rss;
+    int64_t       pss;
+    int64_t       shared_clean;
+    int64_t       shared_dirty;
+    int64_t       private_clean;
+    int64_t       private_dirty;
+    int64_t       swap;
+
+    inline int64_t uss() const {
+      return private_clean + private_dirty;
+    }
+  };
+
+  PidSmapsParser( const int pid, const std::string &proc_dir="/proc" );
+
+  virtual ~PidSmapsParser();
+
+  //
+  // returns 0 on success, -1 if the process is gone or its memory maps are
+  // not readable
+  //
+  int parse( Contents &data );
+
+  //
+  // sum the fields of smaps or smaps_rollup contents
+  //
+  static void scan( const char *buf, Contents &data );
+
+ private:
+
+  int read_file( const std::string &fname, std::string &buf );
+
+  std::string   _dir;
+};
+
+#endif
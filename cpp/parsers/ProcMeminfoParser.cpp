@@ -17,12 +17,11 @@
  * You should have received a copy of the GNU Lesser General Public License
  * along with this program.  If not, see http://www.gnu.org/licenses/.
  */
+#include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
 #include <iostream>
 #include <fstream>
-#include <sstream>
-#include <boost/lexical_cast.hpp>
-#include <boost/algorithm/string.hpp>
-#include <boost/format.hpp>
 
 #include "ProcMeminfoParser.h"
 #include "ParserExceptions.h"
@@ -36,75 +35,105 @@
 
 
 ProcMeminfoParser::ProcMeminfoParser() :
-  fname("/proc/meminfo" )
+  fname("/proc/meminfo" ),
+  fd(-1),
+  buf(4096),
+  nkeys(0)
 {
-  std::ifstream input( fname.c_str() );
-  if ( !input.good()) throw std::ifstream::failure("unable to open " + fname );
+  fd = open(fname.c_str(), O_RDONLY | O_CLOEXEC);
+  if ( fd < 0 ) throw std::ifstream::failure("unable to open " + fname );
 }
 
 
 ProcMeminfoParser::ProcMeminfoParser( const std::string &fname ) :
-  fname(fname)
+  fname(fname),
+  fd(-1),
+  buf(4096),
+  nkeys(0)
 {
-  std::ifstream input( fname.c_str() );
-  if ( !input.good()) throw std::ifstream::failure("unable to open " + fname );
+  fd = open(fname.c_str(), O_RDONLY | O_CLOEXEC);
+  if ( fd < 0 ) throw std::ifstream::failure("unable to open " + fname );
 }
 
 
 
 ProcMeminfoParser::~ProcMeminfoParser() 
 {
+  if ( fd > -1 ) ::close(fd);
 }
 
 
-void   ProcMeminfoParser::parse( ProcMeminfo::Contents & data )
+void ProcMeminfoParser::read_file()
 {
+  size_t len = 0;
+  while ( true ) {
+    if ( len + 1 >= buf.size() ) buf.resize(buf.size() * 2);
+    ssize_t n = pread(fd, &buf[len], buf.size() - len - 1, len);
+    if ( n < 0 ) throw std::ifstream::failure("unable to read " + fname );
+    if ( n == 0 ) break;
+    len += n;
+  }
+  buf[len] = '\0';
+}
 
-  try {
-    std::ifstream procmeminfo_file( fname.c_str() );
-    if ( !procmeminfo_file.good()) throw std::ifstream::failure("unable to open " + fname );
-    DEBUG(std::cout << " opened up the file..."<< std::endl);
-
-    std::string line;
-    while (  std::getline( procmeminfo_file, line ) ) {
-      std::vector<std::string> values;
-      boost::split( values, line, boost::is_any_of(std::string(" ")), boost::algorithm::token_compress_on );
-      DEBUG(std::cout << " line(tokens) " << values.size() << ":" << line << std::endl);
-
-      // key:  value [unit]
-      std::string key;
-      ProcMeminfo::Counter     metric = 0;
-      key = values[0].substr(0, values[0].find(":"));
-        
-      if ( values.size() >= 2 ) {
-        try {
-          metric = boost::lexical_cast<ProcMeminfo::Counter>( values[1] );
-        }
-        catch( boost::bad_lexical_cast ){
+
+void   ProcMeminfoParser::parse( const ProcMeminfo::KeyList &keys, ProcMeminfo::Contents & data )
+{
+  read_file();
+
+  if ( keys.size() != nkeys ) {
+    lines.clear();
+    nkeys = keys.size();
+  }
+  data.values.assign( keys.size(), 0 );
+  data.found.assign( keys.size(), 0 );
+
+  size_t lineno = 0;
+  const char *line = &buf[0];
+  while ( *line ) {
+    const char *colon = strchr(line, ':');
+    const char *eol = strchr(line, '\n');
+    if ( colon == NULL || ( eol && colon > eol ) ) {
+      throw ParserExceptions::ParseError( "Error parsing " + fname + " line (" +
+                                          std::string(line, eol ? eol-line : strlen(line)) + ")" );
+    }
+    size_t klen = colon - line;
+
+    // key:  value [unit]
+    if ( lineno == lines.size() ) lines.push_back( LineSlot() );
+    LineSlot &ls = lines[lineno];
+    if ( ls.key.size() != klen || ls.key.compare(0, klen, line, klen) != 0 ) {
+      ls.key.assign(line, klen);
+      ls.slot = -1;
+      for ( size_t i=0; i < keys.size(); i++ ) {
+        if ( keys[i] == ls.key ) {
+          ls.slot = i;
+          break;
         }
       }
+      DEBUG(std::cout << " resolved line " << lineno << " key " << ls.key << " slot " << ls.slot << std::endl);
+    }
 
-      // handle units
-      ProcMeminfo::Counter  unit_m=1;
-      if ( values.size() >= 3 ) {
-          std::string units(values[2]);
-          boost::to_upper(units);
-          if ( units == "KB" ) unit_m = 1024;
-          if ( units == "MB" ) unit_m = 1024*1024;
-          if ( units == "GB" ) unit_m = 1024*1024*1024;
-          if ( units == "TB" ) unit_m = (uint64_t)1024*1024*1024*1024;
+    if ( ls.slot >= 0 ) {
+      const char *s = colon + 1;
+      while ( *s == ' ' ) s++;
+      ProcMeminfo::Counter metric = 0;
+      while ( *s >= '0' && *s <= '9' ) {
+        metric = metric*10 + (*s - '0');
+        s++;
       }
-        
-      metric = metric * unit_m;
-      data[key]=metric;
+      // handle units
+      while ( *s == ' ' ) s++;
+      if ( *s == 'k' || *s == 'K' ) metric *= 1024;
+      else if ( *s == 'M' ) metric *= 1024*1024;
+      else if ( *s == 'G' ) metric *= 1024*1024*1024;
+      else if ( *s == 'T' ) metric *= (ProcMeminfo::Counter)1024*1024*1024*1024;
+      data.values[ls.slot] = metric;
+      data.found[ls.slot] = 1;
     }
 
+    lineno++;
+    if ( eol == NULL ) break;
+    line = eol + 1;
   }
-  catch(...){
-    throw;
-  }  
-
-
 }
-
-
@@ -25,6 +25,13 @@
 #include <vector>
 #include "states/ProcMeminfo.h"
 
+//
+// Reader for /proc/meminfo.  The file is kept open and read into a reusable
+// buffer with pread.  The slot of each line is resolved against the key list
+// on the first parse and remembered by line number, later parses only
+// confirm that the line still carries the same key, so a steady state parse
+// does not allocate or search.
+//
 class ProcMeminfoParser {
 
   friend class ProcMeminfo;
@@ -37,11 +44,22 @@ public:
 
   virtual ~ProcMeminfoParser();
 
-  void parse( ProcMeminfo::Contents &data );
+  void parse( const ProcMeminfo::KeyList &keys, ProcMeminfo::Contents &data );
     
 private:
 
-  std::string  fname;
+  struct LineSlot {
+    std::string  key;
+    int          slot;      // -1 when the key is not tracked
+  };
+
+  void read_file();
+
+  std::string             fname;
+  int                     fd;
+  std::vector<char>       buf;
+  std::vector<LineSlot>   lines;
+  size_t                  nkeys;    // size of the key list the line slots were resolved for
 };
 
 
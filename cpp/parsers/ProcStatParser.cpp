@@ -17,12 +17,12 @@
  * You should have received a copy of the GNU Lesser General Public License
  * along with this program.  If not, see http://www.gnu.org/licenses/.
  */
+#include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
 #include <iostream>
 #include <fstream>
-#include <sstream>
-#include <boost/lexical_cast.hpp>
-#include <boost/algorithm/string.hpp>
-#include <boost/format.hpp>
+#include <algorithm>
 
 #include "ProcStatParser.h"
 #include "ParserExceptions.h"
@@ -35,177 +35,171 @@
 
 
 ProcStatParser::ProcStatParser() :
-  fname("/proc/stat" )
+  fname("/proc/stat" ),
+  fd(-1),
+  buf(8192)
 {
-  std::ifstream input( fname.c_str() );
-  if ( !input.good()) throw std::ifstream::failure("unable to open " + fname );
+  fd = open(fname.c_str(), O_RDONLY | O_CLOEXEC);
+  if ( fd < 0 ) throw std::ifstream::failure("unable to open " + fname );
 }
 
 
 ProcStatParser::ProcStatParser( const std::string &fname ) :
-  fname(fname)
+  fname(fname),
+  fd(-1),
+  buf(8192)
 {
-  std::ifstream input( fname.c_str() );
-  if ( !input.good()) throw std::ifstream::failure("unable to open " + fname );
+  fd = open(fname.c_str(), O_RDONLY | O_CLOEXEC);
+  if ( fd < 0 ) throw std::ifstream::failure("unable to open " + fname );
 }
 
 
 
 ProcStatParser::~ProcStatParser() 
 {
+  if ( fd > -1 ) ::close(fd);
 }
 
 
-void   ProcStatParser::parse( ProcStat::Contents & data )
+void ProcStatParser::read_file()
 {
+  //
+  // read the whole file, growing the buffer until it fits
+  //
+  size_t len = 0;
+  while ( true ) {
+    if ( len + 1 >= buf.size() ) buf.resize(buf.size() * 2);
+    ssize_t n = pread(fd, &buf[len], buf.size() - len - 1, len);
+    if ( n < 0 ) throw std::ifstream::failure("unable to read " + fname );
+    if ( n == 0 ) break;
+    len += n;
+  }
+  buf[len] = '\0';
+  DEBUG(std::cout << " read " << len << " bytes from " << fname << std::endl);
+}
 
-  try {
-    std::ifstream procstat_file( fname.c_str() );
-    if ( !procstat_file.good()) throw std::ifstream::failure("unable to open " + fname );
-    DEBUG(std::cout << " opened up the file..."<< std::endl);
-
-    std::string line;
-    data.time_stamp = time(NULL);
-    while (  std::getline( procstat_file, line ) ) {
-      std::vector<std::string> values;
-      boost::split( values, line, boost::is_any_of(std::string(" ")), boost::algorithm::token_compress_on );
-      DEBUG(std::cout << " line: " << line << std::endl);
-
-      try {
-        
-        // handle different line types...
-        
-	if( boost::starts_with( values[0], "cpu" ) ) {
-            ProcStat::CpuStat cstat;
-            cstat.id = values[0];
-            cstat.idx = -1;   // default to all
-            try {
-              if ( values[0].size() > 3 ) {
-                std::string ids = values[0].substr(3);
-                cstat.idx= boost::lexical_cast<int>( ids );
-              }
-            }
-            catch( boost::bad_lexical_cast ){
-            }
-            // save off stat line for this cpu
-            cstat.jiffies.resize( values.size()-1 );
-            for( uint32_t i=1; i<values.size(); ++i )
-            {
-              try {
-                cstat.jiffies[i-1] = boost::lexical_cast<ProcStat::Counter>( values[i] );
-              }
-              catch( boost::bad_lexical_cast ){
-              }
-            }
-
-            std::stringstream ss;
-            ss << boost::format("%-5s:%-2d ") % cstat.id % cstat.idx;
-            for ( uint32_t j=0; j < cstat.jiffies.size(); j++ ) ss  << boost::format("%-7lld  ") % cstat.jiffies[j];
-            DEBUG(std::cout << ss.str() << std::endl);
-
-            if ( cstat.idx == -1 ) {
-              data.all = cstat;
-            }
-            else {
-              data.cpus.push_back(cstat);
-            }
-
-
-        
-        }
-
-	if( boost::starts_with( values[0], "intr" ) ) {
-            ProcStat::CounterList stat_list;
-            for( uint32_t i=1; i<values.size(); ++i )
-            {
-              try {
-                stat_list.push_back( boost::lexical_cast<ProcStat::Counter>( values[i] ) );
-              }
-              catch( boost::bad_lexical_cast ){
-              }
-            }
-            data.interrupts.swap( stat_list );
-        }
-
-	if( boost::starts_with( values[0], "softirq" ) ){
-            ProcStat::CounterList stat_list;
-            for( uint32_t i=1; i<values.size(); ++i )
-            {
-              try {
-                stat_list.push_back( boost::lexical_cast<ProcStat::Counter>( values[i] ) );
-              }
-              catch( boost::bad_lexical_cast ){
-              }
-            }
-            data.soft_irqs.swap( stat_list );
-        }
-          
-
-        if( boost::starts_with( values[0], "btime" ) ) {        
-          try {
-            data.boot_time = boost::lexical_cast<ProcStat::Counter>( values[1] );
-          }
-          catch( const boost::bad_lexical_cast& )
-            {
-              throw ParserExceptions::ParseError( "Error parsing /proc/stat line (" + line + ")" );
-            }
-        }
 
-	if( boost::starts_with( values[0], "ctxt" ) ) {        
-          try {
-            data.context_switches = boost::lexical_cast<ProcStat::Counter>( values[1] );
-          }
-          catch( const boost::bad_lexical_cast& )
-            {
-              throw ParserExceptions::ParseError( "Error parsing /proc/stat line (" + line + ")" );
-            }
-        }
+void   ProcStatParser::parse( ProcStat::Contents & data, const int sections )
+{
+  read_file();
+  data.time_stamp = time(NULL);
+  scan(&buf[0], sections, data);
+}
 
-	if( boost::starts_with( values[0], "processes" ) ){        
-          try {
-            data.processes_started = boost::lexical_cast<ProcStat::Counter>( values[1] );
-          }
-          catch( const boost::bad_lexical_cast& )
-            {
-              throw ParserExceptions::ParseError( "Error parsing /proc/stat line (" + line + ")" );
-            }
-        }
 
+//
+// parse an unsigned decimal number, skipping leading blanks
+//
+static inline const char *scan_counter( const char *s, ProcStat::Counter &value )
+{
+  while ( *s == ' ' ) s++;
+  if ( *s < '0' || *s > '9' ) return NULL;
+  ProcStat::Counter v = 0;
+  while ( *s >= '0' && *s <= '9' ) {
+    v = v*10 + (*s - '0');
+    s++;
+  }
+  value = v;
+  return s;
+}
 
-	if( boost::starts_with( values[0], "processes_running" ) ) {        
-          try {
-            data.processes_running = boost::lexical_cast<ProcStat::Counter>( values[1] );
-          }
-          catch( const boost::bad_lexical_cast& )
-            {
-              throw ParserExceptions::ParseError( "Error parsing /proc/stat line (" + line + ")" );
-            }
-        }
+static inline bool starts_with( const char *s, const char *prefix, const size_t len )
+{
+  return strncmp(s, prefix, len) == 0 && s[len] == ' ';
+}
 
-	if( boost::starts_with( values[0], "processes_blocked" ) ) {        
-          try {
-            data.processes_blocked = boost::lexical_cast<ProcStat::Counter>( values[1] );
-          }
-          catch( const boost::bad_lexical_cast& )
-            {
-              throw ParserExceptions::ParseError( "Error parsing /proc/stat line (" + line + ")" );
-            }
-        }
+static void scan_list( const char *s, ProcStat::CounterList &list )
+{
+  list.clear();
+  ProcStat::Counter value;
+  while ( (s = scan_counter(s, value)) != NULL ) list.push_back(value);
+}
 
+static void scan_single( const char *s, const char *line, ProcStat::Counter &value )
+{
+  if ( !scan_counter(s, value) ) {
+    const char *eol = strchr(line, '\n');
+    throw ParserExceptions::ParseError( "Error parsing /proc/stat line (" +
+                                        std::string(line, eol ? eol-line : strlen(line)) + ")" );
+  }
+}
 
+void   ProcStatParser::scan( const char *buf, const int sections, ProcStat::Contents & data )
+{
+  size_t ncpus = 0;
+  const char *line = buf;
+  while ( *line ) {
+    switch ( *line ) {
+    case 'c':
+      if ( (sections & ProcStat::CPU) && strncmp(line, "cpu", 3) == 0 ) {
+        const char *s = line + 3;
+        ProcStat::CpuStat *cstat;
+        int idx = -1;   // default to all
+        if ( *s >= '0' && *s <= '9' ) {
+          ProcStat::Counter v;
+          s = scan_counter(s, v);
+          idx = v;
+          if ( ncpus == data.cpus.size() ) data.cpus.push_back(ProcStat::CpuStat());
+          cstat = &data.cpus[ncpus++];
+        } else {
+          cstat = &data.all;
         }
-      catch( const boost::bad_lexical_cast& )
-        {
-          throw ParserExceptions::ParseError( "Error parsing /proc/stat line (" + line + ")" );
+        if ( cstat->idx != idx || cstat->id.empty() ) {
+          cstat->id.assign(line, s - line);
+          cstat->idx = idx;
         }
+        // save off stat line for this cpu
+        cstat->jiffies.clear();
+        ProcStat::Counter value;
+        while ( (s = scan_counter(s, value)) != NULL ) cstat->jiffies.push_back(value);
+      }
+      else if ( (sections & ProcStat::CTXT) && starts_with(line, "ctxt", 4) ) {
+        scan_single(line + 4, line, data.context_switches);
+      }
+      break;
+    case 'b':
+      if ( (sections & ProcStat::BTIME) && starts_with(line, "btime", 5) ) {
+        scan_single(line + 5, line, data.boot_time);
+      }
+      break;
+    case 'p':
+      if ( sections & ProcStat::PROCS ) {
+        if ( starts_with(line, "processes", 9) ) scan_single(line + 9, line, data.processes_started);
+        else if ( starts_with(line, "procs_running", 13) ) scan_single(line + 13, line, data.processes_running);
+        else if ( starts_with(line, "procs_blocked", 13) ) scan_single(line + 13, line, data.processes_blocked);
+      }
+      break;
+    case 'i':
+      if ( (sections & ProcStat::INTR) && starts_with(line, "intr", 4) ) {
+        scan_list(line + 4, data.interrupts);
+      }
+      break;
+    case 's':
+      if ( (sections & ProcStat::SOFTIRQ) && starts_with(line, "softirq", 7) ) {
+        scan_list(line + 7, data.soft_irqs);
+      }
+      break;
     }
-    
+
+    const char *eol = strchr(line, '\n');
+    if ( eol == NULL ) break;
+    line = eol + 1;
   }
-  catch(...){
-    throw;
-  }  
 
+  if ( sections & ProcStat::CPU ) {
+    data.cpus.resize(ncpus);
 
+    // copy the cpu lines into the contiguous matrix
+    size_t rows = 0;
+    for ( size_t i=0; i < ncpus; i++ ) {
+      if ( (size_t)data.cpus[i].idx >= rows ) rows = data.cpus[i].idx + 1;
+    }
+    data.cpu_rows = rows;
+    data.cpu_matrix.assign( rows * ProcStat::CPU_JIFFIES_MAX, 0 );
+    for ( size_t i=0; i < ncpus; i++ ) {
+      const ProcStat::CpuJiffies &j = data.cpus[i].jiffies;
+      size_t n = std::min( j.size(), (size_t)ProcStat::CPU_JIFFIES_MAX );
+      std::copy( j.begin(), j.begin() + n, data.cpu_matrix.begin() + data.cpus[i].idx * ProcStat::CPU_JIFFIES_MAX );
+    }
+  }
 }
-
-
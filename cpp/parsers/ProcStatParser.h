@@ -23,9 +23,22 @@
 #include <iosfwd>
 #include <string>
 #include <vector>
+#include <boost/shared_ptr.hpp>
 #include "states/ProcStat.h"
 
+class ProcStatParser;
+typedef boost::shared_ptr<ProcStatParser>  ProcStatParserPtr;
 
+//
+// Reader for /proc/stat.  The file is kept open and read into a reusable
+// buffer with pread, numbers are decoded in place and only the sections
+// selected by the caller are decoded (see ProcStat::Section).  Lines of
+// sections that are not selected, such as the intr line with one counter
+// per interrupt source, are skipped without being tokenized.
+//
+// Parsing into the same Contents on every cycle reuses its cpu and counter
+// lists, so a steady state parse does not allocate.
+//
 class ProcStatParser {
 
   friend class ProcStat;
@@ -38,11 +51,20 @@ public:
 
   virtual ~ProcStatParser();
 
-  void parse( ProcStat::Contents &data );
-    
+  void parse( ProcStat::Contents &data, const int sections=ProcStat::ALL );
+
+  //
+  // decode the contents of a stat file, buf must be null terminated
+  //
+  static void scan( const char *buf, const int sections, ProcStat::Contents &data );
+
 private:
 
-  std::string  fname;
+  void read_file();
+
+  std::string        fname;
+  int                fd;
+  std::vector<char>  buf;
 };
 
 
@@ -0,0 +1,42 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include "DiskSaturationThresholdMonitor.h"
+#include "utils/ReferenceWrapper.h"
+
+class DiskUtilizationQueryFunction
+{
+public:
+  DiskUtilizationQueryFunction( const DiskAccumulatorPtr &disk ):
+    disk_(disk)
+  {}
+
+  float operator()() const { return disk_->get_utilization_percent(); }
+
+private:
+  DiskAccumulatorPtr  disk_;
+};
+
+DiskSaturationThresholdMonitor::DiskSaturationThresholdMonitor( const std::string& source_id,
+                                                                const float* threshold,
+                                                                const DiskAccumulatorPtr &disk,
+                                                                const bool enableDispatch ):
+  GenericThresholdMonitor<float, SaturationExceeded>(source_id, disk->get_device(), GetMessageClass(), MakeCref(*threshold), DiskUtilizationQueryFunction(disk), enableDispatch )
+{
+}
@@ -0,0 +1,51 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef DISK_SATURATION_THRESHOLD_MONITOR_H_
+#define DISK_SATURATION_THRESHOLD_MONITOR_H_
+
+#include "ThresholdMonitor.h"
+#include "statistics/DiskAccumulator.h"
+
+//
+// the threshold is exceeded when the device is busy for a larger share of
+// the cycle than the threshold, a negative threshold disables the check
+//
+struct SaturationExceeded
+{
+  bool operator()( const float measured, const float threshold ) const
+  {
+    return threshold >= 0 && measured > threshold;
+  }
+};
+
+//
+// Watches the utilization (share of time with requests in flight) of a
+// block device
+//
+class DiskSaturationThresholdMonitor : public GenericThresholdMonitor<float, SaturationExceeded>
+{
+public:
+  DiskSaturationThresholdMonitor( const std::string& source_id, const float* threshold,
+                                  const DiskAccumulatorPtr &disk, const bool enableDispatch=false );
+
+  static std::string GetMessageClass(){ return "DISK_SATURATION"; }
+};
+
+#endif
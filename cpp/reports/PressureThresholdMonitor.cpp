@@ -0,0 +1,51 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include "PressureThresholdMonitor.h"
+#include "utils/ReferenceWrapper.h"
+
+class PressureQueryFunction
+{
+public:
+  PressureQueryFunction( const ProcPressurePtr &pressure, const ProcPressure::Resource resource ):
+    pressure_(pressure),
+    resource_(resource)
+  {}
+
+  float operator()() const { return PressureThresholdMonitor::GetMeasured( *pressure_, resource_ ); }
+
+private:
+  ProcPressurePtr         pressure_;
+  ProcPressure::Resource  resource_;
+};
+
+PressureThresholdMonitor::PressureThresholdMonitor( const std::string& source_id,
+                                                    const ProcPressure::Resource resource,
+                                                    const float* threshold,
+                                                    const ProcPressurePtr &pressure,
+                                                    const bool enableDispatch ):
+  GenericThresholdMonitor<float, PressureExceeded>(source_id, GetResourceId(resource), GetMessageClass(), MakeCref(*threshold), PressureQueryFunction(pressure, resource), enableDispatch )
+{
+}
+
+float PressureThresholdMonitor::GetMeasured( const ProcPressure &pressure, const ProcPressure::Resource resource )
+{
+  if ( !pressure.is_available(resource) ) return -1.0;
+  return pressure.get(resource).some.avg10;
+}
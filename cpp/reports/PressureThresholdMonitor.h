@@ -0,0 +1,55 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef PRESSURE_THRESHOLD_MONITOR_H_
+#define PRESSURE_THRESHOLD_MONITOR_H_
+
+#include "ThresholdMonitor.h"
+#include "states/ProcPressure.h"
+
+//
+// the threshold is exceeded when the stall share is above it, a negative
+// threshold disables the check and an unavailable resource is measured as -1
+//
+struct PressureExceeded
+{
+  bool operator()( const float measured, const float threshold ) const
+  {
+    return threshold >= 0 && measured >= 0 && measured > threshold;
+  }
+};
+
+//
+// Watches the "some" avg10 stall share of one /proc/pressure resource
+//
+class PressureThresholdMonitor : public GenericThresholdMonitor<float, PressureExceeded>
+{
+public:
+  PressureThresholdMonitor( const std::string& source_id, const ProcPressure::Resource resource,
+                            const float* threshold, const ProcPressurePtr &pressure,
+                            const bool enableDispatch=false );
+
+  // measured value of a resource, -1 when PSI is unavailable
+  static float GetMeasured( const ProcPressure &pressure, const ProcPressure::Resource resource );
+
+  static std::string GetResourceId( const ProcPressure::Resource resource ){ return std::string(ProcPressure::GetName(resource)) + "_pressure"; }
+  static std::string GetMessageClass(){ return "PRESSURE"; }
+};
+
+#endif
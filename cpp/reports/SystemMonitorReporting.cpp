@@ -20,6 +20,7 @@
 #include <iostream>
 #include <fstream>
 #include <sstream>
+#include <stdexcept>
 #include <sys/sysinfo.h>
 #include "SystemMonitorReporting.h"
 #include "statistics/Statistics.h"
@@ -30,7 +31,17 @@ static const size_t BYTES_PER_MEGABYTE = 1024*1024;
 SystemMonitor::SystemMonitor( const CpuList & cpu_list ):
   cpu_usage_stats_( new CpuUsageStats(cpu_list) ),
     mem_usage_state_(new ProcMeminfo()),
-    sys_limit_state_(new SysLimits())
+    sys_limit_state_(new SysLimits()),
+    pressure_state_(new ProcPressure())
+{
+  report();
+}
+
+SystemMonitor::SystemMonitor( const CpuList & cpu_list, const ProcStatPtr &proc_stat ):
+  cpu_usage_stats_( new CpuUsageStats(proc_stat, cpu_list) ),
+    mem_usage_state_(new ProcMeminfo()),
+    sys_limit_state_(new SysLimits()),
+    pressure_state_(new ProcPressure())
 {
   report();
 }
@@ -40,7 +51,8 @@ SystemMonitor::SystemMonitor( const CpuStatsPtr & cpu_usage_stats,
                               const SysLimitsPtr &sys_limit ) :
   cpu_usage_stats_(cpu_usage_stats),
   mem_usage_state_(mem_usage_state),
-  sys_limit_state_(sys_limit)
+  sys_limit_state_(sys_limit),
+  pressure_state_(new ProcPressure())
 {
   report();
 }
@@ -81,45 +93,78 @@ const SystemMonitor::CpuStatsPtr SystemMonitor::getCpuStats() const {
   return cpu_usage_stats_;
 }
 
+const SystemMonitor::MemInfoPtr SystemMonitor::getMemInfo() const {
+  return mem_usage_state_;
+}
+
+const ProcPressurePtr SystemMonitor::getPressure() const {
+  return pressure_state_;
+}
+
 void
 SystemMonitor::report()
+{
+  report_cpu();
+  report_memory();
+}
+
+void
+SystemMonitor::report_cpu()
 {
   struct sysinfo info;
   sysinfo(&info);
 
+  // a failed read keeps the values of the previous report
   try {
     cpu_usage_stats_->update();
-    mem_usage_state_->update();
     sys_limit_state_->update();
-    const ProcMeminfo::Contents &mem_stats = mem_usage_state_->get();
-    report_.virtual_memory_total = mem_stats.at("MemTotal")+ mem_stats.at("SwapTotal");
-    report_.virtual_memory_free =  mem_stats.at("MemFree") + mem_stats.at("SwapFree");
-    report_.physical_memory_total = mem_stats.at("MemTotal");
-    report_.physical_memory_free = mem_stats.at("MemFree");
   }
   catch(...){
-    report_.virtual_memory_total = (info.totalram+info.totalswap) * info.mem_unit;
-    report_.virtual_memory_free = (info.freeram+info.freeswap) * info.mem_unit;
-    report_.physical_memory_total = info.totalram * info.mem_unit;
-    report_.physical_memory_free = info.freeram * info.mem_unit;
   }
-
-  report_.virtual_memory_used = report_.virtual_memory_total-report_.virtual_memory_free;
-  report_.physical_memory_used = report_.physical_memory_total-report_.physical_memory_free;
-  report_.virtual_memory_percent = (double)report_.virtual_memory_used / (double)report_.virtual_memory_total * 100.;  
-  report_.physical_memory_percent = (double)report_.physical_memory_used / (double)report_.physical_memory_total * 100.;
   report_.user_cpu_percent = cpu_usage_stats_->get_user_percent();
   report_.system_cpu_percent = cpu_usage_stats_->get_system_percent();
   report_.idle_cpu_percent = cpu_usage_stats_->get_idle_percent();
   report_.cpu_percent = 100.0 - report_.idle_cpu_percent;
   report_.up_time = info.uptime;
   report_.last_update_time = time(NULL);
-  report_.idle_cpu_percent = cpu_usage_stats_->get_idle_percent();
   report_.all_usage = cpu_usage_stats_->get_all_usage();
   report_.user_usage = cpu_usage_stats_->get_user_usage();
   report_.sys_limits = sys_limit_state_->get();
+  pressure_state_->update();
+  report_.pressure = pressure_state_->get();
   report_.load.one_min = info.loads[0] * 1.0/(1<<SI_LOAD_SHIFT);
   report_.load.five_min = info.loads[1] * 1.0/(1<<SI_LOAD_SHIFT);
   report_.load.fifteen_min = info.loads[2] * 1.0/(1<<SI_LOAD_SHIFT);
-  
+}
+
+void
+SystemMonitor::report_memory()
+{
+  try {
+    mem_usage_state_->update();
+    const ProcMeminfo &mem = *mem_usage_state_;
+    if ( !mem.has(ProcMeminfo::MEM_TOTAL) || !mem.has(ProcMeminfo::MEM_FREE) ) {
+      throw std::out_of_range("meminfo is missing MemTotal/MemFree");
+    }
+    report_.virtual_memory_total = mem.get(ProcMeminfo::MEM_TOTAL) + mem.get(ProcMeminfo::SWAP_TOTAL);
+    report_.virtual_memory_free =  mem.get(ProcMeminfo::MEM_FREE) + mem.get(ProcMeminfo::SWAP_FREE);
+    report_.physical_memory_total = mem.get(ProcMeminfo::MEM_TOTAL);
+    report_.physical_memory_free = mem.get(ProcMeminfo::MEM_FREE);
+    // kernels before 3.14 do not report MemAvailable
+    report_.physical_memory_available = mem.has(ProcMeminfo::MEM_AVAILABLE) ? mem.get(ProcMeminfo::MEM_AVAILABLE) : report_.physical_memory_free;
+  }
+  catch(...){
+    struct sysinfo info;
+    sysinfo(&info);
+    report_.virtual_memory_total = (info.totalram+info.totalswap) * info.mem_unit;
+    report_.virtual_memory_free = (info.freeram+info.freeswap) * info.mem_unit;
+    report_.physical_memory_total = info.totalram * info.mem_unit;
+    report_.physical_memory_free = info.freeram * info.mem_unit;
+    report_.physical_memory_available = report_.physical_memory_free;
+  }
+
+  report_.virtual_memory_used = report_.virtual_memory_total-report_.virtual_memory_free;
+  report_.physical_memory_used = report_.physical_memory_total-report_.physical_memory_free;
+  report_.virtual_memory_percent = (double)report_.virtual_memory_used / (double)report_.virtual_memory_total * 100.;  
+  report_.physical_memory_percent = (double)report_.physical_memory_used / (double)report_.physical_memory_total * 100.;
 }
@@ -26,6 +26,7 @@
 #include "statistics/CpuUsageStats.h"
 #include "states/ProcMeminfo.h"
 #include "states/Limits.h"
+#include "states/ProcPressure.h"
 
 class SystemMonitor : public Reporting
 {
@@ -48,6 +49,7 @@ class SystemMonitor : public Reporting
     uint64_t physical_memory_total;
     uint64_t physical_memory_used;
     uint64_t physical_memory_free;
+    uint64_t physical_memory_available;
     double   physical_memory_percent;
     uint64_t all_usage;
     uint64_t user_usage;
@@ -57,6 +59,7 @@ class SystemMonitor : public Reporting
     double   idle_cpu_percent;
     double   up_time;
     Limits::Contents  sys_limits;  
+    ProcPressure::Contents pressure;
     double   last_update_time;
     loadavg  load;
   };
@@ -64,6 +67,9 @@ class SystemMonitor : public Reporting
 public:
   SystemMonitor( const CpuList &cpu_list );
 
+  // cpu usage is computed from a shared /proc/stat snapshot
+  SystemMonitor( const CpuList &cpu_list, const ProcStatPtr &proc_stat );
+
 
   SystemMonitor( const CpuStatsPtr & cpu_usage_stats,
                  const MemInfoPtr  & mem_usage_state,
@@ -78,12 +84,21 @@ public:
   double   get_loadavg() const;
   const Report &getReport() const;
   void report();
+  // cpu usage, system limits, pressure and load average
+  void report_cpu();
+  // /proc/meminfo, refreshed at its own period by the GPP
+  void report_memory();
   const CpuStatsPtr getCpuStats() const;
+  // meminfo snapshot of the last report, all tracked keys are available
+  const MemInfoPtr getMemInfo() const;
+  // /proc/pressure state, resources are unavailable without PSI support
+  const ProcPressurePtr getPressure() const;
     
 private:
     CpuStatsPtr     cpu_usage_stats_;
     MemInfoPtr      mem_usage_state_;
     SysLimitsPtr    sys_limit_state_;
+    ProcPressurePtr pressure_state_;
     Report          report_;
 };
 
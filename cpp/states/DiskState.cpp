@@ -0,0 +1,170 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include <stdlib.h>
+#include <string.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <dirent.h>
+#include <limits.h>
+#include <iostream>
+#include <algorithm>
+#include "DiskState.h"
+
+#ifdef DEBUG_ON
+#define DEBUG(x)         std::cout << x << std::endl
+#else
+#define DEBUG(x)
+#endif
+
+
+DiskState::DiskState( const std::string &_fname ) :
+  fname(_fname),
+  fd(-1),
+  buf(4096),
+  generation(0)
+{
+}
+
+DiskState::~DiskState()
+{
+  if ( fd > -1 ) close(fd);
+}
+
+const DiskState::Contents &DiskState::get() const
+{
+  return contents;
+}
+
+const DiskState::Counters *DiskState::find( const std::string &device ) const
+{
+  Contents::const_iterator it = contents.find(device);
+  if ( it == contents.end() ) return NULL;
+  return &it->second;
+}
+
+static const char *next_field( const char *p )
+{
+  while ( *p == ' ' ) p++;
+  return p;
+}
+
+static uint64_t read_counter( const char *&p )
+{
+  char *end;
+  uint64_t v = strtoull(next_field(p), &end, 10);
+  p = end;
+  return v;
+}
+
+void DiskState::update_state()
+{
+  if ( fd < 0 ) {
+    fd = open(fname.c_str(), O_RDONLY | O_CLOEXEC);
+    if ( fd < 0 ) {
+      DEBUG("DiskState: unable to open " << fname);
+      contents.clear();
+      return;
+    }
+  }
+
+  //
+  // the whole file has to be read at once, grow the buffer until it fits
+  //
+  ssize_t n;
+  while ( true ) {
+    n = pread(fd, &buf[0], buf.size() - 1, 0);
+    if ( n < 0 && errno == EINTR ) continue;
+    if ( n < (ssize_t)buf.size() - 1 ) break;
+    buf.resize(buf.size() * 2);
+  }
+  if ( n <= 0 ) return;
+  buf[n] = '\0';
+
+  generation++;
+  const char *line = &buf[0];
+  std::string name;
+  while ( *line ) {
+    const char *eol = strchr(line, '\n');
+    if ( eol == NULL ) eol = line + strlen(line);
+
+    // major minor name reads merged sectors ticks writes merged sectors ticks in_flight io_ticks queue_ticks ...
+    const char *p = line;
+    read_counter(p);
+    read_counter(p);
+    p = next_field(p);
+    const char *name_end = p;
+    while ( name_end < eol && *name_end != ' ' ) name_end++;
+    if ( name_end > p ) {
+      name.assign(p, name_end);
+      p = name_end;
+      Counters &c = contents[name];
+      c.reads = read_counter(p);
+      read_counter(p);
+      c.read_sectors = read_counter(p);
+      c.read_ticks = read_counter(p);
+      c.writes = read_counter(p);
+      read_counter(p);
+      c.write_sectors = read_counter(p);
+      c.write_ticks = read_counter(p);
+      c.in_flight = read_counter(p);
+      c.io_ticks = read_counter(p);
+      c.queue_ticks = read_counter(p);
+      c.seen = generation;
+    }
+    line = *eol ? eol + 1 : eol;
+  }
+
+  for ( Contents::iterator it=contents.begin(); it != contents.end(); ) {
+    if ( it->second.seen != generation ) {
+      contents.erase(it++);
+    } else {
+      it++;
+    }
+  }
+}
+
+DiskState::DeviceList DiskState::ListDisks( const std::string &sys_block )
+{
+  DeviceList disks;
+  DIR *dirp = opendir(sys_block.c_str());
+  if ( dirp == NULL ) return disks;
+  struct dirent *entry;
+  while ( (entry = readdir(dirp)) != NULL ) {
+    if ( entry->d_name[0] == '.' ) continue;
+    std::string link = sys_block + "/" + entry->d_name + "/device";
+    if ( access(link.c_str(), F_OK) == 0 ) {
+      disks.push_back(entry->d_name);
+    }
+  }
+  closedir(dirp);
+  std::sort(disks.begin(), disks.end());
+  return disks;
+}
+
+std::string DiskState::ResolveDevice( const std::string &device )
+{
+  std::string path(device);
+  if ( !device.empty() && device[0] == '/' ) {
+    char resolved[PATH_MAX];
+    if ( realpath(device.c_str(), resolved) ) path = resolved;
+  }
+  return path.substr(path.find_last_of('/') + 1);
+}
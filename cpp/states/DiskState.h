@@ -0,0 +1,101 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef _DISKSTATE_H_
+#define _DISKSTATE_H_
+#include <stdint.h>
+#include <map>
+#include <string>
+#include <vector>
+#include <boost/shared_ptr.hpp>
+#include "states/State.h"
+
+class DiskState;
+typedef  boost::shared_ptr<DiskState>  DiskStatePtr;
+
+//
+// Block device counters from /proc/diskstats.
+//
+// The file is kept open and reread every update, the counters of every
+// device it lists are kept by device name.  A device that disappears (e.g.
+// a removed usb disk) is dropped from the contents.
+//
+class DiskState : public State
+{
+
+ public:
+
+  // /proc/diskstats counts 512 byte sectors regardless of the device
+  static const uint64_t SECTOR_SIZE = 512;
+
+  struct Counters {
+    Counters() : reads(0), read_sectors(0), read_ticks(0), writes(0), write_sectors(0), write_ticks(0),
+                 in_flight(0), io_ticks(0), queue_ticks(0), seen(0) {};
+    uint64_t    reads;            // completed read requests
+    uint64_t    read_sectors;
+    uint64_t    read_ticks;       // msec spent reading
+    uint64_t    writes;
+    uint64_t    write_sectors;
+    uint64_t    write_ticks;
+    uint64_t    in_flight;        // requests currently issued to the device
+    uint64_t    io_ticks;         // msec the device had requests in flight
+    uint64_t    queue_ticks;      // weighted msec spent doing io
+    uint64_t    seen;             // last update the device was listed
+  };
+
+  typedef std::map< std::string, Counters >  Contents;
+  typedef std::vector< std::string >         DeviceList;
+
+  DiskState( const std::string &fname="/proc/diskstats" );
+
+  virtual ~DiskState();
+
+  void              update_state();
+
+  const Contents    &get() const;
+
+  // counters of a device, NULL if it is not listed
+  const Counters    *find( const std::string &device ) const;
+
+  //
+  // whole disks backed by hardware (entries of /sys/block with a device
+  // link), loop, ram and device mapper devices are skipped
+  //
+  static DeviceList ListDisks( const std::string &sys_block="/sys/block" );
+
+  //
+  // /proc/diskstats name of a device given as a path (/dev/sda1,
+  // /dev/mapper/root) or a name
+  //
+  static std::string ResolveDevice( const std::string &device );
+
+ private:
+
+  DiskState( const DiskState & );
+  DiskState &operator=( const DiskState & );
+
+  std::string       fname;
+  int               fd;
+  std::vector<char> buf;
+  uint64_t          generation;
+  Contents          contents;
+
+};
+
+#endif
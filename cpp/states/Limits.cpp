@@ -17,27 +17,17 @@
  * You should have received a copy of the GNU Lesser General Public License
  * along with this program.  If not, see http://www.gnu.org/licenses/.
  */
+#include <stdlib.h>
+#include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <dirent.h>
 #include <iostream>
-#include <stdexcept>
 #include <string>
 #include <sstream>
-#include <fstream>
-#include <linux/limits.h>
 #include <sys/time.h>
 #include <sys/resource.h>
-#include <boost/asio.hpp>
-#include <boost/lexical_cast.hpp>
-#include <boost/format.hpp>
-#include <boost/algorithm/string.hpp>
-#include <boost/filesystem/operations.hpp>
 #include "Limits.h"
-#include "utils/popen.h"
-
-#if BOOST_FILESYSTEM_VERSION < 3
-#define BOOST_PATH_STRING(x) (x)
-#else
-#define BOOST_PATH_STRING(x) (x).string()
-#endif
 
 #ifdef DEBUG_ON
 #define DEBUG(x)         std::cout << x << std::endl
@@ -45,6 +35,22 @@
 #define DEBUG(x)
 #endif
 
+//
+// The limits are refreshed from the monitoring loop, so everything here is
+// read directly from procfs into a stack buffer.  No subprocess is spawned
+// (forking a large multi-threaded server every cycle is expensive) and no
+// directory other than the process' fd table is walked.
+//
+static ssize_t read_proc( const char *fname, char *buf, const size_t len )
+{
+  int fd = open(fname, O_RDONLY | O_CLOEXEC);
+  if ( fd < 0 ) return -1;
+  ssize_t n = read(fd, buf, len - 1);
+  close(fd);
+  if ( n < 0 ) return -1;
+  buf[n] = '\0';
+  return n;
+}
 
 const Limits::Contents& 
 Limits::get() const 
@@ -73,71 +79,44 @@ SysLimits::~SysLimits()
 void SysLimits::update_state()
 {
   Contents tmp;
-
-  //  grab current file handles 
-  std::string fname;
-  try{
-    fname = "/proc/sys/fs/file-nr";
-    std::ifstream file_nr(fname.c_str(), std::ifstream::in);
-    if ( !file_nr.good()) throw std::ifstream::failure("unable to open " + fname );
-    std::string line;
-    while ( std::getline( file_nr, line ) ) {
-      std::vector<std::string> values;
-      boost::split( values, line, boost::is_any_of(std::string(" \t")), boost::algorithm::token_compress_on );
-      DEBUG(" values: " << values.size() << "  file-nr line: " << line  );
-        
-      if ( values.size() > 2 ) {
-        try {
-          tmp.files = boost::lexical_cast<int64_t>( values[0] );
-          tmp.files_limit = boost::lexical_cast<int64_t>( values[2] );
-        }
-        catch( boost::bad_lexical_cast ){
+  char buf[256];
+  char *end;
+
+  //  grab current file handles: allocated unused max
+  if ( read_proc("/proc/sys/fs/file-nr", buf, sizeof(buf)) > 0 ) {
+    DEBUG("  file-nr line: " << buf  );
+    int64_t allocated = strtoll(buf, &end, 10);
+    if ( end != buf ) {
+      char *p = end;
+      strtoll(p, &end, 10);
+      if ( end != p ) {
+        p = end;
+        int64_t limit = strtoll(p, &end, 10);
+        if ( end != p ) {
+          tmp.files = allocated;
+          tmp.files_limit = limit;
         }
       }
     }
   }
-  catch( ... ) {
-  }
 
-  try{
-    fname = "/proc/sys/kernel/threads-max";
-    std::ifstream sys_threads_max(fname.c_str(), std::ifstream::in);
-    if ( !sys_threads_max.good()) throw std::ifstream::failure("unable to open " + fname );
-    std::string line;
-    while ( std::getline( sys_threads_max, line ) ) {
-      std::vector<std::string> values;
-      boost::split( values, line, boost::is_any_of(std::string(" \t")), boost::algorithm::token_compress_on );
-      DEBUG( " sys-kernel-threads-max line: " << line  );
-        
-      if ( values.size() > 0 ) {
-        try {
-          tmp.threads_limit = boost::lexical_cast<int64_t>( values[0] );
-        }
-        catch( boost::bad_lexical_cast ){
-        }
-      }
-    }
-  }
-  catch( ... ) {
+  if ( read_proc("/proc/sys/kernel/threads-max", buf, sizeof(buf)) > 0 ) {
+    DEBUG( " sys-kernel-threads-max line: " << buf  );
+    int64_t limit = strtoll(buf, &end, 10);
+    if ( end != buf ) tmp.threads_limit = limit;
   }
 
-  try {
-    std::string line = utils::popen("ps -eo nlwp | tail -n +2 | awk '{ num_threads += $1 } END { print num_threads }' ", true);
-    if ( line != "ERROR" ) {
-      std::vector<std::string> values;
-      boost::split(values, line, boost::is_any_of(std::string(" \t")), boost::algorithm::token_compress_on );
-      DEBUG(" system active threads: " << line);
-      if ( values.size() > 0 ) {
-        try {
-          tmp.threads = boost::lexical_cast<int>( values[0] );
-        }
-        catch( boost::bad_lexical_cast ){
-        }
-      }
+  //
+  // the fourth field of loadavg is runnable/total scheduling entities, the
+  // total is the number of threads on the system
+  //
+  if ( read_proc("/proc/loadavg", buf, sizeof(buf)) > 0 ) {
+    DEBUG(" loadavg: " << buf);
+    char *slash = strchr(buf, '/');
+    if ( slash ) {
+      int64_t threads = strtoll(slash+1, &end, 10);
+      if ( end != slash+1 ) tmp.threads = threads;
     }
-
-  }
-  catch( ... ) {
   }
 
   DEBUG( " SYSTEM: threads/max " << tmp.threads << "/" << tmp.threads_limit  );
@@ -170,53 +149,25 @@ void ProcessLimits::update_state()
     tmp.files_limit = limit.rlim_cur;
   }
 
-  // 
+  // search for Threads tag in the status file
   std::ostringstream ppath;
   ppath << "/proc/"<<pid;
-  boost::filesystem::path pid_dir(ppath.str());
-  if (boost::filesystem::exists(pid_dir)) {
-    std::stringstream filename;
-    filename<< BOOST_PATH_STRING(pid_dir)<<"/status";
-    // search for Threads tag in file.
-    std::ifstream status_file(filename.str().c_str(), std::ifstream::in);
-    if ( status_file.good() ) {
-      std::string line;
-      while ( std::getline( status_file, line ) ) {
-        std::vector<std::string> values;
-        boost::split( values, line, boost::is_any_of(std::string(" ")), boost::algorithm::token_compress_on );
-        DEBUG( " line: " << line  );
-          
-        if ( values.size() > 1 && boost::starts_with( values[0], "Threads:" ) ) {
-          try {
-            tmp.threads = boost::lexical_cast<int>( values[1] );
-          }
-          catch( boost::bad_lexical_cast ){
-          }
-        }
-      }
-    }
-  }
-
-  if ( !tmp.threads ) {
-    std::stringstream subpath;
-    subpath<< BOOST_PATH_STRING(pid_dir)<<"/task/";
-    boost::filesystem::path subPath(subpath.str());
-    if (boost::filesystem::exists(subPath)) {
-      for (boost::filesystem::directory_iterator sub_dir_iter(subPath); 
-           sub_dir_iter!= boost::filesystem::directory_iterator();++sub_dir_iter) {
-        tmp.threads++;
-      }
+  char buf[4096];
+  if ( read_proc((ppath.str()+"/status").c_str(), buf, sizeof(buf)) > 0 ) {
+    const char *threads = strstr(buf, "\nThreads:");
+    if ( threads ) {
+      tmp.threads = strtoll(threads + 9, NULL, 10);
     }
   }
 
-  std::stringstream subfilepath;
-  subfilepath<< BOOST_PATH_STRING(pid_dir)<<"/fd/";
-  boost::filesystem::path subFilePath(subfilepath.str());
-  if (boost::filesystem::exists(subFilePath)) {
-    for (boost::filesystem::directory_iterator sub_dir_iter(subFilePath); 
-         sub_dir_iter!= boost::filesystem::directory_iterator();++sub_dir_iter) {
-      tmp.files++;
+  // open file handles
+  DIR *dirp = opendir((ppath.str()+"/fd").c_str());
+  if ( dirp ) {
+    struct dirent *entry;
+    while ( (entry = readdir(dirp)) != NULL ) {
+      if ( entry->d_name[0] != '.' ) tmp.files++;
     }
+    closedir(dirp);
   }
 
   DEBUG( " Process: threads/max " << tmp.threads << "/" << tmp.threads_limit  );
@@ -224,8 +175,3 @@ void ProcessLimits::update_state()
 
   contents = tmp;
 }
-
-
-
-
-
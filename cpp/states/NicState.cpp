@@ -18,11 +18,6 @@
  * along with this program.  If not, see http://www.gnu.org/licenses/.
  */
 #include "NicState.h"
-#include "../utils/FileReader.h"
-#include "../utils/IOError.h"
-
-#include <boost/lexical_cast.hpp>
-#include <boost/bind.hpp>
 
 #include <iostream>
 
@@ -30,33 +25,18 @@
 #include <sys/socket.h>
 #include <netdb.h>
 #include <ifaddrs.h>
+#include <net/if.h>
 #include <stdio.h>
 #include <stdlib.h>
 #include <unistd.h>
 #include <string.h>
 
-NicState::NicState( const std::string& interface )
+NicState::NicState( const std::string& interface, const NicStatsPtr& nic_stats ):
+nic_stats_(nic_stats)
 {
     data_.interface = interface;
     data_.device = interface;
     extract_device_and_vlan_from_interface();
-    
-    bind_data_to_file( data_.rx_bytes, nic_file_path("/statistics/rx_bytes") );
-    bind_data_to_file( data_.rx_compressed, nic_file_path("/statistics/rx_compressed") );
-    bind_data_to_file( data_.rx_crc_errors, nic_file_path("/statistics/rx_crc_errors") );
-    bind_data_to_file( data_.rx_dropped, nic_file_path("/statistics/rx_dropped") );
-    bind_data_to_file( data_.rx_errors, nic_file_path("/statistics/rx_errors") );
-    bind_data_to_file( data_.rx_packets, nic_file_path("/statistics/rx_packets") );
-    bind_data_to_file( data_.tx_bytes, nic_file_path("/statistics/tx_bytes") );
-    bind_data_to_file( data_.tx_compressed, nic_file_path("/statistics/tx_compressed") );
-    bind_data_to_file( data_.tx_dropped, nic_file_path("/statistics/tx_dropped") );
-    bind_data_to_file( data_.tx_errors, nic_file_path("/statistics/tx_errors") );
-    bind_data_to_file( data_.tx_packets, nic_file_path("/statistics/tx_packets") );
-    bind_data_to_file( data_.tx_queue_len, nic_file_path("/tx_queue_len") );
-    bind_data_to_file( data_.mac_address, nic_file_path("/address") );
-    bind_data_to_file( data_.speed, nic_file_path("/speed") );
-    bind_data_to_file( data_.mtu, nic_file_path("/mtu") );
-    bind_data_to_file( data_.state, nic_file_path("/operstate") );
 }
 
 void 
@@ -70,68 +50,53 @@ NicState::extract_device_and_vlan_from_interface()
     }
 }
 
-std::string 
-NicState::nic_file_path( const std::string& suffix ) const
-{
-    return "/sys/class/net/" + data_.interface + suffix;
-}
-
-template<typename T> 
-void 
-NicState::bind_data_to_file( T& data, const std::string& filename )
-{
-    update_functions.push_back( boost::bind(&NicState::extract_file_contents<T>, 
-                                            this, 
-                                            boost::ref(data),
-                                            filename ) );
-}
-
-template<typename T>
-void NicState::extract_file_contents( T& data, const std::string& filename )
-{
-    try
-    {
-        std::stringstream str( FileReader::ReadFile( filename ) );
-        str >> data;
-    }
-    catch( const IOError& e )
-    {
-        data = T();
-    }
-}
-
 void
 NicState::update_state()
 {
-    for( size_t i=0; i<update_functions.size(); ++i )
+    // an interface that went away reads as zeros
+    static const NicStats::Link missing;
+    const NicStats::Link *link = nic_stats_->find( data_.interface );
+    if( !link )
     {
-        update_functions[i]();
-    }
-    
-    if( data_.v4_address.empty() && data_.v6_address.empty() )
-    {
-        update_addresses();
+        link = &missing;
     }
+
+    data_.rx_bytes = link->rx_bytes;
+    data_.rx_compressed = link->rx_compressed;
+    data_.rx_crc_errors = link->rx_crc_errors;
+    data_.rx_dropped = link->rx_dropped;
+    data_.rx_errors = link->rx_errors;
+    data_.rx_packets = link->rx_packets;
+    data_.tx_bytes = link->tx_bytes;
+    data_.tx_compressed = link->tx_compressed;
+    data_.tx_dropped = link->tx_dropped;
+    data_.tx_errors = link->tx_errors;
+    data_.tx_packets = link->tx_packets;
+    data_.tx_queue_len = link->tx_queue_len;
+    data_.mac_address = link->mac_address;
+    data_.speed = link->speed;
+    data_.numa_node = link->numa_node;
+    data_.mtu = link->mtu;
+    data_.state = link->state;
+    data_.flags = link->flags;
 }
 
 void
-NicState::update_addresses()
+NicState::update_addresses( const struct ifaddrs *ifaddr )
 {
     data_.v4_address = "INVALID";
+    data_.v4_netmask.clear();
+    data_.v4_broadcast.clear();
     data_.v6_address = "INVALID";
+    data_.v6_netmask.clear();
+    data_.v6_scope_id = 0;
     
     char addr[INET6_ADDRSTRLEN];
     char netmask[INET6_ADDRSTRLEN];
-    struct ifaddrs *ifaddr, *ifa;
+    const struct ifaddrs *ifa;
     void* sin_addr;
     void* sin_netmask;
 
-    if (getifaddrs(&ifaddr) == -1) 
-    {
-        perror("getifaddrs");
-        return;
-    }
-
     for (ifa = ifaddr; ifa != NULL; ifa = ifa->ifa_next) 
     {
         if (ifa->ifa_addr == NULL)
@@ -139,8 +104,6 @@ NicState::update_addresses()
 
         if( ifa->ifa_name == data_.interface )
         {
-            data_.flags = ifa->ifa_flags;
-            
             if(ifa->ifa_addr->sa_family==AF_INET)
             {
                 sin_addr = &((struct sockaddr_in*)ifa->ifa_addr)->sin_addr;
@@ -157,6 +120,12 @@ NicState::update_addresses()
                 
                 data_.v4_address = addr;
                 data_.v4_netmask = netmask;
+                
+                if( (ifa->ifa_flags & IFF_BROADCAST) && ifa->ifa_broadaddr != NULL &&
+                    inet_ntop(AF_INET, &((struct sockaddr_in*)ifa->ifa_broadaddr)->sin_addr, addr, sizeof(addr)) != NULL )
+                {
+                    data_.v4_broadcast = addr;
+                }
             }
             else if(ifa->ifa_addr->sa_family==AF_INET6)
             {
@@ -178,8 +147,6 @@ NicState::update_addresses()
             }
         }
     }
-
-    freeifaddrs(ifaddr);
 }
 
 
@@ -24,10 +24,11 @@
 #include <vector>
 #include <stdint.h>
 #include <boost/shared_ptr.hpp>
-#include <boost/function.hpp>
 #include "State.h"
+#include "NicStats.h"
 
 class NicState;
+struct ifaddrs;
 
 typedef boost::shared_ptr< NicState > NicStatePtr;
 
@@ -48,6 +49,7 @@ struct NicStateData
     tx_packets(0),
     tx_queue_len(0),
     speed(0),
+    numa_node(-1),
     flags(0),
     v6_scope_id(0),
     mtu(0)
@@ -69,6 +71,7 @@ struct NicStateData
     uint64_t tx_packets;
     uint64_t tx_queue_len;
     uint64_t speed;
+    int numa_node;
     unsigned int flags;
     std::string mac_address;
     std::string v4_address;
@@ -81,17 +84,26 @@ struct NicStateData
     std::string state;
 };
 
+//
+// State of a single interface.  The counters and link attributes are copied
+// from a NicStats shared by all the interfaces, which must be updated first.
+// The addresses are only refreshed through update_addresses, when they change.
+//
 class NicState : public State
 {
 public:
-    NicState( const std::string& interface );
+    NicState( const std::string& interface, const NicStatsPtr& nic_stats );
 
     void update_state();
 
+    // take the interface's addresses from a getifaddrs list
+    void update_addresses( const struct ifaddrs *ifaddr );
+
     std::string get_interface() const { return data_.interface; }
     std::string get_device() const { return data_.device; }
     std::string get_vlan() const { return data_.vlan; }
     uint64_t get_speed_mbit_per_sec() const { return data_.speed; }
+    int get_numa_node() const { return data_.numa_node; }
     uint64_t get_rx_bytes() const { return data_.rx_bytes; }
     uint64_t get_rx_compressed() const { return data_.rx_compressed; }
     uint64_t get_rx_crc_errors() const { return data_.rx_crc_errors; }
@@ -117,17 +129,12 @@ public:
 
 private:
     void extract_device_and_vlan_from_interface();
-    std::string nic_file_path( const std::string& suffix ) const;
-    template<typename T> void bind_data_to_file( T& data, const std::string& filename );
-    template<typename T> void extract_file_contents( T& data, const std::string& filename );
-    void update_addresses();
 
 protected:
     NicStateData data_;
     
 private:
-    typedef boost::function< void() > StateVariableUpdateFunction;
-    std::vector<StateVariableUpdateFunction> update_functions;
+    NicStatsPtr nic_stats_;
 };
 
 
@@ -0,0 +1,453 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include <stdlib.h>
+#include <string.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/ioctl.h>
+#include <sys/socket.h>
+#include <sys/time.h>
+#include <net/if.h>
+#include <linux/netlink.h>
+#include <linux/rtnetlink.h>
+#include <iostream>
+#include <algorithm>
+#include "NicStats.h"
+
+#ifdef DEBUG_ON
+#define DEBUG(x)         std::cout << x << std::endl
+#else
+#define DEBUG(x)
+#endif
+
+// IF_OPER_* values as reported by /sys/class/net/<interface>/operstate
+static const char *OPERSTATES[] = { "unknown", "notpresent", "down", "lowerlayerdown", "testing", "dormant", "up" };
+
+// a dump is answered right away, do not hang the monitoring cycle if it is not
+static const int RECV_TIMEOUT_SEC = 1;
+
+// updates between two attempts at the netlink dump after it failed, doubled
+// on each consecutive failure up to this many
+static const uint64_t MAX_RETRY_INTERVAL = 32;
+
+
+NicStats::NicStats( const bool use_netlink, const std::string &_proc_net_dev, const std::string &_sys_class_net ) :
+  proc_net_dev(_proc_net_dev),
+  sys_class_net(_sys_class_net),
+  source(use_netlink ? NETLINK : PROC_NET_DEV),
+  sock(-1),
+  seq(0),
+  fd(-1),
+  ctl(-1),
+  buf(16384),
+  generation(0),
+  attribute_reads(0),
+  selected_only(false),
+  dump_failures(0),
+  retry_at(0)
+{
+}
+
+NicStats::~NicStats()
+{
+  if ( sock > -1 ) close(sock);
+  if ( fd > -1 ) close(fd);
+  if ( ctl > -1 ) close(ctl);
+}
+
+const NicStats::Contents &NicStats::get() const
+{
+  return contents;
+}
+
+const NicStats::Link *NicStats::find( const std::string &interface ) const
+{
+  Contents::const_iterator it = contents.find(interface);
+  if ( it == contents.end() ) return NULL;
+  return &it->second;
+}
+
+void NicStats::select( const InterfaceSet &interfaces )
+{
+  selected_only = true;
+  selected = interfaces;
+}
+
+void NicStats::select_all()
+{
+  selected_only = false;
+  selected.clear();
+}
+
+bool NicStats::is_selected( const std::string &interface ) const
+{
+  return !selected_only || selected.find(interface) != selected.end();
+}
+
+NicStats::Source NicStats::get_source() const
+{
+  return source;
+}
+
+size_t NicStats::get_attribute_reads() const
+{
+  return attribute_reads;
+}
+
+template< typename T >
+static void copy_counters( const T &stats, NicStats::Link &link )
+{
+  link.rx_bytes = stats.rx_bytes;
+  link.rx_packets = stats.rx_packets;
+  link.rx_errors = stats.rx_errors;
+  link.rx_dropped = stats.rx_dropped;
+  link.rx_compressed = stats.rx_compressed;
+  link.rx_crc_errors = stats.rx_crc_errors;
+  link.tx_bytes = stats.tx_bytes;
+  link.tx_packets = stats.tx_packets;
+  link.tx_errors = stats.tx_errors;
+  link.tx_dropped = stats.tx_dropped;
+  link.tx_compressed = stats.tx_compressed;
+}
+
+//
+// the attribute payload is only 4 byte aligned and its size varies with the
+// kernel version, copy what is there into a zeroed structure
+//
+template< typename T >
+static void copy_payload( struct rtattr *rta, T &out )
+{
+  memset(&out, 0, sizeof(out));
+  size_t len = RTA_PAYLOAD(rta);
+  memcpy(&out, RTA_DATA(rta), len < sizeof(out) ? len : sizeof(out));
+}
+
+static std::string format_address( const unsigned char *addr, const size_t len )
+{
+  std::string str;
+  char tmp[4];
+  for ( size_t i=0; i < len; i++ ) {
+    snprintf(tmp, sizeof(tmp), i ? ":%02x" : "%02x", addr[i]);
+    str += tmp;
+  }
+  return str;
+}
+
+bool NicStats::open_netlink()
+{
+  sock = socket(AF_NETLINK, SOCK_RAW | SOCK_CLOEXEC, NETLINK_ROUTE);
+  if ( sock < 0 ) {
+    DEBUG("NicStats: socket failed: " << strerror(errno));
+    return false;
+  }
+
+  struct timeval tv;
+  tv.tv_sec = RECV_TIMEOUT_SEC;
+  tv.tv_usec = 0;
+  setsockopt(sock, SOL_SOCKET, SO_RCVTIMEO, &tv, sizeof(tv));
+
+  struct sockaddr_nl addr;
+  memset(&addr, 0, sizeof(addr));
+  addr.nl_family = AF_NETLINK;
+  if ( bind(sock, (struct sockaddr *)&addr, sizeof(addr)) < 0 ) {
+    DEBUG("NicStats: bind failed: " << strerror(errno));
+    close(sock);
+    sock = -1;
+    return false;
+  }
+  return true;
+}
+
+bool NicStats::dump_links()
+{
+  struct {
+    struct nlmsghdr   hdr;
+    struct ifinfomsg  ifi;
+  } req;
+  memset(&req, 0, sizeof(req));
+  req.hdr.nlmsg_len = NLMSG_LENGTH(sizeof(struct ifinfomsg));
+  req.hdr.nlmsg_type = RTM_GETLINK;
+  req.hdr.nlmsg_flags = NLM_F_REQUEST | NLM_F_DUMP;
+  req.hdr.nlmsg_seq = ++seq;
+  req.ifi.ifi_family = AF_UNSPEC;
+  if ( send(sock, &req, req.hdr.nlmsg_len, 0) < 0 ) {
+    DEBUG("NicStats: send failed: " << strerror(errno));
+    return false;
+  }
+
+  while ( true ) {
+    // grow the buffer to the size of the next datagram
+    int len = recv(sock, &buf[0], buf.size(), MSG_PEEK | MSG_TRUNC);
+    if ( len < 0 && errno == EINTR ) continue;
+    if ( len < 0 ) {
+      DEBUG("NicStats: receive failed: " << strerror(errno));
+      return false;
+    }
+    if ( (size_t)len > buf.size() ) buf.resize(len);
+    len = recv(sock, &buf[0], buf.size(), 0);
+    if ( len < 0 ) return false;
+
+    for ( struct nlmsghdr *hdr = (struct nlmsghdr *)&buf[0]; NLMSG_OK(hdr, len); hdr = NLMSG_NEXT(hdr, len) ) {
+      if ( hdr->nlmsg_seq != seq ) continue;
+      if ( hdr->nlmsg_type == NLMSG_DONE ) return true;
+      if ( hdr->nlmsg_type == NLMSG_ERROR ) return false;
+      if ( hdr->nlmsg_type == RTM_NEWLINK ) parse_link(hdr);
+    }
+  }
+}
+
+void NicStats::parse_link( struct nlmsghdr *hdr )
+{
+  struct ifinfomsg *ifi = (struct ifinfomsg *)NLMSG_DATA(hdr);
+  int len = IFLA_PAYLOAD(hdr);
+
+  const char *name = NULL;
+  struct rtattr *stats64 = NULL;
+  struct rtattr *stats32 = NULL;
+  unsigned int mtu = 0;
+  uint32_t tx_queue_len = 0;
+  std::string mac_address;
+  std::string state(OPERSTATES[0]);
+  for ( struct rtattr *rta = IFLA_RTA(ifi); RTA_OK(rta, len); rta = RTA_NEXT(rta, len) ) {
+    switch ( rta->rta_type ) {
+    case IFLA_IFNAME:
+      // the name leads the attributes, skip the rest of a link not selected
+      name = (const char *)RTA_DATA(rta);
+      if ( !is_selected(name) ) return;
+      break;
+    case IFLA_MTU:
+      copy_payload(rta, mtu);
+      break;
+    case IFLA_TXQLEN:
+      copy_payload(rta, tx_queue_len);
+      break;
+    case IFLA_ADDRESS:
+      mac_address = format_address((const unsigned char *)RTA_DATA(rta), RTA_PAYLOAD(rta));
+      break;
+    case IFLA_OPERSTATE: {
+      unsigned char op = *(const unsigned char *)RTA_DATA(rta);
+      if ( op < sizeof(OPERSTATES)/sizeof(OPERSTATES[0]) ) state = OPERSTATES[op];
+      break;
+    }
+    case IFLA_STATS64:
+      stats64 = rta;
+      break;
+    case IFLA_STATS:
+      stats32 = rta;
+      break;
+    }
+  }
+  if ( name == NULL ) return;
+
+  Link &link = contents[name];
+  bool changed = link.seen == 0 || link.flags != ifi->ifi_flags || link.mtu != mtu || link.state != state;
+  link.index = ifi->ifi_index;
+  link.flags = ifi->ifi_flags;
+  link.mtu = mtu;
+  link.tx_queue_len = tx_queue_len;
+  link.mac_address = mac_address;
+  link.state = state;
+  if ( stats64 ) {
+    struct rtnl_link_stats64 stats;
+    copy_payload(stats64, stats);
+    copy_counters(stats, link);
+  } else if ( stats32 ) {
+    struct rtnl_link_stats stats;
+    copy_payload(stats32, stats);
+    copy_counters(stats, link);
+  }
+  if ( changed ) read_attributes(name, link, false);
+  link.seen = generation;
+}
+
+static const char *next_field( const char *p )
+{
+  while ( *p == ' ' ) p++;
+  return p;
+}
+
+static uint64_t read_counter( const char *&p )
+{
+  char *end;
+  uint64_t v = strtoull(next_field(p), &end, 10);
+  p = end;
+  return v;
+}
+
+bool NicStats::read_proc_net_dev()
+{
+  if ( fd < 0 ) {
+    fd = open(proc_net_dev.c_str(), O_RDONLY | O_CLOEXEC);
+    if ( fd < 0 ) {
+      DEBUG("NicStats: unable to open " << proc_net_dev);
+      return false;
+    }
+  }
+  if ( ctl < 0 ) {
+    ctl = socket(AF_INET, SOCK_DGRAM | SOCK_CLOEXEC, 0);
+  }
+
+  ssize_t n;
+  while ( true ) {
+    n = pread(fd, &buf[0], buf.size() - 1, 0);
+    if ( n < 0 && errno == EINTR ) continue;
+    if ( n < (ssize_t)buf.size() - 1 ) break;
+    buf.resize(buf.size() * 2);
+  }
+  if ( n <= 0 ) return false;
+  buf[n] = '\0';
+
+  //
+  // two header lines, then
+  //   name: rx bytes packets errs drop fifo frame compressed multicast tx bytes packets errs drop fifo colls carrier compressed
+  //
+  const char *line = &buf[0];
+  std::string name;
+  while ( *line ) {
+    const char *eol = strchr(line, '\n');
+    if ( eol == NULL ) eol = line + strlen(line);
+    const char *colon = (const char *)memchr(line, ':', eol - line);
+    if ( colon ) {
+      const char *p = next_field(line);
+      name.assign(p, colon);
+      p = colon + 1;
+      if ( !is_selected(name) ) {
+        line = *eol ? eol + 1 : eol;
+        continue;
+      }
+
+      Link &link = contents[name];
+      link.rx_bytes = read_counter(p);
+      link.rx_packets = read_counter(p);
+      link.rx_errors = read_counter(p);
+      link.rx_dropped = read_counter(p);
+      read_counter(p);
+      read_counter(p);
+      link.rx_compressed = read_counter(p);
+      read_counter(p);
+      link.tx_bytes = read_counter(p);
+      link.tx_packets = read_counter(p);
+      link.tx_errors = read_counter(p);
+      link.tx_dropped = read_counter(p);
+      read_counter(p);
+      read_counter(p);
+      read_counter(p);
+      link.tx_compressed = read_counter(p);
+
+      struct ifreq ifr;
+      memset(&ifr, 0, sizeof(ifr));
+      strncpy(ifr.ifr_name, name.c_str(), IFNAMSIZ-1);
+      unsigned int flags = link.flags;
+      unsigned int mtu = link.mtu;
+      if ( ctl > -1 && ioctl(ctl, SIOCGIFFLAGS, &ifr) == 0 ) flags = (unsigned short)ifr.ifr_flags;
+      if ( ctl > -1 && ioctl(ctl, SIOCGIFMTU, &ifr) == 0 ) mtu = ifr.ifr_mtu;
+      if ( link.seen == 0 || link.flags != flags || link.mtu != mtu ) {
+        link.flags = flags;
+        link.mtu = mtu;
+        if ( ctl > -1 && ioctl(ctl, SIOCGIFINDEX, &ifr) == 0 ) link.index = ifr.ifr_ifindex;
+        read_attributes(name, link, true);
+      }
+      link.seen = generation;
+    }
+    line = *eol ? eol + 1 : eol;
+  }
+  return true;
+}
+
+bool NicStats::read_attribute( const std::string &interface, const char *name, std::string &value )
+{
+  std::string path = sys_class_net + "/" + interface + "/" + name;
+  attribute_reads++;
+  int afd = open(path.c_str(), O_RDONLY | O_CLOEXEC);
+  if ( afd < 0 ) return false;
+  char tmp[256];
+  ssize_t n = read(afd, tmp, sizeof(tmp) - 1);
+  close(afd);
+  // speed can not be read while the link is down
+  if ( n <= 0 ) return false;
+  while ( n > 0 && (tmp[n-1] == '\n' || tmp[n-1] == ' ') ) n--;
+  value.assign(tmp, n);
+  return true;
+}
+
+void NicStats::read_attributes( const std::string &interface, Link &link, const bool all )
+{
+  std::string value;
+  link.speed = 0;
+  if ( read_attribute(interface, "speed", value) ) {
+    // virtual links report -1
+    long long speed = strtoll(value.c_str(), NULL, 10);
+    if ( speed > 0 ) link.speed = speed;
+  }
+  // only links backed by a (pci) device have a node
+  link.numa_node = -1;
+  if ( read_attribute(interface, "device/numa_node", value) ) link.numa_node = atoi(value.c_str());
+  if ( all ) {
+    if ( read_attribute(interface, "address", value) ) link.mac_address = value;
+    if ( read_attribute(interface, "tx_queue_len", value) ) link.tx_queue_len = strtoull(value.c_str(), NULL, 10);
+    if ( read_attribute(interface, "operstate", value) ) link.state = value;
+  }
+  link.changed = generation;
+}
+
+void NicStats::update_state()
+{
+  generation++;
+  attribute_reads = 0;
+
+  bool ok = false;
+  if ( source == NETLINK && generation >= retry_at ) {
+    if ( sock < 0 && !open_netlink() ) {
+      // no routing socket on this host
+      DEBUG("NicStats: rtnetlink unavailable, reading " << proc_net_dev);
+      source = PROC_NET_DEV;
+    } else if ( dump_links() ) {
+      ok = true;
+      dump_failures = 0;
+    } else {
+      //
+      // a timeout, ENOBUFS or an error reply, read /proc/net/dev for now and
+      // retry on a new socket (the old one may hold the rest of the dump)
+      //
+      close(sock);
+      sock = -1;
+      dump_failures++;
+      uint64_t interval = std::min(MAX_RETRY_INTERVAL, (uint64_t)1 << std::min(dump_failures - 1, 5u));
+      retry_at = generation + interval;
+      DEBUG("NicStats: rtnetlink dump failed (" << dump_failures << " in a row), retrying in " << interval << " updates");
+    }
+  }
+  if ( !ok ) {
+    ok = read_proc_net_dev();
+  }
+  if ( !ok ) {
+    contents.clear();
+    return;
+  }
+
+  for ( Contents::iterator it=contents.begin(); it != contents.end(); ) {
+    if ( it->second.seen != generation ) {
+      contents.erase(it++);
+    } else {
+      it++;
+    }
+  }
+}
@@ -0,0 +1,149 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef _NICSTATS_H_
+#define _NICSTATS_H_
+#include <stdint.h>
+#include <map>
+#include <set>
+#include <string>
+#include <vector>
+#include <boost/shared_ptr.hpp>
+#include "states/State.h"
+
+struct nlmsghdr;
+class NicStats;
+typedef boost::shared_ptr<NicStats>  NicStatsPtr;
+
+//
+// Counters and link attributes of every network interface on the host.
+//
+// The counters of all links are fetched with a single rtnetlink RTM_GETLINK
+// dump each update, the dump also carries the flags, mtu, queue length,
+// hardware address and operational state.  When the routing socket is not
+// available /proc/net/dev is read instead (kept open, one read per update)
+// and the attributes come from sysfs and SIOCGIFFLAGS/SIOCGIFMTU.  A failed
+// dump only falls back to /proc/net/dev until the dump is retried, after a
+// backoff that grows with the number of consecutive failures.
+//
+// The link speed and numa node are only exposed through sysfs, they are
+// reread when a link appears or its flags, state or mtu change.  In /proc/net/dev mode the
+// other sysfs attributes follow the same rule.
+//
+// The links can be restricted to a selection, the others are skipped
+// before their counters are decoded and their attributes are never read.
+//
+class NicStats : public State
+{
+
+ public:
+
+  enum Source {
+    NETLINK,
+    PROC_NET_DEV
+  };
+
+  struct Link {
+    Link() : index(0), flags(0), mtu(0), tx_queue_len(0), speed(0), numa_node(-1),
+             rx_bytes(0), rx_packets(0), rx_errors(0), rx_dropped(0), rx_compressed(0), rx_crc_errors(0),
+             tx_bytes(0), tx_packets(0), tx_errors(0), tx_dropped(0), tx_compressed(0),
+             seen(0), changed(0) {};
+    int               index;
+    unsigned int      flags;          // IFF_*
+    unsigned int      mtu;
+    uint64_t          tx_queue_len;
+    uint64_t          speed;          // Mbit/s, 0 when unknown
+    int               numa_node;      // node of the device, -1 when unknown
+    std::string       mac_address;
+    std::string       state;          // operstate
+    uint64_t          rx_bytes;
+    uint64_t          rx_packets;
+    uint64_t          rx_errors;
+    uint64_t          rx_dropped;
+    uint64_t          rx_compressed;
+    uint64_t          rx_crc_errors;  // not reported by /proc/net/dev
+    uint64_t          tx_bytes;
+    uint64_t          tx_packets;
+    uint64_t          tx_errors;
+    uint64_t          tx_dropped;
+    uint64_t          tx_compressed;
+    uint64_t          seen;           // last update the link was listed
+    uint64_t          changed;        // last update the attributes were reread
+  };
+
+  typedef std::map< std::string, Link >  Contents;
+  typedef std::set< std::string >        InterfaceSet;
+
+  NicStats( const bool use_netlink=true,
+            const std::string &proc_net_dev="/proc/net/dev",
+            const std::string &sys_class_net="/sys/class/net" );
+
+  virtual ~NicStats();
+
+  void              update_state();
+
+  // only keep the links of these interfaces
+  void              select( const InterfaceSet &interfaces );
+
+  // keep every link (the default)
+  void              select_all();
+
+  const Contents    &get() const;
+
+  // link of an interface, NULL if it is not listed
+  const Link        *find( const std::string &interface ) const;
+
+  // NETLINK unless the routing socket could not be opened
+  Source            get_source() const;
+
+  // number of sysfs files read during the last update
+  size_t            get_attribute_reads() const;
+
+ private:
+
+  NicStats( const NicStats & );
+  NicStats &operator=( const NicStats & );
+
+  bool              open_netlink();
+  bool              dump_links();
+  void              parse_link( struct nlmsghdr *hdr );
+  bool              read_proc_net_dev();
+  void              read_attributes( const std::string &interface, Link &link, const bool all );
+  bool              read_attribute( const std::string &interface, const char *name, std::string &value );
+  bool              is_selected( const std::string &interface ) const;
+
+  std::string       proc_net_dev;
+  std::string       sys_class_net;
+  Source            source;
+  int               sock;           // NETLINK_ROUTE socket
+  uint32_t          seq;
+  int               fd;             // /proc/net/dev
+  int               ctl;            // socket for the interface ioctls
+  std::vector<char> buf;
+  uint64_t          generation;
+  size_t            attribute_reads;
+  bool              selected_only;
+  InterfaceSet      selected;
+  Contents          contents;
+  unsigned int      dump_failures;  // consecutive failed netlink dumps
+  uint64_t          retry_at;       // update at which the dump is retried
+
+};
+
+#endif
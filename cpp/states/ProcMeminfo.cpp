@@ -17,10 +17,39 @@
  * You should have received a copy of the GNU Lesser General Public License
  * along with this program.  If not, see http://www.gnu.org/licenses/.
  */
+#include <stdexcept>
+#include <algorithm>
 #include "ProcMeminfo.h"
 #include "parsers/ProcMeminfoParser.h"
 
-ProcMeminfo::ProcMeminfo()
+static const char *field_names[ProcMeminfo::NFIELDS] = {
+  "MemTotal",
+  "MemFree",
+  "MemAvailable",
+  "Buffers",
+  "Cached",
+  "SwapCached",
+  "Active",
+  "Inactive",
+  "Dirty",
+  "Writeback",
+  "AnonPages",
+  "Mapped",
+  "Shmem",
+  "Slab",
+  "SwapTotal",
+  "SwapFree",
+  "CommitLimit",
+  "Committed_AS",
+  "HugePages_Total",
+  "HugePages_Free",
+  "HugePages_Rsvd",
+  "HugePages_Surp",
+  "Hugepagesize"
+};
+
+ProcMeminfo::ProcMeminfo() :
+  key_list(field_names, field_names + NFIELDS)
 {
 }
 
@@ -30,14 +59,40 @@ ProcMeminfo::~ProcMeminfo()
 
 void ProcMeminfo::update_state()
 {
-  ProcMeminfoParser parser;
-  Contents tmp;
-  parser.parse( tmp );
-  contents = tmp;
+  if ( !parser ) parser.reset( new ProcMeminfoParser() );
+  parser->parse( key_list, contents );
+}
+
+int ProcMeminfo::track( const std::string &key )
+{
+  KeyList::iterator it = std::find(key_list.begin(), key_list.end(), key);
+  if ( it != key_list.end() ) return it - key_list.begin();
+  key_list.push_back(key);
+  return key_list.size() - 1;
+}
+
+const ProcMeminfo::KeyList &ProcMeminfo::keys() const
+{
+  return key_list;
+}
+
+ProcMeminfo::Counter ProcMeminfo::get( const int slot ) const
+{
+  if ( !has(slot) ) return 0;
+  return contents.values[slot];
+}
+
+bool ProcMeminfo::has( const int slot ) const
+{
+  return slot >= 0 && (size_t)slot < contents.found.size() && contents.found[slot];
 }
 
 const ProcMeminfo::Counter ProcMeminfo::getMetric( const std::string &metric ) const {
-  return contents.at(metric);
+  KeyList::const_iterator it = std::find(key_list.begin(), key_list.end(), metric);
+  if ( it == key_list.end() ) throw std::out_of_range("meminfo key not tracked: " + metric);
+  int slot = it - key_list.begin();
+  if ( !has(slot) ) throw std::out_of_range("meminfo key not available: " + metric);
+  return contents.values[slot];
 }
 
 
@@ -46,6 +101,3 @@ ProcMeminfo::get() const
 { 
   return contents;
 }
-
-
-
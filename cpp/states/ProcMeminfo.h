@@ -22,20 +22,59 @@
 #include <stdint.h>
 #include <ctime>
 #include <string>
-#include <map>
+#include <vector>
 #include <boost/shared_ptr.hpp>
 #include "states/State.h"
 
 class ProcMeminfo;
+class ProcMeminfoParser;
 typedef  boost::shared_ptr< ProcMeminfo>  ProcMeminfoPtr;
 
 
+//
+// Contents of /proc/meminfo.  The commonly used keys have fixed slots
+// (Field), other keys can be requested with track() and are then parsed
+// into their own slot on every update.  Values are in bytes, except for
+// the HugePages_* counts.
+//
 class ProcMeminfo : public State
 {
 
  public:
   typedef  uint64_t                           Counter;
-  typedef std::map< std::string, Counter >    Contents;
+  typedef std::vector< std::string >          KeyList;
+
+  enum Field {
+    MEM_TOTAL = 0,
+    MEM_FREE,
+    MEM_AVAILABLE,
+    BUFFERS,
+    CACHED,
+    SWAP_CACHED,
+    ACTIVE,
+    INACTIVE,
+    DIRTY,
+    WRITEBACK,
+    ANON_PAGES,
+    MAPPED,
+    SHMEM,
+    SLAB,
+    SWAP_TOTAL,
+    SWAP_FREE,
+    COMMIT_LIMIT,
+    COMMITTED_AS,
+    HUGEPAGES_TOTAL,
+    HUGEPAGES_FREE,
+    HUGEPAGES_RSVD,
+    HUGEPAGES_SURP,
+    HUGEPAGESIZE,
+    NFIELDS
+  };
+
+  struct Contents {
+    std::vector< Counter >   values;    // indexed by Field or tracked slot
+    std::vector< char >      found;     // key was present during the last parse
+  };
 
   // init file and read in baseline stats
   ProcMeminfo();
@@ -45,8 +84,26 @@ class ProcMeminfo : public State
   // update content state by processing /proc/meminfo
   void              update_state();
 
+  //
+  // parse an additional key on every update, returns its slot
+  //
+  int               track( const std::string &key );
+
+  // keys by slot
+  const KeyList    &keys() const;
+
   // return contents of file
   const Contents   &get() const;
+
+  // value of a slot, 0 if the key is not reported by this kernel
+  Counter           get( const int slot ) const;
+
+  bool              has( const int slot ) const;
+
+  //
+  // value by key name, throws std::out_of_range if the key is not tracked or
+  // was not reported by the last update
+  //
   const Counter     getMetric( const std::string  &metric_name ) const ;
     
  protected:
@@ -55,6 +112,8 @@ class ProcMeminfo : public State
 
  private:
 
+    KeyList                               key_list;
+    boost::shared_ptr<ProcMeminfoParser>  parser;
 };
 
 
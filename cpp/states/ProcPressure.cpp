@@ -0,0 +1,142 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include <stdio.h>
+#include <string.h>
+#include <errno.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <iostream>
+#include "ProcPressure.h"
+
+#ifdef DEBUG_ON
+#define DEBUG(x)         std::cout << x << std::endl
+#else
+#define DEBUG(x)
+#endif
+
+static const char *resource_names[ProcPressure::NRESOURCES] = { "cpu", "memory", "io" };
+
+
+ProcPressure::ProcPressure( const std::string &_dir ) :
+  dir(_dir)
+{
+  for ( int i=0; i < NRESOURCES; i++ ) {
+    fds[i] = -1;
+    disabled[i] = false;
+    have_total[i] = false;
+  }
+}
+
+ProcPressure::~ProcPressure()
+{
+  for ( int i=0; i < NRESOURCES; i++ ) {
+    if ( fds[i] > -1 ) close(fds[i]);
+  }
+}
+
+const char *ProcPressure::GetName( const Resource resource )
+{
+  return resource_names[resource];
+}
+
+const ProcPressure::Contents &ProcPressure::get() const
+{
+  return contents;
+}
+
+const ProcPressure::Pressure &ProcPressure::get( const Resource resource ) const
+{
+  return contents.resources[resource];
+}
+
+bool ProcPressure::is_available( const Resource resource ) const
+{
+  return contents.resources[resource].available;
+}
+
+static bool parse_stall( const char *line, const char *tag, ProcPressure::Stall &stall, uint64_t &total )
+{
+  // some avg10=0.00 avg60=0.00 avg300=0.00 total=0
+  unsigned long long t;
+  char fmt[64];
+  snprintf(fmt, sizeof(fmt), "%s avg10=%%f avg60=%%f avg300=%%f total=%%llu", tag);
+  if ( sscanf(line, fmt, &stall.avg10, &stall.avg60, &stall.avg300, &t) != 4 ) return false;
+  total = t;
+  return true;
+}
+
+int ProcPressure::read_resource( const int idx )
+{
+  if ( fds[idx] < 0 ) {
+    std::string fname = dir + "/" + resource_names[idx];
+    fds[idx] = open(fname.c_str(), O_RDONLY | O_CLOEXEC);
+    if ( fds[idx] < 0 ) {
+      DEBUG("ProcPressure: " << fname << " unavailable");
+      return -1;
+    }
+  }
+
+  char buf[256];
+  ssize_t n = pread(fds[idx], buf, sizeof(buf) - 1, 0);
+  if ( n < 0 && errno == EOPNOTSUPP ) return -1;
+  if ( n <= 0 ) return 0;
+  buf[n] = '\0';
+
+  Pressure &p = contents.resources[idx];
+  Stall some, full;
+  uint64_t some_total = 0, full_total = 0;
+  if ( !parse_stall(buf, "some", some, some_total) ) return 0;
+
+  // the system wide cpu "full" line was added in 5.13
+  const char *line = strchr(buf, '\n');
+  if ( line ) parse_stall(line + 1, "full", full, full_total);
+
+  if ( have_total[idx] ) {
+    some.delta = some_total >= p.some.total ? some_total - p.some.total : 0;
+    full.delta = full_total >= p.full.total ? full_total - p.full.total : 0;
+  }
+  some.total = some_total;
+  full.total = full_total;
+  p.some = some;
+  p.full = full;
+  p.available = true;
+  have_total[idx] = true;
+  return 1;
+}
+
+void ProcPressure::update_state()
+{
+  for ( int i=0; i < NRESOURCES; i++ ) {
+    if ( disabled[i] ) continue;
+    int ret = read_resource(i);
+    if ( ret < 0 ) {
+      // no PSI support, stop probing
+      disabled[i] = true;
+      if ( fds[i] > -1 ) {
+        close(fds[i]);
+        fds[i] = -1;
+      }
+    }
+    if ( ret <= 0 ) {
+      contents.resources[i] = Pressure();
+      have_total[i] = false;
+    }
+  }
+}
@@ -0,0 +1,102 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef _PROCPRESSURE_H_
+#define _PROCPRESSURE_H_
+#include <stdint.h>
+#include <string>
+#include <boost/shared_ptr.hpp>
+#include "states/State.h"
+
+class ProcPressure;
+typedef  boost::shared_ptr<ProcPressure>  ProcPressurePtr;
+
+//
+// Pressure stall information from /proc/pressure/{cpu,memory,io}.
+//
+// "some" is the share of time at least one runnable task was stalled on the
+// resource, "full" the share of time all non-idle tasks were stalled at
+// once.  The files are kept open and reread every update.  A resource is
+// reported as unavailable when the kernel has no PSI support (the files are
+// missing, or reads fail when booted with psi=0); it is not probed again.
+//
+class ProcPressure : public State
+{
+
+ public:
+
+  enum Resource {
+    CPU = 0,
+    MEMORY,
+    IO,
+    NRESOURCES
+  };
+
+  struct Stall {
+    Stall() : avg10(0.0), avg60(0.0), avg300(0.0), total(0), delta(0) {};
+    float     avg10;        // %
+    float     avg60;
+    float     avg300;
+    uint64_t  total;        // usec stalled since boot
+    uint64_t  delta;        // usec stalled since the previous update
+  };
+
+  struct Pressure {
+    Pressure() : available(false) {};
+    bool      available;
+    Stall     some;
+    Stall     full;
+  };
+
+  struct Contents {
+    Pressure  resources[NRESOURCES];
+  };
+
+  ProcPressure( const std::string &dir="/proc/pressure" );
+
+  virtual ~ProcPressure();
+
+  void              update_state();
+
+  const Contents    &get() const;
+
+  const Pressure    &get( const Resource resource ) const;
+
+  bool              is_available( const Resource resource ) const;
+
+  // file name of a resource under /proc/pressure
+  static const char *GetName( const Resource resource );
+
+ private:
+
+  ProcPressure( const ProcPressure & );
+  ProcPressure &operator=( const ProcPressure & );
+
+  // 1 on success, 0 if the read failed, -1 if the kernel has no PSI support
+  int               read_resource( const int idx );
+
+  std::string       dir;
+  int               fds[NRESOURCES];
+  bool              disabled[NRESOURCES];
+  bool              have_total[NRESOURCES];
+  Contents          contents;
+
+};
+
+#endif
@@ -21,7 +21,8 @@
 #include "ProcStat.h"
 #include "parsers/ProcStatParser.h"
 
-ProcStat::ProcStat()
+ProcStat::ProcStat( const int _sections ) :
+  sections(_sections)
 {
 }
 
@@ -31,10 +32,11 @@ ProcStat::~ProcStat()
 
 void ProcStat::update_state()
 {
-  ProcStatParser stat_parser;
-  Contents tmp;
-  stat_parser.parse( tmp );
-  contents = tmp;
+  //
+  // the parser keeps /proc/stat open and decodes into the existing contents
+  //
+  if ( !parser ) parser.reset( new ProcStatParser() );
+  parser->parse( contents, sections );
 }
 
 
@@ -45,6 +47,16 @@ ProcStat::get() const
 }
 
 
+int ProcStat::get_ticks( int64_t &r_sys, int64_t &r_user ) const
+{
+  const CpuJiffies &j = contents.all.jiffies;
+  if ( j.size() <= CPU_JIFFIES_IDLE ) return -1;
+  r_sys = j[CPU_JIFFIES_USER] + j[CPU_JIFFIES_NICE] + j[CPU_JIFFIES_SYSTEM] + j[CPU_JIFFIES_IDLE];
+  r_user = j[CPU_JIFFIES_USER] + j[CPU_JIFFIES_NICE] + j[CPU_JIFFIES_SYSTEM];
+  return 0;
+}
+
+
 static void __readone(FILE *input, int64_t *x) { fscanf(input, "%lld ",(long long *) x); }
 static void __readstr(FILE *input, char *x) {  fscanf(input, "%s ", x);}
 
@@ -27,6 +27,7 @@
 #include "states/State.h"
 
 class ProcStat;
+class ProcStatParser;
 typedef  boost::shared_ptr<ProcStat>  ProcStatPtr;
 
 
@@ -55,7 +56,22 @@ class ProcStat : public State
         CPU_JIFFIES_MAX
     };
 
+    //
+    // sections of /proc/stat to decode
+    //
+    enum Section
+    {
+        CPU     = 1 << 0,       // cpu and cpuN lines
+        CTXT    = 1 << 1,
+        BTIME   = 1 << 2,
+        PROCS   = 1 << 3,       // processes, procs_running, procs_blocked
+        INTR    = 1 << 4,
+        SOFTIRQ = 1 << 5,
+        ALL     = CPU | CTXT | BTIME | PROCS | INTR | SOFTIRQ
+    };
+
     struct CpuStat {
+      CpuStat() : idx(-1) {};
       std::string  id;
       int          idx;             // -1 == all
       CpuJiffies   jiffies;
@@ -66,8 +82,16 @@ class ProcStat : public State
     typedef std::vector< CpuStat >   CpuStats;
 
     struct Contents {
+      Contents() : cpu_rows(0), context_switches(0), boot_time(0), processes_started(0), processes_running(0), processes_blocked(0), time_stamp(0) {};
       CpuStat          all;
       CpuStats         cpus;
+      //
+      // jiffies of the cpuN lines as a contiguous cpu_rows x CPU_JIFFIES_MAX
+      // row major matrix, the row is the cpu idx.  Rows of offline cpus and
+      // fields not reported by the kernel are 0.
+      //
+      CpuJiffies       cpu_matrix;
+      uint32_t         cpu_rows;
       CounterList      interrupts;
       Counter          context_switches;
       Counter          boot_time;
@@ -80,9 +104,12 @@ class ProcStat : public State
     };
 
     static int GetTicks( int64_t &sys, int64_t &user );
+
+    // GetTicks computed from the last update
+    int               get_ticks( int64_t &sys, int64_t &user ) const;
     
     // init file and read in baseline stats
-    ProcStat();
+    ProcStat( const int sections=ALL );
 
     virtual ~ProcStat();
 
@@ -100,6 +127,9 @@ class ProcStat : public State
 
  private:
 
+    int                               sections;
+    boost::shared_ptr<ProcStatParser> parser;
+
 };
 
 
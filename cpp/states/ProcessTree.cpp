@@ -0,0 +1,332 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include <stdlib.h>
+#include <dirent.h>
+#include <iostream>
+#include <boost/foreach.hpp>
+#include "ProcessTree.h"
+
+#ifdef DEBUG_ON
+#define DEBUG(x)         std::cout << x << std::endl
+#else
+#define DEBUG(x)
+#endif
+
+// stat fields used by the index
+static const int STAT_FIELDS = PidProcStatParser::PPID | PidProcStatParser::PGRP | PidProcStatParser::TICKS |
+                               PidProcStatParser::NUM_THREADS | PidProcStatParser::STARTTIME | PidProcStatParser::RSS;
+
+
+ProcessTree::ProcessTree( const std::string &dir ) :
+  proc_dir(dir),
+  roots_changed(false),
+  generation(0),
+  parsed_count(0),
+  synced(false)
+{
+}
+
+ProcessTree::~ProcessTree()
+{
+}
+
+const ProcessTree::Contents &ProcessTree::get() const
+{
+  return contents;
+}
+
+const ProcessTree::ProcessIndex &ProcessTree::get_index() const
+{
+  return index;
+}
+
+size_t ProcessTree::get_parsed_count() const
+{
+  return parsed_count;
+}
+
+bool ProcessTree::enable_events()
+{
+  if ( !connector ) {
+    connector.reset( new ProcConnector() );
+  }
+  if ( !connector->open() ) {
+    connector.reset();
+    return false;
+  }
+  // the index is rebuilt from /proc once the subscription is active
+  synced = false;
+  return true;
+}
+
+bool ProcessTree::events_enabled() const
+{
+  return connector && connector->is_open();
+}
+
+void ProcessTree::set_roots( const std::vector<int> &new_roots )
+{
+  PidSet tmp(new_roots.begin(), new_roots.end());
+  if ( tmp != roots ) {
+    roots.swap(tmp);
+    roots_changed = true;
+  }
+}
+
+bool ProcessTree::parse_stat( const int pid, Process &proc )
+{
+  //
+  // attributed processes are sampled every update, keep their stat file
+  // open; other processes are read once when they are discovered
+  //
+  PidProcStatParser::Contents data;
+  int ret;
+  if ( owned.find(pid) != owned.end() ) {
+    PidProcStatParserPtr &reader = readers[pid];
+    if ( !reader ) reader.reset( new PidProcStatParser(pid, STAT_FIELDS, proc_dir) );
+    ret = reader->parse(data);
+    if ( ret < 0 ) readers.erase(pid);
+  } else {
+    PidProcStatParser reader(pid, STAT_FIELDS, proc_dir);
+    ret = reader.parse(data);
+  }
+  parsed_count++;
+  if ( ret < 0 ) return false;
+
+  proc.pid = pid;
+  proc.ppid = data.ppid;
+  proc.pgrp = data.pgrp;
+  proc.starttime = data.starttime;
+  proc.rss = data.rss;
+  proc.num_threads = data.num_threads;
+  proc.ticks = data.utime + data.stime + data.cutime + data.cstime;
+  proc.refreshed = generation;
+  return true;
+}
+
+int ProcessTree::resolve_owner( Process &proc )
+{
+  //
+  // walk up the parent chain until we reach a process whose owner is known,
+  // a watched root, or the top of the tree, then label the whole chain
+  //
+  std::vector<Process *> chain;
+  Process *cur = &proc;
+  int owner = 0;
+  while ( true ) {
+    if ( cur->owner != -1 ) {
+      owner = cur->owner;
+      break;
+    }
+    chain.push_back(cur);
+    if ( roots.find(cur->pid) != roots.end() ) {
+      owner = cur->pid;
+      break;
+    }
+    if ( roots.find(cur->pgrp) != roots.end() ) {
+      owner = cur->pgrp;
+      break;
+    }
+    if ( cur->ppid <= 1 || cur->ppid == cur->pid || chain.size() > index.size() ) break;
+    ProcessIndex::iterator parent = index.find(cur->ppid);
+    if ( parent == index.end() ) break;
+    cur = &parent->second;
+  }
+  BOOST_FOREACH(Process *p, chain) {
+    p->owner = owner;
+    if ( owner > 0 ) owned.insert(p->pid);
+  }
+  return owner;
+}
+
+void ProcessTree::scan_proc()
+{
+  DIR *dirp = opendir(proc_dir.c_str());
+  if ( dirp == NULL ) {
+    DEBUG("ProcessTree: unable to open " << proc_dir);
+    return;
+  }
+
+  struct dirent *entry;
+  while ( (entry = readdir(dirp)) != NULL ) {
+    const char *name = entry->d_name;
+    if ( name[0] < '0' || name[0] > '9' ) continue;
+    int pid = atoi(name);
+
+    ProcessIndex::iterator it = index.find(pid);
+    if ( it == index.end() ) {
+      Process proc;
+      if ( !parse_stat(pid, proc) ) continue;   // process went away
+      proc.ino = entry->d_ino;
+      proc.generation = generation;
+      index.insert(std::make_pair(pid, proc));
+      pending.push_back(pid);
+      continue;
+    }
+
+    Process &proc = it->second;
+    if ( proc.ino != entry->d_ino || proc.owner > 0 ) {
+      Process tmp;
+      if ( !parse_stat(pid, tmp) ) continue;
+      tmp.ino = entry->d_ino;
+      if ( tmp.starttime == proc.starttime ) {
+        tmp.owner = proc.owner;
+      } else {
+        owned.erase(pid);
+      }
+      tmp.generation = generation;
+      proc = tmp;
+    } else {
+      proc.generation = generation;
+    }
+    if ( proc.owner == -1 ) pending.push_back(pid);
+  }
+  closedir(dirp);
+
+  //
+  // single sweep to drop the processes that are gone
+  //
+  for ( ProcessIndex::iterator it=index.begin(); it != index.end(); ) {
+    if ( it->second.generation != generation ) {
+      owned.erase(it->first);
+      it = index.erase(it);
+    } else {
+      it++;
+    }
+  }
+}
+
+bool ProcessTree::apply_events()
+{
+  events.clear();
+  if ( !connector->poll(events) ) {
+    return false;
+  }
+
+  BOOST_FOREACH(const ProcConnector::Event &ev, events) {
+    switch ( ev.type ) {
+    case ProcConnector::FORK: {
+      //
+      // a child inherits the process group of its parent, its stat file is
+      // only read if it ends up attributed to a watched root.  Attribution
+      // is done right away since the parent may exit later in this batch.
+      //
+      Process proc;
+      proc.pid = ev.pid;
+      proc.ppid = ev.ppid;
+      ProcessIndex::iterator parent = index.find(ev.ppid);
+      if ( parent != index.end() ) proc.pgrp = parent->second.pgrp;
+      proc.generation = generation;
+      owned.erase(ev.pid);
+      Process &child = index[ev.pid];
+      child = proc;
+      resolve_owner(child);
+      break;
+    }
+    case ProcConnector::EXIT:
+      owned.erase(ev.pid);
+      index.erase(ev.pid);
+      break;
+    case ProcConnector::EXEC:
+      break;
+    }
+  }
+  return true;
+}
+
+void ProcessTree::update_state()
+{
+  generation++;
+  parsed_count = 0;
+  pending.clear();
+
+  //
+  // a new root can claim processes that were previously unowned, and a
+  // removed root releases its processes
+  //
+  if ( roots_changed ) {
+    for ( ProcessIndex::iterator it=index.begin(); it != index.end(); it++ ) {
+      int owner = it->second.owner;
+      if ( owner == 0 || ( owner > 0 && roots.find(owner) == roots.end() ) ) {
+        it->second.owner = -1;
+        owned.erase(it->first);
+        pending.push_back(it->first);
+      }
+    }
+    roots_changed = false;
+  }
+
+  if ( synced && events_enabled() && apply_events() ) {
+    DEBUG("ProcessTree: applied " << events.size() << " process events");
+  } else {
+    scan_proc();
+    synced = events_enabled();
+  }
+
+  BOOST_FOREACH(const int pid, pending) {
+    ProcessIndex::iterator it = index.find(pid);
+    if ( it == index.end() || it->second.owner != -1 ) continue;
+    resolve_owner(it->second);
+  }
+
+  //
+  // refresh the usage of the attributed processes that were not parsed
+  // during this update
+  //
+  contents.clear();
+  for ( PidSet::iterator it=owned.begin(); it != owned.end(); ) {
+    ProcessIndex::iterator entry = index.find(*it);
+    if ( entry == index.end() ) {
+      it = owned.erase(it);
+      continue;
+    }
+    Process *proc = &entry->second;
+    if ( proc->refreshed != generation ) {
+      Process tmp;
+      if ( !parse_stat(proc->pid, tmp) ) {
+        // exited, the exit event or the next scan removes it from the index
+        it = owned.erase(it);
+        continue;
+      }
+      if ( proc->starttime == 0 || tmp.starttime == proc->starttime ) {
+        tmp.ino = proc->ino;
+        tmp.owner = proc->owner;
+        tmp.generation = proc->generation;
+        *proc = tmp;
+      }
+    }
+    Group &grp = contents[proc->owner];
+    grp.num_processes++;
+    grp.rss += proc->rss;
+    grp.num_threads += proc->num_threads;
+    grp.ticks += proc->ticks;
+    grp.pids.push_back(proc->pid);
+    it++;
+  }
+
+  // close the stat files of processes that are no longer attributed
+  for ( ReaderMap::iterator it=readers.begin(); it != readers.end(); ) {
+    if ( owned.find(it->first) == owned.end() ) {
+      it = readers.erase(it);
+    } else {
+      it++;
+    }
+  }
+}
@@ -0,0 +1,138 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef _PROCESSTREE_H_
+#define _PROCESSTREE_H_
+#include <stdint.h>
+#include <sys/types.h>
+#include <map>
+#include <string>
+#include <vector>
+#include <boost/shared_ptr.hpp>
+#include <boost/unordered_map.hpp>
+#include <boost/unordered_set.hpp>
+#include "states/State.h"
+#include "utils/ProcConnector.h"
+#include "parsers/PidProcStatParser.h"
+
+class ProcessTree;
+typedef boost::shared_ptr<ProcessTree>  ProcessTreePtr;
+
+//
+// Persistent index of the processes listed under /proc.
+//
+// Each call to update_state performs a single pass over the /proc directory
+// and reconciles it against the index.  A pid's stat file is only parsed when
+// the pid is new, when its /proc entry changed (pid reuse) or when the
+// process belongs to one of the watched roots (its usage must be refreshed).
+// Processes are attributed to a root by pid, by process group, or by walking
+// the parent chain, and keep that attribution when they are reparented or
+// leave the root's process group.
+//
+// When process events are enabled, the index is maintained from the fork and
+// exit notifications of the netlink proc connector and /proc is only walked
+// again if events were lost.  The cost of an update then depends on the
+// number of events and watched processes instead of the size of the host's
+// process table.
+//
+class ProcessTree : public State
+{
+
+ public:
+
+  struct Process {
+    Process() : pid(0), ppid(0), pgrp(0), starttime(0), ino(0), rss(0), num_threads(0), ticks(0), owner(-1), generation(0), refreshed(0) {};
+    int              pid;
+    int              ppid;
+    int              pgrp;
+    uint64_t         starttime;     // identifies the process together with its pid
+    ino_t            ino;           // inode of the /proc/<pid> entry, used as a change hint
+    int64_t          rss;           // pages
+    int64_t          num_threads;
+    int64_t          ticks;         // utime + stime + cutime + cstime
+    int              owner;         // watched root, 0 none, -1 unresolved
+    uint64_t         generation;    // last update the process was seen
+    uint64_t         refreshed;     // last update the stat file was parsed
+  };
+
+  struct Group {
+    Group() : num_processes(0), rss(0), num_threads(0), ticks(0) {};
+    int              num_processes;
+    int64_t          rss;           // pages
+    int64_t          num_threads;
+    int64_t          ticks;
+    std::vector<int> pids;
+  };
+
+  typedef boost::unordered_map<int, Process>  ProcessIndex;
+  typedef boost::unordered_set<int>           PidSet;
+  typedef std::map<int, Group>                Contents;
+  typedef boost::unordered_map<int, PidProcStatParserPtr>  ReaderMap;
+
+  ProcessTree( const std::string &proc_dir="/proc" );
+
+  virtual ~ProcessTree();
+
+  //
+  // Replace the set of watched roots (component pids)
+  //
+  void              set_roots( const std::vector<int> &roots );
+
+  //
+  // Subscribe to process events, returns false (and keeps polling /proc)
+  // when the proc connector is unavailable
+  //
+  bool              enable_events();
+
+  bool              events_enabled() const;
+
+  void              update_state();
+
+  // aggregated usage for each watched root that has live processes
+  const Contents    &get() const;
+
+  const ProcessIndex &get_index() const;
+
+  // number of stat files parsed during the last update
+  size_t            get_parsed_count() const;
+
+ private:
+
+  bool              parse_stat( const int pid, Process &proc );
+  int               resolve_owner( Process &proc );
+  void              scan_proc();
+  bool              apply_events();
+
+  std::string       proc_dir;
+  ProcessIndex      index;
+  PidSet            roots;
+  PidSet            owned;
+  ReaderMap         readers;
+  bool              roots_changed;
+  uint64_t          generation;
+  size_t            parsed_count;
+  Contents          contents;
+  std::vector<int>  pending;
+  ProcConnectorPtr  connector;
+  ProcConnector::EventList events;
+  bool              synced;
+
+};
+
+#endif
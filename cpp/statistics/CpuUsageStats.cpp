@@ -17,7 +17,8 @@
  * You should have received a copy of the GNU Lesser General Public License
  * along with this program.  If not, see http://www.gnu.org/licenses/.
  */
-#include <numeric>
+#include <time.h>
+#include <algorithm>
 #include <iostream>
 #include "CpuUsageStats.h"
 
@@ -30,30 +31,59 @@
 
 
 
+// fields of the rolling windows
+enum { WINDOW_TOTAL=0, WINDOW_USER, WINDOW_SYSTEM, WINDOW_IDLE, WINDOW_FIELDS };
+
+static const double DEFAULT_WINDOW = 5.0;
+
+
+
 ////////////////////////////////////////////////////////////////////////////////
 //
 //          CpuUsageStats
 //
 ////////////////////////////////////////////////////////////////////////////////
 
-CpuUsageStats::CpuUsageStats( const int nhistory ):
-  proc_stat_(),
+CpuUsageStats::CpuUsageStats( ):
+  proc_stat_(new ProcStat(ProcStat::CPU)),
+  shared_(false),
   cpus_(0),
   metrics_(ProcStat::CPU_JIFFIES_MAX, 0.0 ),
-  average_(ProcStat::CPU_JIFFIES_MAX , 0.0 ),
-  history_db_(nhistory)
+  windows_(WINDOW_FIELDS),
+  cpus_all_itv(0),
+  cpus_user_itv(0)
+{
+  set_windows( WindowList() );
+  _update_stats();
+  _start_interval();
+}
+
+CpuUsageStats::CpuUsageStats(const CpuList &cpus ):
+  proc_stat_(new ProcStat(ProcStat::CPU)),
+  shared_(false),
+  cpus_(cpus),
+  metrics_(ProcStat::CPU_JIFFIES_MAX , 0.0 ),
+  windows_(WINDOW_FIELDS),
+  cpus_all_itv(0),
+  cpus_user_itv(0)
 {
+  set_windows( WindowList() );
   _update_stats();
+  _start_interval();
 }
 
-CpuUsageStats::CpuUsageStats(const CpuList &cpus, const int nhistory  ):
-  proc_stat_(),
+CpuUsageStats::CpuUsageStats(const ProcStatPtr &proc_stat, const CpuList &cpus ):
+  proc_stat_(proc_stat),
+  shared_(true),
   cpus_(cpus),
   metrics_(ProcStat::CPU_JIFFIES_MAX , 0.0 ),
-  average_(ProcStat::CPU_JIFFIES_MAX , 0.0 ),
-  history_db_(nhistory)
+  windows_(WINDOW_FIELDS),
+  cpus_all_itv(0),
+  cpus_user_itv(0)
 {
+  set_windows( WindowList() );
   _update_stats();
+  _start_interval();
 }
 
 double CpuUsageStats::get_user_percent() const
@@ -74,223 +104,206 @@ double CpuUsageStats::get_idle_percent() const
 
 double CpuUsageStats::get_user_average() const
 {
-  return average_[ ProcStat::CPU_JIFFIES_USER ];
+  return _window_percent( 0, WINDOW_USER );
 }
 
 double CpuUsageStats::get_system_average() const
 {
-  return average_[ ProcStat::CPU_JIFFIES_SYSTEM ];
+  return _window_percent( 0, WINDOW_SYSTEM );
 }
 
 double CpuUsageStats::get_idle_average() const
 {
-  return average_[ ProcStat::CPU_JIFFIES_IDLE ];
+  return _window_percent( 0, WINDOW_IDLE );
 }
 
-uint64_t CpuUsageStats::get_all_usage() const
+void CpuUsageStats::set_windows( const WindowList &seconds )
 {
-  return cpus_all_itv;
+  if ( seconds.empty() ) {
+    windows_.set_windows( WindowList(1, DEFAULT_WINDOW) );
+  }
+  else {
+    windows_.set_windows( seconds );
+  }
 }
 
-uint64_t CpuUsageStats::get_user_usage() const
+size_t CpuUsageStats::get_nwindows() const
 {
-  return cpus_user_itv;
-  return 0;
+  return windows_.get_nwindows();
 }
 
-
-
-void CpuUsageStats::compute_statistics()
+double CpuUsageStats::get_window_length( const size_t window ) const
 {
-  prev_cpus_stat_ = current_cpus_stat_;
-  _update_stats();
-
-  // sum up all jiffies for all required cpus or all
-  Accumulator cpus_itv =  _get_interval_total();
-  cpus_all_itv = cpus_itv;
-  cpus_user_itv =_get_user_total();
-
-  std::fill( metrics_.begin(),metrics_.end(), 0 );
-  std::fill( average_.begin(),average_.end(), 0 );
-  // calculate percentage for user, system, idle
-  metrics_[ ProcStat::CPU_JIFFIES_USER ] = _calc_metric( ProcStat::CPU_JIFFIES_USER, cpus_itv );
-  metrics_[ ProcStat::CPU_JIFFIES_SYSTEM ] = _calc_metric( ProcStat::CPU_JIFFIES_SYSTEM, cpus_itv );
-  metrics_[ ProcStat::CPU_JIFFIES_IDLE ] = _calc_metric( ProcStat::CPU_JIFFIES_IDLE, cpus_itv );
-  
-  history_db_.push_back(metrics_);
-
-  average_[ ProcStat::CPU_JIFFIES_USER ] = _calc_average( ProcStat::CPU_JIFFIES_USER );
-  average_[ ProcStat::CPU_JIFFIES_SYSTEM ] = _calc_average( ProcStat::CPU_JIFFIES_SYSTEM );
-  average_[ ProcStat::CPU_JIFFIES_IDLE ] = _calc_average( ProcStat::CPU_JIFFIES_IDLE );
+  return windows_.get_length(window);
+}
 
+double CpuUsageStats::get_window_span( const size_t window ) const
+{
+  return windows_.get_span(window);
 }
 
-uint32_t CpuUsageStats::get_ncpus() const 
+double CpuUsageStats::get_user_window( const size_t window ) const
 {
-  uint32_t ncpus = cpus_.size();
-  if ( !ncpus ) ncpus= proc_stat_.get_ncpus();
-  return ncpus;
+  return _window_percent( window, WINDOW_USER );
 }
 
+double CpuUsageStats::get_system_window( const size_t window ) const
+{
+  return _window_percent( window, WINDOW_SYSTEM );
+}
 
-CpuUsageStats::Accumulator CpuUsageStats::_get_interval_total() const
+double CpuUsageStats::get_idle_window( const size_t window ) const
 {
-  if( !prev_cpus_stat_.empty() ) {
-    uint64_t  scc; 
-    uint64_t  scp;
-    scc = _sum_jiffies( current_cpus_stat_ );
-    scp = _sum_jiffies( prev_cpus_stat_ );
-    DEBUG(std::cout << " _get_interval_total  scc/scp/diff " << scc << "/" << scp << "/" << scc - scp << std::endl);
-    return scc - scp;
-  }
-  else
-    return 0;
+  return _window_percent( window, WINDOW_IDLE );
 }
 
-CpuUsageStats::Accumulator CpuUsageStats::_get_user_total() const
+double CpuUsageStats::_window_percent( const size_t window, const size_t field ) const
 {
-  if( !prev_cpus_stat_.empty() ) {
-    uint64_t  scc; 
-    uint64_t  scp;
-    scc = _sum_jiffie_list( current_cpus_stat_, ProcStat::CPU_JIFFIES_SYSTEM );
-    scp = _sum_jiffie_list( prev_cpus_stat_, ProcStat::CPU_JIFFIES_SYSTEM );
-    DEBUG(std::cout << " _get_user_total  scc/scp/diff " << scc << "/" << scp << "/" << scc - scp << std::endl);
-    return scc - scp;
-  }
-  else
-    return 0;
+  if ( window >= windows_.get_nwindows() ) return 0.0;
+  Accumulator total = windows_.get_sum( window, WINDOW_TOTAL );
+  if ( total == 0 ) return 0.0;
+  return windows_.get_sum( window, field ) * 100.0 / (double)total;
 }
 
+uint64_t CpuUsageStats::get_all_usage() const
+{
+  return cpus_all_itv;
+}
 
-void CpuUsageStats::_update_stats() {
-  proc_stat_.update_state();
-  if ( cpus_.size() == 0 ) {
-    current_cpus_stat_.clear();      // we just want all cpu jiffies..
-    current_cpus_stat_.push_back(proc_stat_.get().all);
-  }
-  else {
-    current_cpus_stat_  = proc_stat_.get().cpus;
-  }
+uint64_t CpuUsageStats::get_user_usage() const
+{
+  return cpus_user_itv;
 }
 
+uint32_t CpuUsageStats::get_cpu_rows() const
+{
+  return prev_matrix_.size() / ProcStat::CPU_JIFFIES_MAX;
+}
 
-bool CpuUsageStats::_accum_cpu( const uint32_t cpu_id ) const
+double CpuUsageStats::get_cpu_percent( const uint32_t cpu, const ProcStat::CpuJiffiesField &jiffie ) const
 {
-  bool retval=false;
-  if ( cpus_.size() == 0 || std::count( cpus_.begin(), cpus_.end(), cpu_id ) > 0 )  {
-    retval = true;
-  }
+  size_t idx = cpu * ProcStat::CPU_JIFFIES_MAX + jiffie;
+  if ( idx >= percent_matrix_.size() ) return 0.0;
+  return percent_matrix_[idx];
+}
 
-  return retval;
+double CpuUsageStats::get_cpu_utilization( const uint32_t cpu ) const
+{
+  size_t row = cpu * ProcStat::CPU_JIFFIES_MAX;
+  if ( row >= percent_matrix_.size() ) return 0.0;
+  // a row without jiffies in the interval has all of its percentages at 0
+  double idle = percent_matrix_[row + ProcStat::CPU_JIFFIES_IDLE];
+  double busy = percent_matrix_[row + ProcStat::CPU_JIFFIES_USER] + percent_matrix_[row + ProcStat::CPU_JIFFIES_SYSTEM];
+  if ( idle == 0.0 && busy == 0.0 ) return 0.0;
+  return 100.0 - idle;
 }
 
 
 
-CpuUsageStats::Accumulator  CpuUsageStats::_sum_jiffies(const ProcStat::CpuStats& cpu_stats ) const
+void CpuUsageStats::compute_statistics()
 {
+  static const size_t NFIELDS = ProcStat::CPU_JIFFIES_MAX;
 
-  uint64_t  accum=0;
-  // filter out cpus that were identified... if list == 0 then do not filter any
-  if ( cpus_.size() == 0 ) { 
-    ProcStat::CpuStats::const_iterator iter = cpu_stats.begin();
-    for ( int i=0; iter != cpu_stats.end(); i++, iter++ ) {
-      accum += std::accumulate( (*iter).jiffies.begin(), (*iter).jiffies.end(), 0 );              // skip guest counters...
-      DEBUG(std::cout << " _sum_jiffies cpu/accum:  " << i << "/" << accum << std::endl);
-    }
-  }
-  else {
-    // filter out cpus that were identified... 
-    for( uint32_t i=0; i < cpus_.size(); i++ ) {
-      if ( cpus_[i] < cpu_stats.size() ) {
-        int cpu_idx = cpus_[i];
-        accum += std::accumulate( cpu_stats[cpu_idx].jiffies.begin(), cpu_stats[cpu_idx].jiffies.end(), 0);       // skip guest counters...
-      }
-    }
-  }
+  _update_stats();
 
-  DEBUG(std::cout << " _sum_jiffies accum:  " << accum << std::endl);
-  return accum;
-}
+  const ProcStat::Contents &contents = proc_stat_->get();
+  const ProcStat::CpuJiffies &cur = contents.cpu_matrix;
+  const size_t n = cur.size();
 
-CpuUsageStats::Accumulator  CpuUsageStats::_sum_jiffie_list(const ProcStat::CpuStats& cpu_stats, 
-							const ProcStat::CpuJiffiesField &jiffie_max ) const
-{
+  std::fill( metrics_.begin(),metrics_.end(), 0 );
 
-  uint64_t  accum=0;
-  // filter out cpus that were identified... if list == 0 then do not filter any
-  if ( cpus_.size() == 0 ) { 
-    ProcStat::CpuStats::const_iterator iter = cpu_stats.begin();
-    for ( int i=0; iter != cpu_stats.end(); i++, iter++ ) {
-      accum += std::accumulate( (*iter).jiffies.begin(), (*iter).jiffies.begin()+jiffie_max, 0 );              // skip guest counters...
-      DEBUG(std::cout << " _sum_jiffies cpu/accum:  " << i << "/" << accum << std::endl);
-    }
+  // first sample, or cpus came online: start a new interval
+  if ( prev_matrix_.size() != n || n == 0 ) {
+    _start_interval();
+    cpus_all_itv = 0;
+    cpus_user_itv = 0;
+    return;
   }
-  else {
-    // filter out cpus that were identified... 
-    for( uint32_t i=0; i < cpus_.size(); i++ ) {
-      if ( cpus_[i] < cpu_stats.size() ) {
-        int cpu_idx = cpus_[i];
-        accum += std::accumulate( cpu_stats[cpu_idx].jiffies.begin(), cpu_stats[cpu_idx].jiffies.begin()+jiffie_max, 0);       // skip guest counters...
-      }
-    }
+
+  //
+  // delta of every counter in one pass over the matrix, counters of a cpu
+  // that was offlined and onlined again may restart from 0
+  //
+  const Accumulator *c = &cur[0];
+  const Accumulator *p = &prev_matrix_[0];
+  Accumulator *d = &delta_matrix_[0];
+  for ( size_t i=0; i < n; i++ ) {
+    d[i] = c[i] >= p[i] ? c[i] - p[i] : 0;
   }
 
-  DEBUG(std::cout << " _sum_jiffies accum:  " << accum << std::endl);
-  return accum;
-}
+  //
+  // per cpu percentages, and the masked reduction of the rows in the cpu
+  // list.  Guest time is already accounted in user and nice, so it is not
+  // part of the interval.
+  //
+  Accumulator sums[NFIELDS] = { 0 };
+  double *pct = &percent_matrix_[0];
+  const Accumulator *m = &mask_[0];
+  for ( size_t row=0; row < contents.cpu_rows; row++ ) {
+    const Accumulator *rd = d + row * NFIELDS;
+    Accumulator total = 0;
+    for ( size_t f=0; f < ProcStat::CPU_JIFFIES_GUEST; f++ ) total += rd[f];
+    double scale = total ? 100.0 / (double)total : 0.0;
+    double *rp = pct + row * NFIELDS;
+    for ( size_t f=0; f < NFIELDS; f++ ) {
+      rp[f] = rd[f] * scale;
+      sums[f] += rd[f] * m[row];
+    }
+  }
 
+  std::copy( cur.begin(), cur.end(), prev_matrix_.begin() );
 
-CpuUsageStats::Accumulator  CpuUsageStats::_sum_jiffie_field( const ProcStat::CpuStats& cpu_stats,
-                                               const ProcStat::CpuJiffiesField &jiffie ) const
-{
+  Accumulator cpus_itv = 0;
+  for ( size_t f=0; f < ProcStat::CPU_JIFFIES_GUEST; f++ ) cpus_itv += sums[f];
+  cpus_all_itv = cpus_itv;
+  cpus_user_itv = sums[ ProcStat::CPU_JIFFIES_USER ] + sums[ ProcStat::CPU_JIFFIES_NICE ];
+  DEBUG(std::cout << " compute_statistics  all/user " << cpus_all_itv << "/" << cpus_user_itv << std::endl);
 
-  uint64_t  accum=0;
-  // filter out cpus that were identified... if list == 0 then do not filer any
-  ProcStat::CpuStats::const_iterator iter = cpu_stats.begin();
-  for ( ; iter != cpu_stats.end(); iter++ ) {
-    if ( _accum_cpu( iter->idx ) )  {
-      accum += iter->jiffies[ jiffie ];  
-    }
+  // calculate percentage for user, system, idle
+  if ( cpus_itv ) {
+    metrics_[ ProcStat::CPU_JIFFIES_USER ] = sums[ ProcStat::CPU_JIFFIES_USER ] * 100.0 / (double)cpus_itv;
+    metrics_[ ProcStat::CPU_JIFFIES_SYSTEM ] = sums[ ProcStat::CPU_JIFFIES_SYSTEM ] * 100.0 / (double)cpus_itv;
+    metrics_[ ProcStat::CPU_JIFFIES_IDLE ] = sums[ ProcStat::CPU_JIFFIES_IDLE ] * 100.0 / (double)cpus_itv;
   }
+  
+  Accumulator sample[WINDOW_FIELDS];
+  sample[WINDOW_TOTAL] = cpus_itv;
+  sample[WINDOW_USER] = sums[ ProcStat::CPU_JIFFIES_USER ];
+  sample[WINDOW_SYSTEM] = sums[ ProcStat::CPU_JIFFIES_SYSTEM ];
+  sample[WINDOW_IDLE] = sums[ ProcStat::CPU_JIFFIES_IDLE ];
+  struct timespec ts;
+  clock_gettime( CLOCK_MONOTONIC, &ts );
+  windows_.add( ts.tv_sec + ts.tv_nsec*1e-9, sample );
+}
 
-  return accum;
+uint32_t CpuUsageStats::get_ncpus() const 
+{
+  uint32_t ncpus = cpus_.size();
+  if ( !ncpus ) ncpus= proc_stat_->get_ncpus();
+  return ncpus;
 }
 
 
+void CpuUsageStats::_update_stats() {
+  if ( !shared_ ) proc_stat_->update_state();
+}
 
 
-double CpuUsageStats::_calc_metric( const ProcStat::CpuJiffiesField &jiffie, const Accumulator diff_total ) const
+void CpuUsageStats::_start_interval()
 {
-  // calculate percentage for user, system, idle
-  Accumulator cur_jiffie;
-  Accumulator prev_jiffie;
-  cur_jiffie = _sum_jiffie_field ( current_cpus_stat_, jiffie );
-  prev_jiffie = _sum_jiffie_field ( prev_cpus_stat_, jiffie );
-  
-  double diff_jiffie = (double) (cur_jiffie - prev_jiffie);
-  
-  DEBUG(std::cout << " _calc_metric jiffie:" << jiffie << " cur/prev/diff " << cur_jiffie << "/" << prev_jiffie << "/" << diff_jiffie << std::endl);
-
-  if( 0 != diff_total )
-    return  diff_jiffie / (double)diff_total * 100.0;
-  else
-    return 0.0;
+  const ProcStat::Contents &contents = proc_stat_->get();
+  prev_matrix_ = contents.cpu_matrix;
+  delta_matrix_.assign( prev_matrix_.size(), 0 );
+  percent_matrix_.assign( prev_matrix_.size(), 0.0 );
+  _build_mask( contents.cpu_rows );
 }
 
 
-double CpuUsageStats::_calc_average( const ProcStat::CpuJiffiesField &jiffie ) const
+void CpuUsageStats::_build_mask( const uint32_t rows )
 {
-  double accum=0.0;
-  MetricsHistory::const_iterator iter = history_db_.begin();
-  int n=0;
-  for ( ; iter != history_db_.end(); iter++, n++ ) {
-    const MetricsList ml = history_db_.at(n);
-    DEBUG(std::cout << " history v:"<< n << " jiffies:" << jiffie << " accum:  " << ml[jiffie] << std::endl);
-    accum += ml[ jiffie ];
-  }
-  if ( n>0 ) {
-    return accum=accum/(double)n;
-    DEBUG(std::cout << " _sum_jiffies accum:  " << accum << std::endl);
+  // filter out cpus that were identified... if list == 0 then do not filter any
+  mask_.assign( rows, cpus_.size() == 0 ? 1 : 0 );
+  for( uint32_t i=0; i < cpus_.size(); i++ ) {
+    if ( cpus_[i] < rows ) mask_[ cpus_[i] ] = 1;
   }
-  return  0.0;
 }
@@ -22,8 +22,8 @@
 #include <vector>
 #include <iosfwd>
 #include <boost/shared_ptr.hpp>
-#include <boost/circular_buffer.hpp>
 #include "Statistics.h"
+#include "RollingSums.h"
 #include "states/ProcStat.h"
 
 ////////////////////////////////////////////////////////
@@ -39,15 +39,22 @@ class CpuUsageStats : public CpuStatistics
  public:
   typedef std::vector< uint32_t >  CpuList;
   typedef std::vector< double >    MetricsList;
-  typedef boost::circular_buffer< MetricsList > MetricsHistory;
+  typedef std::vector< double >    WindowList;
 
 public:
 
   // Perform CPU usage based on specified list of cpus...
   // if  cpus.size() == 0 then perform utilization against all cpu ids
   //CpuUsageStats( );
-  CpuUsageStats( const int nhistory=5 );
-  CpuUsageStats( const CpuList &cpus, const int nhistory=5 );
+  CpuUsageStats( );
+  CpuUsageStats( const CpuList &cpus );
+
+  //
+  // Compute usage from a /proc/stat snapshot that is shared with other
+  // consumers.  The owner of the snapshot updates it once per cycle, before
+  // compute_statistics is called, so every consumer sees the same instant.
+  //
+  CpuUsageStats( const ProcStatPtr &proc_stat, const CpuList &cpus );
 
   virtual ~CpuUsageStats() {}
 
@@ -57,36 +64,56 @@ public:
   virtual double get_user_percent() const;
   virtual double get_system_percent() const;
   virtual double get_idle_percent() const;
+  // averages over the first window
   virtual double get_user_average() const;
   virtual double get_system_average() const;
   virtual double get_idle_average() const;
           uint64_t   get_all_usage() const;       
           uint64_t   get_user_usage() const;
 
+  //
+  // rolling averages of the cpu list over time windows (seconds), each
+  // window is updated in constant time per interval.  The default is a
+  // single 5 second window, an empty list restores it.
+  //
+  void                set_windows( const WindowList &seconds );
+  size_t              get_nwindows() const;
+  double              get_window_length( const size_t window ) const;
+  // seconds covered by the samples of the window, less than its length until it filled up
+  double              get_window_span( const size_t window ) const;
+  double              get_user_window( const size_t window ) const;
+  double              get_system_window( const size_t window ) const;
+  double              get_idle_window( const size_t window ) const;
+
+  //
+  // per cpu results of the last interval, for every cpu reported by
+  // /proc/stat whether or not it is part of the cpu list.  Percentages are
+  // of the cpu's own interval, the row of a cpu is its idx.
+  //
+  uint32_t            get_cpu_rows() const;
+  double              get_cpu_percent( const uint32_t cpu, const ProcStat::CpuJiffiesField &jiffie ) const;
+  // 100 - idle percent of the cpu, 0 for cpus without samples
+  double              get_cpu_utilization( const uint32_t cpu ) const;
+
 protected:
 
     typedef ProcStat::Jiffie        Accumulator;
 
-    virtual Accumulator _get_interval_total() const;
-    virtual Accumulator _get_user_total() const;
-    virtual double      _calc_metric( const ProcStat::CpuJiffiesField & jiffie, const Accumulator itv ) const;
-    virtual double     _calc_average(  const ProcStat::CpuJiffiesField & jiffie ) const;
-    virtual Accumulator _sum_jiffies( const ProcStat::CpuStats & cpu_stats ) const;
-    virtual Accumulator _sum_jiffie_list( const ProcStat::CpuStats & cpu_stats,
-					  const ProcStat::CpuJiffiesField & jiffie_max ) const;
-    virtual Accumulator _sum_jiffie_field( const ProcStat::CpuStats& cpu_stats,
-                                           const ProcStat::CpuJiffiesField & jiffie ) const;
-    bool                _accum_cpu( const uint32_t cpu_id ) const;
+    double              _window_percent( const size_t window, const size_t field ) const;
+    void                _start_interval();
+    void                _build_mask( const uint32_t rows );
     virtual void        _update_stats();
 
 private:
-    ProcStat::CpuStats      prev_cpus_stat_;  
-    ProcStat::CpuStats      current_cpus_stat_;  
-    ProcStat                proc_stat_;   
+    ProcStat::CpuJiffies    prev_matrix_;     // cpu_matrix of the previous interval
+    ProcStat::CpuJiffies    delta_matrix_;
+    MetricsList             percent_matrix_;
+    std::vector< Accumulator > mask_;         // 1 for rows in cpus_, 0 otherwise
+    ProcStatPtr             proc_stat_;   
+    bool                    shared_;      // proc_stat_ is updated by its owner
     CpuList                 cpus_;
     MetricsList             metrics_;
-    MetricsList             average_;
-    MetricsHistory          history_db_;
+    RollingSums             windows_;     // total, user, system, idle jiffies
     Accumulator             cpus_all_itv;
     Accumulator             cpus_user_itv;
 };
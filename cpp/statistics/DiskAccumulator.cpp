@@ -0,0 +1,89 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include <limits>
+#include <time.h>
+#include "DiskAccumulator.h"
+
+
+static const double BYTES_PER_MEGABYTE = 1024*1024;
+
+// counters are unsigned long in the kernel and wrap on 32 bit hosts
+static uint64_t delta( const uint64_t cur, const uint64_t prev )
+{
+    return cur >= prev ? cur - prev : 0;
+}
+
+DiskAccumulator::DiskAccumulator( const DiskStatePtr &diskState, const std::string &device ):
+disk_state_(diskState),
+device_(device),
+available_(false),
+prev_time_(std::numeric_limits<double>::max()),
+read_rate_(0),
+write_rate_(0),
+utilization_(0),
+in_flight_(0),
+current_time_(CurrentTime)
+{
+}
+
+void DiskAccumulator::compute_statistics()
+{
+    double current_time = current_time_();
+    double delta_time = current_time - prev_time_;
+
+    const DiskState::Counters *cur = disk_state_->find(device_);
+    if( !cur )
+    {
+        // device went away, start over when it comes back
+        available_ = false;
+        read_rate_ = write_rate_ = utilization_ = 0;
+        in_flight_ = 0;
+        prev_time_ = std::numeric_limits<double>::max();
+        return;
+    }
+
+    if( available_ && delta_time > 0 )
+    {
+        double scale = DiskState::SECTOR_SIZE / (delta_time * BYTES_PER_MEGABYTE);
+        read_rate_ = delta(cur->read_sectors, prev_.read_sectors) * scale;
+        write_rate_ = delta(cur->write_sectors, prev_.write_sectors) * scale;
+        utilization_ = delta(cur->io_ticks, prev_.io_ticks) / (delta_time * 10.0);
+        if( utilization_ > 100.0 ) utilization_ = 100.0;
+    }
+    in_flight_ = cur->in_flight;
+
+    available_ = true;
+    prev_ = *cur;
+    prev_time_ = current_time;
+}
+
+void
+DiskAccumulator::set_current_time_function( DiskAccumulator::CurrentTimeFunction current_time )
+{
+    current_time_ = current_time;
+}
+
+double
+DiskAccumulator::CurrentTime()
+{
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + (double)ts.tv_nsec*1e-9;
+}
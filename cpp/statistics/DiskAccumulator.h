@@ -0,0 +1,77 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef DISK_ACCUMULATOR_H_
+#define DISK_ACCUMULATOR_H_
+
+#include <stdint.h>
+#include <string>
+#include <boost/shared_ptr.hpp>
+#include <boost/function.hpp>
+
+#include "Statistics.h"
+#include "states/DiskState.h"
+
+class DiskAccumulator;
+typedef boost::shared_ptr< DiskAccumulator > DiskAccumulatorPtr;
+
+
+//
+// Throughput and utilization of one block device, computed from the
+// DiskState counters between two updates.  The DiskState must be updated
+// before the accumulator.
+//
+class DiskAccumulator : public Statistics
+{
+public:
+    typedef boost::function< double() > CurrentTimeFunction;
+
+public:
+    DiskAccumulator( const DiskStatePtr &diskState, const std::string &device );
+
+    void compute_statistics();
+
+    std::string get_device() const { return device_; }
+    bool is_available() const { return available_; }
+    double get_read_MB_per_sec() const { return read_rate_; }
+    double get_write_MB_per_sec() const { return write_rate_; }
+    double get_throughput_MB_per_sec() const { return read_rate_ + write_rate_; }
+    // share of the interval the device had requests in flight
+    double get_utilization_percent() const { return utilization_; }
+    uint64_t get_in_flight() const { return in_flight_; }
+
+    void set_current_time_function( CurrentTimeFunction current_time );
+    static double CurrentTime();
+
+private:
+    DiskStatePtr disk_state_;
+    std::string device_;
+    bool available_;
+
+    DiskState::Counters prev_;
+    double prev_time_;
+    double read_rate_;
+    double write_rate_;
+    double utilization_;
+    uint64_t in_flight_;
+
+    CurrentTimeFunction current_time_;
+};
+
+#endif
@@ -29,23 +29,42 @@
 
 static const double BYTES_PER_MEGABYTE = 1024*1024;
 
+// updates kept for the peak rates
+static const size_t PEAK_WINDOW = 30;
+
+// a byte rate this many times its average is a burst, unless it is too low
+// to matter
+static const double BURST_RATIO = 2.0;
+static const double BURST_MIN_MB_PER_SEC = 1.0;
+
 NicAccumulator::NicAccumulator():
-prev_rx_bytes_(0),
-prev_tx_bytes_(0),
 prev_time_(std::numeric_limits<double>::max()),
-throughput_(0),
+bursting_(false),
+burst_count_(0),
 current_time_(CurrentTime)
 {
+    init();
 }
 
 NicAccumulator::NicAccumulator( const NicStatePtr &nicState):
-prev_rx_bytes_(0),
-prev_tx_bytes_(0),
 prev_time_(std::numeric_limits<double>::max()),
-throughput_(0),
+bursting_(false),
+burst_count_(0),
 current_time_(CurrentTime)
 {
-  add_nic(nicState);
+    init();
+    add_nic(nicState);
+}
+
+void
+NicAccumulator::init()
+{
+    for( int i=0; i<NUM_COUNTERS; ++i )
+    {
+        prev_counts_[i] = 0;
+        rates_[i] = 0;
+        history_[i].resize( PEAK_WINDOW );
+    }
 }
 
 void
@@ -91,31 +110,63 @@ void NicAccumulator::compute_statistics()
 	double current_time = current_time_();
 	double delta_time = current_time - prev_time_;
 
-    double current_rx_bytes = 0;
-    double current_tx_bytes = 0;
+    uint64_t current_counts[NUM_COUNTERS] = { 0 };
     
     for( NicStates::const_iterator i=nic_states_.begin(); i!=nic_states_.end(); ++i )
     {
         // Ignore vlans when computing statistics
         if( (*i)->get_vlan().empty() )
         {
-            current_rx_bytes += (*i)->get_rx_bytes();
-            current_tx_bytes += (*i)->get_tx_bytes();
+            current_counts[RX_BYTES] += (*i)->get_rx_bytes();
+            current_counts[TX_BYTES] += (*i)->get_tx_bytes();
+            current_counts[RX_PACKETS] += (*i)->get_rx_packets();
+            current_counts[TX_PACKETS] += (*i)->get_tx_packets();
+            current_counts[RX_DROPPED] += (*i)->get_rx_dropped();
+            current_counts[TX_DROPPED] += (*i)->get_tx_dropped();
+            current_counts[RX_ERRORS] += (*i)->get_rx_errors();
+            current_counts[TX_ERRORS] += (*i)->get_tx_errors();
         }
     }
     
 	if( delta_time > 0 )
 	{
-        double delta_rx_bytes = current_rx_bytes - prev_rx_bytes_;
-        double delta_tx_bytes = current_tx_bytes - prev_tx_bytes_;
-		throughput_ = (delta_rx_bytes + delta_tx_bytes) / (delta_time * BYTES_PER_MEGABYTE);
+        for( int i=0; i<NUM_COUNTERS; ++i )
+        {
+            // counters restart from 0 when a driver is reloaded
+            double delta = current_counts[i] >= prev_counts_[i] ? current_counts[i] - prev_counts_[i] : 0;
+            rates_[i] = delta / delta_time;
+            if( i == RX_BYTES || i == TX_BYTES )
+                rates_[i] /= BYTES_PER_MEGABYTE;
+        }
+
+        // compared against the average before it includes this sample
+        bursting_ = is_burst(RX_BYTES) || is_burst(TX_BYTES);
+        if( bursting_ )
+            ++burst_count_;
+
+        for( int i=0; i<NUM_COUNTERS; ++i )
+        {
+            history_[i].add( current_counts[i], (int64_t)(current_time*1e6) );
+            history_[i].set_usage( rates_[i] );
+        }
 	}
 
-    prev_rx_bytes_ = current_rx_bytes;
-    prev_tx_bytes_ = current_tx_bytes;
+    for( int i=0; i<NUM_COUNTERS; ++i )
+    {
+        prev_counts_[i] = current_counts[i];
+    }
 	prev_time_ = current_time;
 }
 
+bool
+NicAccumulator::is_burst( Counter counter ) const
+{
+    if( history_[counter].get_count() == 0 )
+        return false;
+    return rates_[counter] >= BURST_MIN_MB_PER_SEC &&
+           rates_[counter] > BURST_RATIO * history_[counter].get_ewma();
+}
+
 std::string
 NicAccumulator::get_device() const
 {
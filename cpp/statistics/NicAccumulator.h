@@ -27,18 +27,40 @@
 #include <boost/function.hpp>
 
 #include "Statistics.h"
+#include "UsageHistory.h"
 #include "states/NicState.h"
 
 class NicAccumulator;
 typedef boost::shared_ptr< NicAccumulator > NicAccumulatorPtr;
 
 
+//
+// Rates of one nic device, computed from the counters of its interfaces
+// (vlans excluded) between two updates.  Each direction is tracked on its
+// own since a full duplex link saturates per direction.  Every rate keeps a
+// moving average and the peak over the last samples, and a sample where the
+// byte rate of either direction jumps well above its average is counted as
+// a burst.
+//
 class NicAccumulator : public Statistics
 {
 public:
     typedef boost::function< double() > CurrentTimeFunction;
     typedef std::vector<std::string> Vlans;
 
+    enum Counter
+    {
+        RX_BYTES,       // MB/s
+        TX_BYTES,       // MB/s
+        RX_PACKETS,
+        TX_PACKETS,
+        RX_DROPPED,
+        TX_DROPPED,
+        RX_ERRORS,
+        TX_ERRORS,
+        NUM_COUNTERS
+    };
+
 public:
     NicAccumulator();
     NicAccumulator( const NicStatePtr &nicState );
@@ -50,22 +72,37 @@ public:
     std::string get_device() const;
     const Vlans& get_vlans() const { return vlans_; }
     std::string get_vlans_string() const { return vlans_string_; }
-    double get_throughput_MB_per_sec() const { return throughput_; }
+    double get_throughput_MB_per_sec() const { return rates_[RX_BYTES] + rates_[TX_BYTES]; }
+    double get_rx_MB_per_sec() const { return rates_[RX_BYTES]; }
+    double get_tx_MB_per_sec() const { return rates_[TX_BYTES]; }
+
+    // per second over the last update
+    double get_rate( Counter counter ) const { return rates_[counter]; }
+    double get_average_rate( Counter counter ) const { return history_[counter].get_ewma(); }
+    // highest rate within the last 30 updates
+    double get_peak_rate( Counter counter ) const { return history_[counter].get_peak(); }
+
+    bool is_bursting() const { return bursting_; }
+    uint64_t get_burst_count() const { return burst_count_; }
 
     void set_current_time_function( CurrentTimeFunction current_time );
     static double CurrentTime();
 
 private:
+    void init();
     void validate_device( const std::string& device ) const;
     void add_vlan( const std::string& vlan );
+    bool is_burst( Counter counter ) const;
 
 private:
     typedef std::vector<boost::shared_ptr<const NicState> > NicStates;
     
-    uint64_t prev_rx_bytes_;
-    uint64_t prev_tx_bytes_;
+    uint64_t prev_counts_[NUM_COUNTERS];
     double prev_time_;
-    double throughput_;
+    double rates_[NUM_COUNTERS];
+    UsageHistory history_[NUM_COUNTERS];
+    bool bursting_;
+    uint64_t burst_count_;
 
     NicStates nic_states_;
     Vlans vlans_;
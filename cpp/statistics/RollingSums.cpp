@@ -0,0 +1,137 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include <algorithm>
+#include "RollingSums.h"
+
+
+RollingSums::RollingSums( const size_t _nfields ) :
+  nfields(_nfields),
+  stamps(16),
+  values(16 * _nfields),
+  head(0),
+  used(0),
+  last(-1.0)
+{
+}
+
+void RollingSums::set_windows( const std::vector<double> &lengths )
+{
+  windows.resize(lengths.size());
+  for ( size_t i=0; i < lengths.size(); i++ ) {
+    windows[i].length = lengths[i];
+  }
+  clear();
+}
+
+void RollingSums::clear()
+{
+  for ( size_t i=0; i < windows.size(); i++ ) {
+    windows[i].start = -1.0;
+    windows[i].count = 0;
+    windows[i].sums.assign(nfields, 0);
+  }
+  head = 0;
+  used = 0;
+  last = -1.0;
+}
+
+size_t RollingSums::get_nwindows() const
+{
+  return windows.size();
+}
+
+double RollingSums::get_length( const size_t window ) const
+{
+  return windows[window].length;
+}
+
+double RollingSums::get_span( const size_t window ) const
+{
+  const Window &w = windows[window];
+  if ( w.count == 0 || w.start < 0 ) return 0.0;
+  return last - w.start;
+}
+
+size_t RollingSums::get_count( const size_t window ) const
+{
+  return windows[window].count;
+}
+
+RollingSums::Value RollingSums::get_sum( const size_t window, const size_t field ) const
+{
+  return windows[window].sums[field];
+}
+
+size_t RollingSums::slot( const size_t age ) const
+{
+  // age 0 is the newest sample
+  return ( head + stamps.size() - 1 - age ) % stamps.size();
+}
+
+void RollingSums::grow()
+{
+  // unroll the ring into twice the space, oldest sample first
+  size_t cap = stamps.size();
+  std::vector<double> nstamps(cap * 2);
+  std::vector<Value>  nvalues(cap * 2 * nfields);
+  for ( size_t i=0; i < used; i++ ) {
+    size_t from = slot(used - 1 - i);
+    nstamps[i] = stamps[from];
+    std::copy( values.begin() + from*nfields, values.begin() + (from+1)*nfields, nvalues.begin() + i*nfields );
+  }
+  stamps.swap(nstamps);
+  values.swap(nvalues);
+  head = used;
+}
+
+void RollingSums::add( const double stamp, const Value *v )
+{
+  if ( windows.empty() ) return;
+  if ( used == stamps.size() ) grow();
+
+  const double prev = last;
+  stamps[head] = stamp;
+  std::copy( v, v + nfields, values.begin() + head*nfields );
+  head = ( head + 1 ) % stamps.size();
+  used++;
+  last = stamp;
+
+  size_t keep = 1;
+  for ( size_t i=0; i < windows.size(); i++ ) {
+    Window &w = windows[i];
+    if ( w.count == 0 ) w.start = prev < 0 ? stamp : prev;
+    for ( size_t f=0; f < nfields; f++ ) w.sums[f] += v[f];
+    w.count++;
+
+    // drop the samples that ended before the window, keep the newest one
+    while ( w.count > 1 ) {
+      size_t oldest = slot(w.count - 1);
+      if ( stamps[oldest] > stamp - w.length ) break;
+      const Value *o = &values[oldest*nfields];
+      for ( size_t f=0; f < nfields; f++ ) w.sums[f] -= o[f];
+      w.start = stamps[oldest];
+      w.count--;
+    }
+    keep = std::max(keep, w.count);
+  }
+
+  // the ring only needs the samples of the longest window
+  used = keep;
+}
@@ -0,0 +1,90 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef ROLLING_SUMS_H_
+#define ROLLING_SUMS_H_
+#include <stddef.h>
+#include <stdint.h>
+#include <vector>
+
+//
+// Running sums of a fixed number of counters over several time windows.
+//
+// Samples are deltas (e.g. jiffies consumed since the previous sample) with
+// the time they were taken at.  All windows share one ring of samples; each
+// window keeps its own sums and the number of newest samples it covers.  A
+// new sample is added to every window and the samples that fell out of a
+// window are subtracted again, so the cost per sample is constant and does
+// not depend on the window lengths.  The ring only holds the samples of the
+// longest window.
+//
+class RollingSums
+{
+
+ public:
+
+  typedef uint64_t  Value;
+
+  RollingSums( const size_t nfields );
+
+  //
+  // replace the windows (lengths in seconds), discards the samples
+  //
+  void     set_windows( const std::vector<double> &lengths );
+
+  void     clear();
+
+  size_t   get_nwindows() const;
+
+  double   get_length( const size_t window ) const;
+
+  // seconds actually covered by the samples of a window
+  double   get_span( const size_t window ) const;
+
+  // number of samples in a window
+  size_t   get_count( const size_t window ) const;
+
+  Value    get_sum( const size_t window, const size_t field ) const;
+
+  // values holds nfields deltas, stamp is in seconds
+  void     add( const double stamp, const Value *values );
+
+ private:
+
+  struct Window {
+    double              length;
+    double              start;      // beginning of the interval of the oldest sample
+    size_t              count;
+    std::vector<Value>  sums;
+  };
+
+  size_t   slot( const size_t age ) const;
+  void     grow();
+
+  size_t               nfields;
+  std::vector<Window>  windows;
+  std::vector<double>  stamps;
+  std::vector<Value>   values;     // stamps.size() x nfields
+  size_t               head;       // next slot to write
+  size_t               used;
+  double               last;       // stamp of the newest sample
+
+};
+
+#endif
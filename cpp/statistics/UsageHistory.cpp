@@ -0,0 +1,156 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include <math.h>
+#include <algorithm>
+#include "UsageHistory.h"
+
+
+UsageHistory::UsageHistory( const size_t length, const double _alpha ) :
+  head(0),
+  used(0),
+  alpha(_alpha),
+  ewma(0.0),
+  have_ewma(false)
+{
+  resize(length);
+}
+
+void UsageHistory::resize( const size_t length )
+{
+  ring.assign( std::max(length, (size_t)2), Sample() );
+  sorted.clear();
+  sorted.reserve(ring.size());
+  head = 0;
+  used = 0;
+  ewma = 0.0;
+  have_ewma = false;
+}
+
+void UsageHistory::clear()
+{
+  resize(ring.size());
+}
+
+size_t UsageHistory::capacity() const
+{
+  return ring.size();
+}
+
+size_t UsageHistory::size() const
+{
+  return used;
+}
+
+void UsageHistory::release( const Sample &sample )
+{
+  if ( !sample.has_usage ) return;
+  std::vector<float>::iterator it = std::lower_bound(sorted.begin(), sorted.end(), sample.usage);
+  if ( it != sorted.end() && *it == sample.usage ) sorted.erase(it);
+}
+
+bool UsageHistory::add( const int64_t ticks, const int64_t stamp )
+{
+  if ( ticks < 0 ) return false;
+  head = (head + 1) % ring.size();
+  if ( used == ring.size() ) {
+    release(ring[head]);
+  } else {
+    used++;
+  }
+  Sample &sample = ring[head];
+  sample = Sample();
+  sample.ticks = ticks;
+  sample.stamp = stamp;
+  return true;
+}
+
+int64_t UsageHistory::get_delta() const
+{
+  int64_t p2, p1;
+  get_last(p2, p1);
+  // processes that exited take their ticks with them
+  if ( used < 2 || p2 < p1 ) return 0;
+  return p2 - p1;
+}
+
+void UsageHistory::get_last( int64_t &p2, int64_t &p1 ) const
+{
+  p2 = ring[head].ticks;
+  p1 = ring[(head + ring.size() - 1) % ring.size()].ticks;
+}
+
+int64_t UsageHistory::get_stamp() const
+{
+  return used ? ring[head].stamp : 0;
+}
+
+void UsageHistory::set_usage( const float usage )
+{
+  if ( used == 0 ) return;
+  Sample &sample = ring[head];
+  release(sample);
+  sample.usage = usage;
+  sample.has_usage = true;
+  sorted.insert( std::upper_bound(sorted.begin(), sorted.end(), usage), usage );
+
+  if ( have_ewma ) {
+    ewma = alpha * usage + (1.0 - alpha) * ewma;
+  } else {
+    ewma = usage;
+    have_ewma = true;
+  }
+}
+
+size_t UsageHistory::get_count() const
+{
+  return sorted.size();
+}
+
+float UsageHistory::get_ewma() const
+{
+  return ewma;
+}
+
+float UsageHistory::get_peak() const
+{
+  return sorted.empty() ? 0.0 : sorted.back();
+}
+
+float UsageHistory::get_percentile( const double pct ) const
+{
+  //
+  // nearest rank
+  //
+  if ( sorted.empty() ) return 0.0;
+  size_t rank = (size_t)ceil( pct / 100.0 * sorted.size() );
+  if ( rank < 1 ) rank = 1;
+  if ( rank > sorted.size() ) rank = sorted.size();
+  return sorted[rank-1];
+}
+
+float UsageHistory::get_p50() const
+{
+  return get_percentile(50.0);
+}
+
+float UsageHistory::get_p95() const
+{
+  return get_percentile(95.0);
+}
@@ -0,0 +1,97 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef USAGE_HISTORY_H_
+#define USAGE_HISTORY_H_
+#include <stddef.h>
+#include <stdint.h>
+#include <vector>
+
+//
+// Fixed length history of the cpu time sampled for a component.
+//
+// Each sample holds the cumulative ticks and the time (usec) they were read
+// at.  Once the usage for a sample is known (set_usage), it is folded into an
+// exponentially weighted moving average and into a sorted copy of the usage
+// held by the ring, so the peak and percentiles of the window are available
+// without sorting.  Samples that fall out of the ring are removed from the
+// sorted window.
+//
+class UsageHistory
+{
+
+ public:
+
+  struct Sample {
+    Sample() : ticks(0), stamp(0), usage(0.0), has_usage(false) {};
+    int64_t  ticks;
+    int64_t  stamp;
+    float    usage;
+    bool     has_usage;
+  };
+
+  UsageHistory( const size_t length=60, const double alpha=0.2 );
+
+  // change the number of samples kept, discards the history
+  void     resize( const size_t length );
+
+  void     clear();
+
+  size_t   capacity() const;
+
+  // number of samples held
+  size_t   size() const;
+
+  // negative ticks (process group not sampled) are not recorded and leave
+  // the stamp of the previous sample in place, returns false in that case
+  bool     add( const int64_t ticks, const int64_t stamp );
+
+  // ticks consumed between the two most recent samples, 0 if unknown
+  int64_t  get_delta() const;
+
+  void     get_last( int64_t &p2, int64_t &p1 ) const;
+
+  int64_t  get_stamp() const;
+
+  // record the usage measured for the most recent sample
+  void     set_usage( const float usage );
+
+  // number of samples with a usage
+  size_t   get_count() const;
+  float    get_ewma() const;
+  float    get_peak() const;
+  float    get_percentile( const double pct ) const;
+  float    get_p50() const;
+  float    get_p95() const;
+
+ private:
+
+  void     release( const Sample &sample );
+
+  std::vector<Sample>  ring;
+  std::vector<float>   sorted;      // usage of the samples in the ring
+  size_t               head;        // index of the most recent sample
+  size_t               used;
+  double               alpha;
+  double               ewma;
+  bool                 have_ewma;
+
+};
+
+#endif
@@ -36,6 +36,7 @@ struct nic_allocation_struct {
         data_rate = 0.0;
         data_size = 1;
         multicast_support = "False";
+        socket = -1;
     };
 
     static std::string getId() {
@@ -48,6 +49,7 @@ struct nic_allocation_struct {
     std::string multicast_support;
     std::string ip_addressable;
     std::string interface;
+    CORBA::Long socket;
 };
 
 inline bool operator>>= (const CORBA::Any& a, nic_allocation_struct& s) {
@@ -103,13 +105,21 @@ inline bool operator>>= (const CORBA::Any& a, nic_allocation_struct& s) {
                 }
             }
         }
+        else if (!strcmp("nic_allocation::socket", props[idx].id)) {
+            if (!(props[idx].value >>= s.socket)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
     }
     return true;
 };
 
 inline void operator<<= (CORBA::Any& a, const nic_allocation_struct& s) {
     CF::Properties props;
-    props.length(6);
+    props.length(7);
     props[0].id = CORBA::string_dup("nic_allocation::identifier");
     props[0].value <<= s.identifier;
     props[1].id = CORBA::string_dup("nic_allocation::data_rate");
@@ -122,6 +132,8 @@ inline void operator<<= (CORBA::Any& a, const nic_allocation_struct& s) {
     props[4].value <<= s.ip_addressable;
     props[5].id = CORBA::string_dup("nic_allocation::interface");
     props[5].value <<= s.interface;
+    props[6].id = CORBA::string_dup("nic_allocation::socket");
+    props[6].value <<= s.socket;
     a <<= props;
 };
 
@@ -138,6 +150,8 @@ inline bool operator== (const nic_allocation_struct& s1, const nic_allocation_st
         return false;
     if (s1.interface!=s2.interface)
         return false;
+    if (s1.socket!=s2.socket)
+        return false;
     return true;
 };
 
@@ -341,6 +355,10 @@ struct thresholds_struct {
         nic_usage = 900;
         files_available = 3;
         threads = 3;
+        cpu_pressure = -1;
+        memory_pressure = -1;
+        io_pressure = -1;
+        disk_usage = 90;
     };
 
     static std::string getId() {
@@ -353,6 +371,10 @@ struct thresholds_struct {
     CORBA::Long nic_usage;
     float files_available;
     float threads;
+    float cpu_pressure;
+    float memory_pressure;
+    float io_pressure;
+    float disk_usage;
 };
 
 inline bool operator>>= (const CORBA::Any& a, thresholds_struct& s) {
@@ -377,6 +399,18 @@ inline bool operator>>= (const CORBA::Any& a, thresholds_struct& s) {
     if (props.contains("threads")) {
         if (!(props["threads"] >>= s.threads)) return false;
     }
+    if (props.contains("cpu_pressure")) {
+        if (!(props["cpu_pressure"] >>= s.cpu_pressure)) return false;
+    }
+    if (props.contains("memory_pressure")) {
+        if (!(props["memory_pressure"] >>= s.memory_pressure)) return false;
+    }
+    if (props.contains("io_pressure")) {
+        if (!(props["io_pressure"] >>= s.io_pressure)) return false;
+    }
+    if (props.contains("disk_usage")) {
+        if (!(props["disk_usage"] >>= s.disk_usage)) return false;
+    }
     return true;
 }
 
@@ -394,6 +428,14 @@ inline void operator<<= (CORBA::Any& a, const thresholds_struct& s) {
     props["files_available"] = s.files_available;
  
     props["threads"] = s.threads;
+ 
+    props["cpu_pressure"] = s.cpu_pressure;
+ 
+    props["memory_pressure"] = s.memory_pressure;
+ 
+    props["io_pressure"] = s.io_pressure;
+ 
+    props["disk_usage"] = s.disk_usage;
     a <<= props;
 }
 
@@ -410,6 +452,14 @@ inline bool operator== (const thresholds_struct& s1, const thresholds_struct& s2
         return false;
     if (s1.threads!=s2.threads)
         return false;
+    if (s1.cpu_pressure!=s2.cpu_pressure)
+        return false;
+    if (s1.memory_pressure!=s2.memory_pressure)
+        return false;
+    if (s1.io_pressure!=s2.io_pressure)
+        return false;
+    if (s1.disk_usage!=s2.disk_usage)
+        return false;
     return true;
 }
 
@@ -537,6 +587,20 @@ struct nic_metrics_struct_struct {
         rate_allocated = 0;
         time = 0;
         current_throughput = 0;
+        rx_throughput = 0;
+        tx_throughput = 0;
+        rx_throughput_average = 0;
+        tx_throughput_average = 0;
+        rx_throughput_peak = 0;
+        tx_throughput_peak = 0;
+        rx_packet_rate = 0;
+        tx_packet_rate = 0;
+        rx_dropped_rate = 0;
+        rx_dropped_peak = 0;
+        tx_dropped_rate = 0;
+        rx_error_rate = 0;
+        tx_error_rate = 0;
+        bursts = 0;
     };
 
     static std::string getId() {
@@ -574,6 +638,20 @@ struct nic_metrics_struct_struct {
     std::string time_string_utc;
     double time;
     double current_throughput;
+    double rx_throughput;
+    double tx_throughput;
+    double rx_throughput_average;
+    double tx_throughput_average;
+    double rx_throughput_peak;
+    double tx_throughput_peak;
+    double rx_packet_rate;
+    double tx_packet_rate;
+    double rx_dropped_rate;
+    double rx_dropped_peak;
+    double tx_dropped_rate;
+    double rx_error_rate;
+    double tx_error_rate;
+    CORBA::ULong bursts;
 };
 
 inline bool operator>>= (const CORBA::Any& a, nic_metrics_struct_struct& s) {
@@ -829,13 +907,125 @@ inline bool operator>>= (const CORBA::Any& a, nic_metrics_struct_struct& s) {
                 }
             }
         }
+        else if (!strcmp("nic_metrics::rx_throughput", props[idx].id)) {
+            if (!(props[idx].value >>= s.rx_throughput)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
+        else if (!strcmp("nic_metrics::tx_throughput", props[idx].id)) {
+            if (!(props[idx].value >>= s.tx_throughput)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
+        else if (!strcmp("nic_metrics::rx_throughput_average", props[idx].id)) {
+            if (!(props[idx].value >>= s.rx_throughput_average)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
+        else if (!strcmp("nic_metrics::tx_throughput_average", props[idx].id)) {
+            if (!(props[idx].value >>= s.tx_throughput_average)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
+        else if (!strcmp("nic_metrics::rx_throughput_peak", props[idx].id)) {
+            if (!(props[idx].value >>= s.rx_throughput_peak)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
+        else if (!strcmp("nic_metrics::tx_throughput_peak", props[idx].id)) {
+            if (!(props[idx].value >>= s.tx_throughput_peak)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
+        else if (!strcmp("nic_metrics::rx_packet_rate", props[idx].id)) {
+            if (!(props[idx].value >>= s.rx_packet_rate)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
+        else if (!strcmp("nic_metrics::tx_packet_rate", props[idx].id)) {
+            if (!(props[idx].value >>= s.tx_packet_rate)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
+        else if (!strcmp("nic_metrics::rx_dropped_rate", props[idx].id)) {
+            if (!(props[idx].value >>= s.rx_dropped_rate)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
+        else if (!strcmp("nic_metrics::rx_dropped_peak", props[idx].id)) {
+            if (!(props[idx].value >>= s.rx_dropped_peak)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
+        else if (!strcmp("nic_metrics::tx_dropped_rate", props[idx].id)) {
+            if (!(props[idx].value >>= s.tx_dropped_rate)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
+        else if (!strcmp("nic_metrics::rx_error_rate", props[idx].id)) {
+            if (!(props[idx].value >>= s.rx_error_rate)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
+        else if (!strcmp("nic_metrics::tx_error_rate", props[idx].id)) {
+            if (!(props[idx].value >>= s.tx_error_rate)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
+        else if (!strcmp("nic_metrics::bursts", props[idx].id)) {
+            if (!(props[idx].value >>= s.bursts)) {
+                CORBA::TypeCode_var typecode = props[idx].value.type();
+                if (typecode->kind() != CORBA::tk_null) {
+                    return false;
+                }
+            }
+        }
     }
     return true;
 };
 
 inline void operator<<= (CORBA::Any& a, const nic_metrics_struct_struct& s) {
     CF::Properties props;
-    props.length(31);
+    props.length(45);
     props[0].id = CORBA::string_dup("nic_metrics::interface");
     props[0].value <<= s.interface;
     props[1].id = CORBA::string_dup("nic_metrics::mac_address");
@@ -898,6 +1088,34 @@ inline void operator<<= (CORBA::Any& a, const nic_metrics_struct_struct& s) {
     props[29].value <<= s.time;
     props[30].id = CORBA::string_dup("nic_metrics::current_throughput");
     props[30].value <<= s.current_throughput;
+    props[31].id = CORBA::string_dup("nic_metrics::rx_throughput");
+    props[31].value <<= s.rx_throughput;
+    props[32].id = CORBA::string_dup("nic_metrics::tx_throughput");
+    props[32].value <<= s.tx_throughput;
+    props[33].id = CORBA::string_dup("nic_metrics::rx_throughput_average");
+    props[33].value <<= s.rx_throughput_average;
+    props[34].id = CORBA::string_dup("nic_metrics::tx_throughput_average");
+    props[34].value <<= s.tx_throughput_average;
+    props[35].id = CORBA::string_dup("nic_metrics::rx_throughput_peak");
+    props[35].value <<= s.rx_throughput_peak;
+    props[36].id = CORBA::string_dup("nic_metrics::tx_throughput_peak");
+    props[36].value <<= s.tx_throughput_peak;
+    props[37].id = CORBA::string_dup("nic_metrics::rx_packet_rate");
+    props[37].value <<= s.rx_packet_rate;
+    props[38].id = CORBA::string_dup("nic_metrics::tx_packet_rate");
+    props[38].value <<= s.tx_packet_rate;
+    props[39].id = CORBA::string_dup("nic_metrics::rx_dropped_rate");
+    props[39].value <<= s.rx_dropped_rate;
+    props[40].id = CORBA::string_dup("nic_metrics::rx_dropped_peak");
+    props[40].value <<= s.rx_dropped_peak;
+    props[41].id = CORBA::string_dup("nic_metrics::tx_dropped_rate");
+    props[41].value <<= s.tx_dropped_rate;
+    props[42].id = CORBA::string_dup("nic_metrics::rx_error_rate");
+    props[42].value <<= s.rx_error_rate;
+    props[43].id = CORBA::string_dup("nic_metrics::tx_error_rate");
+    props[43].value <<= s.tx_error_rate;
+    props[44].id = CORBA::string_dup("nic_metrics::bursts");
+    props[44].value <<= s.bursts;
     a <<= props;
 };
 
@@ -964,6 +1182,34 @@ inline bool operator== (const nic_metrics_struct_struct& s1, const nic_metrics_s
         return false;
     if (s1.current_throughput!=s2.current_throughput)
         return false;
+    if (s1.rx_throughput!=s2.rx_throughput)
+        return false;
+    if (s1.tx_throughput!=s2.tx_throughput)
+        return false;
+    if (s1.rx_throughput_average!=s2.rx_throughput_average)
+        return false;
+    if (s1.tx_throughput_average!=s2.tx_throughput_average)
+        return false;
+    if (s1.rx_throughput_peak!=s2.rx_throughput_peak)
+        return false;
+    if (s1.tx_throughput_peak!=s2.tx_throughput_peak)
+        return false;
+    if (s1.rx_packet_rate!=s2.rx_packet_rate)
+        return false;
+    if (s1.tx_packet_rate!=s2.tx_packet_rate)
+        return false;
+    if (s1.rx_dropped_rate!=s2.rx_dropped_rate)
+        return false;
+    if (s1.rx_dropped_peak!=s2.rx_dropped_peak)
+        return false;
+    if (s1.tx_dropped_rate!=s2.tx_dropped_rate)
+        return false;
+    if (s1.rx_error_rate!=s2.rx_error_rate)
+        return false;
+    if (s1.tx_error_rate!=s2.tx_error_rate)
+        return false;
+    if (s1.bursts!=s2.bursts)
+        return false;
     return true;
 };
 
@@ -1246,10 +1492,16 @@ struct component_monitor_struct {
     unsigned short pid;
     float cores;
     float mem_rss;
+    float mem_pss;
+    float mem_uss;
     float mem_percent;
     CORBA::ULong num_processes;
     CORBA::ULong num_threads;
     CORBA::ULong num_files;
+    float cores_ewma;
+    float cores_peak;
+    float cores_p50;
+    float cores_p95;
 };
 
 inline bool operator>>= (const CORBA::Any& a, component_monitor_struct& s) {
@@ -1271,6 +1523,12 @@ inline bool operator>>= (const CORBA::Any& a, component_monitor_struct& s) {
     if (props.contains("component_monitor::component_monitor::mem_rss")) {
         if (!(props["component_monitor::component_monitor::mem_rss"] >>= s.mem_rss)) return false;
     }
+    if (props.contains("component_monitor::component_monitor::mem_pss")) {
+        if (!(props["component_monitor::component_monitor::mem_pss"] >>= s.mem_pss)) return false;
+    }
+    if (props.contains("component_monitor::component_monitor::mem_uss")) {
+        if (!(props["component_monitor::component_monitor::mem_uss"] >>= s.mem_uss)) return false;
+    }
     if (props.contains("component_monitor::component_monitor::mem_percent")) {
         if (!(props["component_monitor::component_monitor::mem_percent"] >>= s.mem_percent)) return false;
     }
@@ -1283,6 +1541,18 @@ inline bool operator>>= (const CORBA::Any& a, component_monitor_struct& s) {
     if (props.contains("component_monitor::component_monitor::num_files")) {
         if (!(props["component_monitor::component_monitor::num_files"] >>= s.num_files)) return false;
     }
+    if (props.contains("component_monitor::component_monitor::cores_ewma")) {
+        if (!(props["component_monitor::component_monitor::cores_ewma"] >>= s.cores_ewma)) return false;
+    }
+    if (props.contains("component_monitor::component_monitor::cores_peak")) {
+        if (!(props["component_monitor::component_monitor::cores_peak"] >>= s.cores_peak)) return false;
+    }
+    if (props.contains("component_monitor::component_monitor::cores_p50")) {
+        if (!(props["component_monitor::component_monitor::cores_p50"] >>= s.cores_p50)) return false;
+    }
+    if (props.contains("component_monitor::component_monitor::cores_p95")) {
+        if (!(props["component_monitor::component_monitor::cores_p95"] >>= s.cores_p95)) return false;
+    }
     return true;
 }
 
@@ -1299,6 +1569,10 @@ inline void operator<<= (CORBA::Any& a, const component_monitor_struct& s) {
  
     props["component_monitor::component_monitor::mem_rss"] = s.mem_rss;
  
+    props["component_monitor::component_monitor::mem_pss"] = s.mem_pss;
+ 
+    props["component_monitor::component_monitor::mem_uss"] = s.mem_uss;
+ 
     props["component_monitor::component_monitor::mem_percent"] = s.mem_percent;
  
     props["component_monitor::component_monitor::num_processes"] = s.num_processes;
@@ -1306,6 +1580,14 @@ inline void operator<<= (CORBA::Any& a, const component_monitor_struct& s) {
     props["component_monitor::component_monitor::num_threads"] = s.num_threads;
  
     props["component_monitor::component_monitor::num_files"] = s.num_files;
+ 
+    props["component_monitor::component_monitor::cores_ewma"] = s.cores_ewma;
+ 
+    props["component_monitor::component_monitor::cores_peak"] = s.cores_peak;
+ 
+    props["component_monitor::component_monitor::cores_p50"] = s.cores_p50;
+ 
+    props["component_monitor::component_monitor::cores_p95"] = s.cores_p95;
     a <<= props;
 }
 
@@ -1320,6 +1602,10 @@ inline bool operator== (const component_monitor_struct& s1, const component_moni
         return false;
     if (s1.mem_rss!=s2.mem_rss)
         return false;
+    if (s1.mem_pss!=s2.mem_pss)
+        return false;
+    if (s1.mem_uss!=s2.mem_uss)
+        return false;
     if (s1.mem_percent!=s2.mem_percent)
         return false;
     if (s1.num_processes!=s2.num_processes)
@@ -1328,6 +1614,14 @@ inline bool operator== (const component_monitor_struct& s1, const component_moni
         return false;
     if (s1.num_files!=s2.num_files)
         return false;
+    if (s1.cores_ewma!=s2.cores_ewma)
+        return false;
+    if (s1.cores_peak!=s2.cores_peak)
+        return false;
+    if (s1.cores_p50!=s2.cores_p50)
+        return false;
+    if (s1.cores_p95!=s2.cores_p95)
+        return false;
     return true;
 }
 
@@ -1335,4 +1629,737 @@ inline bool operator!= (const component_monitor_struct& s1, const component_moni
     return !(s1==s2);
 }
 
+struct application_monitor_struct {
+    application_monitor_struct ()
+    {
+        cores = 0.0;
+        reserved_cores = 0.0;
+        reservation_used = 0.0;
+        mem_rss = 0.0;
+        mem_pss = 0.0;
+        mem_uss = 0.0;
+        mem_percent = 0.0;
+        num_components = 0;
+        num_processes = 0;
+        num_threads = 0;
+        num_files = 0;
+    };
+
+    static std::string getId() {
+        return std::string("application_monitor::application_monitor");
+    };
+
+    std::string waveform_id;
+    float cores;
+    float reserved_cores;
+    float reservation_used;
+    float mem_rss;
+    float mem_pss;
+    float mem_uss;
+    float mem_percent;
+    CORBA::ULong num_components;
+    CORBA::ULong num_processes;
+    CORBA::ULong num_threads;
+    CORBA::ULong num_files;
+};
+
+inline bool operator>>= (const CORBA::Any& a, application_monitor_struct& s) {
+    CF::Properties* temp;
+    if (!(a >>= temp)) return false;
+    const redhawk::PropertyMap& props = redhawk::PropertyMap::cast(*temp);
+    if (props.contains("application_monitor::application_monitor::waveform_id")) {
+        if (!(props["application_monitor::application_monitor::waveform_id"] >>= s.waveform_id)) return false;
+    }
+    if (props.contains("application_monitor::application_monitor::cores")) {
+        if (!(props["application_monitor::application_monitor::cores"] >>= s.cores)) return false;
+    }
+    if (props.contains("application_monitor::application_monitor::reserved_cores")) {
+        if (!(props["application_monitor::application_monitor::reserved_cores"] >>= s.reserved_cores)) return false;
+    }
+    if (props.contains("application_monitor::application_monitor::reservation_used")) {
+        if (!(props["application_monitor::application_monitor::reservation_used"] >>= s.reservation_used)) return false;
+    }
+    if (props.contains("application_monitor::application_monitor::mem_rss")) {
+        if (!(props["application_monitor::application_monitor::mem_rss"] >>= s.mem_rss)) return false;
+    }
+    if (props.contains("application_monitor::application_monitor::mem_pss")) {
+        if (!(props["application_monitor::application_monitor::mem_pss"] >>= s.mem_pss)) return false;
+    }
+    if (props.contains("application_monitor::application_monitor::mem_uss")) {
+        if (!(props["application_monitor::application_monitor::mem_uss"] >>= s.mem_uss)) return false;
+    }
+    if (props.contains("application_monitor::application_monitor::mem_percent")) {
+        if (!(props["application_monitor::application_monitor::mem_percent"] >>= s.mem_percent)) return false;
+    }
+    if (props.contains("application_monitor::application_monitor::num_components")) {
+        if (!(props["application_monitor::application_monitor::num_components"] >>= s.num_components)) return false;
+    }
+    if (props.contains("application_monitor::application_monitor::num_processes")) {
+        if (!(props["application_monitor::application_monitor::num_processes"] >>= s.num_processes)) return false;
+    }
+    if (props.contains("application_monitor::application_monitor::num_threads")) {
+        if (!(props["application_monitor::application_monitor::num_threads"] >>= s.num_threads)) return false;
+    }
+    if (props.contains("application_monitor::application_monitor::num_files")) {
+        if (!(props["application_monitor::application_monitor::num_files"] >>= s.num_files)) return false;
+    }
+    return true;
+}
+
+inline void operator<<= (CORBA::Any& a, const application_monitor_struct& s) {
+    redhawk::PropertyMap props;
+ 
+    props["application_monitor::application_monitor::waveform_id"] = s.waveform_id;
+ 
+    props["application_monitor::application_monitor::cores"] = s.cores;
+ 
+    props["application_monitor::application_monitor::reserved_cores"] = s.reserved_cores;
+ 
+    props["application_monitor::application_monitor::reservation_used"] = s.reservation_used;
+ 
+    props["application_monitor::application_monitor::mem_rss"] = s.mem_rss;
+ 
+    props["application_monitor::application_monitor::mem_pss"] = s.mem_pss;
+ 
+    props["application_monitor::application_monitor::mem_uss"] = s.mem_uss;
+ 
+    props["application_monitor::application_monitor::mem_percent"] = s.mem_percent;
+ 
+    props["application_monitor::application_monitor::num_components"] = s.num_components;
+ 
+    props["application_monitor::application_monitor::num_processes"] = s.num_processes;
+ 
+    props["application_monitor::application_monitor::num_threads"] = s.num_threads;
+ 
+    props["application_monitor::application_monitor::num_files"] = s.num_files;
+    a <<= props;
+}
+
+inline bool operator== (const application_monitor_struct& s1, const application_monitor_struct& s2) {
+    if (s1.waveform_id!=s2.waveform_id)
+        return false;
+    if (s1.cores!=s2.cores)
+        return false;
+    if (s1.reserved_cores!=s2.reserved_cores)
+        return false;
+    if (s1.reservation_used!=s2.reservation_used)
+        return false;
+    if (s1.mem_rss!=s2.mem_rss)
+        return false;
+    if (s1.mem_pss!=s2.mem_pss)
+        return false;
+    if (s1.mem_uss!=s2.mem_uss)
+        return false;
+    if (s1.mem_percent!=s2.mem_percent)
+        return false;
+    if (s1.num_components!=s2.num_components)
+        return false;
+    if (s1.num_processes!=s2.num_processes)
+        return false;
+    if (s1.num_threads!=s2.num_threads)
+        return false;
+    if (s1.num_files!=s2.num_files)
+        return false;
+    return true;
+}
+
+inline bool operator!= (const application_monitor_struct& s1, const application_monitor_struct& s2) {
+    return !(s1==s2);
+}
+
+struct cpu_utilization_struct {
+    cpu_utilization_struct ()
+    {
+        cpu = 0;
+        user = 0.0;
+        system = 0.0;
+        idle = 0.0;
+        utilization = 0.0;
+    };
+
+    static std::string getId() {
+        return std::string("cpu_utilization::cpu_utilization");
+    };
+
+    CORBA::ULong cpu;
+    float user;
+    float system;
+    float idle;
+    float utilization;
+};
+
+inline bool operator>>= (const CORBA::Any& a, cpu_utilization_struct& s) {
+    CF::Properties* temp;
+    if (!(a >>= temp)) return false;
+    const redhawk::PropertyMap& props = redhawk::PropertyMap::cast(*temp);
+    if (props.contains("cpu_utilization::cpu_utilization::cpu")) {
+        if (!(props["cpu_utilization::cpu_utilization::cpu"] >>= s.cpu)) return false;
+    }
+    if (props.contains("cpu_utilization::cpu_utilization::user")) {
+        if (!(props["cpu_utilization::cpu_utilization::user"] >>= s.user)) return false;
+    }
+    if (props.contains("cpu_utilization::cpu_utilization::system")) {
+        if (!(props["cpu_utilization::cpu_utilization::system"] >>= s.system)) return false;
+    }
+    if (props.contains("cpu_utilization::cpu_utilization::idle")) {
+        if (!(props["cpu_utilization::cpu_utilization::idle"] >>= s.idle)) return false;
+    }
+    if (props.contains("cpu_utilization::cpu_utilization::utilization")) {
+        if (!(props["cpu_utilization::cpu_utilization::utilization"] >>= s.utilization)) return false;
+    }
+    return true;
+}
+
+inline void operator<<= (CORBA::Any& a, const cpu_utilization_struct& s) {
+    redhawk::PropertyMap props;
+ 
+    props["cpu_utilization::cpu_utilization::cpu"] = s.cpu;
+ 
+    props["cpu_utilization::cpu_utilization::user"] = s.user;
+ 
+    props["cpu_utilization::cpu_utilization::system"] = s.system;
+ 
+    props["cpu_utilization::cpu_utilization::idle"] = s.idle;
+ 
+    props["cpu_utilization::cpu_utilization::utilization"] = s.utilization;
+    a <<= props;
+}
+
+inline bool operator== (const cpu_utilization_struct& s1, const cpu_utilization_struct& s2) {
+    if (s1.cpu!=s2.cpu)
+        return false;
+    if (s1.user!=s2.user)
+        return false;
+    if (s1.system!=s2.system)
+        return false;
+    if (s1.idle!=s2.idle)
+        return false;
+    if (s1.utilization!=s2.utilization)
+        return false;
+    return true;
+}
+
+inline bool operator!= (const cpu_utilization_struct& s1, const cpu_utilization_struct& s2) {
+    return !(s1==s2);
+}
+
+struct cpu_averages_struct {
+    cpu_averages_struct ()
+    {
+        window = 0;
+        span = 0.0;
+        user = 0.0;
+        system = 0.0;
+        idle = 0.0;
+    };
+
+    static std::string getId() {
+        return std::string("cpu_averages::cpu_averages");
+    };
+
+    CORBA::ULong window;
+    float span;
+    float user;
+    float system;
+    float idle;
+};
+
+inline bool operator>>= (const CORBA::Any& a, cpu_averages_struct& s) {
+    CF::Properties* temp;
+    if (!(a >>= temp)) return false;
+    const redhawk::PropertyMap& props = redhawk::PropertyMap::cast(*temp);
+    if (props.contains("cpu_averages::cpu_averages::window")) {
+        if (!(props["cpu_averages::cpu_averages::window"] >>= s.window)) return false;
+    }
+    if (props.contains("cpu_averages::cpu_averages::span")) {
+        if (!(props["cpu_averages::cpu_averages::span"] >>= s.span)) return false;
+    }
+    if (props.contains("cpu_averages::cpu_averages::user")) {
+        if (!(props["cpu_averages::cpu_averages::user"] >>= s.user)) return false;
+    }
+    if (props.contains("cpu_averages::cpu_averages::system")) {
+        if (!(props["cpu_averages::cpu_averages::system"] >>= s.system)) return false;
+    }
+    if (props.contains("cpu_averages::cpu_averages::idle")) {
+        if (!(props["cpu_averages::cpu_averages::idle"] >>= s.idle)) return false;
+    }
+    return true;
+}
+
+inline void operator<<= (CORBA::Any& a, const cpu_averages_struct& s) {
+    redhawk::PropertyMap props;
+ 
+    props["cpu_averages::cpu_averages::window"] = s.window;
+ 
+    props["cpu_averages::cpu_averages::span"] = s.span;
+ 
+    props["cpu_averages::cpu_averages::user"] = s.user;
+ 
+    props["cpu_averages::cpu_averages::system"] = s.system;
+ 
+    props["cpu_averages::cpu_averages::idle"] = s.idle;
+    a <<= props;
+}
+
+inline bool operator== (const cpu_averages_struct& s1, const cpu_averages_struct& s2) {
+    if (s1.window!=s2.window)
+        return false;
+    if (s1.span!=s2.span)
+        return false;
+    if (s1.user!=s2.user)
+        return false;
+    if (s1.system!=s2.system)
+        return false;
+    if (s1.idle!=s2.idle)
+        return false;
+    return true;
+}
+
+inline bool operator!= (const cpu_averages_struct& s1, const cpu_averages_struct& s2) {
+    return !(s1==s2);
+}
+
+struct diskrateTotal_struct {
+    diskrateTotal_struct ()
+    {
+        rate = 0.0;
+    };
+
+    static std::string getId() {
+        return std::string("diskrateTotal::diskrateTotal");
+    };
+
+    std::string device;
+    float rate;
+};
+
+inline bool operator>>= (const CORBA::Any& a, diskrateTotal_struct& s) {
+    CF::Properties* temp;
+    if (!(a >>= temp)) return false;
+    const redhawk::PropertyMap& props = redhawk::PropertyMap::cast(*temp);
+    if (props.contains("diskrateTotal::diskrateTotal::device")) {
+        if (!(props["diskrateTotal::diskrateTotal::device"] >>= s.device)) return false;
+    }
+    if (props.contains("diskrateTotal::diskrateTotal::rate")) {
+        if (!(props["diskrateTotal::diskrateTotal::rate"] >>= s.rate)) return false;
+    }
+    return true;
+}
+
+inline void operator<<= (CORBA::Any& a, const diskrateTotal_struct& s) {
+    redhawk::PropertyMap props;
+ 
+    props["diskrateTotal::diskrateTotal::device"] = s.device;
+ 
+    props["diskrateTotal::diskrateTotal::rate"] = s.rate;
+    a <<= props;
+}
+
+inline bool operator== (const diskrateTotal_struct& s1, const diskrateTotal_struct& s2) {
+    if (s1.device!=s2.device)
+        return false;
+    if (s1.rate!=s2.rate)
+        return false;
+    return true;
+}
+
+inline bool operator!= (const diskrateTotal_struct& s1, const diskrateTotal_struct& s2) {
+    return !(s1==s2);
+}
+
+struct disk_metrics_struct {
+    disk_metrics_struct ()
+    {
+        read_rate = 0.0;
+        write_rate = 0.0;
+        utilization = 0.0;
+        in_flight = 0;
+        rate_total = 0.0;
+    };
+
+    static std::string getId() {
+        return std::string("disk_metrics::disk_metrics");
+    };
+
+    std::string device;
+    float read_rate;
+    float write_rate;
+    float utilization;
+    CORBA::ULong in_flight;
+    float rate_total;
+};
+
+inline bool operator>>= (const CORBA::Any& a, disk_metrics_struct& s) {
+    CF::Properties* temp;
+    if (!(a >>= temp)) return false;
+    const redhawk::PropertyMap& props = redhawk::PropertyMap::cast(*temp);
+    if (props.contains("disk_metrics::disk_metrics::device")) {
+        if (!(props["disk_metrics::disk_metrics::device"] >>= s.device)) return false;
+    }
+    if (props.contains("disk_metrics::disk_metrics::read_rate")) {
+        if (!(props["disk_metrics::disk_metrics::read_rate"] >>= s.read_rate)) return false;
+    }
+    if (props.contains("disk_metrics::disk_metrics::write_rate")) {
+        if (!(props["disk_metrics::disk_metrics::write_rate"] >>= s.write_rate)) return false;
+    }
+    if (props.contains("disk_metrics::disk_metrics::utilization")) {
+        if (!(props["disk_metrics::disk_metrics::utilization"] >>= s.utilization)) return false;
+    }
+    if (props.contains("disk_metrics::disk_metrics::in_flight")) {
+        if (!(props["disk_metrics::disk_metrics::in_flight"] >>= s.in_flight)) return false;
+    }
+    if (props.contains("disk_metrics::disk_metrics::rate_total")) {
+        if (!(props["disk_metrics::disk_metrics::rate_total"] >>= s.rate_total)) return false;
+    }
+    return true;
+}
+
+inline void operator<<= (CORBA::Any& a, const disk_metrics_struct& s) {
+    redhawk::PropertyMap props;
+ 
+    props["disk_metrics::disk_metrics::device"] = s.device;
+ 
+    props["disk_metrics::disk_metrics::read_rate"] = s.read_rate;
+ 
+    props["disk_metrics::disk_metrics::write_rate"] = s.write_rate;
+ 
+    props["disk_metrics::disk_metrics::utilization"] = s.utilization;
+ 
+    props["disk_metrics::disk_metrics::in_flight"] = s.in_flight;
+ 
+    props["disk_metrics::disk_metrics::rate_total"] = s.rate_total;
+    a <<= props;
+}
+
+inline bool operator== (const disk_metrics_struct& s1, const disk_metrics_struct& s2) {
+    if (s1.device!=s2.device)
+        return false;
+    if (s1.read_rate!=s2.read_rate)
+        return false;
+    if (s1.write_rate!=s2.write_rate)
+        return false;
+    if (s1.utilization!=s2.utilization)
+        return false;
+    if (s1.in_flight!=s2.in_flight)
+        return false;
+    if (s1.rate_total!=s2.rate_total)
+        return false;
+    return true;
+}
+
+inline bool operator!= (const disk_metrics_struct& s1, const disk_metrics_struct& s2) {
+    return !(s1==s2);
+}
+
+struct disk_writeback_struct {
+    disk_writeback_struct ()
+    {
+        dirty = 0.0;
+        writeback = 0.0;
+    };
+
+    static std::string getId() {
+        return std::string("disk_writeback");
+    };
+
+    float dirty;
+    float writeback;
+};
+
+inline bool operator>>= (const CORBA::Any& a, disk_writeback_struct& s) {
+    CF::Properties* temp;
+    if (!(a >>= temp)) return false;
+    const redhawk::PropertyMap& props = redhawk::PropertyMap::cast(*temp);
+    if (props.contains("disk_writeback::dirty")) {
+        if (!(props["disk_writeback::dirty"] >>= s.dirty)) return false;
+    }
+    if (props.contains("disk_writeback::writeback")) {
+        if (!(props["disk_writeback::writeback"] >>= s.writeback)) return false;
+    }
+    return true;
+}
+
+inline void operator<<= (CORBA::Any& a, const disk_writeback_struct& s) {
+    redhawk::PropertyMap props;
+ 
+    props["disk_writeback::dirty"] = s.dirty;
+ 
+    props["disk_writeback::writeback"] = s.writeback;
+    a <<= props;
+}
+
+inline bool operator== (const disk_writeback_struct& s1, const disk_writeback_struct& s2) {
+    if (s1.dirty!=s2.dirty)
+        return false;
+    if (s1.writeback!=s2.writeback)
+        return false;
+    return true;
+}
+
+inline bool operator!= (const disk_writeback_struct& s1, const disk_writeback_struct& s2) {
+    return !(s1==s2);
+}
+
+struct threshold_cadence_struct {
+    threshold_cadence_struct ()
+    {
+        adaptive = false;
+        minimum = 100;
+        maximum = 2000;
+        near = 10;
+        far = 50;
+        hysteresis = 25;
+    };
+
+    static std::string getId() {
+        return std::string("threshold_cadence");
+    };
+
+    bool adaptive;
+    CORBA::ULong minimum;
+    CORBA::ULong maximum;
+    float near;
+    float far;
+    float hysteresis;
+};
+
+inline bool operator>>= (const CORBA::Any& a, threshold_cadence_struct& s) {
+    CF::Properties* temp;
+    if (!(a >>= temp)) return false;
+    const redhawk::PropertyMap& props = redhawk::PropertyMap::cast(*temp);
+    if (props.contains("threshold_cadence::adaptive")) {
+        if (!(props["threshold_cadence::adaptive"] >>= s.adaptive)) return false;
+    }
+    if (props.contains("threshold_cadence::minimum")) {
+        if (!(props["threshold_cadence::minimum"] >>= s.minimum)) return false;
+    }
+    if (props.contains("threshold_cadence::maximum")) {
+        if (!(props["threshold_cadence::maximum"] >>= s.maximum)) return false;
+    }
+    if (props.contains("threshold_cadence::near")) {
+        if (!(props["threshold_cadence::near"] >>= s.near)) return false;
+    }
+    if (props.contains("threshold_cadence::far")) {
+        if (!(props["threshold_cadence::far"] >>= s.far)) return false;
+    }
+    if (props.contains("threshold_cadence::hysteresis")) {
+        if (!(props["threshold_cadence::hysteresis"] >>= s.hysteresis)) return false;
+    }
+    return true;
+}
+
+inline void operator<<= (CORBA::Any& a, const threshold_cadence_struct& s) {
+    redhawk::PropertyMap props;
+ 
+    props["threshold_cadence::adaptive"] = s.adaptive;
+ 
+    props["threshold_cadence::minimum"] = s.minimum;
+ 
+    props["threshold_cadence::maximum"] = s.maximum;
+ 
+    props["threshold_cadence::near"] = s.near;
+ 
+    props["threshold_cadence::far"] = s.far;
+ 
+    props["threshold_cadence::hysteresis"] = s.hysteresis;
+    a <<= props;
+}
+
+inline bool operator== (const threshold_cadence_struct& s1, const threshold_cadence_struct& s2) {
+    if (s1.adaptive!=s2.adaptive)
+        return false;
+    if (s1.minimum!=s2.minimum)
+        return false;
+    if (s1.maximum!=s2.maximum)
+        return false;
+    if (s1.near!=s2.near)
+        return false;
+    if (s1.far!=s2.far)
+        return false;
+    if (s1.hysteresis!=s2.hysteresis)
+        return false;
+    return true;
+}
+
+inline bool operator!= (const threshold_cadence_struct& s1, const threshold_cadence_struct& s2) {
+    return !(s1==s2);
+}
+
+struct threshold_cadence_status_struct {
+    threshold_cadence_status_struct ()
+    {
+        cycle_time = 0;
+        headroom = 0.0;
+        update_time = 0.0;
+        overhead = 0.0;
+        detection_time = 0.0;
+    };
+
+    static std::string getId() {
+        return std::string("threshold_cadence_status");
+    };
+
+    CORBA::ULong cycle_time;
+    float headroom;
+    std::string limiting_metric;
+    float update_time;
+    float overhead;
+    float detection_time;
+};
+
+inline bool operator>>= (const CORBA::Any& a, threshold_cadence_status_struct& s) {
+    CF::Properties* temp;
+    if (!(a >>= temp)) return false;
+    const redhawk::PropertyMap& props = redhawk::PropertyMap::cast(*temp);
+    if (props.contains("threshold_cadence_status::cycle_time")) {
+        if (!(props["threshold_cadence_status::cycle_time"] >>= s.cycle_time)) return false;
+    }
+    if (props.contains("threshold_cadence_status::headroom")) {
+        if (!(props["threshold_cadence_status::headroom"] >>= s.headroom)) return false;
+    }
+    if (props.contains("threshold_cadence_status::limiting_metric")) {
+        if (!(props["threshold_cadence_status::limiting_metric"] >>= s.limiting_metric)) return false;
+    }
+    if (props.contains("threshold_cadence_status::update_time")) {
+        if (!(props["threshold_cadence_status::update_time"] >>= s.update_time)) return false;
+    }
+    if (props.contains("threshold_cadence_status::overhead")) {
+        if (!(props["threshold_cadence_status::overhead"] >>= s.overhead)) return false;
+    }
+    if (props.contains("threshold_cadence_status::detection_time")) {
+        if (!(props["threshold_cadence_status::detection_time"] >>= s.detection_time)) return false;
+    }
+    return true;
+}
+
+inline void operator<<= (CORBA::Any& a, const threshold_cadence_status_struct& s) {
+    redhawk::PropertyMap props;
+ 
+    props["threshold_cadence_status::cycle_time"] = s.cycle_time;
+ 
+    props["threshold_cadence_status::headroom"] = s.headroom;
+ 
+    props["threshold_cadence_status::limiting_metric"] = s.limiting_metric;
+ 
+    props["threshold_cadence_status::update_time"] = s.update_time;
+ 
+    props["threshold_cadence_status::overhead"] = s.overhead;
+ 
+    props["threshold_cadence_status::detection_time"] = s.detection_time;
+    a <<= props;
+}
+
+inline bool operator== (const threshold_cadence_status_struct& s1, const threshold_cadence_status_struct& s2) {
+    if (s1.cycle_time!=s2.cycle_time)
+        return false;
+    if (s1.headroom!=s2.headroom)
+        return false;
+    if (s1.limiting_metric!=s2.limiting_metric)
+        return false;
+    if (s1.update_time!=s2.update_time)
+        return false;
+    if (s1.overhead!=s2.overhead)
+        return false;
+    if (s1.detection_time!=s2.detection_time)
+        return false;
+    return true;
+}
+
+inline bool operator!= (const threshold_cadence_status_struct& s1, const threshold_cadence_status_struct& s2) {
+    return !(s1==s2);
+}
+
+struct update_schedule_struct {
+    update_schedule_struct ()
+    {
+        period = 0;
+        runs = 0;
+        deferred = 0;
+        wall_time = 0.0;
+        cpu_time = 0.0;
+        max_wall_time = 0.0;
+    };
+
+    static std::string getId() {
+        return std::string("update_schedule::update_schedule");
+    };
+
+    std::string name;
+    CORBA::ULong period;
+    CORBA::ULong runs;
+    CORBA::ULong deferred;
+    float wall_time;
+    float cpu_time;
+    float max_wall_time;
+};
+
+inline bool operator>>= (const CORBA::Any& a, update_schedule_struct& s) {
+    CF::Properties* temp;
+    if (!(a >>= temp)) return false;
+    const redhawk::PropertyMap& props = redhawk::PropertyMap::cast(*temp);
+    if (props.contains("update_schedule::update_schedule::name")) {
+        if (!(props["update_schedule::update_schedule::name"] >>= s.name)) return false;
+    }
+    if (props.contains("update_schedule::update_schedule::period")) {
+        if (!(props["update_schedule::update_schedule::period"] >>= s.period)) return false;
+    }
+    if (props.contains("update_schedule::update_schedule::runs")) {
+        if (!(props["update_schedule::update_schedule::runs"] >>= s.runs)) return false;
+    }
+    if (props.contains("update_schedule::update_schedule::deferred")) {
+        if (!(props["update_schedule::update_schedule::deferred"] >>= s.deferred)) return false;
+    }
+    if (props.contains("update_schedule::update_schedule::wall_time")) {
+        if (!(props["update_schedule::update_schedule::wall_time"] >>= s.wall_time)) return false;
+    }
+    if (props.contains("update_schedule::update_schedule::cpu_time")) {
+        if (!(props["update_schedule::update_schedule::cpu_time"] >>= s.cpu_time)) return false;
+    }
+    if (props.contains("update_schedule::update_schedule::max_wall_time")) {
+        if (!(props["update_schedule::update_schedule::max_wall_time"] >>= s.max_wall_time)) return false;
+    }
+    return true;
+}
+
+inline void operator<<= (CORBA::Any& a, const update_schedule_struct& s) {
+    redhawk::PropertyMap props;
+ 
+    props["update_schedule::update_schedule::name"] = s.name;
+ 
+    props["update_schedule::update_schedule::period"] = s.period;
+ 
+    props["update_schedule::update_schedule::runs"] = s.runs;
+ 
+    props["update_schedule::update_schedule::deferred"] = s.deferred;
+ 
+    props["update_schedule::update_schedule::wall_time"] = s.wall_time;
+ 
+    props["update_schedule::update_schedule::cpu_time"] = s.cpu_time;
+ 
+    props["update_schedule::update_schedule::max_wall_time"] = s.max_wall_time;
+    a <<= props;
+}
+
+inline bool operator== (const update_schedule_struct& s1, const update_schedule_struct& s2) {
+    if (s1.name!=s2.name)
+        return false;
+    if (s1.period!=s2.period)
+        return false;
+    if (s1.runs!=s2.runs)
+        return false;
+    if (s1.deferred!=s2.deferred)
+        return false;
+    if (s1.wall_time!=s2.wall_time)
+        return false;
+    if (s1.cpu_time!=s2.cpu_time)
+        return false;
+    if (s1.max_wall_time!=s2.max_wall_time)
+        return false;
+    return true;
+}
+
+inline bool operator!= (const update_schedule_struct& s1, const update_schedule_struct& s2) {
+    return !(s1==s2);
+}
+
 #endif // STRUCTPROPS_H
@@ -0,0 +1,317 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include <errno.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/stat.h>
+#include <sys/types.h>
+#include <iostream>
+#include <fstream>
+#include <sstream>
+#include <boost/lexical_cast.hpp>
+#include <boost/algorithm/string.hpp>
+#include "CgroupAccounting.h"
+
+#ifdef DEBUG_ON
+#define DEBUG(x)         std::cout << x << std::endl
+#else
+#define DEBUG(x)
+#endif
+
+//
+// read a small control file, returns the number of bytes read or -1
+//
+static ssize_t read_control( const std::string &fname, char *buf, const size_t len )
+{
+  int fd = open(fname.c_str(), O_RDONLY | O_CLOEXEC);
+  if ( fd < 0 ) return -1;
+  ssize_t n = read(fd, buf, len-1);
+  close(fd);
+  if ( n < 0 ) return -1;
+  buf[n] = '\0';
+  return n;
+}
+
+
+CgroupAccounting::CgroupAccounting() :
+  active(false),
+  sequence(0)
+{
+}
+
+CgroupAccounting::~CgroupAccounting()
+{
+}
+
+bool CgroupAccounting::enabled() const
+{
+  return active;
+}
+
+const std::string &CgroupAccounting::get_base() const
+{
+  return base;
+}
+
+bool CgroupAccounting::write_file( const std::string &fname, const std::string &value )
+{
+  int fd = open(fname.c_str(), O_WRONLY | O_CLOEXEC);
+  if ( fd < 0 ) return false;
+  ssize_t n = write(fd, value.c_str(), value.size());
+  close(fd);
+  return n == (ssize_t)value.size();
+}
+
+void CgroupAccounting::rollback( const std::string &origin, const std::string &restore, const std::vector<std::string> &created, const bool moved )
+{
+  if ( moved && !write_file(origin + "/cgroup.procs", boost::lexical_cast<std::string>(getpid())) ) {
+    DEBUG("CgroupAccounting: unable to move back to " << origin << ": " << strerror(errno));
+  }
+  // a cgroup can only be removed once its children are gone
+  for ( std::vector<std::string>::const_reverse_iterator it=created.rbegin(); it != created.rend(); it++ ) {
+    rmdir(it->c_str());
+  }
+  if ( !restore.empty() && !write_file(origin + "/cgroup.subtree_control", restore) ) {
+    DEBUG("CgroupAccounting: unable to restore controllers in " << origin << ": " << strerror(errno));
+  }
+  base.clear();
+  components.clear();
+}
+
+bool CgroupAccounting::initialize()
+{
+  boost::mutex::scoped_lock guard(lock);
+  if ( active ) return true;
+
+  //
+  // cgroup v2 membership is the "0::<path>" entry
+  //
+  std::string rel;
+  std::string line;
+  std::ifstream cgroup_file("/proc/self/cgroup");
+  while ( std::getline(cgroup_file, line) ) {
+    if ( line.compare(0, 3, "0::") == 0 ) {
+      rel = line.substr(3);
+      break;
+    }
+  }
+  if ( rel.empty() ) {
+    DEBUG("CgroupAccounting: process is not in a cgroup v2 hierarchy");
+    return false;
+  }
+
+  //
+  // find the cgroup2 mount, the filesystem type follows the " - " separator
+  //
+  std::string mount;
+  std::ifstream mountinfo("/proc/self/mountinfo");
+  while ( std::getline(mountinfo, line) ) {
+    size_t sep = line.find(" - ");
+    if ( sep == std::string::npos ) continue;
+    if ( line.compare(sep+3, 8, "cgroup2 ") != 0 ) continue;
+    std::vector<std::string> fields;
+    std::string head = line.substr(0, sep);
+    boost::split(fields, head, boost::is_any_of(" "));
+    if ( fields.size() > 4 ) {
+      mount = fields[4];
+      break;
+    }
+  }
+  if ( mount.empty() ) {
+    DEBUG("CgroupAccounting: cgroup2 filesystem is not mounted");
+    return false;
+  }
+
+  base = mount + ( rel == "/" ? "" : rel );
+  char buf[512];
+  if ( read_control(base + "/cgroup.controllers", buf, sizeof(buf)) < 0 ||
+       strstr(buf, "memory") == NULL || strstr(buf, "pids") == NULL ) {
+    DEBUG("CgroupAccounting: memory and pids controllers are not delegated to " << base);
+    return false;
+  }
+
+  std::string origin = base;
+  std::string restore;
+  std::vector<std::string> created;
+  if ( rel == "/" ) {
+    //
+    // never populate the root cgroup directly, and only enable the
+    // controllers the host has not enabled already so a failed setup can
+    // put the root back the way it was
+    //
+    if ( read_control(base + "/cgroup.subtree_control", buf, sizeof(buf)) < 0 ) return false;
+    std::string enable;
+    if ( strstr(buf, "memory") == NULL ) {
+      enable += "+memory ";
+      restore += "-memory ";
+    }
+    if ( strstr(buf, "pids") == NULL ) {
+      enable += "+pids ";
+      restore += "-pids ";
+    }
+    if ( !enable.empty() && !write_file(base + "/cgroup.subtree_control", enable) ) return false;
+    base = base + "/redhawk-gpp." + boost::lexical_cast<std::string>(getpid());
+    if ( mkdir(base.c_str(), 0755) == 0 ) {
+      created.push_back(base);
+    } else if ( errno != EEXIST ) {
+      rollback(origin, restore, created, false);
+      return false;
+    }
+  }
+
+  //
+  // controllers can only be enabled for children of a cgroup without
+  // processes, so the GPP moves itself into its own leaf first
+  //
+  std::string gpp_leaf = base + "/gpp";
+  if ( mkdir(gpp_leaf.c_str(), 0755) == 0 ) {
+    created.push_back(gpp_leaf);
+  } else if ( errno != EEXIST ) {
+    rollback(origin, restore, created, false);
+    return false;
+  }
+  if ( !write_file(gpp_leaf + "/cgroup.procs", boost::lexical_cast<std::string>(getpid())) ) {
+    rollback(origin, restore, created, false);
+    return false;
+  }
+  if ( !write_file(base + "/cgroup.subtree_control", "+memory +pids") ) {
+    DEBUG("CgroupAccounting: unable to enable controllers in " << base << ": " << strerror(errno));
+    rollback(origin, restore, created, true);
+    return false;
+  }
+
+  components = base + "/components";
+  if ( mkdir(components.c_str(), 0755) == 0 ) {
+    created.push_back(components);
+  } else if ( errno != EEXIST ) {
+    rollback(origin, restore, created, true);
+    return false;
+  }
+  if ( !write_file(components + "/cgroup.subtree_control", "+memory +pids") ) {
+    rollback(origin, restore, created, true);
+    return false;
+  }
+
+  active = true;
+  return true;
+}
+
+int CgroupAccounting::create_leaf( std::string &leaf )
+{
+  boost::mutex::scoped_lock guard(lock);
+  if ( !active ) return -1;
+
+  leaf = components + "/c" + boost::lexical_cast<std::string>(sequence++);
+  if ( mkdir(leaf.c_str(), 0755) < 0 ) return -1;
+  int fd = open((leaf + "/cgroup.procs").c_str(), O_WRONLY | O_CLOEXEC);
+  if ( fd < 0 ) {
+    rmdir(leaf.c_str());
+  }
+  return fd;
+}
+
+int CgroupAccounting::join( const int procs_fd )
+{
+  if ( write(procs_fd, "0", 1) != 1 ) return -1;
+  return 0;
+}
+
+bool CgroupAccounting::assign( const int pid, const std::string &leaf )
+{
+  //
+  // the child joins its leaf before exec, writing the pid again confirms the
+  // placement (and performs it if the child could not)
+  //
+  if ( !write_file(leaf + "/cgroup.procs", boost::lexical_cast<std::string>(pid)) ) {
+    rmdir(leaf.c_str());
+    return false;
+  }
+  boost::mutex::scoped_lock guard(lock);
+  leaves[pid] = leaf;
+  return true;
+}
+
+void CgroupAccounting::remove_leaf( const std::string &leaf )
+{
+  rmdir(leaf.c_str());
+}
+
+void CgroupAccounting::release( const int pid )
+{
+  boost::mutex::scoped_lock guard(lock);
+  LeafMap::iterator it = leaves.find(pid);
+  if ( it == leaves.end() ) return;
+  if ( rmdir(it->second.c_str()) < 0 ) {
+    // descendants are still running
+    stale.push_back(it->second);
+  }
+  leaves.erase(it);
+}
+
+void CgroupAccounting::cleanup()
+{
+  boost::mutex::scoped_lock guard(lock);
+  std::vector<std::string>::iterator it = stale.begin();
+  while ( it != stale.end() ) {
+    if ( rmdir(it->c_str()) == 0 || errno == ENOENT ) {
+      it = stale.erase(it);
+    } else {
+      it++;
+    }
+  }
+}
+
+bool CgroupAccounting::is_assigned( const int pid )
+{
+  boost::mutex::scoped_lock guard(lock);
+  return leaves.find(pid) != leaves.end();
+}
+
+bool CgroupAccounting::get_usage( const int pid, Usage &usage )
+{
+  std::string leaf;
+  {
+    boost::mutex::scoped_lock guard(lock);
+    LeafMap::const_iterator it = leaves.find(pid);
+    if ( it == leaves.end() ) return false;
+    leaf = it->second;
+  }
+
+  char buf[1024];
+  if ( read_control(leaf + "/cpu.stat", buf, sizeof(buf)) < 0 ) return false;
+  const char *s = strstr(buf, "usage_usec ");
+  if ( !s ) return false;
+  usage.cpu_usec = strtoll(s + 11, NULL, 10);
+
+  if ( read_control(leaf + "/memory.current", buf, sizeof(buf)) < 0 ) return false;
+  usage.memory = strtoll(buf, NULL, 10);
+
+  if ( read_control(leaf + "/pids.current", buf, sizeof(buf)) < 0 ) return false;
+  usage.tasks = strtoll(buf, NULL, 10);
+
+  usage.pids.clear();
+  std::ifstream procs((leaf + "/cgroup.procs").c_str());
+  int p;
+  while ( procs >> p ) usage.pids.push_back(p);
+  return true;
+}
@@ -0,0 +1,118 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef _CGROUP_ACCOUNTING_H_
+#define _CGROUP_ACCOUNTING_H_
+#include <stdint.h>
+#include <map>
+#include <string>
+#include <vector>
+#include <boost/shared_ptr.hpp>
+#include <boost/thread/mutex.hpp>
+
+class CgroupAccounting;
+typedef boost::shared_ptr<CgroupAccounting>  CgroupAccountingPtr;
+
+//
+// Per component accounting with cgroup v2.  The cgroup the GPP runs in must
+// be delegated to it: the GPP moves itself into a "gpp" leaf, enables the
+// memory and pids controllers, and launches each component into its own leaf
+// under "components".  Usage of a component is then read from its leaf
+// (cpu.stat, memory.current, pids.current) independently of the number of
+// processes it runs.
+//
+class CgroupAccounting
+{
+
+ public:
+
+  struct Usage {
+  Usage() : cpu_usec(0), memory(0), tasks(0) {};
+    int64_t           cpu_usec;     // cpu.stat usage_usec
+    int64_t           memory;       // memory.current, bytes
+    int64_t           tasks;        // pids.current, threads
+    std::vector<int>  pids;         // cgroup.procs
+  };
+
+  CgroupAccounting();
+
+  virtual ~CgroupAccounting();
+
+  //
+  // locate the delegated cgroup and create the subtree, returns false when
+  // cgroup v2 or delegation is not available
+  //
+  bool                initialize();
+
+  bool                enabled() const;
+
+  const std::string   &get_base() const;
+
+  //
+  // create a leaf for a component that is about to be launched, returns a
+  // descriptor for the leaf's cgroup.procs or -1
+  //
+  int                 create_leaf( std::string &leaf );
+
+  //
+  // move the calling process into the leaf opened by create_leaf, only uses
+  // async-signal-safe calls so it can run between fork and exec
+  //
+  static int          join( const int procs_fd );
+
+  //
+  // associate a launched process with its leaf, removes the leaf and returns
+  // false if the process could not be placed in it
+  //
+  bool                assign( const int pid, const std::string &leaf );
+
+  // remove a leaf that was not assigned
+  void                remove_leaf( const std::string &leaf );
+
+  // remove the leaf of a process, retried by cleanup while still populated
+  void                release( const int pid );
+
+  void                cleanup();
+
+  bool                is_assigned( const int pid );
+
+  bool                get_usage( const int pid, Usage &usage );
+
+ private:
+
+  bool                write_file( const std::string &fname, const std::string &value );
+
+  // undo a partial initialize: move the GPP back to its original cgroup,
+  // remove the directories that were created and disable the controllers
+  // that were enabled in the original cgroup
+  void                rollback( const std::string &origin, const std::string &restore, const std::vector<std::string> &created, const bool moved );
+
+  typedef std::map<int, std::string>   LeafMap;
+
+  boost::mutex              lock;
+  bool                      active;
+  std::string               base;
+  std::string               components;
+  uint64_t                  sequence;
+  LeafMap                   leaves;
+  std::vector<std::string>  stale;
+
+};
+
+#endif
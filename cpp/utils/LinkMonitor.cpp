@@ -0,0 +1,148 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include <errno.h>
+#include <string.h>
+#include <unistd.h>
+#include <sys/socket.h>
+#include <net/if.h>
+#include <linux/netlink.h>
+#include <linux/rtnetlink.h>
+#include <iostream>
+#include "LinkMonitor.h"
+
+#ifdef DEBUG_ON
+#define DEBUG(x)         std::cout << x << std::endl
+#else
+#define DEBUG(x)
+#endif
+
+// socket buffer requested so a burst of vlans or addresses is not dropped
+static const int RCVBUF_SIZE = 1024*1024;
+
+
+LinkMonitor::LinkMonitor() :
+  sock(-1)
+{
+}
+
+LinkMonitor::~LinkMonitor()
+{
+  close();
+}
+
+bool LinkMonitor::is_open() const
+{
+  return sock >= 0;
+}
+
+bool LinkMonitor::open()
+{
+  if ( sock >= 0 ) return true;
+
+  sock = socket(AF_NETLINK, SOCK_RAW | SOCK_NONBLOCK | SOCK_CLOEXEC, NETLINK_ROUTE);
+  if ( sock < 0 ) {
+    DEBUG("LinkMonitor: socket failed: " << strerror(errno));
+    return false;
+  }
+
+  int rcvbuf = RCVBUF_SIZE;
+  if ( setsockopt(sock, SOL_SOCKET, SO_RCVBUFFORCE, &rcvbuf, sizeof(rcvbuf)) < 0 ) {
+    setsockopt(sock, SOL_SOCKET, SO_RCVBUF, &rcvbuf, sizeof(rcvbuf));
+  }
+
+  struct sockaddr_nl addr;
+  memset(&addr, 0, sizeof(addr));
+  addr.nl_family = AF_NETLINK;
+  addr.nl_groups = RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR;
+  if ( bind(sock, (struct sockaddr *)&addr, sizeof(addr)) < 0 ) {
+    DEBUG("LinkMonitor: unable to subscribe: " << strerror(errno));
+    ::close(sock);
+    sock = -1;
+    return false;
+  }
+  return true;
+}
+
+void LinkMonitor::close()
+{
+  if ( sock < 0 ) return;
+  ::close(sock);
+  sock = -1;
+}
+
+static std::string index_to_name( const int index )
+{
+  char name[IF_NAMESIZE];
+  if ( if_indextoname(index, name) == NULL ) return "";
+  return name;
+}
+
+bool LinkMonitor::poll( EventList &events )
+{
+  if ( sock < 0 ) return false;
+
+  char buf[16384] __attribute__ ((aligned(NLMSG_ALIGNTO)));
+  while ( true ) {
+    struct sockaddr_nl from;
+    socklen_t fromlen = sizeof(from);
+    int len = recvfrom(sock, buf, sizeof(buf), MSG_DONTWAIT, (struct sockaddr *)&from, &fromlen);
+    if ( len < 0 ) {
+      if ( errno == EAGAIN || errno == EWOULDBLOCK ) return true;
+      if ( errno == EINTR ) continue;
+      // ENOBUFS: the kernel dropped notifications
+      DEBUG("LinkMonitor: receive failed: " << strerror(errno));
+      return false;
+    }
+    if ( from.nl_pid != 0 ) continue;       // only accept messages from the kernel
+
+    for ( struct nlmsghdr *hdr = (struct nlmsghdr *)buf; NLMSG_OK(hdr, len); hdr = NLMSG_NEXT(hdr, len) ) {
+      Event tmp;
+      tmp.family = 0;
+      switch ( hdr->nlmsg_type ) {
+      case RTM_NEWLINK:
+      case RTM_DELLINK: {
+        struct ifinfomsg *ifi = (struct ifinfomsg *)NLMSG_DATA(hdr);
+        int attrlen = IFLA_PAYLOAD(hdr);
+        tmp.type = hdr->nlmsg_type == RTM_NEWLINK ? LINK_NEW : LINK_DEL;
+        tmp.index = ifi->ifi_index;
+        for ( struct rtattr *rta = IFLA_RTA(ifi); RTA_OK(rta, attrlen); rta = RTA_NEXT(rta, attrlen) ) {
+          if ( rta->rta_type == IFLA_IFNAME ) tmp.interface = (const char *)RTA_DATA(rta);
+        }
+        break;
+      }
+      case RTM_NEWADDR:
+      case RTM_DELADDR: {
+        struct ifaddrmsg *ifa = (struct ifaddrmsg *)NLMSG_DATA(hdr);
+        tmp.type = hdr->nlmsg_type == RTM_NEWADDR ? ADDR_NEW : ADDR_DEL;
+        tmp.index = ifa->ifa_index;
+        tmp.family = ifa->ifa_family;
+        tmp.interface = index_to_name(ifa->ifa_index);
+        break;
+      }
+      case NLMSG_ERROR:
+      case NLMSG_OVERRUN:
+        return false;
+      default:
+        continue;
+      }
+      events.push_back(tmp);
+    }
+  }
+}
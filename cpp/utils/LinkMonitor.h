@@ -0,0 +1,76 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef _LINK_MONITOR_H_
+#define _LINK_MONITOR_H_
+#include <string>
+#include <vector>
+#include <boost/shared_ptr.hpp>
+
+class LinkMonitor;
+typedef boost::shared_ptr<LinkMonitor>  LinkMonitorPtr;
+
+//
+// Subscriber to the kernel's link and address notifications (RTMGRP_LINK,
+// RTMGRP_IPV4_IFADDR, RTMGRP_IPV6_IFADDR) delivered over rtnetlink.  No
+// privileges are required.  When poll returns false notifications were lost
+// and callers should rescan the interfaces.
+//
+class LinkMonitor
+{
+
+ public:
+
+  enum EventType {
+    LINK_NEW,       // link added or its attributes changed
+    LINK_DEL,
+    ADDR_NEW,
+    ADDR_DEL
+  };
+
+  struct Event {
+    EventType    type;
+    int          index;       // interface index
+    std::string  interface;   // empty if the interface is already gone
+    int          family;      // AF_INET or AF_INET6, address events only
+  };
+
+  typedef std::vector<Event>  EventList;
+
+  LinkMonitor();
+
+  virtual ~LinkMonitor();
+
+  bool    open();
+  void    close();
+  bool    is_open() const;
+
+  //
+  // append all pending notifications without blocking, returns false if the
+  // socket overflowed or failed and notifications were dropped
+  //
+  bool    poll( EventList &events );
+
+ private:
+
+  int     sock;
+
+};
+
+#endif
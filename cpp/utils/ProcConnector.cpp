@@ -0,0 +1,175 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include <errno.h>
+#include <string.h>
+#include <unistd.h>
+#include <sys/socket.h>
+#include <linux/netlink.h>
+#include <linux/connector.h>
+#include <linux/cn_proc.h>
+#include <iostream>
+#include "ProcConnector.h"
+
+#ifdef DEBUG_ON
+#define DEBUG(x)         std::cout << x << std::endl
+#else
+#define DEBUG(x)
+#endif
+
+// socket buffer requested so bursts of forks between cycles are not dropped
+static const int RCVBUF_SIZE = 4*1024*1024;
+
+//
+// proc_event::what values, the enumeration is nested in proc_event in older
+// kernel headers and at namespace scope in newer ones
+//
+static const unsigned int EVENT_FORK = 0x00000001;
+static const unsigned int EVENT_EXEC = 0x00000002;
+static const unsigned int EVENT_EXIT = 0x80000000;
+
+
+ProcConnector::ProcConnector() :
+  sock(-1)
+{
+}
+
+ProcConnector::~ProcConnector()
+{
+  close();
+}
+
+bool ProcConnector::is_open() const
+{
+  return sock >= 0;
+}
+
+bool ProcConnector::open()
+{
+  if ( sock >= 0 ) return true;
+
+  sock = socket(PF_NETLINK, SOCK_DGRAM | SOCK_NONBLOCK | SOCK_CLOEXEC, NETLINK_CONNECTOR);
+  if ( sock < 0 ) {
+    DEBUG("ProcConnector: socket failed: " << strerror(errno));
+    return false;
+  }
+
+  int rcvbuf = RCVBUF_SIZE;
+  if ( setsockopt(sock, SOL_SOCKET, SO_RCVBUFFORCE, &rcvbuf, sizeof(rcvbuf)) < 0 ) {
+    setsockopt(sock, SOL_SOCKET, SO_RCVBUF, &rcvbuf, sizeof(rcvbuf));
+  }
+
+  struct sockaddr_nl addr;
+  memset(&addr, 0, sizeof(addr));
+  addr.nl_family = AF_NETLINK;
+  addr.nl_groups = CN_IDX_PROC;
+  addr.nl_pid = 0;
+  if ( bind(sock, (struct sockaddr *)&addr, sizeof(addr)) < 0 ||
+       !send_control(PROC_CN_MCAST_LISTEN) ) {
+    DEBUG("ProcConnector: unable to subscribe: " << strerror(errno));
+    ::close(sock);
+    sock = -1;
+    return false;
+  }
+  return true;
+}
+
+void ProcConnector::close()
+{
+  if ( sock < 0 ) return;
+  send_control(PROC_CN_MCAST_IGNORE);
+  ::close(sock);
+  sock = -1;
+}
+
+bool ProcConnector::send_control( const int op )
+{
+  char buf[NLMSG_SPACE(sizeof(struct cn_msg) + sizeof(enum proc_cn_mcast_op))];
+  memset(buf, 0, sizeof(buf));
+
+  struct nlmsghdr *hdr = (struct nlmsghdr *)buf;
+  hdr->nlmsg_len = NLMSG_LENGTH(sizeof(struct cn_msg) + sizeof(enum proc_cn_mcast_op));
+  hdr->nlmsg_type = NLMSG_DONE;
+  hdr->nlmsg_pid = getpid();
+
+  struct cn_msg *msg = (struct cn_msg *)NLMSG_DATA(hdr);
+  msg->id.idx = CN_IDX_PROC;
+  msg->id.val = CN_VAL_PROC;
+  msg->len = sizeof(enum proc_cn_mcast_op);
+  *(enum proc_cn_mcast_op *)msg->data = (enum proc_cn_mcast_op)op;
+
+  return send(sock, hdr, hdr->nlmsg_len, 0) == (ssize_t)hdr->nlmsg_len;
+}
+
+bool ProcConnector::poll( EventList &events )
+{
+  if ( sock < 0 ) return false;
+
+  char buf[8192] __attribute__ ((aligned(NLMSG_ALIGNTO)));
+  while ( true ) {
+    struct sockaddr_nl from;
+    socklen_t fromlen = sizeof(from);
+    ssize_t len = recvfrom(sock, buf, sizeof(buf), MSG_DONTWAIT, (struct sockaddr *)&from, &fromlen);
+    if ( len < 0 ) {
+      if ( errno == EAGAIN || errno == EWOULDBLOCK ) return true;
+      if ( errno == EINTR ) continue;
+      // ENOBUFS: the kernel dropped events
+      DEBUG("ProcConnector: receive failed: " << strerror(errno));
+      return false;
+    }
+    if ( from.nl_pid != 0 ) continue;       // only accept messages from the kernel
+
+    for ( struct nlmsghdr *hdr = (struct nlmsghdr *)buf; NLMSG_OK(hdr, (unsigned int)len); hdr = NLMSG_NEXT(hdr, len) ) {
+      if ( hdr->nlmsg_type == NLMSG_NOOP ) continue;
+      if ( hdr->nlmsg_type == NLMSG_ERROR || hdr->nlmsg_type == NLMSG_OVERRUN ) return false;
+
+      struct cn_msg *msg = (struct cn_msg *)NLMSG_DATA(hdr);
+      if ( msg->id.idx != CN_IDX_PROC || msg->id.val != CN_VAL_PROC ) continue;
+      struct proc_event *ev = (struct proc_event *)msg->data;
+
+      //
+      // thread events are reported with a pid different from the thread
+      // group id, only whole processes are of interest
+      //
+      Event tmp;
+      switch ( (unsigned int)ev->what ) {
+      case EVENT_FORK:
+        if ( ev->event_data.fork.child_pid != ev->event_data.fork.child_tgid ) continue;
+        tmp.type = FORK;
+        tmp.pid = ev->event_data.fork.child_tgid;
+        tmp.ppid = ev->event_data.fork.parent_tgid;
+        break;
+      case EVENT_EXEC:
+        tmp.type = EXEC;
+        tmp.pid = ev->event_data.exec.process_tgid;
+        tmp.ppid = 0;
+        break;
+      case EVENT_EXIT:
+        if ( ev->event_data.exit.process_pid != ev->event_data.exit.process_tgid ) continue;
+        tmp.type = EXIT;
+        tmp.pid = ev->event_data.exit.process_tgid;
+        tmp.ppid = 0;
+        break;
+      default:
+        continue;
+      }
+      events.push_back(tmp);
+    }
+  }
+}
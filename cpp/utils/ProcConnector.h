@@ -0,0 +1,75 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef _PROC_CONNECTOR_H_
+#define _PROC_CONNECTOR_H_
+#include <vector>
+#include <boost/shared_ptr.hpp>
+
+class ProcConnector;
+typedef boost::shared_ptr<ProcConnector>  ProcConnectorPtr;
+
+//
+// Subscriber to the kernel's process events (fork, exec, exit) delivered
+// over the netlink connector.  Subscribing requires CAP_NET_ADMIN; callers
+// should fall back to polling /proc when open() fails or when events were
+// lost (poll returns false).
+//
+class ProcConnector
+{
+
+ public:
+
+  enum EventType {
+    FORK,
+    EXEC,
+    EXIT
+  };
+
+  struct Event {
+    EventType  type;
+    int        pid;     // process (thread group) id
+    int        ppid;    // parent process id, FORK only
+  };
+
+  typedef std::vector<Event>  EventList;
+
+  ProcConnector();
+
+  virtual ~ProcConnector();
+
+  bool    open();
+  void    close();
+  bool    is_open() const;
+
+  //
+  // append all pending events without blocking, returns false if the socket
+  // overflowed or failed and events were dropped
+  //
+  bool    poll( EventList &events );
+
+ private:
+
+  bool    send_control( const int op );
+
+  int     sock;
+
+};
+
+#endif
@@ -0,0 +1,141 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef _PROCESS_REGISTRY_H_
+#define _PROCESS_REGISTRY_H_
+#include <list>
+#include <string>
+#include <vector>
+#include <utility>
+#include <boost/unordered_map.hpp>
+#include <boost/unordered_set.hpp>
+
+//
+// Registry of launched processes with constant time lookup by pid and
+// indexes by application id and component identifier.
+//
+// Entries are kept in a list, so iterators and references stay valid while
+// other entries are added or removed.  The value type must provide pid,
+// appName and identifier members; these keys must not be modified after an
+// entry is inserted.
+//
+template < typename T >
+class ProcessRegistry
+{
+
+ public:
+
+  typedef std::list< T >                        List;
+  typedef typename List::iterator               iterator;
+  typedef typename List::const_iterator         const_iterator;
+  typedef typename List::value_type             value_type;
+  typedef typename List::reference              reference;
+  typedef typename List::const_reference        const_reference;
+  typedef typename List::size_type              size_type;
+  typedef std::vector< int >                    PidList;
+
+  iterator          begin()         { return items.begin(); }
+  iterator          end()           { return items.end(); }
+  const_iterator    begin() const   { return items.begin(); }
+  const_iterator    end() const     { return items.end(); }
+  size_type         size() const    { return by_pid.size(); }
+  bool              empty() const   { return by_pid.empty(); }
+
+  iterator find( const int pid ) {
+    typename PidIndex::iterator it = by_pid.find(pid);
+    if ( it == by_pid.end() ) return items.end();
+    return it->second;
+  }
+
+  const_iterator find( const int pid ) const {
+    typename PidIndex::const_iterator it = by_pid.find(pid);
+    if ( it == by_pid.end() ) return items.end();
+    return it->second;
+  }
+
+  //
+  // newest entries are iterated first, returns the existing entry and false
+  // if the pid is already registered
+  //
+  std::pair< iterator, bool > insert( const T &value ) {
+    typename PidIndex::iterator it = by_pid.find(value.pid);
+    if ( it != by_pid.end() ) return std::make_pair(it->second, false);
+    items.push_front(value);
+    iterator entry = items.begin();
+    by_pid[value.pid] = entry;
+    by_app[value.appName].insert(value.pid);
+    by_identifier[value.identifier].insert(value.pid);
+    return std::make_pair(entry, true);
+  }
+
+  bool erase( const int pid ) {
+    typename PidIndex::iterator it = by_pid.find(pid);
+    if ( it == by_pid.end() ) return false;
+    unindex(by_app, it->second->appName, pid);
+    unindex(by_identifier, it->second->identifier, pid);
+    items.erase(it->second);
+    by_pid.erase(it);
+    return true;
+  }
+
+  void erase( iterator entry ) {
+    erase(entry->pid);
+  }
+
+  void clear() {
+    items.clear();
+    by_pid.clear();
+    by_app.clear();
+    by_identifier.clear();
+  }
+
+  PidList find_app( const std::string &appName ) const {
+    return lookup(by_app, appName);
+  }
+
+  PidList find_identifier( const std::string &identifier ) const {
+    return lookup(by_identifier, identifier);
+  }
+
+ private:
+
+  typedef boost::unordered_map< int, iterator >                         PidIndex;
+  typedef boost::unordered_map< std::string, boost::unordered_set<int> > NameIndex;
+
+  static void unindex( NameIndex &index, const std::string &key, const int pid ) {
+    typename NameIndex::iterator it = index.find(key);
+    if ( it == index.end() ) return;
+    it->second.erase(pid);
+    if ( it->second.empty() ) index.erase(it);
+  }
+
+  static PidList lookup( const NameIndex &index, const std::string &key ) {
+    typename NameIndex::const_iterator it = index.find(key);
+    if ( it == index.end() ) return PidList();
+    return PidList(it->second.begin(), it->second.end());
+  }
+
+  List          items;
+  PidIndex      by_pid;
+  NameIndex     by_app;
+  NameIndex     by_identifier;
+
+};
+
+#endif
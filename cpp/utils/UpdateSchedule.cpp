@@ -0,0 +1,179 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#include <time.h>
+#include <iostream>
+#include <algorithm>
+#include <boost/bind.hpp>
+#include "UpdateSchedule.h"
+
+#ifdef DEBUG_ON
+#define DEBUG(x)         std::cout << x << std::endl
+#else
+#define DEBUG(x)
+#endif
+
+// weight of the last run in the moving averages
+static const double COST_ALPHA = 0.2;
+
+static int64_t thread_cpu_usec()
+{
+  struct timespec ts;
+  if ( clock_gettime(CLOCK_THREAD_CPUTIME_ID, &ts) != 0 ) return 0;
+  return (int64_t)ts.tv_sec*1000000 + ts.tv_nsec/1000;
+}
+
+static void run_updateable( UpdateSchedule::UpdateablePtr updateable )
+{
+  updateable->update();
+}
+
+
+UpdateSchedule::UpdateSchedule() :
+  budget(0)
+{
+}
+
+int64_t UpdateSchedule::Now()
+{
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return (int64_t)ts.tv_sec*1000000 + ts.tv_nsec/1000;
+}
+
+size_t UpdateSchedule::add( const std::string &name, const UpdateFunction &update, const uint32_t period, const bool deferrable )
+{
+  Collector c;
+  c.name = name;
+  c.update = update;
+  c.period = period;
+  c.deferrable = deferrable;
+  collectors.push_back(c);
+  return collectors.size()-1;
+}
+
+size_t UpdateSchedule::add( const std::string &name, const UpdateablePtr &updateable, const uint32_t period, const bool deferrable )
+{
+  return add(name, boost::bind(&run_updateable, updateable), period, deferrable);
+}
+
+void UpdateSchedule::set_period( const size_t id, const uint32_t period )
+{
+  if ( id >= collectors.size() ) return;
+  Collector &c = collectors[id];
+  // pull the next run in if the new period is shorter
+  if ( period < c.period ) c.next_due -= (int64_t)(c.period - period)*1000;
+  c.period = period;
+}
+
+void UpdateSchedule::set_budget( const int64_t new_budget )
+{
+  budget = new_budget;
+}
+
+bool UpdateSchedule::ran( const size_t id ) const
+{
+  if ( id >= collectors.size() ) return false;
+  return collectors[id].ran;
+}
+
+const UpdateSchedule::CollectorList &UpdateSchedule::get() const
+{
+  return collectors;
+}
+
+void UpdateSchedule::clear()
+{
+  collectors.clear();
+  due.clear();
+}
+
+void UpdateSchedule::run_collector( Collector &c, const int64_t now )
+{
+  int64_t wall0 = Now();
+  int64_t cpu0 = thread_cpu_usec();
+  c.update();
+  double wall = Now() - wall0;
+  double cpu = thread_cpu_usec() - cpu0;
+
+  Stats &st = c.stats;
+  if ( st.runs == 0 ) {
+    st.wall_time = wall;
+    st.cpu_time = cpu;
+  } else {
+    st.wall_time += COST_ALPHA*(wall - st.wall_time);
+    st.cpu_time += COST_ALPHA*(cpu - st.cpu_time);
+  }
+  st.max_wall_time = std::max(st.max_wall_time, wall);
+  st.last_wall_time = wall;
+  st.runs++;
+
+  c.ran = true;
+  c.deferrals = 0;
+  c.next_due = now + (int64_t)c.period*1000;
+}
+
+size_t UpdateSchedule::run( const int64_t now )
+{
+  //
+  // a collector is due when its period elapsed, with a tenth of the period
+  // of slack so it does not slip a whole cycle on jitter
+  //
+  due.clear();
+  double projected = 0;
+  for ( size_t i=0; i < collectors.size(); i++ ) {
+    Collector &c = collectors[i];
+    c.ran = false;
+    int64_t slack = (int64_t)c.period*100;
+    if ( c.period != 0 && now < c.next_due - slack ) continue;
+    due.push_back(i);
+    projected += c.stats.cpu_time;
+  }
+
+  //
+  // over budget, push back the most expensive collectors that can wait
+  //
+  while ( budget > 0 && projected > budget ) {
+    std::vector<size_t>::iterator victim = due.end();
+    for ( std::vector<size_t>::iterator it=due.begin(); it != due.end(); it++ ) {
+      const Collector &c = collectors[*it];
+      if ( !c.deferrable || c.deferrals >= MAX_DEFERRALS || c.stats.runs == 0 ) continue;
+      if ( victim == due.end() || c.stats.cpu_time > collectors[*victim].stats.cpu_time ) victim = it;
+    }
+    if ( victim == due.end() ) break;
+    Collector &c = collectors[*victim];
+    DEBUG("UpdateSchedule: deferring " << c.name << " projected " << projected << " budget " << budget);
+    c.deferrals++;
+    c.stats.deferred++;
+    projected -= c.stats.cpu_time;
+    due.erase(victim);
+  }
+
+  for ( std::vector<size_t>::iterator it=due.begin(); it != due.end(); it++ ) {
+    run_collector(collectors[*it], now);
+  }
+  return due.size();
+}
+
+void UpdateSchedule::run_all( const int64_t now )
+{
+  for ( CollectorList::iterator it=collectors.begin(); it != collectors.end(); it++ ) {
+    run_collector(*it, now);
+  }
+}
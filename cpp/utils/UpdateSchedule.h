@@ -0,0 +1,116 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+#ifndef _UPDATESCHEDULE_H_
+#define _UPDATESCHEDULE_H_
+#include <stdint.h>
+#include <string>
+#include <vector>
+#include <boost/shared_ptr.hpp>
+#include <boost/function.hpp>
+#include "utils/Updateable.h"
+
+//
+// Runs the collectors of the data model at their own period.
+//
+// Each collector is registered with a period (0 runs it every cycle) and is
+// run by the first cycle at or past its due time; collectors run in the
+// order they were registered.  The wall and cpu time of every run are kept
+// per collector.  When the cpu time the due collectors are expected to take
+// is above the budget, the most expensive deferrable collectors are pushed
+// to the next cycle.  A collector is never deferred more than MAX_DEFERRALS
+// cycles in a row.
+//
+class UpdateSchedule
+{
+
+ public:
+
+  typedef boost::function< void() >           UpdateFunction;
+  typedef boost::shared_ptr< Updateable >     UpdateablePtr;
+
+  static const int MAX_DEFERRALS = 3;
+
+  struct Stats {
+    Stats() : runs(0), deferred(0), wall_time(0), cpu_time(0), max_wall_time(0), last_wall_time(0) {};
+    uint64_t    runs;
+    uint64_t    deferred;         // cycles the collector was due but pushed back
+    double      wall_time;        // usec, moving average of a run
+    double      cpu_time;         // usec, moving average of a run
+    double      max_wall_time;    // usec
+    double      last_wall_time;   // usec
+  };
+
+  struct Collector {
+    Collector() : period(0), deferrable(true), next_due(0), deferrals(0), ran(false) {};
+    std::string     name;
+    UpdateFunction  update;
+    uint32_t        period;       // milliseconds, 0 every cycle
+    bool            deferrable;
+    int64_t         next_due;     // usec, monotonic
+    int             deferrals;    // consecutive cycles deferred
+    bool            ran;          // ran during the last cycle
+    Stats           stats;
+  };
+
+  typedef std::vector< Collector >  CollectorList;
+
+  UpdateSchedule();
+
+  //
+  // register a collector, returns its id
+  //
+  size_t              add( const std::string &name, const UpdateFunction &update, const uint32_t period=0, const bool deferrable=true );
+
+  size_t              add( const std::string &name, const UpdateablePtr &updateable, const uint32_t period=0, const bool deferrable=true );
+
+  void                set_period( const size_t id, const uint32_t period );
+
+  // cpu time (usec) the collectors of a cycle may use, 0 for no limit
+  void                set_budget( const int64_t budget );
+
+  //
+  // run the collectors that are due, returns the number that ran
+  //
+  size_t              run( const int64_t now );
+
+  // run every collector regardless of its schedule
+  void                run_all( const int64_t now );
+
+  // true if the collector ran during the last cycle
+  bool                ran( const size_t id ) const;
+
+  const CollectorList &get() const;
+
+  void                clear();
+
+  // monotonic time in usec
+  static int64_t      Now();
+
+ private:
+
+  void                run_collector( Collector &c, const int64_t now );
+
+  CollectorList       collectors;
+  int64_t             budget;
+  std::vector<size_t> due;
+
+};
+
+#endif
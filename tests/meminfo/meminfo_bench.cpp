@@ -0,0 +1,144 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+
+//
+// Measures the cost of refreshing /proc/meminfo.  ProcMeminfo, which parses
+// into fixed slots through a persistent descriptor, is compared against the
+// parser it replaced, which opened the file every cycle and rebuilt a
+// std::map with boost::split and lexical_cast.  Both are run against this
+// host's /proc/meminfo, or the file given on the command line.
+//
+//   usage: meminfo_bench [-iterations n] [file]
+//
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <iostream>
+#include <fstream>
+#include <map>
+#include <vector>
+#include <boost/format.hpp>
+#include <boost/lexical_cast.hpp>
+#include <boost/algorithm/string.hpp>
+#include "states/ProcMeminfo.h"
+#include "parsers/ProcMeminfoParser.h"
+
+typedef std::map< std::string, ProcMeminfo::Counter > LegacyContents;
+
+static double now()
+{
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return ts.tv_sec + ts.tv_nsec*1e-9;
+}
+
+//
+// the parser used before the fixed slots, ProcMeminfo::update_state created
+// one per cycle and copied the resulting map
+//
+static void legacy_parse( const std::string &fname, LegacyContents &data )
+{
+  std::ifstream procmeminfo_file( fname.c_str() );
+  if ( !procmeminfo_file.good()) throw std::ifstream::failure("unable to open " + fname );
+
+  std::string line;
+  while (  std::getline( procmeminfo_file, line ) ) {
+    std::vector<std::string> values;
+    boost::split( values, line, boost::is_any_of(std::string(" ")), boost::algorithm::token_compress_on );
+    std::string key;
+    ProcMeminfo::Counter     metric = 0;
+    key = values[0].substr(0, values[0].find(":"));
+    if ( values.size() >= 2 ) {
+      try {
+        metric = boost::lexical_cast<ProcMeminfo::Counter>( values[1] );
+      }
+      catch( boost::bad_lexical_cast ){
+      }
+    }
+    ProcMeminfo::Counter  unit_m=1;
+    if ( values.size() >= 3 ) {
+      std::string units(values[2]);
+      boost::to_upper(units);
+      if ( units == "KB" ) unit_m = 1024;
+      if ( units == "MB" ) unit_m = 1024*1024;
+      if ( units == "GB" ) unit_m = 1024*1024*1024;
+    }
+    data[key]=metric * unit_m;
+  }
+}
+
+int main(int argc, char* argv[])
+{
+  int iterations=10000;
+  std::string fname("/proc/meminfo");
+  for ( int i=1; i < argc; i++ ) {
+    if ( strcmp(argv[i], "-iterations") == 0 && i+1 < argc ) iterations=atoi(argv[++i]);
+    else fname=argv[i];
+  }
+
+  LegacyContents legacy;
+  double t0 = now();
+  for ( int i=0; i < iterations; i++ ) {
+    LegacyContents tmp;
+    legacy_parse(fname, tmp);
+    legacy = tmp;
+  }
+  double t_legacy = now() - t0;
+
+  ProcMeminfoParser parser(fname);
+  ProcMeminfo::KeyList keys;
+  ProcMeminfo::Contents contents;
+  for ( LegacyContents::const_iterator it=legacy.begin(); it != legacy.end(); it++ ) keys.push_back(it->first);
+
+  // fixed slots only, as SystemMonitor uses it
+  ProcMeminfo meminfo;
+  ProcMeminfo::KeyList fixed(meminfo.keys());
+  t0 = now();
+  for ( int i=0; i < iterations; i++ ) parser.parse(fixed, contents);
+  double t_fixed = now() - t0;
+
+  // every key tracked
+  t0 = now();
+  for ( int i=0; i < iterations; i++ ) parser.parse(keys, contents);
+  double t_all = now() - t0;
+
+  std::cout << boost::format("%-6d keys  legacy %8.2f us  slots(%d) %8.2f us  all keys %8.2f us")
+    % legacy.size() % (t_legacy*1e6/iterations) % fixed.size() % (t_fixed*1e6/iterations) % (t_all*1e6/iterations) << std::endl;
+
+  //
+  // both parsers should agree on every key, values of a live file can move
+  // between the reads so only the keys are compared there
+  //
+  legacy_parse(fname, legacy);
+  parser.parse(keys, contents);
+  int missing = 0;
+  for ( size_t i=0; i < keys.size(); i++ ) {
+    if ( !contents.found[i] ) missing++;
+  }
+  std::cout << ( missing ? "MISMATCH" : "keys match" ) << std::endl;
+  if ( fname.compare(0, 6, "/proc/") != 0 ) {
+    for ( size_t i=0; i < keys.size(); i++ ) {
+      if ( contents.values[i] != legacy[keys[i]] ) {
+        std::cout << "MISMATCH " << keys[i] << " " << contents.values[i] << " " << legacy[keys[i]] << std::endl;
+      }
+    }
+  }
+  return missing ? 1 : 0;
+}
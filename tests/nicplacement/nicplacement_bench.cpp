@@ -0,0 +1,227 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+
+//
+// Measures nic placement with each policy.  A host with the requested number
+// of interfaces (a mix of 1G, 10G and 40G links spread over two numa nodes,
+// carrying some background traffic) receives a stream of allocations of
+// random size, and a random live allocation is released for each new one
+// once the host holds POPULATION allocations per interface.
+// The acceptance rate and the cost of a placement are reported per policy,
+// and for numa_local the share of allocations placed on the requested node.
+// With -rescan, best fit done by scoring every interface on each call is
+// timed as well.
+//
+// By default three allocations are made per live allocation the host holds.
+//
+//   usage: nicplacement_bench [-rescan] [-allocs n] [nnics ...]
+//
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <iostream>
+#include <sstream>
+#include <algorithm>
+#include <map>
+#include <vector>
+#include <boost/bind.hpp>
+#include <boost/format.hpp>
+#include <boost/foreach.hpp>
+#include "NicPlacement.h"
+
+static const double MBIT = 1e6;
+
+// live allocations per interface
+static const int POPULATION = 8;
+
+// measured throughput is refreshed once every this many allocations
+static const int REFRESH_INTERVAL = 50;
+
+static double now()
+{
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return ts.tv_sec + ts.tv_nsec*1e-9;
+}
+
+struct Nic {
+  std::string name;
+  int         numa_node;
+  DeviceLoad  load;
+};
+
+struct Allocation {
+  std::string interface;
+  double      throughput;
+};
+
+typedef std::map<std::string, Nic> Nics;
+
+//
+// same test as NicAllocator::allocatable_by_data_rate, each direction
+// against the usable capacity
+//
+static bool fits( const Nics &nics, double delta, const std::string &interface )
+{
+  const DeviceLoad &load = nics.find(interface)->second.load;
+  double requested = load.allocated_throughput + delta;
+  return std::max(load.rx_throughput, requested) <= load.maximum_throughput &&
+         std::max(load.tx_throughput, requested) <= load.maximum_throughput;
+}
+
+static Nics build_host( int nnics )
+{
+  Nics nics;
+  for ( int i=0; i < nnics; i++ ) {
+    Nic nic;
+    std::stringstream name;
+    name << "eth" << i;
+    nic.name = name.str();
+    nic.numa_node = i % 2;
+    // one 40G port for every four 10G and three 1G ports
+    double speed = (i % 8 == 0) ? 40000 : (i % 8 < 5) ? 10000 : 1000;
+    nic.load.maximum_throughput = speed * MBIT * 0.8;
+    nics[nic.name] = nic;
+  }
+  return nics;
+}
+
+static void background_traffic( Nics &nics )
+{
+  BOOST_FOREACH(Nics::value_type &entry, nics) {
+    DeviceLoad &load = entry.second.load;
+    load.rx_throughput = load.maximum_throughput * (rand() % 30) / 100.0;
+    load.tx_throughput = load.maximum_throughput * (rand() % 30) / 100.0;
+  }
+}
+
+//
+// allocation sizes from 1 Mbps to 4 Gbps, mostly small
+//
+static double allocation_size()
+{
+  double r = (rand() % 10000) / 10000.0;
+  return MBIT * (1 + 4000 * r * r * r);
+}
+
+static std::string rescan_best_fit( const Nics &nics, double delta )
+{
+  std::vector< std::pair<double, std::string> > ranked;
+  ranked.reserve(nics.size());
+  BOOST_FOREACH(const Nics::value_type &entry, nics) {
+    const DeviceLoad &load = entry.second.load;
+    ranked.push_back(std::make_pair(load.maximum_throughput - load.allocated_throughput, entry.first));
+  }
+  std::sort(ranked.begin(), ranked.end());
+  for ( size_t i=0; i < ranked.size(); i++ ) {
+    if ( fits(nics, delta, ranked[i].second) ) return ranked[i].second;
+  }
+  return "";
+}
+
+static void run( const std::string &policy, int nnics, int nallocs, bool rescan )
+{
+  srand(1);
+  Nics nics = build_host(nnics);
+  background_traffic(nics);
+
+  NicPlacement placement;
+  if ( policy != "rescan" ) placement.set_policy(policy);
+  BOOST_FOREACH(const Nics::value_type &entry, nics) {
+    placement.add_interface(entry.first, entry.first, entry.second.numa_node);
+    placement.set_load(entry.first, entry.second.load);
+  }
+
+  std::vector<Allocation> live;
+  int accepted = 0, local = 0;
+  double elapsed = 0, worst = 0;
+  for ( int i=0; i < nallocs; i++ ) {
+    if ( i % REFRESH_INTERVAL == 0 ) {
+      background_traffic(nics);
+      if ( placement.uses_measured_throughput() ) {
+        BOOST_FOREACH(const Nics::value_type &entry, nics) placement.set_load(entry.first, entry.second.load);
+      }
+    }
+
+    // steady population of live allocations, so the host stays busy
+    // without saturating
+    if ( live.size() >= (size_t)nnics * POPULATION ) {
+      size_t victim = rand() % live.size();
+      Nic &nic = nics[live[victim].interface];
+      nic.load.allocated_throughput -= live[victim].throughput;
+      placement.set_load(nic.name, nic.load);
+      live[victim] = live.back();
+      live.pop_back();
+    }
+
+    double delta = allocation_size();
+    int socket = rand() % 2;
+    double t0 = now();
+    std::string interface;
+    if ( policy == "rescan" ) {
+      interface = rescan_best_fit(nics, delta);
+    } else {
+      interface = placement.place(delta, socket, boost::bind(fits, boost::cref(nics), delta, _1));
+    }
+    double t = now() - t0;
+    elapsed += t;
+    worst = std::max(worst, t);
+    if ( interface.empty() ) continue;
+
+    Nic &nic = nics[interface];
+    nic.load.allocated_throughput += delta;
+    placement.set_load(interface, nic.load);
+    Allocation alloc = { interface, delta };
+    live.push_back(alloc);
+    accepted++;
+    if ( nic.numa_node == socket ) local++;
+  }
+
+  std::cout << boost::format("%-6d %-13s accepted %6.2f%%  local %6.2f%%  place %8.3f us  worst %8.3f us")
+    % nnics % policy % (100.0*accepted/nallocs) % (accepted ? 100.0*local/accepted : 0)
+    % (elapsed*1e6/nallocs) % (worst*1e6) << std::endl;
+}
+
+int main(int argc, char* argv[])
+{
+  bool rescan=false;
+  int nallocs=0;
+  std::vector<int> sizes;
+  for ( int i=1; i < argc; i++ ) {
+    if ( strcmp(argv[i], "-rescan") == 0 ) rescan=true;
+    else if ( strcmp(argv[i], "-allocs") == 0 && i+1 < argc ) nallocs=atoi(argv[++i]);
+    else sizes.push_back(atoi(argv[i]));
+  }
+  if ( sizes.empty() ) {
+    sizes.push_back(16);
+    sizes.push_back(256);
+    sizes.push_back(4096);
+  }
+
+  const char *policies[] = { "first_fit", "best_fit", "least_loaded", "numa_local" };
+  BOOST_FOREACH(int nnics, sizes) {
+    for ( size_t i=0; i < sizeof(policies)/sizeof(policies[0]); i++ ) {
+      run(policies[i], nnics, nallocs ? nallocs : 3*nnics*POPULATION, rescan);
+    }
+    if ( rescan ) run("rescan", nnics, nallocs ? nallocs : 3*nnics*POPULATION, rescan);
+  }
+  return 0;
+}
@@ -0,0 +1,207 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+
+//
+// Measures the per cycle cost of reading the counters of every interface.
+// A synthetic /sys/class/net tree and /proc/net/dev with the requested
+// number of interfaces are generated in a temporary directory, and
+// NicStats reading /proc/net/dev is compared against the 16 sysfs files per
+// interface that NicState used to read.  The rtnetlink dump is measured on
+// this host's links; with -dummy the requested number of dummy links are
+// created first (requires CAP_NET_ADMIN and the dummy module) and the sysfs
+// reads are measured against them as well.
+//
+//   usage: nicstats_bench [-dummy] [-cycles n] [ninterfaces ...]
+//
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <iostream>
+#include <fstream>
+#include <sstream>
+#include <vector>
+#include <boost/format.hpp>
+#include <boost/foreach.hpp>
+#include <boost/filesystem/operations.hpp>
+#include "states/NicStats.h"
+#include "utils/FileReader.h"
+#include "utils/IOError.h"
+
+static const char *LEGACY_FILES[] = {
+  "/statistics/rx_bytes", "/statistics/rx_compressed", "/statistics/rx_crc_errors", "/statistics/rx_dropped",
+  "/statistics/rx_errors", "/statistics/rx_packets", "/statistics/tx_bytes", "/statistics/tx_compressed",
+  "/statistics/tx_dropped", "/statistics/tx_errors", "/statistics/tx_packets", "/tx_queue_len",
+  "/address", "/speed", "/mtu", "/operstate"
+};
+static const int NLEGACY = sizeof(LEGACY_FILES)/sizeof(LEGACY_FILES[0]);
+
+static double now()
+{
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return ts.tv_sec + ts.tv_nsec*1e-9;
+}
+
+static std::string ifname( int i )
+{
+  std::stringstream name;
+  name << "nsb" << i;
+  return name.str();
+}
+
+static void write_file( const std::string &fname, const std::string &contents )
+{
+  std::ofstream ostr(fname.c_str());
+  ostr << contents << std::endl;
+}
+
+static void build_tree( const std::string &top, int nifs, int cycle )
+{
+  std::ofstream dev((top+"/dev").c_str());
+  dev << "Inter-|   Receive                                                |  Transmit" << std::endl;
+  dev << " face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed" << std::endl;
+  for ( int i=0; i < nifs; i++ ) {
+    std::string name = ifname(i);
+    std::string dir = top + "/net/" + name;
+    boost::filesystem::create_directories(dir + "/statistics");
+    uint64_t bytes = (uint64_t)(i+1)*1000000 + cycle*1500;
+    dev << boost::format("%6s: %8d %7d    0    0    0     0          0         0 %8d %7d    0    0    0     0       0          0")
+      % name % bytes % (bytes/1500) % bytes % (bytes/1500) << std::endl;
+    for ( int f=0; f < 11; f++ ) {
+      std::stringstream value;
+      value << (f == 0 || f == 6 ? bytes : 0);
+      write_file(dir + LEGACY_FILES[f], value.str());
+    }
+    write_file(dir + "/tx_queue_len", "1000");
+    write_file(dir + "/address", "02:00:00:00:00:01");
+    write_file(dir + "/speed", "10000");
+    write_file(dir + "/mtu", "1500");
+    write_file(dir + "/operstate", "up");
+  }
+}
+
+//
+// the reads performed by the NicState of each interface every cycle
+//
+static uint64_t legacy_read( const std::string &sys_class_net, const std::vector<std::string> &names )
+{
+  uint64_t total = 0;
+  BOOST_FOREACH(const std::string &name, names) {
+    for ( int f=0; f < NLEGACY; f++ ) {
+      try {
+        std::stringstream str( FileReader::ReadFile(sys_class_net + "/" + name + LEGACY_FILES[f]) );
+        uint64_t v = 0;
+        str >> v;
+        total += v;
+      } catch ( const IOError &e ) {
+      }
+    }
+  }
+  return total;
+}
+
+static void time_stats( const char *label, NicStats &stats, int cycles )
+{
+  stats.update();
+  double t0 = now();
+  size_t reads = 0;
+  for ( int i=0; i < cycles; i++ ) {
+    stats.update();
+    reads += stats.get_attribute_reads();
+  }
+  double elapsed = now() - t0;
+  std::cout << boost::format("%-7d %-12s %9.3f ms  (%d sysfs reads)") % stats.get().size() % label % (elapsed*1e3/cycles) % (reads/cycles) << std::endl;
+}
+
+static void time_legacy( const std::string &sys_class_net, const std::vector<std::string> &names, int cycles )
+{
+  double t0 = now();
+  for ( int i=0; i < cycles; i++ ) legacy_read(sys_class_net, names);
+  double elapsed = now() - t0;
+  std::cout << boost::format("%-7d %-12s %9.3f ms  (%d sysfs reads)") % names.size() % "sysfs" % (elapsed*1e3/cycles) % (names.size()*NLEGACY) << std::endl;
+}
+
+static void run( int nifs, int cycles )
+{
+  char tmpl[] = "/tmp/nicstats.XXXXXX";
+  std::string top(mkdtemp(tmpl));
+  build_tree(top, nifs, 0);
+  std::vector<std::string> names;
+  for ( int i=0; i < nifs; i++ ) names.push_back(ifname(i));
+
+  NicStats stats(false, top+"/dev", top+"/net");
+  time_stats("proc_net_dev", stats, cycles);
+  time_legacy(top+"/net", names, cycles);
+
+  boost::filesystem::remove_all(top);
+}
+
+static void run_netlink( int ndummy, int cycles )
+{
+  std::vector<std::string> names;
+  for ( int i=0; i < ndummy; i++ ) {
+    std::string cmd = "ip link add " + ifname(i) + " type dummy";
+    if ( system(cmd.c_str()) != 0 ) break;
+    names.push_back(ifname(i));
+  }
+
+  NicStats netlink;
+  NicStats procfs(false);
+  netlink.update();
+  if ( netlink.get_source() != NicStats::NETLINK ) {
+    std::cout << "rtnetlink unavailable" << std::endl;
+  } else {
+    time_stats("netlink", netlink, cycles);
+  }
+  time_stats("proc_net_dev", procfs, cycles);
+
+  if ( names.empty() ) {
+    for ( NicStats::Contents::const_iterator it=procfs.get().begin(); it != procfs.get().end(); it++ ) names.push_back(it->first);
+    time_legacy("/sys/class/net", names, cycles);
+  } else {
+    time_legacy("/sys/class/net", names, cycles);
+    BOOST_FOREACH(const std::string &name, names) {
+      std::string cmd = "ip link del " + name;
+      if ( system(cmd.c_str()) != 0 ) std::cout << "unable to remove " << name << std::endl;
+    }
+  }
+}
+
+int main(int argc, char* argv[])
+{
+  bool dummy=false;
+  int cycles=100;
+  std::vector<int> sizes;
+  for ( int i=1; i < argc; i++ ) {
+    if ( strcmp(argv[i], "-dummy") == 0 ) dummy=true;
+    else if ( strcmp(argv[i], "-cycles") == 0 && i+1 < argc ) cycles=atoi(argv[++i]);
+    else sizes.push_back(atoi(argv[i]));
+  }
+  if ( sizes.empty() ) {
+    sizes.push_back(100);
+  }
+
+  BOOST_FOREACH(int nifs, sizes) {
+    run(nifs, cycles);
+  }
+  run_netlink(dummy ? sizes.back() : 0, cycles);
+  return 0;
+}
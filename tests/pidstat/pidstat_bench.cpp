@@ -0,0 +1,183 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+
+//
+// Compares the cost of sampling /proc/<pid>/stat with the fscanf based
+// parser PidProcStatParser used to be, a PidProcStatParser created for each
+// sample, and a PidProcStatParser kept open per pid.  A synthetic /proc tree
+// is generated in a temporary directory; every 10th process has a command
+// name containing spaces and parenthesis.
+//
+//   usage: pidstat_bench [-cycles n] [npids ...]
+//
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <linux/limits.h>
+#include <iostream>
+#include <fstream>
+#include <sstream>
+#include <vector>
+#include <boost/format.hpp>
+#include <boost/foreach.hpp>
+#include <boost/shared_ptr.hpp>
+#include <boost/filesystem/operations.hpp>
+#include "PidProcStatParser.h"
+
+static double now()
+{
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return ts.tv_sec + ts.tv_nsec*1e-9;
+}
+
+static int64_t expected_ticks( int pid )
+{
+  return (pid % 97) + (pid % 13) + 2 + 1;
+}
+
+static void write_stat( const std::string &top, int pid )
+{
+  std::stringstream dname;
+  dname << top << "/" << pid;
+  boost::filesystem::create_directory(dname.str());
+  std::ofstream ostr((dname.str()+"/stat").c_str());
+  std::string comm = (pid % 10) ? "worker" : "my ) proc";
+  ostr << pid << " (" << comm << ") S 1 " << pid << " " << pid
+       << " 0 -1 4194560 1093 0 0 0 " << (pid % 97) << " " << (pid % 13) << " 2 1 20 0 "
+       << (1 + pid % 4) << " 0 " << pid << " 12345678 " << (100 + pid % 50)
+       << " 18446744073709551615 1 1 0 0 0 0 0 0 0 0 0 0 17 0 0 0 0 0 0" << std::endl;
+}
+
+//
+// the parser as it was before the persistent reader
+//
+struct legacy_parser {
+  int64_t pid, ppid, pgrp, session, tty_nr, tty_pgrp, flags, min_flt, cmin_flt, maj_flt, cmaj_flt, utime, stime, cutime, cstime;
+  char state;
+  std::string comm;
+
+  void readone(FILE *input, int64_t *x) { fscanf(input, "%lld ", (long long *) x); }
+  void readstr(FILE *input, char *x) {  fscanf(input, "%s ", x);}
+  void readchar(FILE *input, char *x) {  fscanf(input, "%c ", x);}
+
+  int parse( const std::string &top, int _pid ) {
+    char tcomm[PATH_MAX];
+    std::stringstream ss;
+    ss<<top<<"/"<<_pid<<"/stat";
+    FILE *input=fopen(ss.str().c_str(), "r");
+    if( !input ) return -1;
+    readone(input,&pid);
+    readstr(input,tcomm);
+    comm = tcomm;
+    readchar(input,&state);
+    readone(input,&ppid);
+    readone(input,&pgrp);
+    readone(input,&session);
+    readone(input,&tty_nr);
+    readone(input,&tty_pgrp);
+    readone(input,&flags);
+    readone(input,&min_flt);
+    readone(input,&cmin_flt);
+    readone(input,&maj_flt);
+    readone(input,&cmaj_flt);
+    readone(input,&utime);
+    readone(input,&stime);
+    readone(input,&cutime);
+    readone(input,&cstime);
+    fclose(input);
+    return 0;
+  }
+};
+
+static void run( int npids, int cycles )
+{
+  char tmpl[] = "/tmp/pidstat.XXXXXX";
+  std::string top(mkdtemp(tmpl));
+  std::vector<int> pids;
+  for ( int pid=2; pid < npids+2; pid++ ) {
+    write_stat(top, pid);
+    pids.push_back(pid);
+  }
+  double samples = (double)npids * cycles;
+
+  int bad=0;
+  legacy_parser legacy;
+  double t0 = now();
+  for ( int c=0; c < cycles; c++ ) {
+    BOOST_FOREACH(int pid, pids) {
+      legacy.parse(top, pid);
+      if ( legacy.utime+legacy.stime+legacy.cutime+legacy.cstime != expected_ticks(pid) ) bad++;
+    }
+  }
+  double t_legacy = now() - t0;
+  std::cout << boost::format("%-7d fscanf      %8.0f ns/sample  %6d misparsed") % npids % (t_legacy*1e9/samples) % (bad/cycles) << std::endl;
+
+  bad=0;
+  PidProcStatParser::Contents data;
+  t0 = now();
+  for ( int c=0; c < cycles; c++ ) {
+    BOOST_FOREACH(int pid, pids) {
+      PidProcStatParser parser(pid, PidProcStatParser::TICKS, top);
+      parser.parse(data);
+      if ( data.utime+data.stime+data.cutime+data.cstime != expected_ticks(pid) ) bad++;
+    }
+  }
+  double t_oneshot = now() - t0;
+  std::cout << boost::format("%-7d open+pread  %8.0f ns/sample  %6d misparsed") % npids % (t_oneshot*1e9/samples) % (bad/cycles) << std::endl;
+
+  bad=0;
+  std::vector< boost::shared_ptr<PidProcStatParser> > readers;
+  BOOST_FOREACH(int pid, pids) {
+    readers.push_back( boost::shared_ptr<PidProcStatParser>( new PidProcStatParser(pid, PidProcStatParser::TICKS, top) ) );
+  }
+  t0 = now();
+  for ( int c=0; c < cycles; c++ ) {
+    for ( size_t i=0; i < readers.size(); i++ ) {
+      readers[i]->parse(data);
+      if ( data.utime+data.stime+data.cutime+data.cstime != expected_ticks(pids[i]) ) bad++;
+    }
+  }
+  double t_persistent = now() - t0;
+  std::cout << boost::format("%-7d persistent  %8.0f ns/sample  %6d misparsed") % npids % (t_persistent*1e9/samples) % (bad/cycles) << std::endl;
+
+  readers.clear();
+  boost::filesystem::remove_all(top);
+}
+
+int main(int argc, char* argv[])
+{
+  int cycles=10;
+  std::vector<int> sizes;
+  for ( int i=1; i < argc; i++ ) {
+    if ( strcmp(argv[i], "-cycles") == 0 && i+1 < argc ) cycles=atoi(argv[++i]);
+    else sizes.push_back(atoi(argv[i]));
+  }
+  if ( sizes.empty() ) {
+    sizes.push_back(1000);
+    sizes.push_back(5000);
+  }
+
+  BOOST_FOREACH(int npids, sizes) {
+    run(npids, cycles);
+  }
+  return 0;
+}
@@ -0,0 +1,140 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+
+//
+// Checks ProcPressure against a synthetic /proc/pressure tree generated in a
+// temporary directory: the some/full lines, a cpu file without the "full"
+// line (kernels before 5.13), the stall deltas between updates, and a
+// resource whose file is missing.
+//
+//   usage: procpressure_test
+//
+#include <math.h>
+#include <stdio.h>
+#include <fstream>
+#include <string>
+#include <boost/filesystem/operations.hpp>
+#include "states/ProcPressure.h"
+
+static int failures = 0;
+
+#define CHECK(cond)                                                       \
+  do {                                                                    \
+    if ( !(cond) ) {                                                      \
+      fprintf(stderr, "%s:%d: check failed: %s\n", __FILE__, __LINE__, #cond); \
+      failures++;                                                         \
+    }                                                                     \
+  } while (0)
+
+static bool near( const float a, const float b )
+{
+  return fabs(a - b) < 1e-3;
+}
+
+//
+// rewrites the file in place, ProcPressure keeps it open and rereads it
+//
+static void write_file( const std::string &fname, const std::string &contents )
+{
+  std::ofstream out(fname.c_str(), std::ios::trunc);
+  out << contents;
+}
+
+static std::string stall_line( const char *tag, const char *avgs, const unsigned long long total )
+{
+  char line[128];
+  snprintf(line, sizeof(line), "%s %s total=%llu\n", tag, avgs, total);
+  return line;
+}
+
+static void test_pressure( const std::string &dir )
+{
+  // cpu as on a pre 5.13 kernel, no io file at all
+  write_file(dir + "/cpu", stall_line("some", "avg10=1.50 avg60=0.75 avg300=0.25", 1000));
+  write_file(dir + "/memory",
+             stall_line("some", "avg10=12.00 avg60=6.00 avg300=3.00", 5000) +
+             stall_line("full", "avg10=4.00 avg60=2.00 avg300=1.00", 2000));
+
+  ProcPressure pressure(dir);
+  pressure.update_state();
+
+  CHECK( pressure.is_available(ProcPressure::CPU) );
+  const ProcPressure::Pressure &cpu = pressure.get(ProcPressure::CPU);
+  CHECK( near(cpu.some.avg10, 1.5) );
+  CHECK( near(cpu.some.avg60, 0.75) );
+  CHECK( near(cpu.some.avg300, 0.25) );
+  CHECK( cpu.some.total == 1000 );
+  CHECK( cpu.some.delta == 0 );
+  CHECK( near(cpu.full.avg10, 0.0) );
+  CHECK( cpu.full.total == 0 );
+
+  CHECK( pressure.is_available(ProcPressure::MEMORY) );
+  const ProcPressure::Pressure &mem = pressure.get(ProcPressure::MEMORY);
+  CHECK( near(mem.some.avg10, 12.0) );
+  CHECK( near(mem.full.avg10, 4.0) );
+  CHECK( near(mem.full.avg300, 1.0) );
+  CHECK( mem.some.total == 5000 );
+  CHECK( mem.full.total == 2000 );
+  CHECK( mem.some.delta == 0 );
+
+  CHECK( !pressure.is_available(ProcPressure::IO) );
+
+  // the totals grow, the deltas are measured from the previous update
+  write_file(dir + "/cpu", stall_line("some", "avg10=2.00 avg60=1.00 avg300=0.50", 1750));
+  write_file(dir + "/memory",
+             stall_line("some", "avg10=10.00 avg60=6.00 avg300=3.00", 5400) +
+             stall_line("full", "avg10=3.00 avg60=2.00 avg300=1.00", 2100));
+  // a missing resource is not probed again
+  write_file(dir + "/io", stall_line("some", "avg10=1.00 avg60=1.00 avg300=1.00", 10));
+  pressure.update_state();
+
+  CHECK( near(pressure.get(ProcPressure::CPU).some.avg10, 2.0) );
+  CHECK( pressure.get(ProcPressure::CPU).some.total == 1750 );
+  CHECK( pressure.get(ProcPressure::CPU).some.delta == 750 );
+  CHECK( pressure.get(ProcPressure::CPU).full.delta == 0 );
+  CHECK( pressure.get(ProcPressure::MEMORY).some.delta == 400 );
+  CHECK( pressure.get(ProcPressure::MEMORY).full.delta == 100 );
+  CHECK( !pressure.is_available(ProcPressure::IO) );
+
+  // an unparsable read drops the resource for the cycle and restarts the deltas
+  write_file(dir + "/cpu", "");
+  pressure.update_state();
+  CHECK( !pressure.is_available(ProcPressure::CPU) );
+  write_file(dir + "/cpu", stall_line("some", "avg10=2.00 avg60=1.00 avg300=0.50", 2000));
+  pressure.update_state();
+  CHECK( pressure.is_available(ProcPressure::CPU) );
+  CHECK( pressure.get(ProcPressure::CPU).some.total == 2000 );
+  CHECK( pressure.get(ProcPressure::CPU).some.delta == 0 );
+}
+
+int main()
+{
+  boost::filesystem::path dir = boost::filesystem::temp_directory_path() / boost::filesystem::unique_path("procpressure-%%%%-%%%%");
+  boost::filesystem::create_directories(dir);
+  test_pressure(dir.string());
+  boost::filesystem::remove_all(dir);
+
+  if ( failures ) {
+    fprintf(stderr, "%d check(s) failed\n", failures);
+    return 1;
+  }
+  printf("procpressure_test: all checks passed\n");
+  return 0;
+}
@@ -0,0 +1,196 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+
+//
+// Compares the cost of registering, looking up and removing component
+// processes with the ProcessRegistry against the std::deque and find_if
+// search that GPP_i used for its process list.  Components are spread over
+// applications of ten components each; the app lookup mirrors the scan done
+// by GPP_i::process_ODM for every application state change.
+//
+//   usage: procreg_bench [nprocs ...]
+//
+#include <stdlib.h>
+#include <time.h>
+#include <iostream>
+#include <sstream>
+#include <algorithm>
+#include <deque>
+#include <functional>
+#include <vector>
+#include <boost/format.hpp>
+#include <boost/foreach.hpp>
+#include "utils/ProcessRegistry.h"
+
+struct component {
+  int         pid;
+  std::string appName;
+  std::string identifier;
+  bool        app_started;
+};
+
+class FindPid : public std::binary_function< component, int, bool >  {
+public:
+  bool operator() ( const component &a, const int &pid ) const {
+    return a.pid == pid;
+  }
+};
+
+class FindApp : public std::binary_function< component, std::string, bool  >  {
+public:
+  bool operator() ( const component &a, const std::string &appName ) const {
+    return a.appName == appName;
+  }
+};
+
+static const int APP_SIZE=10;
+
+static double now()
+{
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return ts.tv_sec + ts.tv_nsec*1e-9;
+}
+
+static std::vector<component> make_components( int n )
+{
+  std::vector<component> ret;
+  for ( int i=0; i < n; i++ ) {
+    component c;
+    c.pid = 1000 + i*3;
+    std::stringstream app, id;
+    app << "app_" << i/APP_SIZE;
+    id << "comp_" << i << ":" << app.str();
+    c.appName = app.str();
+    c.identifier = id.str();
+    c.app_started = false;
+    ret.push_back(c);
+  }
+  return ret;
+}
+
+struct timings {
+  timings() : add(0), lookup(0), app(0), remove(0) {};
+  double add, lookup, app, remove;
+};
+
+static timings run_deque( const std::vector<component> &comps, const std::vector<int> &order, int napps )
+{
+  timings t;
+  std::deque<component> pids;
+  double t0 = now();
+  BOOST_FOREACH(const component &c, comps) {
+    if ( std::find_if( pids.begin(), pids.end(), std::bind2nd( FindPid(), c.pid ) ) != pids.end() ) continue;
+    pids.push_front(c);
+  }
+  t.add = now() - t0;
+
+  t0 = now();
+  BOOST_FOREACH(const int idx, order) {
+    std::deque<component>::iterator it = std::find_if( pids.begin(), pids.end(), std::bind2nd( FindPid(), comps[idx].pid ) );
+    if ( it != pids.end() ) it->app_started = true;
+  }
+  t.lookup = now() - t0;
+
+  t0 = now();
+  for ( int a=0; a < napps; a++ ) {
+    std::string appId = comps[(a*APP_SIZE) % comps.size()].appName;
+    std::deque<component>::iterator i = pids.begin();
+    while ( i != pids.end() ) {
+      i = std::find_if( i, pids.end(), std::bind2nd( FindApp(), appId ) );
+      if ( i != pids.end() ) {
+        i->app_started = false;
+        i++;
+      }
+    }
+  }
+  t.app = now() - t0;
+
+  t0 = now();
+  BOOST_FOREACH(const int idx, order) {
+    std::deque<component>::iterator it = std::find_if( pids.begin(), pids.end(), std::bind2nd( FindPid(), comps[idx].pid ) );
+    if ( it != pids.end() ) pids.erase(it);
+  }
+  t.remove = now() - t0;
+  return t;
+}
+
+static timings run_registry( const std::vector<component> &comps, const std::vector<int> &order, int napps )
+{
+  timings t;
+  ProcessRegistry<component> pids;
+  double t0 = now();
+  BOOST_FOREACH(const component &c, comps) {
+    pids.insert(c);
+  }
+  t.add = now() - t0;
+
+  t0 = now();
+  BOOST_FOREACH(const int idx, order) {
+    ProcessRegistry<component>::iterator it = pids.find(comps[idx].pid);
+    if ( it != pids.end() ) it->app_started = true;
+  }
+  t.lookup = now() - t0;
+
+  t0 = now();
+  for ( int a=0; a < napps; a++ ) {
+    std::string appId = comps[(a*APP_SIZE) % comps.size()].appName;
+    BOOST_FOREACH(const int pid, pids.find_app(appId)) {
+      ProcessRegistry<component>::iterator it = pids.find(pid);
+      if ( it != pids.end() ) it->app_started = false;
+    }
+  }
+  t.app = now() - t0;
+
+  t0 = now();
+  BOOST_FOREACH(const int idx, order) {
+    pids.erase(comps[idx].pid);
+  }
+  t.remove = now() - t0;
+  return t;
+}
+
+static void report( const char *name, int n, const timings &t )
+{
+  std::cout << boost::format("%-7d %-8s add %9.3f ms  lookup %9.3f ms  app %9.3f ms  remove %9.3f ms")
+    % n % name % (t.add*1e3) % (t.lookup*1e3) % (t.app*1e3) % (t.remove*1e3) << std::endl;
+}
+
+int main(int argc, char* argv[])
+{
+  std::vector<int> sizes;
+  for ( int i=1; i < argc; i++ ) sizes.push_back(atoi(argv[i]));
+  if ( sizes.empty() ) {
+    sizes.push_back(1000);
+    sizes.push_back(10000);
+    sizes.push_back(50000);
+  }
+
+  BOOST_FOREACH(int n, sizes) {
+    std::vector<component> comps = make_components(n);
+    std::vector<int> order;
+    for ( int i=0; i < n; i++ ) order.push_back(i);
+    std::random_shuffle(order.begin(), order.end());
+    int napps = std::min(1000, n/APP_SIZE);
+    report("deque", n, run_deque(comps, order, napps));
+    report("registry", n, run_registry(comps, order, napps));
+  }
+  return 0;
+}
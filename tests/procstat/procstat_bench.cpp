@@ -0,0 +1,185 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+
+//
+// Measures the cost of parsing /proc/stat.  A fixture for a host with the
+// requested number of cpus (and a matching intr line) is generated in a
+// temporary file, and ProcStatParser is compared against the ifstream,
+// boost::split and lexical_cast parser it replaced, both decoding every
+// section and decoding only the cpu lines.  The parsers are also run
+// against this host's /proc/stat.
+//
+//   usage: procstat_bench [-iterations n] [ncpus]
+//
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <unistd.h>
+#include <iostream>
+#include <fstream>
+#include <sstream>
+#include <vector>
+#include <boost/format.hpp>
+#include <boost/lexical_cast.hpp>
+#include <boost/algorithm/string.hpp>
+#include "states/ProcStat.h"
+#include "parsers/ProcStatParser.h"
+
+static double now()
+{
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return ts.tv_sec + ts.tv_nsec*1e-9;
+}
+
+static std::string make_fixture( int ncpus )
+{
+  char tmpl[] = "/tmp/procstat.XXXXXX";
+  int fd = mkstemp(tmpl);
+  close(fd);
+  std::ofstream ostr(tmpl);
+  ostr << "cpu  " << 1000*ncpus << " 12 " << 300*ncpus << " " << 90000*ncpus << " 441 0 123 0 0 0" << std::endl;
+  for ( int i=0; i < ncpus; i++ ) {
+    ostr << "cpu" << i << " " << 1000+i << " 0 " << 300+i << " " << 90000+i << " " << i << " 0 " << i % 7 << " 0 0 0" << std::endl;
+  }
+  // large hosts report a counter for every interrupt source
+  ostr << "intr 123456789";
+  for ( int i=0; i < 32*ncpus; i++ ) ostr << " " << (i % 5 ? 0 : i*17);
+  ostr << std::endl;
+  ostr << "ctxt 9876543210" << std::endl;
+  ostr << "btime 1700000000" << std::endl;
+  ostr << "processes 4321123" << std::endl;
+  ostr << "procs_running 3" << std::endl;
+  ostr << "procs_blocked 0" << std::endl;
+  ostr << "softirq 55555 1 2 3 4 5 6 7 8 9 10" << std::endl;
+  return std::string(tmpl);
+}
+
+//
+// the parser previously used by ProcStat
+//
+static void legacy_parse( const std::string &fname, ProcStat::Contents &data )
+{
+  std::ifstream procstat_file( fname.c_str() );
+  std::string line;
+  data.time_stamp = time(NULL);
+  while ( std::getline( procstat_file, line ) ) {
+    std::vector<std::string> values;
+    boost::split( values, line, boost::is_any_of(std::string(" ")), boost::algorithm::token_compress_on );
+    if ( boost::starts_with( values[0], "cpu" ) ) {
+      ProcStat::CpuStat cstat;
+      cstat.id = values[0];
+      cstat.idx = -1;
+      try {
+        if ( values[0].size() > 3 ) cstat.idx = boost::lexical_cast<int>( values[0].substr(3) );
+      }
+      catch( boost::bad_lexical_cast ) {
+      }
+      cstat.jiffies.resize( values.size()-1 );
+      for ( uint32_t i=1; i<values.size(); ++i ) {
+        try {
+          cstat.jiffies[i-1] = boost::lexical_cast<ProcStat::Counter>( values[i] );
+        }
+        catch( boost::bad_lexical_cast ) {
+        }
+      }
+      // the legacy parser formatted a debug line for every cpu
+      std::stringstream ss;
+      ss << boost::format("%-5s:%-2d ") % cstat.id % cstat.idx;
+      for ( uint32_t j=0; j < cstat.jiffies.size(); j++ ) ss << boost::format("%-7lld  ") % cstat.jiffies[j];
+      if ( cstat.idx == -1 ) data.all = cstat;
+      else data.cpus.push_back(cstat);
+    }
+    if ( boost::starts_with( values[0], "intr" ) || boost::starts_with( values[0], "softirq" ) ) {
+      ProcStat::CounterList stat_list;
+      for ( uint32_t i=1; i<values.size(); ++i ) {
+        try {
+          stat_list.push_back( boost::lexical_cast<ProcStat::Counter>( values[i] ) );
+        }
+        catch( boost::bad_lexical_cast ) {
+        }
+      }
+      if ( values[0] == "intr" ) data.interrupts.swap( stat_list );
+      else data.soft_irqs.swap( stat_list );
+    }
+    if ( boost::starts_with( values[0], "btime" ) ) data.boot_time = boost::lexical_cast<ProcStat::Counter>( values[1] );
+    if ( boost::starts_with( values[0], "ctxt" ) ) data.context_switches = boost::lexical_cast<ProcStat::Counter>( values[1] );
+    if ( boost::starts_with( values[0], "processes" ) ) data.processes_started = boost::lexical_cast<ProcStat::Counter>( values[1] );
+  }
+}
+
+static bool same_cpus( const ProcStat::Contents &a, const ProcStat::Contents &b )
+{
+  if ( a.all.jiffies != b.all.jiffies || a.cpus.size() != b.cpus.size() ) return false;
+  for ( size_t i=0; i < a.cpus.size(); i++ ) {
+    if ( a.cpus[i].idx != b.cpus[i].idx || a.cpus[i].id != b.cpus[i].id || a.cpus[i].jiffies != b.cpus[i].jiffies ) return false;
+  }
+  return true;
+}
+
+static void run( const std::string &label, const std::string &fname, int iterations, bool check )
+{
+  ProcStat::Contents ref;
+  legacy_parse(fname, ref);
+
+  double t0 = now();
+  for ( int i=0; i < iterations; i++ ) {
+    ProcStat::Contents data;
+    legacy_parse(fname, data);
+  }
+  double legacy = (now() - t0) / iterations;
+
+  ProcStatParser parser(fname);
+  ProcStat::Contents all, cpu;
+  parser.parse(all, ProcStat::ALL);
+  t0 = now();
+  for ( int i=0; i < iterations; i++ ) parser.parse(all, ProcStat::ALL);
+  double t_all = (now() - t0) / iterations;
+
+  parser.parse(cpu, ProcStat::CPU);
+  t0 = now();
+  for ( int i=0; i < iterations; i++ ) parser.parse(cpu, ProcStat::CPU);
+  double t_cpu = (now() - t0) / iterations;
+
+  bool match = same_cpus(ref, all) && same_cpus(ref, cpu) && ref.interrupts == all.interrupts &&
+    ref.soft_irqs == all.soft_irqs && ref.context_switches == all.context_switches &&
+    ref.boot_time == all.boot_time && ref.processes_started == all.processes_started;
+
+  std::cout << boost::format("%-16s %4d cpus  legacy %9.1f us  all sections %8.1f us  cpu only %8.1f us  %s")
+    % label % all.cpus.size() % (legacy*1e6) % (t_all*1e6) % (t_cpu*1e6) % (!check ? "" : match ? "match" : "MISMATCH") << std::endl;
+}
+
+int main(int argc, char* argv[])
+{
+  int iterations=2000;
+  int ncpus=128;
+  for ( int i=1; i < argc; i++ ) {
+    if ( strcmp(argv[i], "-iterations") == 0 && i+1 < argc ) iterations=atoi(argv[++i]);
+    else ncpus=atoi(argv[i]);
+  }
+
+  std::string fixture = make_fixture(ncpus);
+  run("fixture", fixture, iterations, true);
+  unlink(fixture.c_str());
+  // counters change between reads, only the fixture is compared
+  run("/proc/stat", "/proc/stat", iterations, false);
+  return 0;
+}
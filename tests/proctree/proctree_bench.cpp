@@ -0,0 +1,270 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+
+//
+// Measures the per cycle cost of indexing the process table.  A synthetic
+// /proc tree with the requested number of pids is generated in a temporary
+// directory, and the ProcessTree index is compared against the full rescan
+// that GPP_i::update_grp_child_pids used to perform.  With -events the cost
+// of an update on this host's /proc is measured with process events enabled
+// (requires CAP_NET_ADMIN) and with polling.
+//
+//   usage: proctree_bench [-legacy] [-events] [-cycles n] [npids ...]
+//
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+#include <unistd.h>
+#include <glob.h>
+#include <iostream>
+#include <fstream>
+#include <sstream>
+#include <algorithm>
+#include <map>
+#include <vector>
+#include <boost/format.hpp>
+#include <boost/foreach.hpp>
+#include <boost/lexical_cast.hpp>
+#include <boost/algorithm/string.hpp>
+#include <boost/filesystem/operations.hpp>
+#include "states/ProcessTree.h"
+
+static const int NROOTS=4;
+static const int NCHILDREN=8;
+
+static double now()
+{
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return ts.tv_sec + ts.tv_nsec*1e-9;
+}
+
+static void write_stat( const std::string &top, int pid, int ppid, int pgrp, uint64_t starttime )
+{
+  std::stringstream dname;
+  dname << top << "/" << pid;
+  boost::filesystem::create_directory(dname.str());
+  std::ofstream ostr((dname.str()+"/stat").c_str());
+  ostr << pid << " (proc " << pid << ") S " << ppid << " " << pgrp << " " << pgrp
+       << " 0 -1 4194560 1093 0 0 0 " << (pid % 97) << " " << (pid % 13) << " 0 0 20 0 "
+       << (1 + pid % 4) << " 0 " << starttime << " 12345678 " << (100 + pid % 50)
+       << " 18446744073709551615 1 1 0 0 0 0 0 0 0 0 0 0 17 0 0 0 0 0 0" << std::endl;
+}
+
+//
+// component roots start at pid 1000, each with children in its own process
+// group plus one grandchild that moved to a new process group
+//
+static std::vector<int> build_tree( const std::string &top, int npids )
+{
+  std::vector<int> roots;
+  int pid=2;
+  for ( int r=0; r < NROOTS; r++ ) {
+    int root=1000 + r*100;
+    roots.push_back(root);
+    write_stat(top, root, 1, root, 1);
+    for ( int c=1; c <= NCHILDREN; c++ ) write_stat(top, root+c, root, root, 1);
+    write_stat(top, root+NCHILDREN+1, root+1, root+NCHILDREN+1, 1);
+  }
+  int created = NROOTS*(NCHILDREN+2);
+  while ( created < npids ) {
+    if ( pid >= 1000 && pid < 1000+NROOTS*100 ) { pid++; continue; }
+    write_stat(top, pid, 1, pid, 1);
+    pid++;
+    created++;
+  }
+  return roots;
+}
+
+//
+// replace a fraction of the unrelated processes with new ones
+//
+static void churn( const std::string &top, int npids, int count, uint64_t starttime )
+{
+  for ( int i=0; i < count; i++ ) {
+    int pid = 1000 + NROOTS*100 + (rand() % npids);
+    std::stringstream dname;
+    dname << top << "/" << pid;
+    boost::filesystem::remove_all(dname.str());
+    write_stat(top, pid, 1, pid, starttime);
+  }
+}
+
+struct legacy_values {
+  float mem_rss;
+  int   num_threads;
+  int   pgrpid;
+  int   num_processes;
+  std::vector<int> pids;
+};
+
+//
+// the full rescan previously performed every cycle
+//
+static void legacy_scan( const std::string &top, std::map<int,legacy_values> &parsed_stat, std::map<int,legacy_values> &grp_children )
+{
+  glob_t globbuf;
+  std::vector<int> pids_now;
+  glob((top+"/[0-9]*").c_str(), GLOB_NOSORT, NULL, &globbuf);
+  for (unsigned int i = 0; i < globbuf.gl_pathc; i++) {
+    std::string stat_filename(globbuf.gl_pathv[globbuf.gl_pathc - i - 1]);
+    pids_now.push_back(boost::lexical_cast<int>(stat_filename.substr(stat_filename.rfind("/")+1)));
+  }
+  globfree(&globbuf);
+
+  BOOST_FOREACH(const int &_pid, pids_now) {
+    if (parsed_stat.find(_pid) != parsed_stat.end()) continue;
+    std::stringstream stat_filename;
+    stat_filename << top << "/" << _pid << "/stat";
+    std::string line;
+    std::vector<std::string> fields;
+    std::ifstream istr(stat_filename.str().c_str());
+    std::getline(istr, line);
+    boost::split(fields, line, boost::is_any_of(std::string(" ")));
+    if (fields.size() < 38) continue;
+    legacy_values tmp;
+    tmp.mem_rss = boost::lexical_cast<float>(fields[24]);
+    tmp.num_threads = boost::lexical_cast<int>(fields[20]);
+    tmp.pgrpid = boost::lexical_cast<int>(fields[5]);
+    parsed_stat[_pid] = tmp;
+    legacy_values &grp = grp_children[tmp.pgrpid];
+    grp.num_processes += 1;
+    grp.pids.push_back(_pid);
+  }
+  std::vector<int> to_erase;
+  for (std::map<int, legacy_values>::iterator _it = parsed_stat.begin(); _it != parsed_stat.end(); _it++) {
+    if (std::find(pids_now.begin(), pids_now.end(), _it->first) == pids_now.end()) {
+      to_erase.push_back(_it->first);
+    }
+  }
+  BOOST_FOREACH(const int &_pid, to_erase) {
+    parsed_stat.erase(_pid);
+  }
+}
+
+static void run( int npids, int cycles, bool legacy )
+{
+  char tmpl[] = "/tmp/proctree.XXXXXX";
+  std::string top(mkdtemp(tmpl));
+  std::vector<int> roots = build_tree(top, npids);
+  int nchurn = std::max(1, npids/100);
+
+  ProcessTree tree(top);
+  tree.set_roots(roots);
+
+  double t0 = now();
+  tree.update_state();
+  double cold = now() - t0;
+
+  double steady = 0;
+  size_t steady_parsed = 0;
+  for ( int i=0; i < cycles; i++ ) {
+    t0 = now();
+    tree.update_state();
+    steady += now() - t0;
+    steady_parsed += tree.get_parsed_count();
+  }
+
+  double churned = 0;
+  size_t churn_parsed = 0;
+  for ( int i=0; i < cycles; i++ ) {
+    churn(top, npids, nchurn, 100+i);
+    t0 = now();
+    tree.update_state();
+    churned += now() - t0;
+    churn_parsed += tree.get_parsed_count();
+  }
+
+  int tracked = 0;
+  const ProcessTree::Contents &groups = tree.get();
+  for ( ProcessTree::Contents::const_iterator it=groups.begin(); it != groups.end(); it++ ) tracked += it->second.num_processes;
+
+  std::cout << boost::format("%-7d index   cold %9.3f ms  steady %9.3f ms (%4d parsed)  1%% churn %9.3f ms (%4d parsed)  tracked %d/%d")
+    % npids % (cold*1e3) % (steady*1e3/cycles) % (steady_parsed/cycles) % (churned*1e3/cycles) % (churn_parsed/cycles)
+    % tracked % (NROOTS*(NCHILDREN+2)) << std::endl;
+
+  if ( legacy ) {
+    std::map<int,legacy_values> parsed_stat, grp_children;
+    t0 = now();
+    legacy_scan(top, parsed_stat, grp_children);
+    cold = now() - t0;
+    steady = 0;
+    for ( int i=0; i < cycles; i++ ) {
+      t0 = now();
+      legacy_scan(top, parsed_stat, grp_children);
+      steady += now() - t0;
+    }
+    std::cout << boost::format("%-7d rescan  cold %9.3f ms  steady %9.3f ms") % npids % (cold*1e3) % (steady*1e3/cycles) << std::endl;
+  }
+
+  boost::filesystem::remove_all(top);
+}
+
+static void run_events( int cycles )
+{
+  ProcessTree polled, evented;
+  if ( !evented.enable_events() ) {
+    std::cout << "process events unavailable" << std::endl;
+    return;
+  }
+  std::vector<int> roots(1, getpid());
+  polled.set_roots(roots);
+  evented.set_roots(roots);
+  polled.update_state();
+  evented.update_state();
+
+  double t_polled = 0, t_evented = 0;
+  for ( int i=0; i < cycles; i++ ) {
+    double t0 = now();
+    polled.update_state();
+    t_polled += now() - t0;
+    t0 = now();
+    evented.update_state();
+    t_evented += now() - t0;
+  }
+  std::cout << boost::format("%-7d /proc   polled %9.3f ms  events %9.3f ms")
+    % polled.get_index().size() % (t_polled*1e3/cycles) % (t_evented*1e3/cycles) << std::endl;
+}
+
+int main(int argc, char* argv[])
+{
+  bool legacy=false;
+  bool events=false;
+  int cycles=10;
+  std::vector<int> sizes;
+  for ( int i=1; i < argc; i++ ) {
+    if ( strcmp(argv[i], "-legacy") == 0 ) legacy=true;
+    else if ( strcmp(argv[i], "-events") == 0 ) events=true;
+    else if ( strcmp(argv[i], "-cycles") == 0 && i+1 < argc ) cycles=atoi(argv[++i]);
+    else sizes.push_back(atoi(argv[i]));
+  }
+  if ( sizes.empty() ) {
+    sizes.push_back(1000);
+    sizes.push_back(10000);
+    sizes.push_back(50000);
+  }
+
+  BOOST_FOREACH(int npids, sizes) {
+    run(npids, cycles, legacy);
+  }
+  if ( events ) run_events(cycles);
+  return 0;
+}
@@ -24,10 +24,11 @@ int main(int argc, char* argv[])
 
     ProcMeminfo meminfo;
     meminfo.update_state();
-    ProcMeminfo::Contents  c=meminfo.get();
-    ProcMeminfo::Contents::const_iterator iter=c.begin();
+    const ProcMeminfo::KeyList &keys=meminfo.keys();
     std::cout << "MEMINFO:" << std::endl;
-    for ( ; iter != c.end(); iter++ ) std::cout << iter->first << " = "  << iter->second  << std::endl;
+    for ( size_t i=0; i < keys.size(); i++ ) {
+      if ( meminfo.has(i) ) std::cout << keys[i] << " = "  << meminfo.get(i)  << std::endl;
+    }
       
 
     ProcStat pstat;
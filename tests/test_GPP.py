@@ -303,7 +303,16 @@ class ComponentTests(ossie.utils.testing.ScaComponentTestCase):
         self.assertEquals(component_monitor[0].waveform_id, comp_id)
         self.assertEquals(component_monitor[0].num_processes, 1)
         self.assertTrue(component_monitor[0].num_threads >= 4)
-        
+        self.assertTrue(component_monitor[0].cores_peak >= component_monitor[0].cores_p95)
+        self.assertTrue(component_monitor[0].cores_p95 >= component_monitor[0].cores_p50)
+
+        application_monitor = self.comp.application_monitor
+        self.assertEquals(len(application_monitor), 1)
+        self.assertEquals(application_monitor[0].waveform_id, component_monitor[0].waveform_id)
+        self.assertEquals(application_monitor[0].num_components, 1)
+        self.assertEquals(application_monitor[0].num_processes, component_monitor[0].num_processes)
+        self.assertEquals(application_monitor[0].num_threads, component_monitor[0].num_threads)
+
         try:
             os.kill(pid, 0)
         except OSError:
@@ -1057,6 +1066,207 @@ class ComponentTests_SystemReservations(ossie.utils.testing.ScaComponentTestCase
         self.assertTrue(component_monitor.cores > 0.75)
         self.assertTrue(component_monitor.cores < 1.75)
 
+    def testCpuUtilization(self):
+        self._domainBooter, domMgr = self.launchDomainManager(domain_name='REDHAWK_TEST_'+str(os.getpid()))
+        self._deviceBooter, devMgr = self.launchDeviceManager("sdr/dev/nodes/DevMgr_sample/DeviceManager.dcd.xml", domainManager=self.dom.ref)
+        wait_amount = (self.dom.devMgrs[0].devs[0].threshold_cycle_time / 1000.0) * 2
+        time.sleep(wait_amount)
+        online = [ int(line.split()[0][3:]) for line in open('/proc/stat') if line.startswith('cpu') and line[3].isdigit() ]
+        cpu_utilization = self.dom.devMgrs[0].devs[0].cpu_utilization
+        self.assertEquals([ cpu.cpu for cpu in cpu_utilization ], online)
+        for cpu in cpu_utilization:
+            self.assertTrue(cpu.idle >= 0 and cpu.idle <= 100)
+            self.assertTrue(cpu.user + cpu.system <= 100.01)
+            self.assertTrue(self.float_eq(cpu.utilization, 100 - cpu.idle, 0.01))
+
+    def testCpuAverages(self):
+        self._domainBooter, domMgr = self.launchDomainManager(domain_name='REDHAWK_TEST_'+str(os.getpid()))
+        self._deviceBooter, devMgr = self.launchDeviceManager("sdr/dev/nodes/DevMgr_sample/DeviceManager.dcd.xml", domainManager=self.dom.ref)
+        gpp = self.dom.devMgrs[0].devs[0]
+        cpu_averages = gpp.cpu_averages
+        self.assertEquals([ avg.window for avg in cpu_averages ], [5, 60, 900])
+        for avg in cpu_averages:
+            self.assertTrue(avg.idle >= 0 and avg.idle <= 100)
+            self.assertTrue(avg.span <= 900)
+        gpp.cpu_average_windows = [1, 30]
+        time.sleep((gpp.threshold_cycle_time / 1000.0) * 6)
+        cpu_averages = gpp.cpu_averages
+        self.assertEquals([ avg.window for avg in cpu_averages ], [1, 30])
+        self.assertTrue(cpu_averages[0].span >= 1)
+        self.assertTrue(cpu_averages[1].span < 30)
+
+    def testDiskCapacity(self):
+        self._domainBooter, domMgr = self.launchDomainManager(domain_name='REDHAWK_TEST_'+str(os.getpid()))
+        self._deviceBooter, devMgr = self.launchDeviceManager("sdr/dev/nodes/DevMgr_sample/DeviceManager.dcd.xml", domainManager=self.dom.ref)
+        gpp = self.dom.devMgrs[0].devs[0]
+        time.sleep((gpp.threshold_cycle_time / 1000.0) * 2)
+
+        # without diskrateTotal every hardware backed disk is monitored
+        disks = sorted([ d for d in os.listdir('/sys/block') if os.path.exists('/sys/block/'+d+'/device') ])
+        disk_metrics = gpp.disk_metrics
+        self.assertEquals([ disk.device for disk in disk_metrics ], disks)
+        for disk in disk_metrics:
+            self.assertTrue(disk.utilization >= 0 and disk.utilization <= 100)
+            self.assertEquals(disk.rate_total, 0)
+        self.assertTrue(gpp.disk_writeback.dirty >= 0)
+
+        # nothing can be allocated until disk rates are configured
+        self.assertEquals(gpp.diskCapacity, 0)
+        self.assertFalse(gpp.allocateCapacity({'diskCapacity': 10.0}))
+        if not disks:
+            return
+
+        gpp.diskrateTotal = [{'diskrateTotal::diskrateTotal::device': disks[0], 'diskrateTotal::diskrateTotal::rate': 1000.0}]
+        time.sleep((gpp.threshold_cycle_time / 1000.0) * 2)
+        self.assertEquals(gpp.disk_metrics[0].rate_total, 1000.0)
+        self.assertTrue(self.float_eq(gpp.diskCapacity, 1000.0 * gpp.thresholds.disk_usage / 100.0, 0.01))
+        capacity = gpp.diskCapacity
+        self.assertFalse(gpp.allocateCapacity({'diskCapacity': capacity + 1}))
+        self.assertTrue(gpp.allocateCapacity({'diskCapacity': 100.0}))
+        self.assertTrue(self.float_eq(gpp.diskCapacity, capacity - 100.0, 0.01))
+        gpp.deallocateCapacity({'diskCapacity': 100.0})
+        self.assertTrue(self.float_eq(gpp.diskCapacity, capacity, 0.01))
+
+    def testThresholdCadence(self):
+        self._domainBooter, domMgr = self.launchDomainManager(domain_name='REDHAWK_TEST_'+str(os.getpid()))
+        self._deviceBooter, devMgr = self.launchDeviceManager("sdr/dev/nodes/DevMgr_sample/DeviceManager.dcd.xml", domainManager=self.dom.ref)
+        gpp = self.dom.devMgrs[0].devs[0]
+        time.sleep(1)
+        status = gpp.threshold_cadence_status
+        self.assertEquals(status.cycle_time, gpp.threshold_cycle_time)
+        self.assertTrue(status.update_time > 0)
+        self.assertTrue(status.overhead >= 0)
+        self.assertTrue(self.float_eq(status.detection_time, status.cycle_time + status.update_time, 0.01))
+        self.assertTrue(status.headroom >= 0 and status.headroom <= 100)
+
+        # any headroom lengthens the cycle up to the maximum, in steps
+        gpp.threshold_cadence.near = 0
+        gpp.threshold_cadence.far = 0
+        gpp.threshold_cadence.minimum = 100
+        gpp.threshold_cadence.maximum = 1000
+        gpp.threshold_cadence.adaptive = True
+        time.sleep(5)
+        self.assertEquals(gpp.threshold_cadence_status.cycle_time, 1000)
+
+        # no headroom is far enough, the cycle drops to the minimum right away
+        gpp.threshold_cadence.near = 100
+        gpp.threshold_cadence.far = 100
+        time.sleep(1.5)
+        self.assertEquals(gpp.threshold_cadence_status.cycle_time, 100)
+
+    def testPressureThresholds(self):
+        self._domainBooter, domMgr = self.launchDomainManager(domain_name='REDHAWK_TEST_'+str(os.getpid()))
+        self._deviceBooter, devMgr = self.launchDeviceManager("sdr/dev/nodes/DevMgr_sample/DeviceManager.dcd.xml", domainManager=self.dom.ref)
+        gpp = self.dom.devMgrs[0].devs[0]
+        # the pressure checks are disabled by default
+        self.assertEquals(gpp.thresholds.cpu_pressure, -1)
+        self.assertEquals(gpp.thresholds.memory_pressure, -1)
+        self.assertEquals(gpp.thresholds.io_pressure, -1)
+
+    def testUpdateSchedule(self):
+        self._domainBooter, domMgr = self.launchDomainManager(domain_name='REDHAWK_TEST_'+str(os.getpid()))
+        self._deviceBooter, devMgr = self.launchDeviceManager("sdr/dev/nodes/DevMgr_sample/DeviceManager.dcd.xml", domainManager=self.dom.ref)
+        gpp = self.dom.devMgrs[0].devs[0]
+        self.assertEquals(gpp.update_cpu_budget, 100)
+        gpp.threshold_cycle_time = 200
+        time.sleep(3)
+        schedule = dict((entry.name, entry) for entry in gpp.update_schedule)
+        for name in ['proc_stat', 'system_monitor', 'meminfo', 'process_limits', 'nic', 'disks', 'exec_partitions']:
+            self.assertTrue(name in schedule)
+        self.assertEquals(schedule['proc_stat'].period, 0)
+        self.assertEquals(schedule['meminfo'].period, 1000)
+        self.assertEquals(schedule['process_limits'].period, 5000)
+
+        # collectors with a period are refreshed less often than the cycle
+        self.assertTrue(schedule['proc_stat'].runs > schedule['nic'].runs)
+        self.assertTrue(schedule['system_monitor'].runs > schedule['meminfo'].runs)
+        self.assertTrue(schedule['nic'].runs > schedule['process_limits'].runs)
+        for entry in schedule.values():
+            self.assertTrue(entry.runs > 0)
+            self.assertTrue(entry.wall_time >= 0)
+            self.assertTrue(entry.max_wall_time >= entry.wall_time)
+
+        # the collectors that are refreshed every cycle are never deferred
+        self.assertEquals(schedule['proc_stat'].deferred, 0)
+        self.assertEquals(schedule['system_monitor'].deferred, 0)
+
+    def testMonitorFilteredNics(self):
+        self._domainBooter, domMgr = self.launchDomainManager(domain_name='REDHAWK_TEST_'+str(os.getpid()))
+        self._deviceBooter, devMgr = self.launchDeviceManager("sdr/dev/nodes/DevMgr_sample/DeviceManager.dcd.xml", domainManager=self.dom.ref)
+        gpp = self.dom.devMgrs[0].devs[0]
+        self.assertEquals(gpp.monitor_filtered_nics, False)
+        names = [nic.interface for nic in gpp.nic_metrics]
+        self.assertTrue('lo' in names)
+
+        # lo is not matched by nic_interfaces, it is no longer polled
+        gpp.monitor_filtered_nics = True
+        time.sleep(2)
+        filtered = gpp.available_nic_interfaces
+        for name in [nic.interface for nic in gpp.nic_metrics]:
+            self.assertTrue(name in filtered or [f for f in filtered if f.split('.')[0] == name])
+        self.assertFalse('lo' in [nic.interface for nic in gpp.nic_metrics])
+        for nic in gpp.networkMonitor:
+            self.assertTrue([f for f in filtered if f.split('.')[0] == nic.interface])
+
+        gpp.monitor_filtered_nics = False
+        time.sleep(2)
+        self.assertTrue('lo' in [nic.interface for nic in gpp.nic_metrics])
+
+    def testNicDirectionMetrics(self):
+        self._domainBooter, domMgr = self.launchDomainManager(domain_name='REDHAWK_TEST_'+str(os.getpid()))
+        self._deviceBooter, devMgr = self.launchDeviceManager("sdr/dev/nodes/DevMgr_sample/DeviceManager.dcd.xml", domainManager=self.dom.ref)
+        gpp = self.dom.devMgrs[0].devs[0]
+
+        # generate some traffic on the loopback device between two updates
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        for i in range(200):
+            sock.sendto('x'*1000, ('127.0.0.1', 9))
+        sock.close()
+        time.sleep(2)
+
+        nics = dict([(nic.interface, nic) for nic in gpp.nic_metrics])
+        self.assertTrue('lo' in nics)
+        for nic in nics.values():
+            for rate in ('rx_throughput', 'tx_throughput', 'rx_packet_rate', 'tx_packet_rate',
+                         'rx_dropped_rate', 'tx_dropped_rate', 'rx_error_rate', 'tx_error_rate'):
+                self.assertTrue(getattr(nic, rate) >= 0)
+            self.assertTrue(nic.rx_throughput_peak >= nic.rx_throughput)
+            self.assertTrue(nic.tx_throughput_peak >= nic.tx_throughput)
+            self.assertTrue(nic.rx_dropped_peak >= nic.rx_dropped_rate)
+            total = nic.rx_throughput + nic.tx_throughput
+            self.assertTrue(abs(nic.current_throughput - total) <= 0.001 * max(1.0, total))
+
+        # everything sent on lo is also received on lo
+        self.assertTrue(nics['lo'].rx_throughput_peak > 0)
+        self.assertAlmostEquals(nics['lo'].rx_throughput_peak, nics['lo'].tx_throughput_peak, places=3)
+
+    def testNicPlacementPolicy(self):
+        self._domainBooter, domMgr = self.launchDomainManager(domain_name='REDHAWK_TEST_'+str(os.getpid()))
+        self._deviceBooter, devMgr = self.launchDeviceManager("sdr/dev/nodes/DevMgr_sample/DeviceManager.dcd.xml", domainManager=self.dom.ref)
+        gpp = self.dom.devMgrs[0].devs[0]
+        self.assertEquals(gpp.nic_placement_policy, 'first_fit')
+
+        # interfaces with a known speed can take a zero rate allocation
+        available = gpp.available_nic_interfaces
+        usable = [nic.interface for nic in gpp.nic_metrics if nic.interface in available and nic.rate > 0]
+        for policy in ('best_fit', 'least_loaded', 'numa_local', 'first_fit'):
+            gpp.nic_placement_policy = policy
+            self.assertEquals(gpp.nic_placement_policy, policy)
+            if not usable:
+                continue
+            alloc = [CF.DataType(id='nic_allocation::identifier', value=any.to_any('alloc_'+policy)),
+                     CF.DataType(id='nic_allocation::data_rate', value=CORBA.Any(CORBA.TC_float, 0.0)),
+                     CF.DataType(id='nic_allocation::data_size', value=CORBA.Any(CORBA.TC_short, 1)),
+                     CF.DataType(id='nic_allocation::multicast_support', value=any.to_any('')),
+                     CF.DataType(id='nic_allocation::socket', value=CORBA.Any(CORBA.TC_long, 0))]
+            props = [CF.DataType(id='nic_allocation', value=any.to_any(alloc))]
+            self.assertTrue(gpp.allocateCapacity(props))
+            status = [s for s in gpp.nic_allocation_status if s.identifier == 'alloc_'+policy]
+            self.assertEquals(len(status), 1)
+            self.assertTrue(status[0].interface in available)
+            gpp.deallocateCapacity(props)
+            self.assertFalse([s for s in gpp.nic_allocation_status if s.identifier == 'alloc_'+policy])
+
     def testDeadlock(self):
         self._domainBooter, domMgr = self.launchDomainManager(domain_name='REDHAWK_TEST_'+str(os.getpid()))
         self._deviceBooter, devMgr = self.launchDeviceManager("sdr/dev/nodes/DevMgr_sample/DeviceManager.dcd.xml", domainManager=self.dom.ref)
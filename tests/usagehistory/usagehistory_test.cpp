@@ -0,0 +1,130 @@
+/*
+ * This file is protected by Copyright. Please refer to the COPYRIGHT file
+ * distributed with this source distribution.
+ *
+ * This file is part of REDHAWK GPP.
+ *
+ * REDHAWK GPP is free software: you can redistribute it and/or modify it
+ * under the terms of the GNU Lesser General Public License as published by the
+ * Free Software Foundation, either version 3 of the License, or (at your
+ * option) any later version.
+ *
+ * REDHAWK GPP is distributed in the hope that it will be useful, but WITHOUT
+ * ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+ * FITNESS FOR A PARTICULAR PURPOSE.  See the GNU Lesser General Public License
+ * for more details.
+ *
+ * You should have received a copy of the GNU Lesser General Public License
+ * along with this program.  If not, see http://www.gnu.org/licenses/.
+ */
+
+//
+// Checks the usage history the GPP keeps for each component, including a
+// cycle where the component's process group is missing from the process
+// tree.  Each cycle is driven the way GPP_i::update drives it: a sample only
+// yields a usage when the previous sample carries the previous cycle's stamp.
+//
+//   usage: usagehistory_test
+//
+#include <math.h>
+#include <stdio.h>
+#include <stdint.h>
+#include "statistics/UsageHistory.h"
+
+static int failures = 0;
+
+#define CHECK(cond)                                                       \
+  do {                                                                    \
+    if ( !(cond) ) {                                                      \
+      fprintf(stderr, "%s:%d: check failed: %s\n", __FILE__, __LINE__, #cond); \
+      failures++;                                                         \
+    }                                                                     \
+  } while (0)
+
+static bool near( const float a, const float b )
+{
+  return fabs(a - b) < 1e-4;
+}
+
+//
+// one update cycle, returns the usage recorded or -1 if none was
+//
+static float cycle( UsageHistory &history, const int64_t ticks, const int64_t last_stamp, const int64_t stamp )
+{
+  bool have_history = history.size() > 0 && history.get_stamp() == last_stamp;
+  if ( !history.add(ticks, stamp) ) return -1;
+  if ( !have_history ) return -1;
+  float usage = history.get_delta();
+  history.set_usage(usage);
+  return usage;
+}
+
+static void test_steady()
+{
+  UsageHistory history(10, 0.5);
+  CHECK( cycle(history, 1000, 0, 1) == -1 );
+  CHECK( near(cycle(history, 1010, 1, 2), 10) );
+  CHECK( near(cycle(history, 1030, 2, 3), 20) );
+  CHECK( near(cycle(history, 1040, 3, 4), 10) );
+  CHECK( history.get_count() == 3 );
+  CHECK( near(history.get_peak(), 20) );
+  CHECK( near(history.get_p50(), 10) );
+  CHECK( near(history.get_ewma(), 12.5) );
+}
+
+static void test_missing_group()
+{
+  UsageHistory history(10, 0.5);
+  cycle(history, 1000, 0, 1);
+  cycle(history, 1010, 1, 2);
+  cycle(history, 1020, 2, 3);
+  CHECK( history.size() == 3 );
+
+  // the group is missing, nothing is recorded and the stamp stays behind
+  CHECK( !history.add(-1, 4) );
+  CHECK( history.size() == 3 );
+  CHECK( history.get_stamp() == 3 );
+  CHECK( history.get_count() == 2 );
+
+  // the group is back, this cycle only starts a fresh interval
+  CHECK( cycle(history, 1030, 4, 5) == -1 );
+  CHECK( history.get_count() == 2 );
+
+  // and the next one measures it
+  CHECK( near(cycle(history, 1040, 5, 6), 10) );
+  CHECK( history.get_count() == 3 );
+  CHECK( near(history.get_peak(), 10) );
+  CHECK( near(history.get_p95(), 10) );
+  CHECK( near(history.get_ewma(), 10) );
+}
+
+static void test_window()
+{
+  UsageHistory history(3, 0.5);
+  int64_t ticks = 0;
+  for ( int64_t stamp=1; stamp <= 3; stamp++ ) {
+    ticks += 100;
+    cycle(history, ticks, stamp-1, stamp);
+  }
+  CHECK( near(history.get_peak(), 100) );
+  for ( int64_t stamp=4; stamp <= 6; stamp++ ) {
+    ticks += 10;
+    cycle(history, ticks, stamp-1, stamp);
+  }
+  // the 100 tick samples have left the ring
+  CHECK( history.get_count() == 3 );
+  CHECK( near(history.get_peak(), 10) );
+}
+
+int main()
+{
+  test_steady();
+  test_missing_group();
+  test_window();
+  if ( failures ) {
+    fprintf(stderr, "%d check(s) failed\n", failures);
+    return 1;
+  }
+  printf("usagehistory_test: all checks passed\n");
+  return 0;
+}